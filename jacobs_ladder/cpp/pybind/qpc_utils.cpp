@@ -1,5 +1,3 @@
-#ifdef _WIN32
-
 #include "QpcUtils.h"
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
@@ -19,7 +17,9 @@ PYBIND11_MODULE(qpc_utils, m) {
         .def("qpcPrintTimeDiffUs", &QpcUtils::qpcPrintTimeDiffUs)
         .def("qpcPrintTimeDiffMs", &QpcUtils::qpcPrintTimeDiffMs)
         .def("qpcDisplayStatistics", &QpcUtils::qpcDisplayStatistics)
-        .def("qpcCalculatePercentError", &QpcUtils::qpcCalculatePercentError);
+        .def("qpcCalculatePercentError", &QpcUtils::qpcCalculatePercentError)
+        .def("qpcSmartSleepUntil", &QpcUtils::qpcSmartSleepUntil, py::call_guard<py::gil_scoped_release>())
+        .def("qpcSmartSleepNs", &QpcUtils::qpcSmartSleepNs, py::call_guard<py::gil_scoped_release>())
+        .def("qpcCalibrate", &QpcUtils::qpcCalibrate, py::arg("samples") = 50)
+        .def("qpcGetSpinThresholdNs", &QpcUtils::qpcGetSpinThresholdNs);
 }
-
-#endif // _WIN32
\ No newline at end of file
@@ -1,5 +1,3 @@
-#ifdef _WIN32
-
 // Project includes
 #include "QpcUtils.h"
 #include "MathUtils.h"
@@ -14,10 +12,11 @@
 #include <numeric>
 #include <algorithm>
 #include <chrono>
-#include <pybind11/pybind11.h>
-#include <pybind11/stl.h>
+#ifndef _WIN32
+#include <time.h>
+#endif
 
-namespace py = pybind11;
+#ifdef _WIN32
 
 QpcUtils::QpcUtils() {
     // Set system timer resolution to 1 ms using windows multimedia API
@@ -25,6 +24,7 @@ QpcUtils::QpcUtils() {
 
     // Initialize frequency and precision
     qpcSetFrequency(false);
+    qpcCalibrate();
 
     // Set thread affinity to a single CPU core for better timing accuracy
     mPreviousMask = SetThreadAffinityMask(GetCurrentThread(), 1);
@@ -42,14 +42,6 @@ QpcUtils::~QpcUtils() {
     SetThreadAffinityMask(GetCurrentThread(), mPreviousMask);
 }
 
-long long QpcUtils::qpcGetFutureTime(long long now, long long ms) const {
-    if (now < 0 || ms < 0) {
-        std::cerr << "Error: Invalid time values.\n";
-        return -1;
-    }
-    return now + static_cast<long long>((ms / MS_TO_SEC_CONVERSION_FACTOR) * mFrequencyHz);
-}
-
 long long QpcUtils::qpcGetTicks() const {
     LARGE_INTEGER ticks;
     if (QueryPerformanceCounter(&ticks)) {
@@ -74,11 +66,6 @@ void QpcUtils::qpcSetFrequency(bool printMsgs) {
     }
 }
 
-void QpcUtils::qpcCoarseSleep(long long ms) {
-    // Sleep for the specified number of milliseconds using coarse sleep (1 ms resolution since we used winmm function timeBeginPeriod(1))
-    std::this_thread::sleep_for(std::chrono::milliseconds(ms));
-}
-
 void QpcUtils::qpcSleep(int option, long long dimmensionlessTime) {
     long long dimensionlessTimeInNs;
     double conversionFactor;
@@ -127,6 +114,107 @@ void QpcUtils::qpcSleep(int option, long long dimmensionlessTime) {
     }
 }
 
+#else // POSIX
+
+QpcUtils::QpcUtils() {
+    // CLOCK_MONOTONIC_RAW counts nanoseconds
+    qpcSetFrequency(false);
+    qpcCalibrate();
+}
+
+QpcUtils::~QpcUtils() {
+}
+
+long long QpcUtils::qpcGetTicks() const {
+    struct timespec ts;
+    if (clock_gettime(CLOCK_MONOTONIC_RAW, &ts) == 0) {
+        return static_cast<long long>(ts.tv_sec) * 1'000'000'000LL + ts.tv_nsec;
+    } else {
+        std::cerr << "Error: Unable to read CLOCK_MONOTONIC_RAW.\n";
+        return -1;
+    }
+}
+
+void QpcUtils::qpcSetFrequency(bool printMsgs) {
+    struct timespec resolution;
+    mFrequencyHz = 1'000'000'000LL;
+    if (printMsgs && clock_getres(CLOCK_MONOTONIC_RAW, &resolution) == 0) {
+        std::cout << "Performance Counter Frequency: " << mFrequencyHz << " Hz (resolution "
+                  << resolution.tv_nsec << " ns)\n";
+    }
+}
+
+void QpcUtils::qpcSleep(int option, long long dimmensionlessTime) {
+    long long dimensionlessTimeInNs;
+    // If option is 0, the time is in nanoseconds
+    if (option == 0) {
+        dimensionlessTimeInNs = dimmensionlessTime;
+    }
+    // If option is 1, convert the time from microseconds
+    else if (option == 1) {
+        dimensionlessTimeInNs = dimmensionlessTime * 1'000;
+    }
+    // If option is 2, convert the time from milliseconds
+    else if (option == 2) {
+        dimensionlessTimeInNs = dimmensionlessTime * 1'000'000;
+    }
+    // Invalid option, print error message and return
+    else {
+        std::cerr << "Error: Invalid option. Use 0 for ns, 1 for us, or 2 for ms.\n";
+        return;
+    }
+
+    qpcSmartSleepNs(dimensionlessTimeInNs);
+}
+
+#endif // _WIN32
+
+long long QpcUtils::qpcGetFutureTime(long long now, long long ms) const {
+    if (now < 0 || ms < 0) {
+        std::cerr << "Error: Invalid time values.\n";
+        return -1;
+    }
+    return now + static_cast<long long>((ms / MS_TO_SEC_CONVERSION_FACTOR) * mFrequencyHz);
+}
+
+void QpcUtils::qpcCoarseSleep(long long ms) {
+    // Sleep for the specified number of milliseconds using coarse sleep (1 ms resolution since we used winmm function timeBeginPeriod(1))
+    std::this_thread::sleep_for(std::chrono::milliseconds(ms));
+}
+
+void QpcUtils::qpcSmartSleepUntil(long long targetTicks) {
+    long long now = qpcGetTicks();
+    long long remainingNs = static_cast<long long>((targetTicks - now) * (NS_TO_SEC_CONVERSION_FACTOR / mFrequencyHz));
+
+    // Let the OS sleep for everything but the calibrated overshoot, then spin on the counter for the remainder
+    if (remainingNs > mSpinThresholdNs) {
+        std::this_thread::sleep_for(std::chrono::nanoseconds(remainingNs - mSpinThresholdNs));
+    }
+
+    while (qpcGetTicks() < targetTicks) {
+    }
+}
+
+void QpcUtils::qpcSmartSleepNs(long long ns) {
+    long long start = qpcGetTicks();
+    qpcSmartSleepUntil(start + static_cast<long long>(ns * (mFrequencyHz / NS_TO_SEC_CONVERSION_FACTOR)));
+}
+
+long long QpcUtils::qpcCalibrate(int samples) {
+    // Worst wake-up overshoot of a 1 ms OS sleep
+    long long worstOvershootNs = 0;
+    for (int i = 0; i < samples; i++) {
+        long long start = qpcGetTicks();
+        std::this_thread::sleep_for(std::chrono::milliseconds(1));
+        long long elapsedNs = static_cast<long long>((qpcGetTicks() - start) * (NS_TO_SEC_CONVERSION_FACTOR / mFrequencyHz));
+        worstOvershootNs = std::max(worstOvershootNs, elapsedNs - 1'000'000LL);
+    }
+
+    // Margin for the odd wake-up later than any seen while calibrating, clamped to a sensible spin budget
+    mSpinThresholdNs = std::clamp(worstOvershootNs * 2, 100'000LL, 5'000'000LL);
+    return mSpinThresholdNs;
+}
+
 void QpcUtils::qpcSleepNs(long long ns) {
     qpcSleep(0, ns);
 }
@@ -261,5 +349,3 @@ double QpcUtils::qpcCalculatePercentError(double expectedTime, double meanTime)
     std::cout << "Percent Error: " << percentError << "%\n";
     return percentError;
 }
-
-#endif // _WIN32
\ No newline at end of file
@@ -1,15 +1,20 @@
 #ifndef QPC_UTILS_H
 #define QPC_UTILS_H
 
-#ifdef _WIN32
-
 // system includes
+#ifdef _WIN32
 #include <windows.h>
+#endif
 #include <chrono>
+#include <tuple>
 #include <utility>
 #include <vector>
 #include <cstdlib>
 
+/**
+ * High resolution timer. On Windows this is the QueryPerformanceCounter; on Linux and macOS it reads
+ * CLOCK_MONOTONIC_RAW in nanosecond ticks (qpcGetFrequency() returns 1'000'000'000), which is not slewed by NTP.
+ */
 class QpcUtils {
 public:
     QpcUtils();
@@ -28,16 +33,32 @@ public:
     std::tuple<double, double, long long, double> qpcDisplayStatistics(const std::vector<long long>& durations) const;
     double qpcCalculatePercentError(double expectedTime, double meanTime) const;
 
+    /**
+     * Hybrid sleep until an absolute tick count: an OS sleep until mSpinThresholdNs before the target, then a spin
+     * on the counter for the remainder. The threshold is calibrated from the measured OS sleep overshoot.
+     */
+    void qpcSmartSleepUntil(long long targetTicks);
+    void qpcSmartSleepNs(long long ns);
+
+    /**
+     * Measure how late the OS wakes from short sleeps and set the spin threshold of qpcSmartSleepUntil to the worst
+     * overshoot seen plus a margin. Runs once in the constructor.
+     */
+    long long qpcCalibrate(int samples = 50);
+    long long qpcGetSpinThresholdNs() const { return mSpinThresholdNs; }
+
 private:
     long long mFrequencyHz;
     static constexpr long long mPrecisionNs = 16'000'000;
+    long long mSpinThresholdNs {2'000'000};
+#ifdef _WIN32
     LARGE_INTEGER mStartTime;
     DWORD_PTR mPreviousMask;
+#endif
 
     void qpcSetFrequency(bool printMsgs = false);
     void qpcSleep(int option, long long dimmensionlessTime);
     long long qpcPrintTimeDiff(int option, long long start, long long end) const;
 };
 
-#endif // _WIN32
 #endif // QPC_UTILS_H
@@ -1,5 +1,3 @@
-#ifdef _WIN32
-
 #include <iostream>
 #include <cstdint>
 #include <vector>
@@ -78,8 +76,20 @@ int main() {
     std::cout << "Using QpcUtils::qpcSleepUs(1000000) i.e. 1000 ms\n";
     stats = timer.qpcDisplayStatistics(durations);
     percentError = timer.qpcCalculatePercentError(1000000000.0, std::get<0>(stats));
+    std::cout << "\n";
+    durations.clear();
+
+    // Test the accuracy of the calibrated hybrid sleep for 1 ms
+    std::cout << "Calibrated spin threshold: " << timer.qpcGetSpinThresholdNs() << " ns\n";
+    for (unsigned int i = 0; i < 1000; i++) {
+        long long start = timer.qpcGetTicks();
+        timer.qpcSmartSleepNs(1000000);
+        long long end = timer.qpcGetTicks();
+        durations.push_back(end - start);
+    }
+    std::cout << "Using QpcUtils::qpcSmartSleepNs(1000000) i.e. 1 ms\n";
+    stats = timer.qpcDisplayStatistics(durations);
+    percentError = timer.qpcCalculatePercentError(1000000.0, std::get<0>(stats));
     
     return 0;
 }
-
-#endif // _WIN32
\ No newline at end of file
@@ -22,6 +22,7 @@ Output columns:
    identification   : chord name or "Unknown"
 """
 
+from itertools import chain, islice
 from pathlib import Path
 import csv
 
@@ -295,68 +296,148 @@ def intervals_to_notes(intervals, root_pc=0):
     return [NOTE_NAMES[n] for n in notes]
 
 
-def find_rotation_match(intervals, template_dict):
+def canonical_rotation(intervals):
     """
-    Try rotations of 'intervals' and check if any match a canonical template.
-    Returns (rotated_intervals, template_name) or (None, None).
+    Return the lexicographically smallest rotation of 'intervals' along with
+    the offset it starts at, i.e. (canonical, k) where canonical == rotate(intervals, k).
+    When several offsets produce the same minimal rotation the smallest one is used.
     """
-    for rot in all_rotations(intervals):
-        for name, canon in template_dict.items():
-            if rot == canon:
-                return rot, name
-    return None, None
+    seq = tuple(intervals)
+    n = len(seq)
+    if n == 0:
+        return seq, 0
+    offset = min(range(n), key=lambda i: seq[i:] + seq[:i])
+    return seq[offset:] + seq[:offset], offset
 
 
-def classify_csv(path: Path):
-    if not path.exists():
-        raise SystemExit(f"File not found: {path}")
+def rotation_period(canonical):
+    """
+    Smallest positive shift that maps 'canonical' onto itself (len for aperiodic sequences).
+    """
+    n = len(canonical)
+    for p in range(1, n):
+        if n % p == 0 and canonical[p:] + canonical[:p] == canonical:
+            return p
+    return max(n, 1)
 
-    # read CSV
-    with path.open(newline="") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
 
-    if not rows:
-        print("Empty CSV")
-        return
+def build_rotation_index(template_dict):
+    """
+    Build a hash index from the canonical rotation of each template to the templates that share it.
+
+    Returns:
+        dict[tuple, tuple]: canonical -> (period, ((name, template_offset), ...)) in template_dict order
+    """
+    index = {}
+    for name, canon in template_dict.items():
+        canonical, offset = canonical_rotation(canon)
+        period, entries = index.get(canonical, (rotation_period(canonical), ()))
+        index[canonical] = (period, entries + ((name, offset),))
+    return index
+
 
-    # detect degree from column count
-    degree = len(reader.fieldnames)
+ROTATION_INDEX_BY_DEGREE = {
+    degree: build_rotation_index(templates) for degree, templates in TEMPLATES_BY_DEGREE.items()
+}
 
-    if degree not in TEMPLATES_BY_DEGREE:
-        raise ValueError(f"No template dictionary defined for degree {degree}")
 
-    template_dict = TEMPLATES_BY_DEGREE[degree]
+def match_rotation_index(intervals, rotation_index):
+    """
+    Classify 'intervals' with one canonicalization and one dictionary lookup.
+    Returns (rotated_intervals, template_name) or (None, None).
+    """
+    canonical, offset = canonical_rotation(intervals)
+    hit = rotation_index.get(canonical)
+    if hit is None:
+        return None, None
 
-    # output file
-    out_path = path.with_name(path.stem + "_named.csv")
+    period, entries = hit
+    # Templates that are rotations of one another share a key; prefer the one reached by the
+    # smallest rotation of 'intervals', then dictionary order, exactly like the brute-force scan.
+    name, shift = min(
+        ((name, (offset - template_offset) % period) for name, template_offset in entries),
+        key=lambda entry: entry[1],
+    )
+    return rotate(list(intervals), shift), name
 
-    rows_out = []
-    for row in rows:
-        intervals = [int(row[c]) for c in reader.fieldnames]
 
-        rot, name = find_rotation_match(intervals, template_dict)
+def find_rotation_match(intervals, template_dict):
+    """
+    Try rotations of 'intervals' and check if any match a canonical template.
+    Returns (rotated_intervals, template_name) or (None, None).
+    """
+    degree = len(intervals)
+    if TEMPLATES_BY_DEGREE.get(degree) is template_dict:
+        rotation_index = ROTATION_INDEX_BY_DEGREE[degree]
+    else:
+        rotation_index = build_rotation_index(template_dict)
+    return match_rotation_index(intervals, rotation_index)
+
+
+def iter_classified_rows(reader, fieldnames, rotation_index):
+    """
+    Lazily classify rows from a csv.DictReader, yielding output rows one at a time.
+    """
+    for row in reader:
+        intervals = [int(row[c]) for c in fieldnames]
+
+        rot, name = match_rotation_index(intervals, rotation_index)
 
         if name:
             notes = intervals_to_notes(rot, 0)
-            rows_out.append({
+            yield {
                 "intervals": ",".join(str(x) for x in rot),
                 "notes": ",".join(notes),
                 "identification": name
-            })
+            }
         else:
-            rows_out.append({
+            yield {
                 "intervals": ",".join(str(x) for x in intervals),
                 "notes": "",
                 "identification": "Unknown"
-            })
+            }
 
-    # write output CSV
-    with out_path.open("w", newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=["intervals", "notes", "identification"])
-        writer.writeheader()
-        for r in rows_out:
-            writer.writerow(r)
+
+def classify_csv(path: Path, batch_size: int = 4096):
+    """
+    Classify every row of a degree-N interval CSV and write a "_named" CSV next to it.
+
+    Rows are streamed through in batches of 'batch_size' so large generated CSVs are never
+    fully loaded into memory.
+    """
+    if not path.exists():
+        raise SystemExit(f"File not found: {path}")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+    # output file
+    out_path = path.with_name(path.stem + "_named.csv")
+
+    with path.open(newline="") as f:
+        reader = csv.DictReader(f)
+
+        first_row = next(reader, None)
+        if first_row is None:
+            print("Empty CSV")
+            return
+
+        # detect degree from column count
+        degree = len(reader.fieldnames)
+
+        if degree not in TEMPLATES_BY_DEGREE:
+            raise ValueError(f"No template dictionary defined for degree {degree}")
+
+        rotation_index = ROTATION_INDEX_BY_DEGREE[degree]
+        classified = iter_classified_rows(chain([first_row], reader), reader.fieldnames, rotation_index)
+
+        # write output CSV
+        with out_path.open("w", newline='') as out:
+            writer = csv.DictWriter(out, fieldnames=["intervals", "notes", "identification"])
+            writer.writeheader()
+            batch = list(islice(classified, batch_size))
+            while batch:
+                writer.writerows(batch)
+                batch = list(islice(classified, batch_size))
 
     print(f"Wrote {out_path}")
 
@@ -1,13 +1,140 @@
+import heapq
 import itertools
+import math
+
+from typing import Iterator
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+# Semitones above the tonic of the roman numeral degrees of a major key
+ROMAN_NUMERAL_DEGREES = {"I": 0, "II": 2, "III": 4, "IV": 5, "V": 7, "VI": 9, "VII": 11}
+
+# Pitch classes above the root of the chord qualities used in the chord labels, e.g. "bII Dominant 7"
+CHORD_QUALITIES = {
+    "Major": (0, 4, 7),
+    "Minor": (0, 3, 7),
+    "Diminished": (0, 3, 6),
+    "Diminshed": (0, 3, 6),
+    "Augmented": (0, 4, 8),
+    "Major 7": (0, 4, 7, 11),
+    "Dominant": (0, 4, 7, 10),
+    "Dominant 7": (0, 4, 7, 10),
+    "Minor 7": (0, 3, 7, 10),
+    "Minor 7 b5": (0, 3, 6, 10),
+    "Diminished 7": (0, 3, 6, 9),
+}
+
+# Circular semitone distance from each pitch class to the nearest pitch class of every 12-bit mask (bit 0 = C),
+# indexed [pitch_class][mask]; 0 for the empty mask
+NEAREST_PITCH_CLASS_DISTANCE = [
+    [min((min((pitch_class - other) % 12, (other - pitch_class) % 12) for other in range(12) if mask >> other & 1), default=0)
+     for mask in range(4096)]
+    for pitch_class in range(12)
+]
+
+
+def chord_label_mask(chord: str, key: int = 0) -> int:
+    """Build the 12-bit pitch class mask (bit 0 = C) of a roman numeral chord label such as "bVI Major 7"
+
+    Args:
+        chord (str): optional b or # accidental, roman numeral, space, quality from CHORD_QUALITIES
+        key (int, optional): pitch class of the tonic. Defaults to 0 (C).
+
+    Raises:
+        ValueError: if the numeral or quality is not recognised
+
+    Returns:
+        int: 12-bit pitch class mask
+    """
+    numeral, _, quality = chord.partition(" ")
+    accidental = 0
+    if numeral[:1] in ("b", "#"):
+        accidental = -1 if numeral[0] == "b" else 1
+        numeral = numeral[1:]
+    if numeral not in ROMAN_NUMERAL_DEGREES or quality not in CHORD_QUALITIES:
+        raise ValueError(f"Unrecognised chord label '{chord}'")
+
+    root = (key + ROMAN_NUMERAL_DEGREES[numeral] + accidental) % 12
+    mask = 0
+    for pitch_class in CHORD_QUALITIES[quality]:
+        mask |= 1 << (root + pitch_class) % 12
+    return mask
+
+
+def voice_leading_distance(first_mask: int, second_mask: int) -> int:
+    """Voice leading distance between two pitch class sets: the semitones each pitch class of either chord is from the
+    nearest pitch class of the other, summed. Common tones cost nothing and the distance is symmetric.
+
+    Args:
+        first_mask (int): 12-bit pitch class mask
+        second_mask (int): 12-bit pitch class mask
+
+    Returns:
+        int: distance in semitones
+    """
+    distance = 0
+    for pitch_class in range(12):
+        if first_mask >> pitch_class & 1:
+            distance += NEAREST_PITCH_CLASS_DISTANCE[pitch_class][second_mask]
+        if second_mask >> pitch_class & 1:
+            distance += NEAREST_PITCH_CLASS_DISTANCE[pitch_class][first_mask]
+    return distance
+
 
 class ChordSeqTree:
     """
     List the possible combinations of a group of chords.  This study utility is useful for iterating through the 
     possible chord combinations that are possible for a given list of chords.
+
+    Sequences can be counted without enumerating them, streamed lazily, or explored as a tree of progressions scored
+    by voice leading distance, where branches that cannot make the top k (or that take too large a step) are pruned.
     """
     
-    def __init__(self):
-        pass
+    def __init__(self, key: int = 0, masks: dict[str, int] = None):
+        """Create a sequence explorer
+
+        Args:
+            key (int, optional): pitch class of the tonic the roman numeral labels are relative to. Defaults to 0 (C).
+            masks (dict[str, int], optional): 12-bit pitch class masks of chords whose labels chord_label_mask does
+                not understand. Defaults to None.
+        """
+        self.key = key
+        self.masks = dict(masks) if masks else {}
+
+    def count_sequences(self, num_chords: int, choices: int, ordered: bool = False, repeats: bool = False) -> int:
+        """Count the sequences without enumerating them
+
+        Args:
+            num_chords (int): size of the chord vocabulary
+            choices (int): chords per sequence
+            ordered (bool, optional): count orderings of the same chords separately. Defaults to False.
+            repeats (bool, optional): allow a chord more than once. Defaults to False.
+
+        Returns:
+            int: the number of sequences iter_sequences would yield
+        """
+        if ordered:
+            return num_chords ** choices if repeats else math.perm(num_chords, choices)
+        if repeats:
+            return math.comb(num_chords + choices - 1, choices) if num_chords else int(choices == 0)
+        return math.comb(num_chords, choices)
+
+    def iter_sequences(self, chords: list[str], choices: int, ordered: bool = False, repeats: bool = False) -> Iterator[tuple[str, ...]]:
+        """Stream the sequences one at a time
+
+        Args:
+            chords (list[str]): the chord vocabulary
+            choices (int): chords per sequence
+            ordered (bool, optional): yield orderings of the same chords separately. Defaults to False.
+            repeats (bool, optional): allow a chord more than once. Defaults to False.
+
+        Returns:
+            Iterator[tuple[str, ...]]: the sequences, in lexicographic order of the vocabulary
+        """
+        if ordered:
+            return itertools.product(chords, repeat=choices) if repeats else itertools.permutations(chords, choices)
+        return itertools.combinations_with_replacement(chords, choices) if repeats else itertools.combinations(chords, choices)
     
     def generate_chord_sequences(self, chords: list[str], choices: int):
         """Generate a list of unique chord combinations 
@@ -19,10 +146,119 @@ class ChordSeqTree:
         Returns:
             list[list[str]]: All of the chord combinations possible for the given value of choices. 
         """
-        combinations = list(itertools.combinations(chords, choices))
-        print(f"With {len(chords)} possible chords and {choices} choices: \nThere are {len(combinations)} possible chord sequences\n")
+        print(f"With {len(chords)} possible chords and {choices} choices: \nThere are {self.count_sequences(len(chords), choices)} possible chord sequences\n")
         
-        return combinations
+        return list(self.iter_sequences(chords, choices))
+
+    def get_mask(self, chord: str) -> int:
+        """The 12-bit pitch class mask of a chord, from the masks given at construction or its roman numeral label"""
+        mask = self.masks.get(chord)
+        if mask is None:
+            mask = self.masks[chord] = chord_label_mask(chord, key=self.key)
+        return mask
+
+    def distance_matrix(self, chords: list[str]) -> list[list[int]]:
+        """Voice leading distance between every pair of chords in the vocabulary
+
+        Args:
+            chords (list[str]): the chord vocabulary
+
+        Returns:
+            list[list[int]]: distances indexed [from][to] in vocabulary order
+        """
+        masks = [self.get_mask(chord) for chord in chords]
+        return [[voice_leading_distance(first, second) for second in masks] for first in masks]
+
+    def score_progression(self, progression: list[str]) -> int:
+        """Total voice leading distance of a progression, lower being smoother
+
+        Args:
+            progression (list[str]): chords in the order they are played
+
+        Returns:
+            int: the summed distance between consecutive chords
+        """
+        masks = [self.get_mask(chord) for chord in progression]
+        return sum(voice_leading_distance(first, second) for first, second in zip(masks, masks[1:]))
+
+    def iter_progressions(self, chords: list[str], choices: int, repeats: bool = False,
+                          max_step: int = None) -> Iterator[tuple[int, tuple[str, ...]]]:
+        """Stream the ordered progressions depth first with their scores, pruning every branch at a step whose voice
+        leading distance exceeds max_step
+
+        Args:
+            chords (list[str]): the chord vocabulary
+            choices (int): chords per progression
+            repeats (bool, optional): allow a chord more than once. Defaults to False.
+            max_step (int, optional): largest distance allowed between consecutive chords. Defaults to None (no limit).
+
+        Yields:
+            tuple[int, tuple[str, ...]]: score and progression
+        """
+        for score, path in self._walk(chords, choices, repeats, max_step, bound=None):
+            yield score, tuple(chords[index] for index in path)
+
+    def best_progressions(self, chords: list[str], choices: int, k: int = 10, repeats: bool = False,
+                          max_step: int = None) -> list[tuple[int, tuple[str, ...]]]:
+        """Find the k smoothest ordered progressions with a bounded heap. Once k progressions are held, branches whose
+        partial score already reaches the worst of them are not explored.
+
+        Args:
+            chords (list[str]): the chord vocabulary
+            choices (int): chords per progression
+            k (int, optional): number of progressions to return. Defaults to 10.
+            repeats (bool, optional): allow a chord more than once. Defaults to False.
+            max_step (int, optional): largest distance allowed between consecutive chords. Defaults to None (no limit).
+
+        Returns:
+            list[tuple[int, tuple[str, ...]]]: (score, progression) pairs, smoothest first (ties in vocabulary order)
+        """
+        if k <= 0:
+            return []
+        # Max-heap on (score, order) through negation, so the root is the worst progression kept
+        heap: list[tuple[int, int, tuple[int, ...]]] = []
+        bound = [math.inf]
+        for order, (score, path) in enumerate(self._walk(chords, choices, repeats, max_step, bound=bound)):
+            if len(heap) < k:
+                heapq.heappush(heap, (-score, -order, path))
+            else:
+                heapq.heappushpop(heap, (-score, -order, path))
+            if len(heap) == k:
+                bound[0] = -heap[0][0]
+        ranked = sorted((-negative_score, -negative_order, path) for negative_score, negative_order, path in heap)
+        return [(score, tuple(chords[index] for index in path)) for score, _, path in ranked]
+
+    def _walk(self, chords: list[str], choices: int, repeats: bool, max_step: int | None,
+              bound: list[float] | None) -> Iterator[tuple[int, tuple[int, ...]]]:
+        """Depth first walk of the progression tree over vocabulary indices. A branch is cut when a step exceeds
+        max_step or its partial score reaches bound[0] (distances are never negative, so it cannot improve)."""
+        if choices <= 0:
+            return
+        distances = self.distance_matrix(chords)
+        size = len(chords)
+        path: list[int] = []
+        used = [False] * size
+
+        def extend(score: int) -> Iterator[tuple[int, tuple[int, ...]]]:
+            if len(path) == choices:
+                yield score, tuple(path)
+                return
+            row = distances[path[-1]] if path else None
+            for index in range(size):
+                if used[index] and not repeats:
+                    continue
+                step = row[index] if row is not None else 0
+                if max_step is not None and step > max_step:
+                    continue
+                if bound is not None and score + step >= bound[0]:
+                    continue
+                path.append(index)
+                used[index] = True
+                yield from extend(score + step)
+                used[index] = False
+                path.pop()
+
+        yield from extend(0)
     
 
 if __name__ == "__main__":
@@ -43,4 +279,9 @@ if __name__ == "__main__":
     
     cst.generate_chord_sequences(chords=chords, choices=2)
     cst.generate_chord_sequences(chords=chords, choices=3)
-    cst.generate_chord_sequences(chords=chords, choices=4)
\ No newline at end of file
+    for choices in (4, 8):
+        print(f"{choices} chords: {cst.count_sequences(len(chords), choices)} combinations, "
+              f"{cst.count_sequences(len(chords), choices, ordered=True)} ordered progressions")
+    print("\nSmoothest 4 chord progressions:")
+    for score, progression in cst.best_progressions(chords, choices=4, k=5):
+        print(f"{score:>3}  {' -> '.join(progression)}")
@@ -0,0 +1,229 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+
+class Clock(ABC):
+    """Time source shared by MidiRecorder, MidiScheduler, PlayMidi and the TimingThread.
+
+    Schedulers never sleep or wait on a Condition directly. They go through wait_until()/notify() and start their
+    threads with start_thread(), which is what lets a VirtualClock run them deterministically.
+    """
+
+    # Schedulers wait on their Condition until this close to a deadline, then spin on now() for the remainder
+    spin_threshold: float = 0.002
+
+    @abstractmethod
+    def now(self) -> float:
+        """Monotonic time in seconds"""
+
+    @abstractmethod
+    def get_ticks(self) -> int:
+        """Monotonic time in ticks of get_frequency()"""
+
+    @abstractmethod
+    def get_frequency(self) -> int:
+        """Ticks per second"""
+
+    def wait_until(self, condition: threading.Condition, deadline: float | None) -> None:
+        """Wait on a held Condition until it is notified or until spin_threshold before the deadline. Callers re-check
+        their state afterwards and finish the last stretch with spin_until().
+
+        Args:
+            condition (threading.Condition): a Condition held by the caller
+            deadline (float | None): absolute time in seconds, None to wait until notified
+        """
+        condition.wait(None if deadline is None else max(deadline - self.spin_threshold - self.now(), 0.0))
+
+    def spin_until(self, deadline: float) -> None:
+        """Busy-wait for the last stretch before a deadline"""
+        while self.now() < deadline:
+            pass
+
+    def notify(self, condition: threading.Condition) -> None:
+        """Wake the scheduler thread waiting on a held Condition
+
+        Args:
+            condition (threading.Condition): a Condition held by the caller
+        """
+        condition.notify()
+
+    def sleep(self, seconds: float) -> None:
+        """Block the calling thread for a number of seconds"""
+        time.sleep(seconds)
+
+    def start_thread(self, target, name: str) -> threading.Thread:
+        """Start a daemon scheduler thread
+
+        Args:
+            target (callable): the thread's main loop
+            name (str): thread name
+
+        Returns:
+            threading.Thread: the started thread
+        """
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        return thread
+
+
+class MonotonicClock(Clock):
+    """time.perf_counter, in nanosecond ticks"""
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def get_ticks(self) -> int:
+        return time.perf_counter_ns()
+
+    def get_frequency(self) -> int:
+        return 1_000_000_000
+
+
+class QpcClock(Clock):
+    """The compiled qpc_utils timer: QueryPerformanceCounter on Windows, CLOCK_MONOTONIC_RAW in nanoseconds on Linux and
+    macOS. The last stretch before a deadline is spun in C++ with the GIL released."""
+
+    def __init__(self):
+        from jacobs_ladder import qpc_utils
+
+        self.qpc = qpc_utils.QpcUtils()
+        self.frequency = self.qpc.qpcGetFrequency()
+
+    def now(self) -> float:
+        return self.qpc.qpcGetTicks() / self.frequency
+
+    def get_ticks(self) -> int:
+        return self.qpc.qpcGetTicks()
+
+    def get_frequency(self) -> int:
+        return self.frequency
+
+    def sleep(self, seconds: float) -> None:
+        self.qpc.qpcSmartSleepNs(int(seconds * 1e9))
+
+    def spin_until(self, deadline: float) -> None:
+        self.qpc.qpcSmartSleepUntil(int(deadline * self.frequency))
+
+
+class VirtualClock(Clock):
+    """A clock that only moves when advance() is called, for running schedulers deterministically in tests.
+
+    Threads started with start_thread() are tracked. advance() steps time to each deadline a tracked thread is
+    waiting for, wakes it and lets every tracked thread settle back into wait_until() before stepping on, so scheduled
+    messages land on exact virtual times and hours of playback take milliseconds.
+    """
+
+    spin_threshold = 0.0
+
+    def __init__(self, start: float = 0.0, frequency: int = 1_000_000_000):
+        """Create a virtual clock
+
+        Args:
+            start (float, optional): initial time in seconds. Defaults to 0.0.
+            frequency (int, optional): ticks per second. Defaults to 1_000_000_000.
+        """
+        self._now = start
+        self.frequency = frequency
+        self._lock = threading.Condition()
+        # Waiting threads by ident: (deadline or None, the Condition they wait on)
+        self._parked: dict[int, tuple[float | None, threading.Condition]] = {}
+        self._tracked: set[int] = set()
+        self._running = 0
+
+    def now(self) -> float:
+        return self._now
+
+    def get_ticks(self) -> int:
+        return round(self._now * self.frequency)
+
+    def get_frequency(self) -> int:
+        return self.frequency
+
+    def wait_until(self, condition: threading.Condition, deadline: float | None) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            self._parked[ident] = (deadline, condition)
+            self._lock.notify_all()
+        try:
+            condition.wait()
+        finally:
+            with self._lock:
+                self._parked.pop(ident, None)
+                self._lock.notify_all()
+
+    def notify(self, condition: threading.Condition) -> None:
+        # The woken threads count as running until they wait again, so advance() cannot step past their new work
+        with self._lock:
+            for ident in [ident for ident, (_, parked_on) in self._parked.items() if parked_on is condition]:
+                del self._parked[ident]
+        condition.notify_all()
+
+    def sleep(self, seconds: float) -> None:
+        condition = threading.Condition()
+        deadline = self._now + seconds
+        with condition:
+            while self._now < deadline:
+                self.wait_until(condition, deadline)
+
+    def start_thread(self, target, name: str) -> threading.Thread:
+        def run():
+            with self._lock:
+                self._tracked.add(threading.get_ident())
+            try:
+                target()
+            finally:
+                with self._lock:
+                    self._tracked.discard(threading.get_ident())
+                    self._running -= 1
+                    self._lock.notify_all()
+
+        with self._lock:
+            self._running += 1
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        thread.start()
+        return thread
+
+    def settle(self, timeout: float = 5.0) -> None:
+        """Block until every tracked thread is waiting on the clock (or has exited)
+
+        Raises:
+            TimeoutError: if a tracked thread keeps running for timeout real seconds
+        """
+        with self._lock:
+            if not self._lock.wait_for(lambda: sum(ident in self._tracked for ident in self._parked) >= self._running, timeout):
+                raise TimeoutError("Tracked threads did not settle")
+
+    def advance(self, seconds: float) -> None:
+        """Move time forward, waking each waiting thread at its exact deadline on the way
+
+        Args:
+            seconds (float): how far to advance
+        """
+        end = self._now + seconds
+        while True:
+            self.settle()
+            with self._lock:
+                deadlines = [deadline for deadline, _ in self._parked.values() if deadline is not None and deadline <= end]
+                if not deadlines:
+                    self._now = end
+                    return
+                self._now = max(self._now, min(deadlines))
+                woken = [ident for ident, (deadline, _) in self._parked.items()
+                         if deadline is not None and deadline <= self._now]
+                conditions = {id(self._parked[ident][1]): self._parked.pop(ident)[1] for ident in woken}
+            for condition in conditions.values():
+                with condition:
+                    condition.notify_all()
+
+
+def default_clock() -> Clock:
+    """The most precise clock available: the compiled qpc_utils timer when it has been built, otherwise
+    time.perf_counter"""
+    try:
+        return QpcClock()
+    except ImportError:
+        return MonotonicClock()
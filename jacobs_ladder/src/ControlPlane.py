@@ -0,0 +1,206 @@
+import asyncio
+import json
+import logging
+import socket
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+# Datagrams queued per sender while the socket is applying backpressure. Telemetry is superseded by the next
+# key event, so once the queue is full the oldest datagram is dropped rather than blocking the MIDI callback.
+MAX_PENDING_DATAGRAMS = 256
+
+
+class ControlPlane:
+    """A single asyncio event loop, run on a daemon thread, which hosts every UDP endpoint of a MidiController.
+
+    Receivers block in the loop's selector until a datagram arrives instead of polling a socket with a timeout, and
+    senders hand datagrams to the loop so the MIDI callback thread never touches a socket.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.loop = asyncio.new_event_loop()
+        self.thread: threading.Thread | None = None
+        self.transports: list[asyncio.DatagramTransport] = []
+
+    def start(self) -> None:
+        """Start the event loop thread (no-op if it is already running)"""
+        if self.thread is not None:
+            return
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(ready,), name="ControlPlane", daemon=True)
+        self.thread.start()
+        ready.wait()
+
+    def _run(self, ready: threading.Event) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(ready.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def stop(self) -> None:
+        """Close every endpoint and stop the event loop thread"""
+        if self.thread is None:
+            return
+        for transport in self.transports:
+            self.loop.call_soon_threadsafe(transport.close)
+        self.transports = []
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.thread = None
+
+    def open_endpoint(self, protocol_factory, **kwargs) -> tuple[asyncio.DatagramTransport, asyncio.DatagramProtocol]:
+        """Create a datagram endpoint on the event loop from any thread
+
+        Args:
+            protocol_factory (Callable[[], asyncio.DatagramProtocol]): protocol factory
+            **kwargs: forwarded to loop.create_datagram_endpoint (local_addr, family, ...)
+
+        Returns:
+            tuple[asyncio.DatagramTransport, asyncio.DatagramProtocol]: the transport and protocol
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(self.loop.create_datagram_endpoint(protocol_factory, **kwargs), self.loop)
+        transport, protocol = future.result()
+        self.transports.append(transport)
+        return transport, protocol
+
+    def close_endpoint(self, transport: asyncio.DatagramTransport) -> None:
+        """Close an endpoint opened with open_endpoint
+
+        Args:
+            transport (asyncio.DatagramTransport): the endpoint's transport
+        """
+        if transport in self.transports:
+            self.transports.remove(transport)
+        if self.thread is not None:
+            self.loop.call_soon_threadsafe(transport.close)
+
+
+class _ReceiverProtocol(asyncio.DatagramProtocol):
+    """Dispatches each datagram on the control plane thread as soon as the selector reports it"""
+
+    def __init__(self, receiver: "DatagramReceiver"):
+        self.receiver = receiver
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        try:
+            self.receiver.dispatch_message(data=data)
+        except Exception as e:
+            self.receiver.logger.error(f"[CP] Error dispatching message on port {self.receiver.receive_address[1]}: {e}")
+
+    def error_received(self, exc: Exception) -> None:
+        self.receiver.logger.error(f"[CP] Socket error on port {self.receiver.receive_address[1]}: {exc}")
+
+
+class _SenderProtocol(asyncio.DatagramProtocol):
+    """Sends queued datagrams unless the transport has asked the protocol to pause writing"""
+
+    def __init__(self, logger: logging.Logger, on_resume):
+        self.logger = logger
+        self.on_resume = on_resume
+        self.transport: asyncio.DatagramTransport | None = None
+        self.paused = False
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        self.transport = transport
+
+    def pause_writing(self) -> None:
+        self.paused = True
+
+    def resume_writing(self) -> None:
+        self.paused = False
+        self.on_resume()
+
+    def error_received(self, exc: Exception) -> None:
+        self.logger.error(f"[CP] Error sending data: {exc}")
+
+
+class DatagramSender:
+    """Drop-in replacement for UDPSender which sends through a ControlPlane.
+
+    send_bytes may be called from any thread. Datagrams are appended to a bounded queue and flushed by the event loop;
+    a burst of sends (e.g. the type-1 and type-2 datagrams of one key event) costs a single loop wakeup.
+    """
+
+    def __init__(self, host: str, port: int, logger: logging.Logger, control_plane: ControlPlane,
+                 max_pending: int = MAX_PENDING_DATAGRAMS):
+        self.logger = logger
+        self.send_address = (host, port)
+        self.control_plane = control_plane
+        self.pending: deque[bytes] = deque(maxlen=max_pending)
+        self.dropped = 0
+        self.flush_scheduled = False
+        self.transport, self.protocol = control_plane.open_endpoint(lambda: _SenderProtocol(logger, self._flush), family=socket.AF_INET)
+
+    def send(self, data):
+        """Send Udp data to the specified send address
+
+        Args:
+            data (Any): Any data you want to send over Udp (bytes are sent as is, anything else is JSON encoded)
+        """
+        if not isinstance(data, (bytes, bytearray)):
+            data = json.dumps(data).encode()
+        self.send_bytes(data)
+
+    def send_bytes(self, data_bytes: bytes):
+        """Queue raw bytes for the Dart app
+
+        Args:
+            data_bytes (bytes): header bitmask pair for dart app
+        """
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(data_bytes)
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            try:
+                self.control_plane.loop.call_soon_threadsafe(self._flush)
+            except RuntimeError:
+                # The control plane has been stopped
+                self.flush_scheduled = False
+
+    def _flush(self) -> None:
+        self.flush_scheduled = False
+        protocol = self.protocol
+        while self.pending and not protocol.paused and not self.transport.is_closing():
+            try:
+                self.transport.sendto(self.pending.popleft(), self.send_address)
+            except Exception as e:
+                self.logger.error(f"[CP] Error sending data: {e}")
+
+    def stop(self):
+        self.control_plane.close_endpoint(self.transport)
+
+
+class DatagramReceiver(ABC):
+    """Drop-in replacement for UDPReceiver which listens on a ControlPlane instead of a polling thread"""
+
+    def __init__(self, host: str, port: int, logger: logging.Logger, control_plane: ControlPlane):
+        self.logger = logger
+        self.receive_address = (host, port)
+        self.control_plane = control_plane
+        self.transport: asyncio.DatagramTransport | None = None
+
+    def start_listener(self):
+        self.transport, _ = self.control_plane.open_endpoint(lambda: _ReceiverProtocol(self), local_addr=self.receive_address)
+
+    def stop(self):
+        if self.transport is not None:
+            self.control_plane.close_endpoint(self.transport)
+            self.transport = None
+
+    @abstractmethod
+    def dispatch_message(self, data):
+        """This is a method which parses messages across a user specified UDP interface. Called on the control plane thread.
+
+        Args:
+            data (bytes): the received datagram
+        """
+        pass
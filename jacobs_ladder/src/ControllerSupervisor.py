@@ -0,0 +1,84 @@
+import argparse
+import threading
+
+from .ControlPlane import ControlPlane
+from .Logging import setup_logging
+from .MidiManager import MidiController
+from .MusicTheory import TheoryTables
+from .Utilities import parse_supervisor_config
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+
+class ControllerSupervisor:
+    """Hosts several MidiControllers (one per keyboard) in a single process.
+
+    Each controller keeps its own voice allocator, sustain state, output port set and UDP endpoints, while the
+    immutable music theory tables (scales, bitmasks, chord dictionaries) and the parsed tuning configs are built once
+    and shared by reference. All UDP endpoints run on one ControlPlane event loop.
+    """
+
+    def __init__(self, controller_kwargs: list[dict], log_level: int = 20):
+        """Build the shared tables and the control plane
+
+        Args:
+            controller_kwargs (list[dict]): MidiController kwargs of each keyboard (see parse_supervisor_config)
+            log_level (int, optional): log level of the supervisor log. Defaults to 20.
+        """
+        self.controller_kwargs = controller_kwargs
+        self.logger = setup_logging(app_name="ControllerSupervisor", level=log_level)
+
+        chord_loading = controller_kwargs[0].get('chord_loading', "background")
+        self.theory_tables = TheoryTables(logger=self.logger, chord_loading=chord_loading)
+        self.control_plane = ControlPlane(logger=self.logger)
+        self.controllers: list[MidiController] = []
+        self.stopped = threading.Event()
+
+    def start(self) -> None:
+        """Construct every controller. A controller which fails to start stops the ones already running."""
+        try:
+            for kwargs in self.controller_kwargs:
+                controller = MidiController(**kwargs, theory_tables=self.theory_tables,
+                                            control_plane=self.control_plane, listen=False)
+                self.controllers.append(controller)
+                self.logger.info(f"[CS] Started '{controller.name}' on input '{controller.input_port}' "
+                                 f"(control port {controller.control_port}, telemetry port {controller.telemetry_port})")
+        except Exception:
+            self.shutdown()
+            raise
+
+    def run(self) -> None:
+        """Start the controllers and block until Ctrl+C or shutdown()"""
+        self.start()
+        try:
+            print(f"Listening for MIDI messages on {len(self.controllers)} controllers. Press Ctrl+C to exit.")
+            while not self.stopped.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            print("Exiting...")
+            for controller in self.controllers:
+                controller.turn_off_all_notes()
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        """Stop every controller, then the shared control plane"""
+        for controller in self.controllers:
+            try:
+                controller.shutdown()
+            except Exception as e:
+                self.logger.error(f"[CS] Failed to shut down '{controller.name}': {e}")
+        self.controllers = []
+        self.control_plane.stop()
+        self.stopped.set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one MidiController per keyboard from a supervisor YAML config.")
+    parser.add_argument('config_path', type=str, help="Path to YAML config file.")
+    args = parser.parse_args()
+
+    controller_kwargs = parse_supervisor_config(args.config_path, print_config=True)
+    supervisor = ControllerSupervisor(controller_kwargs, log_level=controller_kwargs[0]['log_level'])
+    supervisor.run()
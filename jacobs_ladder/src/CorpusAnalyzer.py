@@ -0,0 +1,229 @@
+import argparse
+import logging
+import os
+import time
+
+from multiprocessing import Pool
+from pathlib import Path
+
+from .MusicTheory import MusicTheory, TheoryTables
+from .Voice import Voice
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+DEFAULT_SCALE_INCLUDES = ["Ionian", "Harmonic Minor", "Harmonic Major", "Melodic Minor"]
+OUTPUT_FORMATS = ("csv", "parquet")
+MIDI_EXTENSIONS = (".mid", ".midi")
+
+# Theory tables of a worker process, built once by init_worker from the chord dictionaries loaded by the parent
+_worker_tables: TheoryTables | None = None
+_worker_options: dict = {}
+
+
+def iter_held_notes(path: str):
+    """Stream a MIDI file and yield the held notes after every note event, honouring the sustain pedal like
+    MidiController does (released notes stay held until the pedal is lifted).
+
+    Args:
+        path (str): path to a .mid file
+
+    Yields:
+        tuple[float, str, int, int, list[int]]: time in seconds, event ("note_on", "note_off" or "sustain_off"),
+            note, velocity and the held notes after the event
+    """
+    import mido
+
+    held: list[int] = []
+    sustained: list[int] = []
+    sustain = False
+    now = 0.0
+    for msg in mido.MidiFile(path):
+        now += msg.time
+        if msg.type == "note_on" and msg.velocity > 0:
+            held.append(msg.note)
+            yield now, "note_on", msg.note, msg.velocity, held
+        elif msg.type == "note_off" or msg.type == "note_on":
+            if sustain:
+                sustained.append(msg.note)
+            elif msg.note in held:
+                held.remove(msg.note)
+            yield now, "note_off", msg.note, msg.velocity, held
+        elif msg.type == "control_change" and msg.control == 64:
+            if msg.value >= 64:
+                sustain = True
+            elif sustain:
+                sustain = False
+                for note in sustained:
+                    if note in held:
+                        held.remove(note)
+                sustained = []
+                yield now, "sustain_off", 64, msg.value, held
+
+
+def analyze_events(path: str, music_theory: MusicTheory, scale_includes: list[str]) -> dict[str, list]:
+    """Run the live analysis (determine_chord, get_candidate_scales, find_key) on every note event of a MIDI file
+
+    Args:
+        path (str): path to a .mid file
+        music_theory (MusicTheory): a fresh MusicTheory (find_key depends on its history)
+        scale_includes (list[str]): scale families passed to get_candidate_scales
+
+    Returns:
+        dict[str, list]: columns time_s, event, note, velocity, held_notes, chord, candidate_scales, key
+    """
+    columns = {name: [] for name in ("time_s", "event", "note", "velocity", "held_notes", "chord", "candidate_scales", "key")}
+    for now, event, note, velocity, held in iter_held_notes(path):
+        # Octaves share an output instance in MidiController, which is what determine_chord relies on
+        message_heap = [Voice(held_note, held_note % 12, 144, 100) for held_note in held]
+
+        chord = None
+        if message_heap:
+            try:
+                chord = music_theory.determine_chord(message_heap)
+            except KeyError:
+                chord = "unknown"
+        candidate_scales, _ = music_theory.get_candidate_scales(message_heap=message_heap, scale_includes=scale_includes)
+        key = music_theory.find_key()
+
+        columns["time_s"].append(round(now, 6))
+        columns["event"].append(event)
+        columns["note"].append(note)
+        columns["velocity"].append(velocity)
+        columns["held_notes"].append(" ".join(map(str, sorted(held))))
+        columns["chord"].append(chord)
+        columns["candidate_scales"].append(";".join(candidate_scales))
+        columns["key"].append(key)
+    return columns
+
+
+def write_columns(columns: dict[str, list], output_path: Path, output_format: str) -> None:
+    """Write the analysis of one file as CSV or Parquet
+
+    Args:
+        columns (dict[str, list]): the analysis columns
+        output_path (Path): destination file
+        output_format (str): "csv" or "parquet" (requires pyarrow or fastparquet)
+    """
+    import pandas as pd
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    data_frame = pd.DataFrame(columns)
+    if output_format == "parquet":
+        data_frame.to_parquet(output_path, index=False)
+    else:
+        data_frame.to_csv(output_path, index=False)
+
+
+def init_worker(chord_lookups: dict[int, dict], options: dict) -> None:
+    """Pool initializer: build the worker's theory tables from the parent's chord dictionaries"""
+    global _worker_tables, _worker_options
+    _worker_tables = TheoryTables(logger=logging.getLogger("CorpusAnalyzer"), chord_lookups=chord_lookups)
+    _worker_options = options
+
+
+def analyze_file(job: tuple[str, str]) -> tuple[str, int, str | None]:
+    """Analyse one MIDI file in a worker process and write its results
+
+    Args:
+        job (tuple[str, str]): input path and output path
+
+    Returns:
+        tuple[str, int, str | None]: input path, number of events and an error message (None on success)
+    """
+    path, output_path = job
+    try:
+        music_theory = MusicTheory(logger=logging.getLogger("CorpusAnalyzer"), tables=_worker_tables)
+        columns = analyze_events(path, music_theory, _worker_options["scale_includes"])
+        write_columns(columns, Path(output_path), _worker_options["output_format"])
+        return path, len(columns["event"]), None
+    except Exception as e:
+        return path, 0, f"{type(e).__name__}: {e}"
+
+
+def collect_jobs(inputs: list[str], output_dir: str, output_format: str) -> list[tuple[str, str]]:
+    """Find the MIDI files to analyse and where each result goes (the input tree is mirrored under output_dir)
+
+    Args:
+        inputs (list[str]): MIDI files and/or directories searched recursively
+        output_dir (str): results directory
+        output_format (str): "csv" or "parquet"
+
+    Returns:
+        list[tuple[str, str]]: (input path, output path) pairs
+    """
+    jobs = []
+    for entry in map(Path, inputs):
+        if entry.is_dir():
+            paths = sorted(path for path in entry.rglob("*") if path.suffix.lower() in MIDI_EXTENSIONS)
+            root = entry
+        else:
+            paths = [entry]
+            root = entry.parent
+        for path in paths:
+            output_path = Path(output_dir) / path.relative_to(root).with_suffix(f".{output_format}")
+            jobs.append((str(path), str(output_path)))
+    return jobs
+
+
+def analyze_corpus(inputs: list[str], output_dir: str, output_format: str = "csv", workers: int = None,
+                   scale_includes: list[str] = None, chunksize: int = None) -> dict:
+    """Analyse a corpus of MIDI files across a process pool
+
+    Args:
+        inputs (list[str]): MIDI files and/or directories
+        output_dir (str): results directory
+        output_format (str, optional): "csv" or "parquet". Defaults to "csv".
+        workers (int, optional): worker processes. Defaults to os.cpu_count().
+        scale_includes (list[str], optional): scale families for get_candidate_scales. Defaults to DEFAULT_SCALE_INCLUDES.
+        chunksize (int, optional): files handed to a worker at a time. Defaults to ~4 chunks per worker.
+
+    Returns:
+        dict: files, events, failures (list of (path, error)), seconds and files_per_second
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Invalid output_format '{output_format}'. Must be one of {OUTPUT_FORMATS}.")
+
+    if output_format == "parquet":
+        import importlib.util
+        if not any(importlib.util.find_spec(engine) for engine in ("pyarrow", "fastparquet")):
+            raise ImportError("Parquet output requires pyarrow or fastparquet")
+
+    jobs = collect_jobs(inputs, output_dir, output_format)
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, len(jobs) // (workers * 4))
+    options = {"scale_includes": scale_includes or DEFAULT_SCALE_INCLUDES, "output_format": output_format}
+
+    start = time.perf_counter()
+    # Load the chord dictionaries once here; the workers get them through the initializer instead of reloading them
+    chord_lookups = TheoryTables(logger=logging.getLogger("CorpusAnalyzer"), chord_loading="eager").get_chord_lookups()
+
+    events = 0
+    failures = []
+    with Pool(processes=workers, initializer=init_worker, initargs=(chord_lookups, options)) as pool:
+        for path, file_events, error in pool.imap_unordered(analyze_file, jobs, chunksize=chunksize):
+            events += file_events
+            if error is not None:
+                failures.append((path, error))
+    seconds = time.perf_counter() - start
+
+    return {"files": len(jobs), "events": events, "failures": failures, "seconds": seconds,
+            "files_per_second": len(jobs) / seconds if seconds else 0.0}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chord, scale and key statistics for a library of MIDI files.")
+    parser.add_argument("inputs", nargs="+", help="MIDI files and/or directories (searched recursively).")
+    parser.add_argument("--output-dir", default="analysis", help="Where the per-file results are written.")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="csv", help="Output format.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--chunksize", type=int, default=None, help="Files per work chunk.")
+    parser.add_argument("--scales", nargs="+", default=DEFAULT_SCALE_INCLUDES, help="Scale families to consider.")
+    args = parser.parse_args()
+
+    summary = analyze_corpus(args.inputs, args.output_dir, output_format=args.format, workers=args.workers,
+                             scale_includes=args.scales, chunksize=args.chunksize)
+    for path, error in summary["failures"]:
+        print(f"Failed: {path}: {error}")
+    print(f"Analysed {summary['files']} files ({summary['events']} events) in {summary['seconds']:.2f} s: "
+          f"{summary['files_per_second']:.1f} files/s, {summary['events'] / summary['seconds']:.0f} events/s")
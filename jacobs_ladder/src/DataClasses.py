@@ -1,10 +1,26 @@
-from dataclasses import dataclass
-from .Utilities import division_to_dt
+from dataclasses import dataclass, field
+from .KeyMask import keyboard_mask, mask_to_bytes, pitch_class_mask
+from .Utilities import division_to_dt, sanitize_scale_name
 
-@dataclass
+@dataclass(frozen=True)
 class Scale:
     name: str
-    notes: list[str]
+    notes: tuple[str, ...]
+    # Position in Scales.get_all_scales() and family (a scale_includes name such as "Ionian"), set by the registry
+    scale_id: int = -1
+    family: str = ""
+    # Derived from the notes once, at creation
+    ascii_name: str = field(init=False, repr=False, compare=False)
+    pitch_classes: int = field(init=False, repr=False, compare=False)  # 12-bit mask, bit 0 = C
+    key_mask: int = field(init=False, repr=False, compare=False)       # 88-key mask, bit 0 = A0
+    key_mask_bytes: bytes = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "notes", tuple(self.notes))
+        object.__setattr__(self, "ascii_name", sanitize_scale_name(self.name))
+        object.__setattr__(self, "pitch_classes", pitch_class_mask(self.notes))
+        object.__setattr__(self, "key_mask", keyboard_mask(self.pitch_classes))
+        object.__setattr__(self, "key_mask_bytes", mask_to_bytes(self.key_mask))
     
 @dataclass
 class IntervalScale:
@@ -30,6 +30,10 @@ notes_to_midi = {"A0": 21, "B\u266d0": 22, "B0": 23, "C1": 24, "D\u266d1": 25, "
                  "E\u266d7": 99, "E7": 100, "F7": 101, "G\u266d7": 102, "G7": 103, "A\u266d7": 104, 
                  "A7": 105, "B\u266d7": 106, "B7": 107, "C8": 108}
 
+# Reverse of midi_notes: every MIDI note (ascending) carrying each note name
+note_name_to_midi_notes = {name: tuple(note for note, note_name in midi_notes.items() if note_name == name)
+                           for name in dict.fromkeys(midi_notes.values())}
+
 beat_to_note_divisions = {1: "WHOLE", 2: "HALF", 3: "TRIPLET_HALF", 4: "QUARTER", 5: "QUINTUPLET_QUARTER", 6: "TRIPLET_QUARTER",
                           7: "SEPTUPLET_QUARTER", 8: "EIGHTH", 9: "", 10: "", }
 
@@ -39,4 +43,13 @@ def get_midi_notes():
     Returns:
         dict: {MIDI note: note name}
     """
-    return midi_notes
\ No newline at end of file
+    return midi_notes
+
+
+def get_note_name_to_midi_notes():
+    """Return a dictionary of note name: MIDI notes key value pairs (the reverse of get_midi_notes)
+
+    Returns:
+        dict: {note name: (MIDI notes in ascending order)}
+    """
+    return note_name_to_midi_notes
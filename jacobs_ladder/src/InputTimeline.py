@@ -0,0 +1,81 @@
+from .Clock import Clock, default_clock
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+
+class InputTimeline:
+    """Input-side timeline of a MIDI port built by accumulating the delta times rtmidi delivers with each message.
+
+    rtmidi stamps every message when the driver receives it, so the accumulated deltas follow the performance rather
+    than the moment the Python callback happened to run. When cross-checking is enabled the callback's arrival time on
+    the clock is compared to the timeline to measure callback lag, and the timeline is re-anchored if the two drift
+    apart by more than resync_threshold (e.g. the port was reopened and rtmidi's deltas restarted).
+    """
+
+    def __init__(self, clock: Clock = None, cross_check: bool = True, resync_threshold: float = 0.050):
+        """Create an empty timeline
+
+        Args:
+            clock (Clock, optional): clock the timeline is anchored to. Defaults to default_clock().
+            cross_check (bool, optional): compare every message's arrival time to the timeline. Defaults to True.
+            resync_threshold (float, optional): callback lag in seconds above which the timeline is re-anchored.
+                Defaults to 0.050.
+        """
+        self.clock = clock or default_clock()
+        self.cross_check = cross_check
+        self.resync_threshold = resync_threshold
+
+        # Timeline position of the last message and the clock time position 0 corresponds to
+        self.position: float | None = None
+        self.origin = 0.0
+
+        # Instrumentation
+        self.messages = 0
+        self.resyncs = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+
+    def advance(self, dt: float) -> float:
+        """Account for one received message
+
+        Args:
+            dt (float): seconds since the previous message on the port, as delivered by rtmidi
+
+        Returns:
+            float: the message's time on the timeline in seconds
+        """
+        self.messages += 1
+        if self.position is None:
+            self.position = 0.0
+            self.origin = self.clock.now()
+            return self.position
+
+        self.position += dt
+        if self.cross_check:
+            arrival = self.clock.now()
+            lag = arrival - self.origin - self.position
+            if lag < 0.0:
+                # This callback ran sooner after its message than the one the timeline was anchored on
+                self.origin = arrival - self.position
+                lag = 0.0
+            elif lag > self.resync_threshold:
+                self.origin = arrival - self.position
+                self.resyncs += 1
+                lag = 0.0
+            self.lag_total += lag
+            self.lag_max = max(self.lag_max, lag)
+        return self.position
+
+    def now(self) -> float:
+        """The current clock time expressed on the timeline, for events that do not come with a message (e.g. the
+        start of a recording)"""
+        if self.position is None:
+            return 0.0
+        return self.clock.now() - self.origin
+
+    def summary(self) -> str:
+        """Callback lag statistics for logging"""
+        mean_lag = self.lag_total / max(self.messages - 1, 1)
+        return (f"{self.messages} messages, callback lag mean {mean_lag * 1e3:.3f} ms, max {self.lag_max * 1e3:.3f} ms, "
+                f"{self.resyncs} resyncs")
@@ -122,24 +122,29 @@ class JacobsLadder:
                         selection = input("Enter your selection: ")
                         # TODO: Use the most recently played note instead of hard-coding 60
                         scales = self.scale_classifier.convert_intervals(starting_note=60)
+                        # Each sequence is queued to start where the previous one ends, then the menu waits for
+                        # the scale to finish before printing the next one
+                        handle = None
                         if selection == "1":
                             for scale in scales:
                                 print(scale)
                                 for _ in range(2):
-                                    self.midi_injector.play_scale(note_list=scale, dur_list=[0.20]*len(scale))
-                                    self.midi_injector.play_scale(note_list=scale[::-1][1:-1], dur_list=[0.20]*len(scale))
+                                    handle = self.midi_injector.play_scale(note_list=scale, dur_list=[0.20]*len(scale), after=handle)
+                                    handle = self.midi_injector.play_scale(note_list=scale[::-1][1:-1], dur_list=[0.20]*len(scale), after=handle)
+                                handle.wait()
 
                         elif selection == "2":
                             num_voices = input("Enter the number of voices: ")
                             if int(num_voices) > 0 and int(num_voices) <= 5:
-                                for scale in scales:
-                                    harmonized_scale = self.scale_classifier.create_harmonized_scale(scale=scale, num_voices=int(num_voices))
+                                harmonized_scales = self.scale_classifier.harmonize_scales(starting_note=60, num_voices=int(num_voices))
+                                for scale, harmonized_scale in zip(scales, harmonized_scales):
                                     print(scale)
                                     for _ in range(2):
                                         for harmony in harmonized_scale:
-                                            self.midi_injector.play_chord(note_list=harmony, duration=0.15, velocity=50)
+                                            handle = self.midi_injector.play_chord(note_list=harmony, duration=0.15, velocity=50, after=handle)
                                         for harmony in harmonized_scale[::-1][1:-1]:
-                                            self.midi_injector.play_chord(note_list=harmony, duration=0.15, velocity=50)
+                                            handle = self.midi_injector.play_chord(note_list=harmony, duration=0.15, velocity=50, after=handle)
+                                    handle.wait()
 
                             else:
                                 print("Invalid number of voices: choose a number between 1 and 4.")
@@ -147,6 +152,7 @@ class JacobsLadder:
                             print("Invalid selection")
 
                     except KeyboardInterrupt:
+                        self.midi_injector.cancel_all()
                         print("Exitting...")
                 
                 elif choice == "5":
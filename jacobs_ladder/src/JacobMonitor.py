@@ -6,12 +6,13 @@ from pathlib import Path
 import re
 
 from .Utilities import build_udp_message
-from .Udp import UDPReceiver
+from .ControlPlane import ControlPlane, DatagramReceiver
 
-class JacobMonitor(UDPReceiver):
+class JacobMonitor(DatagramReceiver):
 
-    def __init__(self, manager: object, host: str = "127.0.0.1", port: int = 50001, logger: logging.Logger = None):
-        super().__init__(host=host, port=port, logger=logger)
+    def __init__(self, manager: object, host: str = "127.0.0.1", port: int = 50001, logger: logging.Logger = None,
+                 control_plane: ControlPlane = None):
+        super().__init__(host=host, port=port, logger=logger, control_plane=control_plane or ControlPlane(logger))
 
         self.manager = manager
         self.logger = logger
@@ -4,7 +4,7 @@ from .Enums import Pitch
 from .Pitch import *
 from .Utilities import determine_octave, get_root_from_letter_note, remove_harmonically_redundant_intervals
 from .TuningUtils import read_tuning_config
-from jacobs_ladder.bindings.tuning_utils import generate_tunings
+from .Voice import PitchClassMap, Voice
 
 __author__ = "Alex Wilson"
 __copyright__ = "Copyright (c) 2023 Jacob's Ladder"
@@ -65,34 +65,50 @@ class JustIntonation:
 
         return intervals
 
-    def get_pitch_bend_message(self, message_heap_elem: list):
+    def get_pitch_bend_message(self, message_heap_elem: Voice):
         """Gets the formed MIDI pitch bend message to be sent by the MidiManager
 
         Args:
-            message_heap_elem (list): a singular message_heap list representing a single note plus metadata 
-                                      of the form [note, instance_index, status, velocity, pitch]
+            message_heap_elem (Voice): a singular message_heap entry representing a single note plus metadata
         """
         # Ensure pitch bend amount is within the valid range
-        pitch_bend_amount = max(0, min(16383, message_heap_elem[4].analog_value_abs))
+        pitch_bend_amount = max(0, min(16383, message_heap_elem.pitch.analog_value_abs))
 
         # Calculate the LSB (Least Significant Byte) and MSB (Most Significant Byte) of the pitch bend value
         lsb = pitch_bend_amount & 0x7F
         msb = (pitch_bend_amount >> 7) & 0x7F
 
         # Status byte for pitch bend message NOTE_ON status + offset to convert to pitch bend message
-        status_byte = message_heap_elem[2] + 80
+        status_byte = message_heap_elem.status + 80
 
         # Log the pitch bend message
         pitch_bend_message = [status_byte, lsb, msb]
 
         return pitch_bend_message
 
-    def get_tuning_info(self, message_heap: list[list], current_msg: list, dt: float, key=None):
+    def get_tuning_index(self, message_heap: list[Voice], note: int, pitch_class_map: PitchClassMap = None):
+        """Get the instance index shared by the octaves of a note
+
+        Args:
+            message_heap (list[Voice]): the currently sounding notes
+            note (int): the note which was just played
+            pitch_class_map (PitchClassMap, optional): used for an O(1) lookup when provided. Defaults to None.
+
+        Returns:
+            int | None: the instance index of a sounding octave of note, None otherwise
+        """
+        if pitch_class_map is not None:
+            return pitch_class_map.lookup(note)
+        return determine_octave(message_heap=message_heap, note=note)
+
+    def get_tuning_info(self, message_heap: list[Voice], current_msg: Voice, dt: float, key=None, pitch_class_map: PitchClassMap = None):
         """Adjust the pitch of individual notes within a given chord
         If the chord is unknown then it will be tuned using intervals instead
 
         Args:
-            message_heap (list[list]): an unsorted list of notes with their metadata
+            message_heap (list[Voice]): an unsorted list of notes with their metadata
+            current_msg (Voice): the note which was just played (also present in message_heap)
+            pitch_class_map (PitchClassMap, optional): the owner's pitch class map, used instead of scanning message_heap. Defaults to None.
             chord (string, optional): a unique string representation of the chord being played. Defaults to None.
 
         Returns:
@@ -104,18 +120,17 @@ class JustIntonation:
                 self.root = get_root_from_letter_note(key.split(" ")[0])
             else:
                 self.root = self.previous_root
-            note = current_msg[0]
-            tuning_index = determine_octave(message_heap=message_heap, note=note)
+            note = current_msg.note
+            tuning_index = self.get_tuning_index(message_heap=message_heap, note=note, pitch_class_map=pitch_class_map)
             octaves = [octave for octave in range(self.root + 12, 109, 12)]
             octaves += [octave for octave in range(self.root - 12, 20, -12)]
             octaves += [self.root]
 
-            current_msg_index = message_heap.index(current_msg)
             if note in octaves:
                 if tuning_index is not None:
                     for msg in message_heap:
-                        if msg[1] == tuning_index:
-                            message_heap[current_msg_index][4] = msg[4]
+                        if msg.instance_index == tuning_index:
+                            current_msg.pitch = msg.pitch
                             break
             else:
                 # Only consider octaves strictly below the note
@@ -123,54 +138,53 @@ class JustIntonation:
 
                 if not positive_differences:
                     self.logger.error("[JI] No positive interval found... Re-examine dynamic tuning logic")
-                    message_heap[current_msg_index][4] = pitches[get_preferred_interval_name(self.tuning["octave"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["octave"])]
                 else:
                     shortest_difference = min(positive_differences)
                 if shortest_difference == 1:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["minor_second_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["minor_second_up"])]
                 elif shortest_difference == 2:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["major_second_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["major_second_up"])]
                 elif shortest_difference == 3:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["minor_third_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["minor_third_up"])]
                 elif shortest_difference == 4:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["major_third_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["major_third_up"])]
                 elif shortest_difference == 5:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["perfect_fourth_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["perfect_fourth_up"])]
                 elif shortest_difference == 6:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["tritone_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["tritone_up"])]
                 elif shortest_difference == 7:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["perfect_fifth_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["perfect_fifth_up"])]
                 elif shortest_difference == 8:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["minor_sixth_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["minor_sixth_up"])]
                 elif shortest_difference == 9:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["major_sixth_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["major_sixth_up"])]
                 elif shortest_difference == 10:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["minor_seventh_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["minor_seventh_up"])]
                 elif shortest_difference == 11:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["major_seventh_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["major_seventh_up"])]
                 elif shortest_difference == 12:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["octave"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["octave"])]
                 else:
                     self.logger.error("[JI] shortest_difference value was invalid... Re-examine dynamic tuning logic")
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["octave"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["octave"])]
 
-            pitch_bend_msg = self.get_pitch_bend_message(message_heap_elem=message_heap[current_msg_index])
+            pitch_bend_msg = self.get_pitch_bend_message(message_heap_elem=current_msg)
     
             return tuning_index, pitch_bend_msg, message_heap
         
         elif self.tuning_mode == "static":
-            note = current_msg[0]
-            tuning_index = determine_octave(message_heap=message_heap, note=note)
+            note = current_msg.note
+            tuning_index = self.get_tuning_index(message_heap=message_heap, note=note, pitch_class_map=pitch_class_map)
             octaves = [octave for octave in range(self.root + 12, 109, 12)]
             octaves += [octave for octave in range(self.root - 12, 20, -12)]
             octaves += [self.root]
 
-            current_msg_index = message_heap.index(current_msg)
             if note in octaves:
                 if tuning_index is not None:
                     for msg in message_heap:
-                        if msg[1] == tuning_index:
-                            message_heap[current_msg_index][4] = msg[4]
+                        if msg.instance_index == tuning_index:
+                            current_msg.pitch = msg.pitch
                             break
             else:
                 # Only consider octaves strictly below the note
@@ -178,60 +192,59 @@ class JustIntonation:
 
                 if not positive_differences:
                     self.logger.error("[JI] No positive interval found... Re-examine dynamic tuning logic")
-                    message_heap[current_msg_index][4] = pitches[get_preferred_interval_name(self.tuning["octave"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["octave"])]
                 else:
                     shortest_difference = min(positive_differences)
                 if shortest_difference == 1:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["minor_second_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["minor_second_up"])]
                 elif shortest_difference == 2:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["major_second_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["major_second_up"])]
                 elif shortest_difference == 3:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["minor_third_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["minor_third_up"])]
                 elif shortest_difference == 4:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["major_third_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["major_third_up"])]
                 elif shortest_difference == 5:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["perfect_fourth_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["perfect_fourth_up"])]
                 elif shortest_difference == 6:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["tritone_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["tritone_up"])]
                 elif shortest_difference == 7:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["perfect_fifth_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["perfect_fifth_up"])]
                 elif shortest_difference == 8:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["minor_sixth_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["minor_sixth_up"])]
                 elif shortest_difference == 9:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["major_sixth_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["major_sixth_up"])]
                 elif shortest_difference == 10:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["minor_seventh_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["minor_seventh_up"])]
                 elif shortest_difference == 11:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["major_seventh_up"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["major_seventh_up"])]
                 elif shortest_difference == 12:
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["octave"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["octave"])]
                 else:
                     self.logger.error("[JI] shortest_difference value was invalid... Re-examine dynamic tuning logic")
-                    message_heap[message_heap.index(current_msg)][4] = pitches[get_preferred_interval_name(self.tuning["octave"])]
+                    current_msg.pitch = pitches[get_preferred_interval_name(self.tuning["octave"])]
 
-            pitch_bend_msg = self.get_pitch_bend_message(message_heap_elem=message_heap[current_msg_index])
+            pitch_bend_msg = self.get_pitch_bend_message(message_heap_elem=current_msg)
     
             return tuning_index, pitch_bend_msg, message_heap
         
         elif self.tuning_mode == "just-intonation":
-            note = current_msg[0]
-            tuning_index = determine_octave(message_heap=message_heap, note=note)
+            note = current_msg.note
+            tuning_index = self.get_tuning_index(message_heap=message_heap, note=note, pitch_class_map=pitch_class_map)
             octaves = [octave for octave in range(self.root + 12, 109, 12)]
             octaves += [octave for octave in range(self.root - 12, 20, -12)]
             octaves += [self.root]
 
-            current_msg_index = message_heap.index(current_msg)
             if note in octaves:
                 if tuning_index is not None:
                     for msg in message_heap:
-                        if msg[1] == tuning_index:
-                            message_heap[current_msg_index][4] = msg[4]
+                        if msg.instance_index == tuning_index:
+                            current_msg.pitch = msg.pitch
                             break
             reduced_message_heap = remove_harmonically_redundant_intervals(message_heap=message_heap)
 
             # print(reduced_message_heap)
 
-            pitch_bend_msg = self.get_pitch_bend_message(message_heap_elem=message_heap[current_msg_index])
+            pitch_bend_msg = self.get_pitch_bend_message(message_heap_elem=current_msg)
             return tuning_index, pitch_bend_msg, message_heap
             
         else:
@@ -588,11 +601,11 @@ class JustIntonation:
             # Handle case where chord is not known
             pass
 
-    def recenter_frequency(self, message_heap: list[list], instance_index: int):
+    def recenter_frequency(self, message_heap: list[Voice], instance_index: int):
         """Used to recenter the base frequencies of instances which are no longer in use
 
         Args:
-            message_heap (list[list]): a list of notes with their metadata [note, instance_index, status, velocity]
+            message_heap (list[Voice]): a list of notes with their metadata
             instance_index (int): the instance index of the note which has received the note off message
         """
         pass
@@ -647,7 +660,7 @@ class JustIntonation:
             ratios = []
             for relationship in tuning:
                 ratios.append(self.select_tuning_ratio(relationship=relationship, tuning_config=tuning_config, method="random")["ratio"])
-            self.logger.info(f"[JI] {tuning}\t{ratios}")
+            self.logger.info("[JI] %s\t%s", tuning, ratios)
 
 if __name__ == "__main__":
     kwargs = {
@@ -0,0 +1,130 @@
+from .Dictionaries import get_midi_notes
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+# 88-key masks are plain ints: bit 0 is MIDI note 21 (A0) and bit 87 is MIDI note 108 (C8).
+# On the wire they are 11 bytes, bit 0 of the first byte being A0, which is int.to_bytes(11, "little").
+LOWEST_KEY = 21
+HIGHEST_KEY = 108
+NUM_KEYS = HIGHEST_KEY - LOWEST_KEY + 1
+MASK_BYTES = (NUM_KEYS + 7) // 8
+EMPTY_MASK_BYTES = bytes(MASK_BYTES)
+
+# Letter name (all flats, as used by the Scale objects) -> pitch class
+NOTE_NAME_TO_PITCH_CLASS = {name: midi % 12 for midi, name in get_midi_notes().items()}
+
+# Every key of the keyboard with a given pitch class, indexed by pitch class
+PITCH_CLASS_KEY_MASKS = [
+    sum(1 << (midi - LOWEST_KEY) for midi in range(LOWEST_KEY, HIGHEST_KEY + 1) if midi % 12 == pitch_class)
+    for pitch_class in range(12)
+]
+
+
+def pitch_class_mask(note_names: list[str]) -> int:
+    """Build a 12-bit pitch class mask (bit 0 = C) from letter note names
+
+    Args:
+        note_names (list[str]): note names such as those of a Scale, e.g. ["C", "D", "E♭"]
+
+    Returns:
+        int: 12-bit pitch class mask
+    """
+    mask = 0
+    for name in note_names:
+        mask |= 1 << NOTE_NAME_TO_PITCH_CLASS[name]
+    return mask
+
+
+def keyboard_mask(pitch_classes: int) -> int:
+    """Expand a 12-bit pitch class mask to the 88-key mask of every key in those pitch classes
+
+    Args:
+        pitch_classes (int): 12-bit pitch class mask
+
+    Returns:
+        int: 88-key mask
+    """
+    mask = 0
+    for pitch_class in range(12):
+        if pitch_classes >> pitch_class & 1:
+            mask |= PITCH_CLASS_KEY_MASKS[pitch_class]
+    return mask
+
+
+def notes_mask(notes) -> int:
+    """Build the 88-key mask of a collection of MIDI notes, ignoring notes off the keyboard
+
+    Args:
+        notes (Iterable[int]): MIDI notes
+
+    Returns:
+        int: 88-key mask
+    """
+    mask = 0
+    for note in notes:
+        if LOWEST_KEY <= note <= HIGHEST_KEY:
+            mask |= 1 << (note - LOWEST_KEY)
+    return mask
+
+
+def mask_to_bytes(mask: int) -> bytes:
+    """Serialise an 88-key mask to the 11-byte wire format (bit 0 of the first byte is A0)
+
+    Args:
+        mask (int): 88-key mask
+
+    Returns:
+        bytes: 11 bytes
+    """
+    return mask.to_bytes(MASK_BYTES, "little")
+
+
+class LiveKeyMask:
+    """88-key mask of the sounding notes, updated incrementally as voices are pushed onto and deleted from the
+    message_heap. Keys are reference counted since the same note can be held more than once while sustained.
+    """
+    __slots__ = ("counts", "mask")
+
+    def __init__(self):
+        self.counts: list[int] = [0] * 128
+        self.mask: int = 0
+
+    def add(self, note: int) -> None:
+        """Register a sounding note
+
+        Args:
+            note (int): MIDI note (transposed notes outside 0-127 are ignored)
+        """
+        if not 0 <= note < 128:
+            return
+        self.counts[note] += 1
+        if self.counts[note] == 1 and LOWEST_KEY <= note <= HIGHEST_KEY:
+            self.mask |= 1 << (note - LOWEST_KEY)
+
+    def remove(self, note: int) -> None:
+        """Unregister a released note
+
+        Args:
+            note (int): MIDI note (transposed notes outside 0-127 are ignored)
+        """
+        if not 0 <= note < 128 or self.counts[note] == 0:
+            return
+        self.counts[note] -= 1
+        if self.counts[note] == 0 and LOWEST_KEY <= note <= HIGHEST_KEY:
+            self.mask &= ~(1 << (note - LOWEST_KEY))
+
+    def rebuild(self, notes) -> None:
+        """Resynchronise the mask from the sounding notes
+
+        Args:
+            notes (Iterable[int]): MIDI notes
+        """
+        self.counts = [0] * 128
+        self.mask = 0
+        for note in notes:
+            self.add(note)
+
+    def to_bytes(self) -> bytes:
+        """Return the mask in the 11-byte wire format"""
+        return mask_to_bytes(self.mask)
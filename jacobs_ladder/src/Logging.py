@@ -1,18 +1,83 @@
+import atexit
 import logging
+import queue
+import threading
 
-import logging
+from logging.handlers import QueueHandler, QueueListener
+
+# Seconds during which repeats of a message (same logger, level and call site) are dropped in asynchronous mode
+DEFAULT_RATE_LIMIT = 1.0
+
+# Messages RateLimitFilter keeps track of before it forgets those outside its interval
+MAX_TRACKED_MESSAGES = 1024
+
+# Background listener of every asynchronous logger, by logger name
+_listeners: dict[str, QueueListener] = {}
+_listeners_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """Drop repeats of a message from the same call site within an interval. The next record let through notes how
+    many were dropped, so a burst of identical warnings costs one queue put rather than one per event."""
+
+    def __init__(self, interval: float = DEFAULT_RATE_LIMIT):
+        """Constructor for the RateLimitFilter class
+
+        Args:
+            interval (float, optional): seconds a message is suppressed for after it is let through. Defaults to DEFAULT_RATE_LIMIT.
+        """
+        super().__init__()
+        self.interval = interval
+        # (logger name, level, file, line, unformatted message) -> (time let through, records dropped since)
+        self.last_seen: dict[tuple, tuple[float, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Keyed on the unformatted message, so lazily formatted arguments do not make every record unique
+        message = record.msg if isinstance(record.msg, str) else type(record.msg)
+        key = (record.name, record.levelno, record.pathname, record.lineno, message)
+        now = record.created
+        seen = self.last_seen.get(key)
+        if seen is not None and now - seen[0] < self.interval:
+            self.last_seen[key] = (seen[0], seen[1] + 1)
+            return False
+
+        if len(self.last_seen) >= MAX_TRACKED_MESSAGES:
+            # Eagerly formatted messages (f-strings) are all different, so forget the ones outside the interval
+            self.last_seen = {tracked: value for tracked, value in self.last_seen.items() if now - value[0] < self.interval}
+        self.last_seen[key] = (now, 0)
+        if seen is not None and seen[1] and isinstance(record.msg, str) and isinstance(record.args, tuple):
+            template = record.msg if record.args else record.msg.replace("%", "%%")
+            record.msg = f"{template} (%d similar messages suppressed)"
+            record.args = record.args + (seen[1],)
+        return True
+
+
+class LazyQueueHandler(QueueHandler):
+    """QueueHandler which enqueues the record as it is. The standard one formats the message in the logging thread
+    (to make the record picklable); here the listener thread does all of the formatting."""
 
-def setup_logging(app_name: str, level: int = 20) -> logging.Logger:
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(app_name: str, level: int = 20, asynchronous: bool = False, rate_limit: float = DEFAULT_RATE_LIMIT) -> logging.Logger:
     """Setup logging for the MidiManager class
 
     Args:
         app_name (str): the name of the app and subsequently the name of the logfile
         level (int, optional): 10: DEBUG, 20: INFO, 30: WARNING, 40: ERROR, 50: CRITICAL. Defaults to 20.
+        asynchronous (bool, optional): hand records to a background thread through a queue, which formats and writes
+            them, so a logging call never waits on the file. Repeated messages are rate limited. Defaults to False.
+        rate_limit (float, optional): seconds repeats of a message are dropped for in asynchronous mode, 0 to keep
+            every record. Defaults to DEFAULT_RATE_LIMIT.
 
     Returns:
         logging.Logger
     """
     log_filename = f"./jacobs_ladder/logs/{app_name}.log"
+
+    # An asynchronous logger set up before under this name is flushed first
+    stop_logging(app_name)
     
     loglevel = logging.getLevelName(level)
     
@@ -28,10 +93,49 @@ def setup_logging(app_name: str, level: int = 20) -> logging.Logger:
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     file_handler.setFormatter(formatter)
     
-    # Add the handler to the logger
-    logger.addHandler(file_handler)
+    if asynchronous:
+        # The caller only puts the record on an unbounded queue; the listener thread formats and writes it
+        log_queue = queue.SimpleQueue()
+        queue_handler = LazyQueueHandler(log_queue)
+        queue_handler.setLevel(loglevel)
+        if rate_limit:
+            queue_handler.addFilter(RateLimitFilter(interval=rate_limit))
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        with _listeners_lock:
+            _listeners[app_name] = listener
+        logger.addHandler(queue_handler)
+    else:
+        # Add the handler to the logger
+        logger.addHandler(file_handler)
     
     # Prevent log messages from being propagated to the root logger
     logger.propagate = False
     
     return logger
+
+
+def stop_logging(app_name: str = None) -> None:
+    """Flush and stop the background listener of an asynchronous logger (every one when app_name is None). Its queue
+    handler is removed, so the logger can be set up again.
+
+    Args:
+        app_name (str, optional): the name given to setup_logging. Defaults to None.
+    """
+    with _listeners_lock:
+        names = list(_listeners) if app_name is None else [app_name]
+        listeners = [(name, _listeners.pop(name)) for name in names if name in _listeners]
+
+    for name, listener in listeners:
+        # Remove the front end first so nothing is enqueued after the listener's sentinel
+        logger = logging.getLogger(name)
+        for handler in list(logger.handlers):
+            if isinstance(handler, LazyQueueHandler):
+                logger.removeHandler(handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+# Records still queued at interpreter exit are written rather than lost
+atexit.register(stop_logging)
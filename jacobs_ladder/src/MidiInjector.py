@@ -1,10 +1,10 @@
-import time
 import numpy as np
 
-from .Dictionaries import get_midi_notes
+from .Dictionaries import get_midi_notes, get_note_name_to_midi_notes
 from .Scales import get_major_scales, get_harmonic_minor_scales, get_harmonic_major_scales, get_melodic_minor_scales
 from .DataClasses import Scale
 from .Logging import setup_logging
+from .TimingThread import PlaybackHandle, TimingThread, get_shared_timing_thread
 
 import rtmidi
 
@@ -22,17 +22,22 @@ class MidiInjector:
     # software into my software package. 
     # TODO: Figure out how to make my software work for other software synths with port support and start writing 
     # interfaces/configuration files to automatically interface with commonly used software.
-    def __init__(self, output_port="jacob"):
+    def __init__(self, output_port="jacob", timing_thread: TimingThread = None):
         """Given an output MIDI port, the MidiInjector can be used to send MIDI data for the purposes of playing audio back to the user
 
         Args:
             output_port (str, optional): Name of the output port you want to send Midi data on. Defaults to "jacob".
+            timing_thread (TimingThread, optional): thread the note sequences are scheduled on. Defaults to the one
+                shared by every MidiInjector in the process.
         """
         self.logger = setup_logging(f"MidiInjector{output_port.capitalize()}")
         self.midi_out = rtmidi.MidiOut()
         self.output_ports = output_port
         self.initialize_port()
+        self.timing_thread = timing_thread or get_shared_timing_thread()
+        self.handles: list[PlaybackHandle] = []
         self.int_note = get_midi_notes()
+        self.note_name_to_midi_notes = get_note_name_to_midi_notes()
         self.major_scales = get_major_scales()
         self.melodic_minor_scales = get_melodic_minor_scales()
         self.harmonic_major_scales = get_harmonic_major_scales()
@@ -68,10 +73,21 @@ class MidiInjector:
         Args:
             note (int): The note number corresponding to the key you want to send a note off message for
         """
-        note_off = [[128 + channel, note, 80] for channel in range(16)]
-        for notes in note_off:
+        for notes in self.note_off_messages(note):
             self.midi_out.send_message(notes)
 
+    @staticmethod
+    def note_off_messages(note):
+        """The note-off messages for a note on every channel
+
+        Args:
+            note (int): The note number corresponding to the key you want to send a note off message for
+
+        Returns:
+            list[list[int]]: one note-off message per channel
+        """
+        return [[128 + channel, note, 80] for channel in range(16)]
+
     def send_sustain_pedal_high(self):
         """Send a sustain pedal message (sustain pedal is held down)"""
         sustain_pedal_high = [176, 64, 127]
@@ -82,26 +98,54 @@ class MidiInjector:
         sustain_pedal_low = [176, 64, 0]
         self.midi_out.send_message(sustain_pedal_low)
 
-    def play_scale(self, note_list, dur_list):
-        """Send a list of notes and durations to be played
+    def schedule(self, events, after: PlaybackHandle = None, length: float = None):
+        """Schedule (offset in seconds, message) pairs on the timing thread without blocking
+
+        Args:
+            events (list[tuple[float, list[int]]]): messages and when to send them relative to the start
+            after (PlaybackHandle, optional): start when this sequence ends instead of now. Defaults to None.
+            length (float, optional): seconds the sequence occupies. Defaults to the offset of its last message.
+
+        Returns:
+            PlaybackHandle: handle to cancel or wait for the sequence
+        """
+        self.handles = [handle for handle in self.handles if not handle.done]
+        handle = self.timing_thread.schedule(self.midi_out.send_message, events, after=after, length=length)
+        self.handles.append(handle)
+        return handle
+
+    def cancel_all(self):
+        """Cancel every sequence this injector has scheduled that is still playing"""
+        for handle in self.handles:
+            handle.cancel()
+        self.handles = []
+
+    def play_scale(self, note_list, dur_list, velocity=80, after: PlaybackHandle = None):
+        """Schedule a list of notes and durations to be played, returning immediately
 
         Args:
-            note_list (list[int]): A list of note numbers to be played one after another
+            note_list (list[int | str]): A list of note numbers to be played one after another. A note name plays
+                that note in every octave.
             dur_list (list[float]): A list of durations which correspond to the length of each note in seconds
+            velocity (int, optional): The velocity of the notes. Defaults to 80.
+            after (PlaybackHandle, optional): start when this sequence ends instead of now. Defaults to None.
+
+        Returns:
+            PlaybackHandle: handle to cancel or wait for the scale
         """
-        
+        events = []
+        offset = 0.0
         for note, dur in zip(note_list, dur_list):
             if isinstance(note, str):
-                note_keys = [key for key, value in self.int_note.items() if value == note]
-                for all_note in note_keys:
-                    self.send_note_on(all_note, 80)
-                    self.send_note_off(all_note)
-                time.sleep(dur)
+                for all_note in self.note_name_to_midi_notes.get(note, ()):
+                    events.append((offset, [144, all_note, velocity]))
+                    events.extend((offset, message) for message in self.note_off_messages(all_note))
             elif isinstance(note, int):
-                self.send_note_on(note, 80)
-                time.sleep(dur)
-                self.send_note_off(note)
-                
+                events.append((offset, [144, note, velocity]))
+                events.extend((offset + dur, message) for message in self.note_off_messages(note))
+            offset += dur
+        return self.schedule(events, after=after, length=offset)
+
     def create_full_scale(self, scale: Scale):
         """Given a Scale object, create a full scale with all of the possible notes
 
@@ -112,12 +156,11 @@ class MidiInjector:
             list[int]: a list of integer MIDI notes representing the full scale
         """
         full_scale = []
-        lowest_note = min([key for key, value in self.int_note.items() if value == scale.notes[0]])
-        highest_note = max([key for key, value in self.int_note.items() if value == scale.notes[0]])
+        lowest_note = self.note_name_to_midi_notes[scale.notes[0]][0]
+        highest_note = self.note_name_to_midi_notes[scale.notes[0]][-1]
         parsed_scale = scale.notes
         for note in parsed_scale:
-            note_keys = [key for key, value in self.int_note.items() if value == note]
-            full_scale.extend(note_keys)
+            full_scale.extend(self.note_name_to_midi_notes[note])
             
         full_scale = [num for num in full_scale if lowest_note <= num <= highest_note]
         return sorted(full_scale)
@@ -152,49 +195,54 @@ class MidiInjector:
         Returns:
             int: the closest index to of this note to middle C
         """
-        starting_note_indices = [midi_note for midi_note, note_name in self.int_note.items() if note_name == starting_note]
+        starting_note_indices = self.note_name_to_midi_notes[starting_note]
         closest_note = min(starting_note_indices, key=lambda x: abs(x - 61))
         return closest_note
 
-    def play_chord(self, note_list: list, duration: float, velocity: int):
-        """Play a chord by sending note-on messages for the specified notes and holding them for 2 seconds
+    def play_chord(self, note_list: list, duration: float, velocity: int, after: PlaybackHandle = None):
+        """Schedule a chord: note-on messages for the specified notes now, note-off messages after duration seconds
 
         Args:
             note_list (list[int]): A list of notes you would like to play simultaneously
+            duration (float): How long to hold the chord in seconds
+            velocity (int): The velocity of the notes
+            after (PlaybackHandle, optional): start when this sequence ends instead of now. Defaults to None.
+
+        Returns:
+            PlaybackHandle: handle to cancel or wait for the chord
         """
-        for note in note_list:
-            self.send_note_on(note, int(velocity))
-        time.sleep(float(duration))
-        for note in note_list:
-            self.send_note_off(note)
-            
-    def play_chord_by_intervals(self, interval_list):
-        """Play a chord by sending note-on messages for the specified notes and holding them for 2 seconds
+        events = [(0.0, [144, note, int(velocity)]) for note in note_list]
+        events.extend((float(duration), message) for note in note_list for message in self.note_off_messages(note))
+        return self.schedule(events, after=after)
+
+    def play_chord_by_intervals(self, interval_list, after: PlaybackHandle = None):
+        """Schedule a chord built up from middle C and hold it for 0.6 seconds
 
         Args:
             interval_list (list[int]): A list of intervals for constructing the chord
+            after (PlaybackHandle, optional): start when this sequence ends instead of now. Defaults to None.
+
+        Returns:
+            PlaybackHandle: handle to cancel or wait for the chord
         """
         base_note = 60
         note_list = [base_note] + [base_note + interval for interval in list(np.cumsum(interval_list))]
-        
-        for note in note_list:
-            self.send_note_on(note, 80)
-
-        time.sleep(0.6)
-
-        for note in note_list:
-            self.send_note_off(note)
-
+        return self.play_chord(note_list, duration=0.6, velocity=80, after=after)
 
 if __name__ == "__main__":
     midi_injector = MidiInjector()
 
-    midi_injector.play_scale(midi_injector.harmonic_major_scales[0].notes + ["C"], [0.10] * (len(midi_injector.harmonic_major_scales[0].notes)+1))
-    midi_injector.play_scale(reversed(midi_injector.harmonic_major_scales[0].notes[1:]), [0.12] * (len(midi_injector.harmonic_major_scales[0].notes)+1))
+    # Each scale starts where the previous one ends; the calls return immediately
+    handle = midi_injector.play_scale(list(midi_injector.harmonic_major_scales[0].notes) + ["C"], [0.10] * (len(midi_injector.harmonic_major_scales[0].notes)+1))
+    handle = midi_injector.play_scale(reversed(midi_injector.harmonic_major_scales[0].notes[1:]), [0.12] * (len(midi_injector.harmonic_major_scales[0].notes)+1), after=handle)
 
-    midi_injector.play_scale(midi_injector.harmonic_minor_scales[0].notes + ["C"], [0.12] * (len(midi_injector.harmonic_minor_scales[0].notes)+1))
-    midi_injector.play_scale(reversed(midi_injector.harmonic_minor_scales[0].notes[1:]), [0.10] * (len(midi_injector.harmonic_minor_scales[0].notes)+1))
+    handle = midi_injector.play_scale(list(midi_injector.harmonic_minor_scales[0].notes) + ["C"], [0.12] * (len(midi_injector.harmonic_minor_scales[0].notes)+1), after=handle)
+    handle = midi_injector.play_scale(reversed(midi_injector.harmonic_minor_scales[0].notes[1:]), [0.10] * (len(midi_injector.harmonic_minor_scales[0].notes)+1), after=handle)
         
     C_Harm_maj_full_scale = midi_injector.create_full_scale(midi_injector.harmonic_major_scales[0])
-    midi_injector.play_scale(C_Harm_maj_full_scale[:-1], [0.20] * (len(C_Harm_maj_full_scale)-1))
-    midi_injector.play_scale(reversed(C_Harm_maj_full_scale), [0.20] * len(C_Harm_maj_full_scale))
\ No newline at end of file
+    handle = midi_injector.play_scale(C_Harm_maj_full_scale[:-1], [0.20] * (len(C_Harm_maj_full_scale)-1), after=handle)
+    handle = midi_injector.play_scale(reversed(C_Harm_maj_full_scale), [0.20] * len(C_Harm_maj_full_scale), after=handle)
+    try:
+        handle.wait()
+    except KeyboardInterrupt:
+        midi_injector.cancel_all()
@@ -1,26 +1,28 @@
 import argparse
 import sys
 import heapq
-import logging
 import rtmidi
 import subprocess
 import warnings
 
 from pathlib import Path
-from copy import deepcopy
 
+from .ControlPlane import ControlPlane, DatagramSender
 from .Enums import Algorithm
 from .JacobMonitor import JacobMonitor
 from .JustIntonation import JustIntonation
+from .KeyMask import EMPTY_MASK_BYTES, LiveKeyMask
+from .InputTimeline import InputTimeline
 from .MidiRecorder import MidiRecorder
 from .MockSender import MockSender
 from .MusicTheory import MusicTheory
 from .NegativeHarmony import NegativeHarmony, NoteMap
-from .Pitch import PitchInfo
-from .Udp import UDPSender
+from .SharedState import NO_SCALE, SharedStateWriter
+from .Voice import PitchClassMap, Voice
 
-from .Logging import setup_logging
-from .Utilities import build_udp_message, determine_octave, parse_midi_controller_config, pack_message, pack_message_heap
+from .Logging import setup_logging, stop_logging
+from .RealTime import RealTimeMode
+from .Utilities import LIVE_KEYS_HEADER, build_udp_message, find_port, parse_midi_controller_config, pack_message, pack_message_heap
 
 __author__ = "Alex Wilson"
 __copyright__ = "Copyright (c) 2023 Jacob's Ladder"
@@ -47,10 +49,31 @@ class MidiController:
             output_ports (list, optional): output port name. Defaults to [f"jacobs_ladder_{i}" for i in range(12)].
             tuning (dict, optional): a dictionary giving the controller its tuning. Defaults to None.
             tuning_mode (str, optional): static, dynamic, or None for no tuning. Defaults to None.
+            chord_loading (str, optional): eager, lazy, or background loading of the large chord dictionaries. Defaults to "background".
+            shared_state_path (str, optional): publish the live state to this memory-mapped file (see SharedState). Defaults to None (disabled).
+            name (str, optional): instance name used for the log file when several controllers run in one process. Defaults to None.
+            control_port (int, optional): UDP port JacobMonitor listens on. Defaults to 50000 with the default output ports, else 50002.
+            telemetry_port (int, optional): UDP port the type-1/type-2 datagrams are sent to, None to disable.
+                Defaults to 50005 with the default output ports, else None.
+            theory_tables (TheoryTables, optional): music theory tables shared with other controllers. Defaults to None.
+            control_plane (ControlPlane, optional): event loop shared with other controllers. Defaults to None.
+            listen (bool, optional): block in start_listening() once constructed. Defaults to True.
+            negative_harmony (NegativeHarmony, optional): play the notes of its active maps on their own output voices. Defaults to None (disabled).
+            async_logging (bool, optional): write the log on a background thread (see Logging.setup_logging) so logging from the
+                MIDI callback never blocks note output. Defaults to False.
+            midi_in (rtmidi.MidiIn, optional): an already opened input (anything with set_callback, get_message,
+                is_port_open and close_port) to use instead of opening input_port. Defaults to None.
+            midi_out_ports (list, optional): 12 already opened outputs (anything with send_message, is_port_open and
+                close_port) to use instead of the output_ports. Given together with midi_in. Defaults to None.
+            real_time (dict, optional): real-time mode settings, e.g. {"cores": [2], "priority": 50, "idle_gap": 0.5}:
+                full garbage collections are deferred to idle gaps and the callback and timing threads are pinned to
+                cores and run at a SCHED_FIFO priority where permitted (see RealTime.RealTimeMode). Defaults to None (off).
         """
         allowed_keys = {
             'log_level', 'input_port', 'output_ports', 'scale_includes', 'tempo', 'time_signature', 'player', 
-            'tuning', 'tuning_mode', 'tuning_ratios_all', 'tuning_ratios_pref', 'tuning_configuration'
+            'tuning', 'tuning_mode', 'tuning_ratios_all', 'tuning_ratios_pref', 'tuning_configuration', 'chord_loading', 'shared_state_path',
+            'name', 'control_port', 'telemetry_port', 'theory_tables', 'control_plane', 'listen',
+            'negative_harmony', 'async_logging', 'real_time', 'midi_in', 'midi_out_ports'
         }
 
         for key in kwargs:
@@ -58,6 +81,7 @@ class MidiController:
                 raise ValueError(f"Unknown argument: {key}")
         
         self.log_level = kwargs.get('log_level', 20)
+        self.async_logging = kwargs.get('async_logging', False)
         self.input_port = kwargs.get('input_port', None)
         self.output_ports = kwargs.get('output_ports', [f"jacobs_ladder_{i}" for i in range(12)])
         self.virtual_ports_initialized = False
@@ -69,24 +93,41 @@ class MidiController:
         self.tuning_ratios_pref = tuning_cfg.get('tuning_ratios_pref', '5-limit-pref')
         self.tempo = kwargs.get('tempo', 120)
         self.time_signature = kwargs.get('time_signature', "4/4")
-
-        self.logger = setup_logging(app_name="JacobsLadder", level=self.log_level)
+        self.chord_loading = kwargs.get('chord_loading', "background")
+        self.shared_state_path = kwargs.get('shared_state_path', None)
+        self.name = kwargs.get('name', None)
+        default_output_ports = self.output_ports == [f"jacobs_ladder_{i}" for i in range(12)]
+        self.control_port = kwargs.get('control_port', 50000 if default_output_ports else 50002)
+        self.telemetry_port = kwargs.get('telemetry_port', 50005 if default_output_ports else None)
+
+        self.logger = setup_logging(app_name="JacobsLadder" if self.name is None else f"JacobsLadder_{self.name}", level=self.log_level,
+                                    asynchronous=self.async_logging)
         
         # MIDI port management
-        self.midi_in = rtmidi.MidiIn()
-        self.midi_out_ports = [rtmidi.MidiOut() for _ in range(12)] if sys.platform.startswith("win") else []
+        midi_in = kwargs.get('midi_in', None)
+        midi_out_ports = kwargs.get('midi_out_ports', None)
+        if (midi_in is None) != (midi_out_ports is None):
+            raise ValueError("midi_in and midi_out_ports must be given together")
         self.input_port = self.input_port
         self.output_ports = self.output_ports
 
+        if midi_in is None:
+            self.midi_in = rtmidi.MidiIn()
+            self.midi_out_ports = [rtmidi.MidiOut() for _ in range(12)] if sys.platform.startswith("win") else []
 
-        # TODO: On Windows call virtual port setup script here before initilization 
-        
-        # Create midi in and midi out virtual port objects
-        self.initialize_ports()
+            # TODO: On Windows call virtual port setup script here before initilization 
+            
+            # Create midi in and midi out virtual port objects
+            self.initialize_ports()
+        else:
+            self.midi_in = midi_in
+            self.midi_out_ports = list(midi_out_ports)
 
         # Output port instance management
         self.instance_index = list(range(12))
         self.message_heap = [] 
+        self.pitch_class_map = PitchClassMap()
+        self.live_keys = LiveKeyMask()
         self.in_use_indices = {}
 
         # Sustain pedal management
@@ -94,11 +135,14 @@ class MidiController:
         self.sustained_notes = []
         
         # Music Theory
-        self.music_theory = MusicTheory(logger=self.logger)
-        # self.negative_harmony = NegativeHarmony(substitute=False)
-        # c_revolved = NoteMap(name="C revolved", octaveNoteMap={60: 60, 61: 71, 62: 70, 63: 69, 64: 68, 65: 67, 66: 66, 67: 65, 68: 64, 69: 63, 70: 62, 71: 61}, algorithm=Algorithm.FIXED_AXIS, active=True, keyCenter=60)
-        # self.negative_harmony.addNoteMapping(noteMap=c_revolved)
-        # self.negative_harmony.subNegHarmNotes(shouldSubstitute=True)
+        self.music_theory = MusicTheory(logger=self.logger, chord_loading=self.chord_loading, tables=kwargs.get('theory_tables', None))
+
+        # Negative harmony, e.g. NegativeHarmony() with NoteMap(name="C revolved", octaveNoteMap={60: 60, 61: 71, ...},
+        # algorithm=Algorithm.FIXED_AXIS, active=True, keyCenter=60) added. Each mapped note sounds on its own output
+        # voice, kept per played note so the note off releases exactly what the note on sent
+        self.negative_harmony = kwargs.get('negative_harmony', None)
+        self.mapped_voices = {}
+        self.sustained_mapped_indices = []
 
         # Tuning management
         self.just_intonation = JustIntonation(self.logger, **kwargs.get("tuning_configuration", None))
@@ -106,24 +150,35 @@ class MidiController:
         # Transposition Management
         self.transpose = 0
         
-        # Communication with Jacob
-        if self.output_ports == [f"jacobs_ladder_{i}" for i in range(12)]:
-            self.udp_sender = UDPSender(host='127.0.0.1', port=50005, logger=self.logger)
-            
-            self.udp_receiver = JacobMonitor(manager=self, host='127.0.0.1', port=50000, logger=self.logger)
-            self.udp_receiver.start_listener()
-
+        # Communication with Jacob. All UDP endpoints share one asyncio event loop running on a background thread
+        self.owns_control_plane = kwargs.get('control_plane', None) is None
+        self.control_plane = ControlPlane(logger=self.logger) if self.owns_control_plane else kwargs['control_plane']
+        if self.telemetry_port is not None:
+            self.udp_sender = DatagramSender(host='127.0.0.1', port=self.telemetry_port, logger=self.logger, control_plane=self.control_plane)
         else:
-            self.udp_receiver = JacobMonitor(manager=self, host='127.0.0.1', port=50002, logger=self.logger)
-            self.udp_receiver.start_listener()
             self.udp_sender = MockSender(host='127.0.0.1', port=50003)
 
-        # Recorder
+        self.udp_receiver = JacobMonitor(manager=self, host='127.0.0.1', port=self.control_port, logger=self.logger, control_plane=self.control_plane)
+        self.udp_receiver.start_listener()
+
+        # Optional shared-memory state channel for local front ends
+        self.shared_state = SharedStateWriter(self.shared_state_path) if self.shared_state_path else None
+
+        # Recorder, timestamped on the input timeline accumulated from rtmidi's delta times
         self.should_record = False
-        self.recorder = MidiRecorder(logger=self.logger)
+        self.input_timeline = InputTimeline()
+        self.recorder = MidiRecorder(logger=self.logger, clock=self.input_timeline.clock)
+
+        # Real-time mode, started once everything the callback uses has been built
+        real_time = kwargs.get('real_time', None)
+        self.real_time = None
+        if real_time is not None:
+            self.real_time = RealTimeMode(logger=self.logger, is_idle=lambda: not self.message_heap and not self.sustain, **real_time)
+            self.real_time.start(tables=self.music_theory.tables)
         
         self.set_midi_callback()
-        self.start_listening()
+        if kwargs.get('listen', True):
+            self.start_listening()
 
     def initialize_ports(self):
         """Initialize input and output ports based on OS."""
@@ -131,15 +186,11 @@ class MidiController:
         is_posix = sys.platform.startswith("darwin") or sys.platform.startswith("linux")
 
         if is_posix:
-            input_port = None
-            for i, name in enumerate(self.midi_in.get_ports()):
-                if self.input_port in name:
-                    input_port = i
-                    print(f"Using input: {name}")
-                    break
-
+            available_input_ports = self.midi_in.get_ports()
+            input_port = find_port(available_input_ports, self.input_port)
             if input_port is None:
                 raise RuntimeError("MIDI input not found")
+            print(f"Using input: {available_input_ports[input_port]}")
 
             self.midi_in.open_port(input_port)
 
@@ -147,7 +198,7 @@ class MidiController:
             NUM_PORTS = 12
             for i in range(NUM_PORTS):
                 out = rtmidi.MidiOut()
-                port_name = f"jacobs_ladder_{i}"
+                port_name = self.output_ports[i]
                 out.open_virtual_port(port_name)
                 self.midi_out_ports.append(out)
                 print(f"Created virtual output: {port_name}")
@@ -157,11 +208,8 @@ class MidiController:
         try:
             available_input_ports = self.midi_in.get_ports()
 
-            # Match full port name or startswith self.input_port
-            input_port_index = next(
-                (i for i, p in enumerate(available_input_ports) if p.startswith(self.input_port)),
-                None
-            )
+            # Match the full port name, ignoring the number Windows appends
+            input_port_index = find_port(available_input_ports, self.input_port)
 
             if input_port_index is not None:
                 self.midi_in.open_port(input_port_index)
@@ -176,11 +224,8 @@ class MidiController:
             available_output_ports = self.midi_out_ports[0].get_ports()
 
             for midi_out_idx, port_name in enumerate(self.output_ports):
-                # Match full port name or startswith
-                output_port_index = next(
-                    (i for i, p in enumerate(available_output_ports) if p.startswith(port_name)),
-                    None
-                )
+                # Match the full port name, so jacobs_ladder_1 never opens jacobs_ladder_10
+                output_port_index = find_port(available_output_ports, port_name)
 
                 if output_port_index is not None:
                     self.midi_out_ports[midi_out_idx].open_port(output_port_index)
@@ -209,24 +254,23 @@ class MidiController:
             port (str): the Midi port you want to select
         """
         available_input_ports = self.midi_in.get_ports()
-        input_port_index = next(
-            (i for i, p in enumerate(available_input_ports) if p.startswith(port)),
-            None
-        )
+        input_port_index = find_port(available_input_ports, port)
         if input_port_index is not None:
             self.input_port = port
         else:
             raise RuntimeError(f"Failed to find port {port}")
 
-    def delete_suspended_note(self, sus_note: list):
+    def delete_suspended_note(self, sus_note: Voice):
         """Delete notes which have been sustained when the associated NOTE_OFF message has already been played
 
         Args:
-            sus_note (list): a list of suspended (or sustained) notes to be deleted
+            sus_note (Voice): a suspended (or sustained) note to be deleted
         """
-        for index, sublist in enumerate(self.message_heap):
-            if sublist[0] == sus_note[0]:
+        for index, voice in enumerate(self.message_heap):
+            if voice.note == sus_note.note:
                 del self.message_heap[index]
+                self.pitch_class_map.remove(voice)
+                self.live_keys.remove(voice.note)
                 return
 
     def filter(self, message: tuple, timestamp: float):
@@ -240,64 +284,76 @@ class MidiController:
             timestamp (float): Empty variable, necessary for MIDI callback as the underlying C++ code 
             is expecting this function signiture
         """
+        if self.real_time is not None:
+            self.real_time.on_callback()
         payload, dt  = message
         status, note, velocity = payload
+        event_time = self.input_timeline.advance(dt)
 
         if self.should_record and self.tuning_mode in ("none", None):
-            self.recorder.record_event(status, note, velocity)
+            self.recorder.record_event(status, note, velocity, timestamp=event_time)
 
         self.just_intonation.tuning_mode = self.tuning_mode
 
         if status in range(144, 160):
-            instance_index = determine_octave(message_heap=self.message_heap, note=note)
+            instance_index = self.pitch_class_map.lookup(note)
             if instance_index is None:
-                if note not in [msg_note[0] for msg_note in self.message_heap]:
+                if note not in [voice.note for voice in self.message_heap]:
+                    if not self.instance_index:
+                        # Mapped negative harmony notes share the 12 output voices, so the pool can run out
+                        self.logger.warning("[MM] no free output voice for note %d, dropped", note)
+                        return
                     instance_index = heapq.heappop(self.instance_index)
                 else:
-                    logging.warning(f"no instances are left! {instance_index}")
+                    self.logger.warning("[MM] no instances are left! %s", instance_index)
                         
             self.in_use_indices[note] = instance_index
-            current_msg = [note + self.transpose, instance_index, status, velocity, PitchInfo()]
+            current_msg = Voice(note + self.transpose, instance_index, status, velocity)
             heapq.heappush(self.message_heap, current_msg)
+            self.pitch_class_map.add(current_msg)
+            self.live_keys.add(current_msg.note)
             
             # chord = self.music_theory.determine_chord(self.message_heap) # commenting out until I can make this call more efficient
             candidate_scales, bitmasks = self.music_theory.get_candidate_scales(message_heap=self.message_heap, scale_includes=self.scale_includes)
             key = self.music_theory.find_key()
             # print(chord)
 
-            data_bytes = pack_message(message_heap=self.message_heap, candidate_scales=candidate_scales, bitmasks=bitmasks)
+            data_bytes = pack_message(message_heap=self.message_heap, candidate_scales=candidate_scales, bitmasks=bitmasks, live_keys=self.live_keys.to_bytes())
             datagram1 = build_udp_message(message_type=1, payload_bytes=data_bytes)
             self.udp_sender.send_bytes(datagram1)
             
             if self.tuning_mode == "static" or self.tuning_mode == "dynamic" or self.tuning_mode == "just-intonation":
-                tuning_index, pitch_bend_message, message_heap = self.just_intonation.get_tuning_info(message_heap=self.message_heap, current_msg=current_msg, dt=dt, key=key)
+                tuning_index, pitch_bend_message, message_heap = self.just_intonation.get_tuning_info(message_heap=self.message_heap, current_msg=current_msg, dt=dt, key=key, pitch_class_map=self.pitch_class_map)
                 self.message_heap = message_heap
                 self.midi_out_ports[tuning_index].send_message(pitch_bend_message)
             else:
                 self.midi_out_ports[instance_index].send_message([224, 0, 64])
 
-            # result = self.negative_harmony.processNoteOn(note=note) TODO: Integrate better
-
-            # for play_note in result["play"]: 
-            #     self.midi_out_ports[0].send_message([status, play_note, velocity])
-
             message_heap_bytes = pack_message_heap(self.message_heap)
             datagram2 = build_udp_message(message_type=2, payload_bytes=message_heap_bytes)
             self.udp_sender.send_bytes(datagram2)
+            self.publish_shared_state(message_heap_bytes, candidate_scales, key)
 
-            self.midi_out_ports[instance_index].send_message([status, note, velocity])
+            if self.negative_harmony is None:
+                self.midi_out_ports[instance_index].send_message([status, note, velocity])
+            else:
+                self.play_mapped_notes(status, note, velocity, instance_index)
 
         elif status in range(128, 144):
-            instance_index = self.in_use_indices[note]
-            # result = self.negative_harmony.processNoteOff(note=note) TODO: Integrate better
-            # for off_note in result:
-            #     self.midi_out_ports[0].send_message([status, off_note, velocity])
+            instance_index = self.in_use_indices.get(note)
+            if instance_index is None:
+                # Its note on was dropped for lack of a free voice
+                return
             self.midi_out_ports[instance_index].send_message([status, note, velocity])
+            if note in self.mapped_voices:
+                self.release_mapped_notes(status, note, velocity, instance_index)
             if not self.sustain:
                 # Delete only the first occurance of note in self.message_heap
-                for index, sublist in enumerate(self.message_heap):
-                    if sublist[0] == note:
+                for index, voice in enumerate(self.message_heap):
+                    if voice.note == note:
                         del self.message_heap[index]
+                        self.pitch_class_map.remove(voice)
+                        self.live_keys.remove(voice.note)
                         break
                 heapq.heapify(self.message_heap)
                 if instance_index not in self.instance_index:
@@ -305,24 +361,25 @@ class MidiController:
                 del self.in_use_indices[note]
 
             else:
-                heapq.heappush(self.sustained_notes, [note, instance_index, status, velocity])
+                heapq.heappush(self.sustained_notes, Voice(note, instance_index, status, velocity))
             
             # chord = self.music_theory.determine_chord(self.message_heap) # commenting out until I can make this call more efficient
             candidate_scales, bitmasks = self.music_theory.get_candidate_scales(message_heap=self.message_heap, scale_includes=self.scale_includes)
             key = self.music_theory.find_key()
 
-            data_bytes = pack_message(message_heap=self.message_heap, candidate_scales=candidate_scales, bitmasks=bitmasks)
+            data_bytes = pack_message(message_heap=self.message_heap, candidate_scales=candidate_scales, bitmasks=bitmasks, live_keys=self.live_keys.to_bytes())
             if data_bytes:
                 datagram1 = build_udp_message(message_type=1, payload_bytes=data_bytes)
                 self.udp_sender.send_bytes(datagram1)
             else:
-                live_keys_payload = "Live keys"[:25].ljust(25).encode("ascii") + bytearray([0]*11)
+                live_keys_payload = LIVE_KEYS_HEADER + EMPTY_MASK_BYTES
                 datagram1 = build_udp_message(message_type=1, payload_bytes=live_keys_payload)
                 self.udp_sender.send_bytes(datagram1)
             
             message_heap_bytes = pack_message_heap(self.message_heap)
             datagram2 = build_udp_message(message_type=2, payload_bytes=message_heap_bytes)
             self.udp_sender.send_bytes(datagram2)
+            self.publish_shared_state(message_heap_bytes, candidate_scales, key)
 
         elif status in range(176, 192) and note == 64:
             if velocity == 127:
@@ -334,15 +391,15 @@ class MidiController:
                 for instance_index in range(12):
                     self.midi_out_ports[instance_index].send_message([status, 64, 0])
                 
-                sus_notes_copy = deepcopy(self.sustained_notes)
+                sus_notes_copy = list(self.sustained_notes)
                 multiple_played_notes = []
                 for sus_note in sus_notes_copy:
-                    instance_index = self.in_use_indices[sus_note[0]]
+                    instance_index = self.in_use_indices[sus_note.note]
                     self.delete_suspended_note(sus_note=sus_note)
                     if instance_index or instance_index == 0:
-                        if sus_note[1] not in [sublist[1] for sublist in self.message_heap]:
+                        if sus_note.instance_index not in [voice.instance_index for voice in self.message_heap]:
                             heapq.heappush(self.instance_index, instance_index)
-                            del self.in_use_indices[sus_note[0]]
+                            del self.in_use_indices[sus_note.note]
                         else:
                             multiple_played_notes.append(sus_note)
 
@@ -351,15 +408,21 @@ class MidiController:
                 else:
                     counter = 0
                     length = len([note[0] for note in self.in_use_indices.items()])
-                    while sorted([note[0] for note in self.in_use_indices.items()]) != sorted([note[0] for note in self.message_heap]):
+                    while sorted([note[0] for note in self.in_use_indices.items()]) != sorted([voice.note for voice in self.message_heap]):
                         if counter > 1000:
-                            logging.warning("Loop is misbehaving or you just held the sustain pedal for a really long time!")
+                            self.logger.warning("[MM] Loop is misbehaving or you just held the sustain pedal for a really long time!")
                             break
                         for duplicate_note in [note[0] for note in self.in_use_indices.items()]:
                             counter += 1
-                            if duplicate_note not in [note[0] for note in self.message_heap]:
+                            if duplicate_note not in [voice.note for voice in self.message_heap]:
                                 del self.in_use_indices[duplicate_note]
                                 break
+
+                # Only now does in_use_indices hold just the voices of the notes still sounding
+                for mapped_index in self.sustained_mapped_indices:
+                    if mapped_index not in self.instance_index and mapped_index not in self.in_use_indices.values():
+                        heapq.heappush(self.instance_index, mapped_index)
+                self.sustained_mapped_indices = []
                 
                 heapq.heapify(self.message_heap)
                 sus_notes_copy = []
@@ -374,6 +437,69 @@ class MidiController:
         elif status == 169:
             self.turn_off_all_notes()
 
+    def play_mapped_notes(self, status: int, note: int, velocity: int, instance_index: int) -> None:
+        """Send a NOTE_ON for the original note (unless it is substituted) and one for each note the active negative
+        harmony maps transform it into, each on a free output voice (or the original's voice once all are in use).
+        A substituted original sounds nothing, so the first mapped note takes its voice.
+
+        Args:
+            status (int): the NOTE_ON status byte
+            note (int): the played Midi note
+            velocity (int): the played velocity
+            instance_index (int): the output voice of the played note
+        """
+        if note in self.mapped_voices:
+            # Retriggered under the sustain pedal before its note off
+            self.release_mapped_notes(128 + (status & 0x0F), note, 0, instance_index)
+        if self.negative_harmony.play_original:
+            self.midi_out_ports[instance_index].send_message([status, note, velocity])
+
+        mapped_voices = []
+        for mapped_note in self.negative_harmony.table[note]:
+            if not mapped_voices and not self.negative_harmony.play_original:
+                mapped_index = instance_index
+            else:
+                mapped_index = heapq.heappop(self.instance_index) if self.instance_index else instance_index
+            if mapped_index != instance_index:
+                self.midi_out_ports[mapped_index].send_message([224, 0, 64])
+            self.midi_out_ports[mapped_index].send_message([status, mapped_note, velocity])
+            mapped_voices.append((mapped_index, mapped_note))
+        self.mapped_voices[note] = mapped_voices
+
+    def release_mapped_notes(self, status: int, note: int, velocity: int, instance_index: int) -> None:
+        """Send the NOTE_OFF messages for the mapped notes sent with a note's NOTE_ON and free their output voices,
+        after the sustain pedal is released if it is down
+
+        Args:
+            status (int): the NOTE_OFF status byte
+            note (int): the released Midi note
+            velocity (int): the release velocity
+            instance_index (int): the output voice of the released note
+        """
+        for mapped_index, mapped_note in self.mapped_voices.pop(note):
+            self.midi_out_ports[mapped_index].send_message([status, mapped_note, velocity])
+            if mapped_index == instance_index:
+                continue
+            if self.sustain:
+                self.sustained_mapped_indices.append(mapped_index)
+            elif mapped_index not in self.instance_index:
+                heapq.heappush(self.instance_index, mapped_index)
+
+    def publish_shared_state(self, message_heap_bytes: bytes, candidate_scales: list[str], key: str | None) -> None:
+        """Publish the live state to the shared-memory channel if it is enabled
+
+        Args:
+            message_heap_bytes (bytes): the message_heap packed with pack_message_heap
+            candidate_scales (list[str]): names of the candidate scales
+            key (str | None): the current key as returned by MusicTheory.find_key
+        """
+        if self.shared_state is None:
+            return
+        scale_ids = self.music_theory.scale_ids
+        self.shared_state.publish(live_keys=self.live_keys.to_bytes(), voices=message_heap_bytes,
+                                  candidate_ids=[scale_ids[name] for name in candidate_scales],
+                                  key_id=scale_ids.get(key, NO_SCALE))
+
     def change_recording_mode(self, recording_mode: int, tempo: int) -> None:
         """Change the recording mode (start/stop)
 
@@ -382,7 +508,7 @@ class MidiController:
         """
         if recording_mode == 1:
             self.should_record = True
-            self.recorder.start(tempo=tempo)
+            self.recorder.start(tempo=tempo, start_time=self.input_timeline.now())
         elif recording_mode == 0:
             self.should_record = False
             self.recorder.stop()
@@ -432,12 +558,33 @@ class MidiController:
             print("Exiting...")
             self.turn_off_all_notes()
         finally:
-            self.close_ports()
+            self.shutdown()
+
+    def shutdown(self):
+        """Close the MIDI ports and release the UDP endpoints and shared-memory state of this controller"""
+        self.logger.info(f"[MM] Input timeline: {self.input_timeline.summary()}")
+        self.close_ports()
+        self.udp_receiver.stop()
+        self.udp_sender.stop()
+        if self.owns_control_plane:
+            self.control_plane.stop()
+        if self.shared_state is not None:
+            self.shared_state.close()
+            self.shared_state = None
+        if self.real_time is not None:
+            self.real_time.stop()
+        if self.async_logging:
+            stop_logging(self.logger.name)
             
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Load MidiController from YAML config.")
     parser.add_argument('config_path', type=str, help="Path to YAML config file.")
+    parser.add_argument('--profile-startup', action='store_true', help="Print an import-time breakdown before starting.")
     args = parser.parse_args()
 
+    if args.profile_startup:
+        from .StartupProfile import print_import_breakdown
+        print_import_breakdown("jacobs_ladder.src.MidiManager")
+
     kwargs = parse_midi_controller_config(args.config_path, print_config=True)
     midi_controller = MidiController(**kwargs)
\ No newline at end of file
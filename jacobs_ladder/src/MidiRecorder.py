@@ -1,32 +1,35 @@
 import logging
 import threading
-import mido
 import os
-import sys
 
-is_posix = sys.platform.startswith("darwin") or sys.platform.startswith("linux")
-try:
-    from jacobs_ladder import qpc_utils
-except ImportError:
-    from .MockQpc import MockQpcUtils
+from .Clock import Clock, default_clock
 
 class MidiRecorder:
-    def __init__(self, logger: logging.Logger):
-        if not is_posix:
-            self.qpc = qpc_utils.QpcUtils()
-        else:
-            self.qpc = MockQpcUtils()
+    def __init__(self, logger: logging.Logger, clock: Clock = None):
+        """Create a recorder
+
+        Args:
+            logger (logging.Logger): logger
+            clock (Clock, optional): timestamps the recorded messages. Defaults to default_clock() (QPC on Windows
+                when available, otherwise time.perf_counter).
+        """
+        self.clock = clock or default_clock()
         self.logger = logger
         self.is_recording = False
         self.is_saving = False
-        self.start_ticks = None
-        self.last_ticks = None
+        self.start_time = None
         self.messages = []
         self._saving_thread = None
         self.tempo = 120
 
-    def start(self, tempo: int):
-        """Begin recording MIDI messages."""
+    def start(self, tempo: int, start_time: float = None):
+        """Begin recording MIDI messages.
+
+        Args:
+            tempo (int): tempo of the saved file in bpm
+            start_time (float, optional): start of the recording in seconds on the timeline the recorded timestamps
+                use (see InputTimeline.now). Defaults to now on the recorder's clock.
+        """
         if self.is_recording:
             self.logger.warning("Warning: Recorder is already running.")
             return
@@ -36,8 +39,7 @@ class MidiRecorder:
 
         self.tempo = tempo
         self.is_recording = True
-        self.start_ticks = self.qpc.qpcGetTicks()
-        self.last_ticks = self.start_ticks
+        self.start_time = self.clock.get_ticks() / self.clock.get_frequency() if start_time is None else start_time
         self.messages = []
 
     def stop(self, filename="recording.mid"):
@@ -61,25 +63,28 @@ class MidiRecorder:
         # Spawn detached thread for saving
         self._saving_thread = threading.Thread(
             target=self._save_recording,
-            args=(filename, self.start_ticks),
+            args=(filename, self.start_time),
             daemon=True
         )
         self._saving_thread.start()
 
-    def _save_recording(self, filename, start_ticks):
+    def _save_recording(self, filename, start_time):
         """Threaded save operation, clears messages after saving."""
+        # Deferred so mido is only imported once a recording is actually saved
+        import mido
+
         try:
-            freq = self.qpc.qpcGetFrequency()
             mid = mido.MidiFile(ticks_per_beat=960)
             track = mido.MidiTrack()
             mid.tracks.append(track)
 
-            last_ticks = start_ticks
+            last_ticks = 0
             tempo = mido.bpm2tempo(self.tempo)
 
-            for msg_data, ticks in self.messages:
-                delta_s = (ticks - last_ticks) / freq
-                last_ticks = ticks
+            for msg_data, timestamp in self.messages:
+                # Round each message's absolute time to the tick grid so rounding errors do not accumulate
+                ticks = max(round(mido.second2tick(timestamp - start_time, mid.ticks_per_beat, tempo)), last_ticks)
+                delta_ticks = ticks - last_ticks
 
                 status, note_or_control, velocity_or_value = msg_data
                 msg_type = None
@@ -92,8 +97,6 @@ class MidiRecorder:
                     msg_type = 'control_change'
 
                 if msg_type:
-                    delta_ticks = int(mido.second2tick(delta_s, mid.ticks_per_beat, tempo))
-
                     if msg_type in ['note_on', 'note_off']:
                         msg = mido.Message(msg_type,
                                         note=note_or_control,
@@ -105,6 +108,7 @@ class MidiRecorder:
                                         value=velocity_or_value,
                                         time=delta_ticks)
                     track.append(msg)
+                    last_ticks = ticks
                 else:
                     self.logger.warning(f"Skipped unknown status byte: {status}")
 
@@ -119,12 +123,21 @@ class MidiRecorder:
             self.is_saving = False
 
 
-    def record_event(self, status: int, note: int, velocity: int):
-        """Record an incoming MIDI message with high-resolution timestamp."""
+    def record_event(self, status: int, note: int, velocity: int, timestamp: float = None):
+        """Record an incoming MIDI message.
+
+        Args:
+            status (int): status byte
+            note (int): note or controller number
+            velocity (int): velocity or controller value
+            timestamp (float, optional): the message's time in seconds on the input timeline, built from rtmidi's
+                delta times. Defaults to now on the recorder's clock, which adds the callback's scheduling jitter.
+        """
         if not self.is_recording:
             return
         if self.is_saving:
             self.logger.warning("Recording blocked: previous recording is still saving.")
             return
-        ticks = self.qpc.qpcGetTicks()
-        self.messages.append(((status, note, velocity), ticks))
+        if timestamp is None:
+            timestamp = self.clock.get_ticks() / self.clock.get_frequency()
+        self.messages.append(((status, note, velocity), timestamp))
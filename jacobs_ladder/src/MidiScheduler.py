@@ -1,24 +1,34 @@
 import threading
 from collections import deque
-import rtmidi
 import time
 
+from .Clock import Clock, default_clock
 from .DataClasses import NoteEvent
 from .Dictionaries import get_midi_notes
 from .CircularQueue import CircularQueue
 
 class MidiScheduler:
     
-    def __init__(self, midi_out_port: str = "jacob"):
+    def __init__(self, midi_out_port: str = "jacob", clock: Clock = None, midi_out=None):
         """Initialize the MidiScheduler with an output port and an empty deque for event storage.
 
         Args:
-            midi_out_port (rtmidi.MidiOut()): The RtMidi output object for sending messages.
+            midi_out_port (str): Name of the output port to open for sending messages.
+            clock (Clock, optional): time source the events are scheduled on. Defaults to default_clock().
+            midi_out (rtmidi.MidiOut, optional): an already opened output (anything with send_message) to use instead
+                of opening midi_out_port. Defaults to None.
         """
-        self.midi_out = rtmidi.MidiOut()
         self.output_port = midi_out_port
+        self.clock = clock or default_clock()
         self.events = CircularQueue()
         self.stash = []
+
+        # Playback state of the scheduler thread, guarded by the condition
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._playing = False
+        self._closed = False
+        self._next_deadline = 0.0
         
         self.CONTROL_CHANGE_STATUS = 176
         self.SUSTAIN_PEDAL_NOTE = 64
@@ -27,7 +37,13 @@ class MidiScheduler:
         self.NOTE_ON_STATUS = 144
         self.NOTE_OFF_STATUS = 128
         
-        self.initialize_port()
+        if midi_out is None:
+            import rtmidi
+
+            self.midi_out = rtmidi.MidiOut()
+            self.initialize_port()
+        else:
+            self.midi_out = midi_out
         self.int_note = get_midi_notes()
         
     def initialize_port(self):
@@ -36,6 +52,8 @@ class MidiScheduler:
         Raises:
             RuntimeError: If the port cannot be found, this funtion raises an error
         """
+        import rtmidi
+
         try:
             available_output_ports = [port.split(" ", 1)[0] for port in self.midi_out.get_ports()]
             index = available_output_ports.index(self.output_port)
@@ -87,6 +105,9 @@ class MidiScheduler:
     def schedule_events(self, initial_delay: int = 0):
         """Schedule all NoteEvents for playback with appropriate timing.
 
+        Each event plays its dt after the previous one. Deadlines are kept absolute on the clock, so the time spent
+        sending one event does not push back every event after it.
+
         Args:
             initial_delay (int): The delay in milliseconds before playing the first note.
         """
@@ -97,21 +118,55 @@ class MidiScheduler:
             return
     
         # Schedule events
-        if initial_delay > 0:
-            threading.Timer(initial_delay / 1000, self.play_events).start()
-        else:
+        with self._condition:
+            self._next_deadline = self.clock.now() + initial_delay / 1000
+            self._playing = True
+            self._closed = False
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = self.clock.start_thread(self._run, name="MidiScheduler")
+            self.clock.notify(self._condition)
+
+    def _run(self):
+        """Scheduler thread: wait for the next deadline, then play the event that is due"""
+        condition = self._condition
+        clock = self.clock
+        while True:
+            with condition:
+                while not self._playing and not self._closed:
+                    clock.wait_until(condition, None)
+                if self._closed:
+                    return
+                target = self._next_deadline
+                if target - clock.now() > clock.spin_threshold:
+                    clock.wait_until(condition, target)
+                    continue
+
+            clock.spin_until(target)
             self.play_events()
 
     def play_events(self):
         """Play the first event and schedule the subsequent events."""
         current_event = self.events.dequeue()
-        self.play_event(current_event)
-
-        if self.events.circular_queue:
-            next_event = self.events.circular_queue[0]
-            threading.Timer(next_event.dt / 1000, self.schedule_events).start()
-        else:
-            threading.Timer(0, self.schedule_events).start()
+        if current_event is not None:
+            self.play_event(current_event)
+
+        with self._condition:
+            if current_event is not None and self.events.circular_queue:
+                next_event = self.events.circular_queue[0]
+                self._next_deadline += next_event.dt / 1000
+            else:
+                print("No more events")
+                self._playing = False
+
+    def stop(self):
+        """Stop playback and shut the scheduler thread down. Queued events are kept."""
+        with self._condition:
+            self._playing = False
+            self._closed = True
+            self.clock.notify(self._condition)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
 
     def play_event(self, event: NoteEvent):
         """Play a single NoteEvent and schedule the next one.
@@ -0,0 +1,286 @@
+import argparse
+import os
+import struct
+import time
+
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
+from .Enums import Algorithm
+from .NegativeHarmony import NoteMap
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+MIDI_EXTENSIONS = (".mid", ".midi")
+DRUM_CHANNEL = 9
+
+# Octave note maps for the command line, as in NegativeHarmony's example maps
+OCTAVE_NOTE_MAPS = {
+    "cg-reflected": {60: 67, 61: 66, 62: 65, 63: 64, 64: 63, 65: 62, 66: 61, 67: 60, 68: 71, 69: 70, 70: 69, 71: 68},
+    "c-revolved": {60: 60, 61: 71, 62: 70, 63: 69, 64: 68, 65: 67, 66: 66, 67: 65, 68: 64, 69: 63, 70: 62, 71: 61},
+}
+
+# Data byte counts of the channel messages by status high nibble; 0x80, 0x90 and 0xA0 carry a note number first
+_DATA_BYTES = {0x80: 2, 0x90: 2, 0xA0: 2, 0xB0: 2, 0xC0: 1, 0xD0: 1, 0xE0: 2}
+
+# Lookup table of a worker process, set once by init_worker
+_worker_table: np.ndarray | None = None
+_worker_options: dict = {}
+
+
+def build_note_table(note_map: NoteMap = None, transpose: int = 0) -> np.ndarray:
+    """Build the 128 entry note lookup table applying a NoteMap and then a transposition
+
+    Notes outside the piano range are left to the transposition only, as NoteMap does not map them. Notes
+    transposed outside 0-127 are wrapped back by octaves.
+
+    Args:
+        note_map (NoteMap, optional): negative harmony map, applied whether or not it is active. Defaults to None.
+        transpose (int, optional): semitones in the range (-12, 12) inclusive, as MidiController.transpose_by. Defaults to 0.
+
+    Raises:
+        ValueError: if transpose is out of range
+
+    Returns:
+        np.ndarray: uint8 table indexed by note number
+    """
+    if not -12 <= transpose <= 12:
+        raise ValueError(f"transpose must be in the range (-12, 12) inclusive, got {transpose}")
+
+    table = np.arange(128, dtype=np.int16)
+    if note_map is not None:
+        offset = note_map.__midiRange__[0]
+        table[offset:offset + len(note_map.noteMapping)] = note_map.noteMapping
+    table += transpose
+    table[table < 0] += 12
+    table[table > 127] -= 12
+    return table.astype(np.uint8)
+
+
+def find_note_offsets(data: bytes, skip_drums: bool = True) -> np.ndarray:
+    """Walk the tracks of a Standard MIDI File and find the byte offset of the note number of every note on, note
+    off and polyphonic aftertouch message. Nothing but the event framing is decoded.
+
+    Args:
+        data (bytes): contents of a .mid file
+        skip_drums (bool, optional): leave the notes on Midi channel 10 alone. Defaults to True.
+
+    Raises:
+        ValueError: if the file is not a Standard MIDI File or a track is malformed
+
+    Returns:
+        np.ndarray: offsets into data
+    """
+    if data[:4] != b"MThd":
+        raise ValueError("Not a Standard MIDI File")
+
+    offsets = []
+    position = 8 + struct.unpack_from(">I", data, 4)[0]
+    end_of_file = len(data)
+    while position + 8 <= end_of_file:
+        chunk_type = data[position:position + 4]
+        chunk_length = struct.unpack_from(">I", data, position + 4)[0]
+        position += 8
+        chunk_end = position + chunk_length
+        if chunk_end > end_of_file:
+            raise ValueError(f"Chunk at byte {position - 8} runs past the end of the file")
+        if chunk_type == b"MTrk":
+            _find_track_note_offsets(data, position, chunk_end, skip_drums, offsets)
+        position = chunk_end
+    return np.array(offsets, dtype=np.int64)
+
+
+def _find_track_note_offsets(data: bytes, position: int, end: int, skip_drums: bool, offsets: list[int]) -> None:
+    """Append the note number offsets of one track chunk (see find_note_offsets)"""
+    running_status = 0
+    while position < end:
+        # Delta time
+        while data[position] & 0x80:
+            position += 1
+        position += 1
+
+        status = data[position]
+        if status & 0x80:
+            position += 1
+        else:
+            status = running_status
+            if not status:
+                raise ValueError(f"Data byte without a running status at byte {position}")
+
+        if status == 0xFF or status in (0xF0, 0xF7):
+            if status == 0xFF:
+                position += 1
+            length = 0
+            while True:
+                byte = data[position]
+                position += 1
+                length = (length << 7) | (byte & 0x7F)
+                if not byte & 0x80:
+                    break
+            position += length
+            # Sysex events cancel the running status; meta events leave it alone, as many files rely on that
+            if status != 0xFF:
+                running_status = 0
+            continue
+
+        kind = status & 0xF0
+        if kind not in _DATA_BYTES:
+            raise ValueError(f"Unexpected status byte {status:#04x} at byte {position - 1}")
+        if kind < 0xB0 and not (skip_drums and status & 0x0F == DRUM_CHANNEL):
+            offsets.append(position)
+        position += _DATA_BYTES[kind]
+        running_status = status
+
+
+def transform_bytes(data: bytes, table: np.ndarray, skip_drums: bool = True) -> tuple[bytes, int]:
+    """Map every note number of a Standard MIDI File through a lookup table. Event lengths do not change, so only
+    the note bytes are rewritten.
+
+    Args:
+        data (bytes): contents of a .mid file
+        table (np.ndarray): uint8 lookup table from build_note_table
+        skip_drums (bool, optional): leave the notes on Midi channel 10 alone. Defaults to True.
+
+    Returns:
+        tuple[bytes, int]: the transformed file and the number of notes rewritten
+    """
+    offsets = find_note_offsets(data, skip_drums=skip_drums)
+    buffer = np.frombuffer(data, dtype=np.uint8).copy()
+    buffer[offsets] = table[buffer[offsets]]
+    return buffer.tobytes(), len(offsets)
+
+
+def output_path_for(path: Path, suffix: str) -> Path:
+    """Where the transformed copy of a file is written: alongside it, e.g. song.mid -> song.negative.mid"""
+    return path.with_name(f"{path.stem}.{suffix}{path.suffix}")
+
+
+def init_worker(table: np.ndarray, options: dict) -> None:
+    """Pool initializer: keep the lookup table for every file the worker transforms"""
+    global _worker_table, _worker_options
+    _worker_table = table
+    _worker_options = options
+
+
+def transform_file(job: tuple[str, str]) -> tuple[str, int, int, str | None]:
+    """Transform one MIDI file in a worker process and write the result
+
+    Args:
+        job (tuple[str, str]): input path and output path
+
+    Returns:
+        tuple[str, int, int, str | None]: input path, number of notes, number of bytes and an error message (None on success)
+    """
+    path, output_path = job
+    try:
+        data = Path(path).read_bytes()
+        transformed, notes = transform_bytes(data, _worker_table, skip_drums=_worker_options["skip_drums"])
+        Path(output_path).write_bytes(transformed)
+        return path, notes, len(data), None
+    except Exception as e:
+        return path, 0, 0, f"{type(e).__name__}: {e}"
+
+
+def collect_jobs(inputs: list[str], suffix: str) -> list[tuple[str, str]]:
+    """Find the MIDI files to transform, skipping the results of earlier runs with the same suffix
+
+    Args:
+        inputs (list[str]): MIDI files and/or directories searched recursively
+        suffix (str): added before the extension of the outputs
+
+    Returns:
+        list[tuple[str, str]]: (input path, output path) pairs
+    """
+    jobs = []
+    for entry in map(Path, inputs):
+        if entry.is_dir():
+            paths = sorted(path for path in entry.rglob("*") if path.suffix.lower() in MIDI_EXTENSIONS)
+        else:
+            paths = [entry]
+        for path in paths:
+            if path.stem.endswith(f".{suffix}"):
+                continue
+            jobs.append((str(path), str(output_path_for(path, suffix))))
+    return jobs
+
+
+def transform_corpus(inputs: list[str], table: np.ndarray, suffix: str, workers: int = None,
+                     skip_drums: bool = True, chunksize: int = None) -> dict:
+    """Transform a corpus of MIDI files across a process pool, writing each result alongside its source
+
+    Args:
+        inputs (list[str]): MIDI files and/or directories
+        table (np.ndarray): uint8 lookup table from build_note_table
+        suffix (str): added before the extension of the outputs
+        workers (int, optional): worker processes. Defaults to os.cpu_count().
+        skip_drums (bool, optional): leave the notes on Midi channel 10 alone. Defaults to True.
+        chunksize (int, optional): files handed to a worker at a time. Defaults to ~4 chunks per worker.
+
+    Returns:
+        dict: files, notes, bytes, failures (list of (path, error)), seconds, files_per_second and megabytes_per_second
+    """
+    jobs = collect_jobs(inputs, suffix)
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, len(jobs) // (workers * 4))
+    options = {"skip_drums": skip_drums}
+
+    start = time.perf_counter()
+    notes = 0
+    size = 0
+    failures = []
+    with Pool(processes=workers, initializer=init_worker, initargs=(table, options)) as pool:
+        for path, file_notes, file_bytes, error in pool.imap_unordered(transform_file, jobs, chunksize=chunksize):
+            notes += file_notes
+            size += file_bytes
+            if error is not None:
+                failures.append((path, error))
+    seconds = time.perf_counter() - start
+
+    return {"files": len(jobs), "notes": notes, "bytes": size, "failures": failures, "seconds": seconds,
+            "files_per_second": len(jobs) / seconds if seconds else 0.0,
+            "megabytes_per_second": size / 1e6 / seconds if seconds else 0.0}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply a negative harmony map and/or a transposition to a library of MIDI files.")
+    parser.add_argument("inputs", nargs="+", help="MIDI files and/or directories (searched recursively).")
+    parser.add_argument("--map", choices=sorted(OCTAVE_NOTE_MAPS), default=None, help="Negative harmony octave note map.")
+    parser.add_argument("--algorithm", choices=[algorithm.name for algorithm in Algorithm], default=Algorithm.LOWER_OCTAVE.name,
+                        help="Negative harmony algorithm.")
+    parser.add_argument("--key-center", type=int, default=60, help="Axis note of the FIXED_AXIS algorithm.")
+    parser.add_argument("--transpose", type=int, default=0, help="Semitones in the range (-12, 12) inclusive.")
+    parser.add_argument("--suffix", default=None, help="Added before the extension of the outputs (default from the options).")
+    parser.add_argument("--include-drums", action="store_true", help="Also transform Midi channel 10.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--chunksize", type=int, default=None, help="Files per work chunk.")
+    args = parser.parse_args()
+
+    if args.map is None and args.transpose == 0:
+        parser.error("Nothing to do: give --map and/or --transpose")
+
+    note_map = None
+    if args.map is not None:
+        note_map = NoteMap(name=args.map, octaveNoteMap=dict(OCTAVE_NOTE_MAPS[args.map]), algorithm=Algorithm[args.algorithm],
+                           active=True, keyCenter=args.key_center)
+    try:
+        table = build_note_table(note_map=note_map, transpose=args.transpose)
+    except ValueError as e:
+        parser.error(str(e))
+
+    suffix = args.suffix
+    if suffix is None:
+        parts = [f"{args.map}-{args.algorithm.lower()}"] if args.map else []
+        if args.transpose:
+            parts.append(f"t{args.transpose:+d}")
+        suffix = "_".join(parts)
+
+    summary = transform_corpus(args.inputs, table, suffix, workers=args.workers, skip_drums=not args.include_drums,
+                               chunksize=args.chunksize)
+    for path, error in summary["failures"]:
+        print(f"Failed: {path}: {error}")
+    print(f"Transformed {summary['files']} files ({summary['notes']} notes) in {summary['seconds']:.2f} s: "
+          f"{summary['files_per_second']:.1f} files/s, {summary['notes'] / summary['seconds']:.0f} notes/s, "
+          f"{summary['megabytes_per_second']:.1f} MB/s")
@@ -1,12 +0,0 @@
-class MockQpcUtils:
-    
-    def __init__(self):
-        pass
-    
-    def qpcGetTicks() -> int:
-        return 0
-    
-    def qpcGetFrequency() -> int:
-        return 10_000
-    
-    
\ No newline at end of file
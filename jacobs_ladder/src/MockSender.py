@@ -4,4 +4,10 @@ class MockSender:
         pass
     
     def send(self, data):
-        pass
\ No newline at end of file
+        pass
+    
+    def send_bytes(self, data_bytes: bytes):
+        pass
+
+    def stop(self):
+        pass
@@ -1,5 +1,7 @@
 import logging
+import threading
 from collections import Counter
+from collections.abc import Mapping
 from copy import deepcopy
 
 from .ChordClassifier import get_degree_2_chord_dict, get_degree_3_chord_dict, get_degree_4_chord_dict, get_degree_5_chord_dict, get_degree_6_chord_dict, get_degree_7_chord_dict, get_degree_8_chord_dict
@@ -8,46 +10,269 @@ from .Dictionaries import get_midi_notes
 from .Queue import InOutQueue
 from .Scales import *
 from .Logging import setup_logging
+from .TriadDefinitions import TriadDefinitions
 from .Utilities import remove_harmonically_redundant_intervals
+from .Voice import Voice
 
 __author__ = "Alex Wilson"
 __copyright__ = "Copyright (c) 2023 Jacob's Ladder"
 __date__ = "November 11th 2023 (creation)"
 
+# Loaders for the degree-N chord dictionaries (degree = number of unique pitch classes)
+CHORD_DICT_LOADERS = {
+    2: get_degree_2_chord_dict,
+    3: get_degree_3_chord_dict,
+    4: get_degree_4_chord_dict,
+    5: get_degree_5_chord_dict,
+    6: get_degree_6_chord_dict,
+    7: get_degree_7_chord_dict,
+    8: get_degree_8_chord_dict,
+}
+
+# Most live chords have 2-4 voices so these are always loaded at construction
+EAGER_CHORD_DEGREES = (2, 3, 4)
+
+CHORD_LOADING_MODES = ("eager", "lazy", "background")
+
+# Display names of the TriadDefinitions families, formatted with the note names of the sorted notes
+TRIAD_NAME_FORMATS = {
+    "major_triad": "{root} Maj",                                 # Major (C, E, G) or (C, G, E)
+    "major_triad_1st_inv": "{leaf}/{root}",                      # Major 1st Inversion (E, G, C)
+    "major_triad_1st_inv_var": "{branch}/{root}",                # Major 1st Inversion (E, C, G)
+    "major_triad_2nd_inv": "{branch}/{root}",                    # Major 2nd Inversion (G, C, E)
+    "major_triad_2nd_inv_var": "{leaf}/{root}",                  # Major 2nd Inversion (G, E, C)
+    "minor_triad": "{root}m",                                    # Minor (C, Eb, G)
+    "minor_triad_1st_inv": "{leaf}m/{root}",                     # Minor 1st Inversion (Eb, G, C)
+    "minor_triad_1st_inv_var": "{branch}m/{root}",               # Minor 1st Inversion (Eb, C, G)
+    "minor_triad_2nd_inv": "{branch}m/{root}",                   # Minor 2nd Inversion (G, C, Eb)
+    "minor_triad_2nd_inv_var": "{leaf}m/{root}",                 # Minor 2nd Inversion (G, Eb, C)
+    "add2": "{root}add(2)",                                      # Add 2 chord (C, D, E)
+    "add2_1st_inv": "{leaf}add(2)/{root}",                       # Add 2 chord 1st inversion (D, E, C)
+    "add2_2nd_inv": "{branch}add(2)/{root}",                     # Add 2 chord 2nd inversion (E, C, D)
+    "diminished": "{root}dim",                                   # Diminished (C, Eb, Gb) or (C, Gb, Eb)
+    "augmented": "{root}aug",                                    # Augmented (C, E, Ab) or (C, Ab, E)
+    "eleven_sus4": "{root}11sus4",                               # Quartal chord (C, F, Bb)
+    "sus2": "{root}sus2",                                        # Suspended 2 (C, D, G)
+    "nine_chord": "{root}9",                                     # 9 chord with no third (C, G, D)
+    "sus4": "{root}sus4",                                        # Suspended 4 (C, F, G)
+    "eleven_chord": "{root}11",                                  # 11 chord with no third (C, G, F)
+    "dominant_no_third": "{root}7sus",                           # Dominant with no 3rd (C, G, Bb)
+    "dominant_no_third_1st_inv": "{leaf}7sus/{root}",            # Dominant with no 3rd 1st Inversion (G, Bb, C)
+    "dominant_no_third_2nd_inv": "{branch}7sus/{root}",          # Dominant with no 3rd 2nd Inversion (Bb, C, G)
+    "dominant_no_fifth": "{root}7",                              # Dominant with no 5th
+    "dominant_no_fifth_1st_inv": "{leaf}7/{root}",               # Dominant with no 5th 1st Inversion
+    "dominant_no_fifth_2nd_inv": "{branch}7/{root}",             # Dominant with no 5th 2nd Inversion
+    "min6": "{root}min6",                                        # Minor 6 (Diminished 1st Inversion)
+    "min6_1st_inv": "{leaf}min6/{root}",                         # Minor 6 1st inv (Diminished 2nd Inversion)
+    "maj7_no_third": "{root}maj7sus",                            # Major 7 no 3rd
+    "maj7_no_third_1st_inv": "{leaf}maj7sus/{root}",             # Major 7 no 3rd 1st Inversion
+    "maj7_no_third_2nd_inv": "{branch}maj7sus/{root}",           # Major 7 no 3rd 2nd Inversion
+    "maj7_no_fifth": "{root}maj7",                               # Major 7 no 5th
+    "maj7_no_fifth_1st_inv": "{leaf}maj7/{root}",                # Major 7 no 5th 1st Inversion
+    "maj7_no_fifth_2nd_inv": "{branch}maj7/{root}",              # Major 7 no 5th 2nd Inversion
+    "mush": "{root} mush",                                       # Mush
+    "maj7_add2": "{root} maj7/9",                                # Major 7/9 no third no fifth
+    "maj7_add2_1st_inv": "{leaf} maj7/9/{root}",                 # Major 7/9 no third no fifth 1st inversion
+    "maj7_add2_2nd_inv": "{branch} maj7sus2(no5)/{root}",        # Major 7/9 no third no fifth 2nd inversion
+    "dim_maj7_no_fifth": "{root} dim maj7",                      # Diminished major 7 with no fifth
+    "dim_maj7_no_fifth_1st_inv": "{leaf} dim maj7/{root}",       # Diminished major 7 with no fifth 1st inversion
+    "dim_maj7_no_fifth_2nd_inv": "{root} phryg",                 # Diminished major 7 with no fifth 2nd inversion
+    "sus_maj47": "{root}maj7sus4 ",                              # Suspended 4th with a major 7th
+    "sus_maj47_1st_inv": "{leaf}maj7sus4/{root}",                # Suspended 4th with a major 7th 1st inversion
+    "sus_maj47_2nd_inv": "{branch}maj7sus4/{root}",              # Suspended 4th with a major 7th 2nd inversion
+    "maj7_flat5": "{root}maj7\u266d5",                           # Major 7 flat 5
+    "maj7_flat5_1st_inv": "{leaf}maj7\u266d5/{root}",            # Major 7 flat 5 1st inversion
+    "maj7_flat5_2nd_inv": "{branch}maj7\u266d5/{root}",          # Major 7 flat 5 2nd inversion
+    "majmin": "{root}maj min",                                   # Major Minor
+    "aug_maj7_3rd_inv_no_third": "{branch}aug/{root}",           # Major Minor 1st inversion
+    "aug_maj7_no_third": "{root}aug maj7",                       # Augmented maj7
+    "sus67": "{root}maj7sus(add6)",                              # Suspened maj7 add 6
+    "min_add2_no_fifth": "{root}min(add2)",                      # Minor add 2
+    "min_add2_no_fifth_1st_inv": "{leaf}min(add2)/{root}",       # Min add2 1st inversion
+    "min7_no5": "{root}min7(no5)",                               # Min7 no 5th
+    "sus56": "{root}sus6",                                       # Sus chord add 6
+    "min7_no5_2nd_inv": "{branch}min7(no5)/{root}",              # Min7 no 5th 2nd inversion
+    "major_flat5": "{root}maj \u266d5",                          # Major flat 5
+    "major_flat5_1st_inv": "{leaf}maj \u266d5/{root}",           # Major flat 5 1st inversion
+    "major_flat5_2nd_inv": "{root}7 \u266d5",                    # Major flat 5 2nd inversion
+    "maj79": "{root}maj7/9",                                     # Major 7 add 9
+    "maj79_1st_inv": "{leaf}maj7/9/{root}",                      # Major 7 add 9 1st inversion
+    "maj79_2nd_inv": "{branch}maj7/9/{root}",                    # Major 7 add 9 2nd inversion
+    "maj_flat9": "{root}maj \u266d9",                            # Major flat 9
+    "maj_flat9_1st_inv": "{leaf}maj \u266d9/{root}",             # Major flat 9 1st inversion
+    "maj_flat9_2nd_inv": "{branch}maj \u266d9/{root}",           # Major flat 9 2nd inversion
+    "maj_add9": "{root}maj(add9no5)",                            # Major add 9 no fifth
+    "maj_add9_1st_inv": "{leaf}maj(add9no5)/{root}",             # Major add 9 no fifth 1st inversion
+    "maj_add9_2nd_inv": "{branch}maj(add9no5)/{root}",           # Major add 9 no fifth 2nd inversion
+    "maj7_flat13": "{root}maj7/\u266d13(no3no5)",                # Major 7 flat 13 no third no fifth
+    "sus4_flat9": "{root}sus4/\u266d9(no3no5)",                  # Sus 4 flat 9 no third no fifth
+    "sus49": "{root}sus4(add9no5)",                              # Sus 4 add 9 no fifth
+    "sus49_1st_inv": "{leaf}sus4(add9no5)/{root}",               # Sus 4 flat 9 no third no fifth 1st inversion
+    "min_sus4": "{root}min sus4(no5)",                           # Sus 4 flat 9 no third no fifth 1st inversion
+    "dominant_no_third_var": "{root}7(no3)",                     # Dominant no third
+    "six_nine": "{root} 6/9",                                    # Six nine chord
+    "maj7_no_third_var": "{root}maj7(no3)",                      # Major7 no third high fifth
+    "maj7_no_third_var_1st_inv": "{leaf}maj7(no3)/{root}",       # Major7 no third high fifth 1st inversion
+    "maj7_no_third_var_2nd_inv": "{branch}maj7(no3)/{root}",     # Major7 no third high fifth 2nd inversion
+    "sharp11_no_third": "{root}\u266f11(no3)",                   # Sharp 11 no third
+    "sharp11_no_third_1st_inv": "{leaf}\u266f11(no3)/{root}",    # Sharp 11 no third 1st inversion
+    "sharp11_no_third_2nd_inv": "{branch}\u266f11(no3)/{root}",  # Sharp 11 no third 2nd inversion
+    "dominant_no_fifth_var": "{root}7(no5)",                     # Dominant no fifth
+    "dominant_no_fifth_var_1st_inv": "{leaf}7(no5)/{root}",      # Dominant no fifth 1st inversion
+    "dominant_no_fifth_var_2nd_inv": "{branch}7(no5)/{root}",    # Dominant no fifth 2nd inversion
+    "maj_flat5_var": "{root}maj\u266d5",                         # Major flat 5
+    "maj_flat5_var_1st_inv": "{leaf}maj\u266d5/{root}",          # Major flat 5 1st inversion
+    "maj_flat5_var_2nd_inv": "{branch}maj\u266d5/{root}",        # Major flat 5 2nd inversion
+    "maj7_flat5_var": "{root}maj7\u266d5",                       # Major 7 flat 5 2nd inversion
+    "maj7_flat5_var_1st_inv": "{leaf}maj7\u266d5/{root}",        # Major 7 flat 5 1st inversion
+    "maj7_flat5_var_2nd_inv": "{branch}maj7\u266d5/{root}",      # Major 7 flat 5 2nd inversion
+    "min6_var": "{root}min6(no5)",                               # Minor 6
+    "min6_var_2nd_inv": "{branch}min6(no5)/{root}",              # Minor 6 2nd inversion
+    "min9_no5": "{root}min9(no5)",                               # Minor 9 no fifth
+    "min9_no5_1st_inv": "{leaf}min9(no5)/{root}",                # Minor 9 no fifth 1st inversion
+    "min9_no5_2nd_inv": "{branch}min9(no5)/{root}",              # Minor 9 no fifth 2nd inversion
+}
+
+class TheoryTables:
+    """The immutable music theory tables (scales, scale bitmasks and IDs, chord dictionaries) used by MusicTheory.
+
+    Building them is the expensive part of constructing a MusicTheory, and nothing mutates them after they are built,
+    so one instance is shared by every MusicTheory of a process (see ControllerSupervisor).
+    """
+    def __init__(self, logger: logging.Logger, chord_loading: str = "lazy", chord_lookups: dict[int, dict] = None):
+        """Build the scale tables and load the chord dictionaries
+
+        Args:
+            logger (logging.Logger): logger for chord loading errors
+            chord_loading (str, optional): how the degree 5-8 chord dictionaries are loaded. "eager" loads them at
+                construction, "lazy" loads each on first access and "background" loads them on a daemon thread.
+                Degrees 2-4 are always loaded at construction. Defaults to "lazy".
+            chord_lookups (dict[int, dict], optional): already loaded chord dictionaries by degree, e.g. handed to
+                worker processes so they do not reload them. Defaults to None.
+        """
+        if chord_loading not in CHORD_LOADING_MODES:
+            raise ValueError(f"Invalid chord_loading '{chord_loading}'. Must be one of {CHORD_LOADING_MODES}.")
+
+        self.logger = logger
+        self.chord_loading = chord_loading
+
+        # Scales used for justly tuning between two chords from different potential scales
+        self.diminished_scales:           tuple[Scale, ...]           = get_diminished_scales()
+        self.major_scales:                tuple[Scale, ...]           = get_major_scales()
+        self.harmonic_minor_scales:       tuple[Scale, ...]           = get_harmonic_minor_scales()
+        self.harmonic_major_scales:       tuple[Scale, ...]           = get_harmonic_major_scales()
+        self.melodic_minor_scales:        tuple[Scale, ...]           = get_melodic_minor_scales()
+        self.diminished_blues_scales:     tuple[Scale, ...]           = get_diminished_blues_scales()
+        self.diminished_harmonic_scales:  tuple[Scale, ...]           = get_diminished_harmonic_scales()
+        self.whole_tone_scales:           tuple[Scale, ...]           = get_whole_tone_scales()
+        self.pentatonic_scales:           tuple[Scale, ...]           = get_pentatonic_scales()
+
+        # 88-key bitmask and stable ID of every scale, from the process-wide scale registry
+        self.scale_bitmasks:              Mapping[str, bytes]         = SCALE_BITMASKS
+        self.scale_ids:                   Mapping[str, int]           = SCALE_IDS
+
+        # Degree-N chord dictionaries, materialised on demand behind a per-degree lock
+        self._chord_lookups:        dict[int, dict]             = dict(chord_lookups) if chord_lookups else {}
+        self._chord_lookup_locks:   dict[int, threading.Lock]   = {degree: threading.Lock() for degree in CHORD_DICT_LOADERS}
+        self._chord_loader_thread:  threading.Thread | None     = None
+
+        for degree in EAGER_CHORD_DEGREES:
+            self.get_chord_lookup(degree)
+
+        deferred_degrees = [degree for degree in CHORD_DICT_LOADERS if degree not in EAGER_CHORD_DEGREES]
+        if chord_loading == "eager":
+            for degree in deferred_degrees:
+                self.get_chord_lookup(degree)
+        elif chord_loading == "background":
+            self._chord_loader_thread = threading.Thread(target=self._load_chord_lookups, args=(deferred_degrees,), daemon=True)
+            self._chord_loader_thread.start()
+
+    def get_chord_lookup(self, degree: int) -> dict:
+        """Return the chord dictionary for a given degree, loading it on first access
+
+        Args:
+            degree (int): the number of unique pitch classes in the chord (2-8)
+
+        Returns:
+            dict: interval tuple -> chord name
+        """
+        lookup = self._chord_lookups.get(degree)
+        if lookup is None:
+            with self._chord_lookup_locks[degree]:
+                lookup = self._chord_lookups.get(degree)
+                if lookup is None:
+                    lookup = CHORD_DICT_LOADERS[degree]()
+                    self._chord_lookups[degree] = lookup
+        return lookup
+
+    def get_chord_lookups(self) -> dict[int, dict]:
+        """Load (if needed) and return every chord dictionary by degree
+
+        Returns:
+            dict[int, dict]: degree -> interval tuple -> chord name
+        """
+        return {degree: self.get_chord_lookup(degree) for degree in CHORD_DICT_LOADERS}
+
+    def wait_for_chord_lookups(self, timeout: float | None = None) -> bool:
+        """Block until the background chord loader (if any) has finished
+
+        Args:
+            timeout (float | None, optional): seconds to wait. Defaults to None (wait forever).
+
+        Returns:
+            bool: True if every chord dictionary is loaded
+        """
+        if self._chord_loader_thread is not None:
+            self._chord_loader_thread.join(timeout)
+        return len(self._chord_lookups) == len(CHORD_DICT_LOADERS)
+
+    def _load_chord_lookups(self, degrees: list[int]) -> None:
+        """Target of the background chord loader thread"""
+        for degree in degrees:
+            try:
+                self.get_chord_lookup(degree)
+            except Exception as e:
+                self.logger.error(f"[MT] Failed to load degree {degree} chord dictionary: {e}")
+
+
 class MusicTheory:
     """The MusicTheory Class is used to encapsulate the fundamentals of music theory to perform activities such as chord 
     recognition and display, potential scales which can be played over currently suspended notes, representing 
     chords in the simplest harmonic form possible, and key determination.
     """
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, chord_loading: str = "lazy", tables: TheoryTables = None):
         """A class used for determining chords and scales that the real-time midi notes which are currently player are a part of
 
         Args:
             logger (logging.Logger, optional): a reference to the MidiManager's logger. Defaults to None.
+            chord_loading (str, optional): how the degree 5-8 chord dictionaries are loaded. "eager" loads them at
+                construction, "lazy" loads each on first access and "background" loads them on a daemon thread.
+                Degrees 2-4 are always loaded at construction. Ignored when tables is given. Defaults to "lazy".
+            tables (TheoryTables, optional): theory tables shared with other MusicTheory instances. Defaults to None
+                (build a private set).
         """
         self.logger = logger
+        self.tables = tables if tables is not None else TheoryTables(logger=logger, chord_loading=chord_loading)
+        self.chord_loading = self.tables.chord_loading
   
         # Dictionary to convert int midi notes into letter notes assuming all flats for ease of logic
         self.int_note:              dict[int, str]              = get_midi_notes()
+
+        # Spread triad classification (one hash lookup, tables shared by every instance in the process)
+        self.triad_definitions:     TriadDefinitions            = TriadDefinitions()
         
-        # Scales used for justly tuning between two chords from different potential scales
-        self.diminished_scales:           list[Scale]                 = get_diminished_scales()
-        self.major_scales:                list[Scale]                 = get_major_scales()
-        self.harmonic_minor_scales:       list[Scale]                 = get_harmonic_minor_scales()
-        self.harmonic_major_scales:       list[Scale]                 = get_harmonic_major_scales()
-        self.melodic_minor_scales:        list[Scale]                 = get_melodic_minor_scales()
-        self.diminished_blues_scales:     list[Scale]                 = get_diminished_blues_scales()
-        self.diminished_harmonic_scales:  list[Scale]                 = get_diminished_harmonic_scales()
-        self.whole_tone_scales:           list[Scale]                 = get_whole_tone_scales()
-        self.pentatonic_scales:           list[Scale]                 = get_pentatonic_scales()
-
-        self.degree_2_chord_lookup: dict = get_degree_2_chord_dict()
-        self.degree_3_chord_lookup: dict = get_degree_3_chord_dict()
-        self.degree_4_chord_lookup: dict = get_degree_4_chord_dict()
-        self.degree_5_chord_lookup: dict = get_degree_5_chord_dict()
-        self.degree_6_chord_lookup: dict = get_degree_6_chord_dict()
-        self.degree_7_chord_lookup: dict = get_degree_7_chord_dict()
-        self.degree_8_chord_lookup: dict = get_degree_8_chord_dict()
+        # Scales used for justly tuning between two chords from different potential scales (shared, read only)
+        self.diminished_scales:           tuple[Scale, ...]           = self.tables.diminished_scales
+        self.major_scales:                tuple[Scale, ...]           = self.tables.major_scales
+        self.harmonic_minor_scales:       tuple[Scale, ...]           = self.tables.harmonic_minor_scales
+        self.harmonic_major_scales:       tuple[Scale, ...]           = self.tables.harmonic_major_scales
+        self.melodic_minor_scales:        tuple[Scale, ...]           = self.tables.melodic_minor_scales
+        self.diminished_blues_scales:     tuple[Scale, ...]           = self.tables.diminished_blues_scales
+        self.diminished_harmonic_scales:  tuple[Scale, ...]           = self.tables.diminished_harmonic_scales
+        self.whole_tone_scales:           tuple[Scale, ...]           = self.tables.whole_tone_scales
+        self.pentatonic_scales:           tuple[Scale, ...]           = self.tables.pentatonic_scales
+        self.scale_bitmasks:              Mapping[str, bytes]         = self.tables.scale_bitmasks
+        self.scale_ids:                   Mapping[str, int]           = self.tables.scale_ids
 
         # History of at most the last 5 lists of candidate keys used to determine the key uniquely at a given point in time
         # TODO: Determine the optimum lookback period (more than 5, less than 5?)
@@ -56,20 +281,70 @@ class MusicTheory:
         self.key = "C Ionian"
 
 
-    def determine_chord(self, message_heap: list[list[int]]):
+    def get_chord_lookup(self, degree: int) -> dict:
+        """Return the chord dictionary for a given degree, loading it on first access
+
+        Args:
+            degree (int): the number of unique pitch classes in the chord (2-8)
+
+        Returns:
+            dict: interval tuple -> chord name
+        """
+        return self.tables.get_chord_lookup(degree)
+
+    def wait_for_chord_lookups(self, timeout: float | None = None) -> bool:
+        """Block until the background chord loader (if any) has finished
+
+        Args:
+            timeout (float | None, optional): seconds to wait. Defaults to None (wait forever).
+
+        Returns:
+            bool: True if every chord dictionary is loaded
+        """
+        return self.tables.wait_for_chord_lookups(timeout)
+
+    @property
+    def degree_2_chord_lookup(self) -> dict:
+        return self.get_chord_lookup(2)
+
+    @property
+    def degree_3_chord_lookup(self) -> dict:
+        return self.get_chord_lookup(3)
+
+    @property
+    def degree_4_chord_lookup(self) -> dict:
+        return self.get_chord_lookup(4)
+
+    @property
+    def degree_5_chord_lookup(self) -> dict:
+        return self.get_chord_lookup(5)
+
+    @property
+    def degree_6_chord_lookup(self) -> dict:
+        return self.get_chord_lookup(6)
+
+    @property
+    def degree_7_chord_lookup(self) -> dict:
+        return self.get_chord_lookup(7)
+
+    @property
+    def degree_8_chord_lookup(self) -> dict:
+        return self.get_chord_lookup(8)
+
+    def determine_chord(self, message_heap: list[Voice]):
         """Based on the currently active notes in the message_heap, determine the chord
         This function can be used to display chord data to the terminal or to make tuning decisions based on intervalic relationships
 
         Args:
-            message_heap (list[list[int]]): A list of lists of the form [[note, instance_index, status, velocity], ...]
+            message_heap (list[Voice]): the currently sounding notes
 
         Returns:
             str: stringified description of the chord that was played
         """
-        sorted_message_heap: list[list[int]] = remove_harmonically_redundant_intervals(message_heap=message_heap)
+        sorted_message_heap: list[Voice] = remove_harmonically_redundant_intervals(message_heap=message_heap)
         
-        notes: list[int] = [note[0] for note in sorted_message_heap]
-        instance_indices: list[int] = [indices[1] for indices in sorted_message_heap]
+        notes: list[int] = [voice.note for voice in sorted_message_heap]
+        instance_indices: list[int] = [voice.instance_index for voice in sorted_message_heap]
 
         intervals: tuple[int] = self.get_intervals(notes)
 
@@ -102,67 +377,30 @@ class MusicTheory:
             return None
     
     
-    def get_candidate_scales(self, message_heap: list[list[int]], scale_includes: list[str]) -> list[str]:
+    def get_candidate_scales(self, message_heap: list[Voice], scale_includes: list[str]) -> list[str]:
         """Get a list of candidate scales which are compatible with the current suspended notes
 
         Args:
-            message_heap (list[list[int]]): A list of lists of the form [[note, instance_index, status, velocity], ...]
+            message_heap (list[Voice]): the currently sounding notes
             scale_includes (list[str]): A list of scales types to be included in the output
 
         Returns:
             list[str]: A list of candidiate scales which are compatible with the current suspended notes
         """
-        notes = [self.int_note[note[0]] for note in message_heap]
-        unique_notes = list(set(notes))
+        # 12-bit pitch class mask of the sounding notes; a scale is a candidate when it has no pitch class outside it
+        sounding = 0
+        for voice in message_heap:
+            sounding |= 1 << voice.note % 12
         avoid_notes = set({'A', 'A♭', 'B', 'B♭', 'C', 'D', 'D♭', 'E', 'E♭', 'F', 'G', 'G♭'})
         
         candidate_keys = []
         bitmasks = []
-        if "Diminished" in scale_includes:
-            for scale in self.diminished_scales:
-                if all(element in scale.notes for element in unique_notes):
-                    candidate_keys.append(scale)
-                    bitmasks.append(self.get_bitmask(scale=scale))
-        if "Ionian" in scale_includes:
-            for scale in self.major_scales:
-                if all(element in scale.notes for element in unique_notes):
-                    candidate_keys.append(scale)
-                    bitmasks.append(self.get_bitmask(scale=scale))
-        if "Harmonic Minor" in scale_includes:
-            for scale in self.harmonic_minor_scales:
-                if all(element in scale.notes for element in unique_notes):
-                    candidate_keys.append(scale)
-                    bitmasks.append(self.get_bitmask(scale=scale))
-        if "Harmonic Major" in scale_includes:
-            for scale in self.harmonic_major_scales:
-                if all(element in scale.notes for element in unique_notes):
-                    candidate_keys.append(scale)
-                    bitmasks.append(self.get_bitmask(scale=scale))
-        if "Melodic Minor" in scale_includes:
-            for scale in self.melodic_minor_scales:
-                if all(element in scale.notes for element in unique_notes):
-                    candidate_keys.append(scale)
-                    bitmasks.append(self.get_bitmask(scale=scale))
-        if "Diminished Blues" in scale_includes:
-            for scale in self.diminished_blues_scales:
-                if all(element in scale.notes for element in unique_notes):
-                    candidate_keys.append(scale)
-                    bitmasks.append(self.get_bitmask(scale=scale))
-        if "Diminished Harmonic" in scale_includes:
-            for scale in self.diminished_harmonic_scales:
-                if all(element in scale.notes for element in unique_notes):
-                    candidate_keys.append(scale)
-                    bitmasks.append(self.get_bitmask(scale=scale))
-        if "Whole Tone" in scale_includes:
-            for scale in self.whole_tone_scales:
-                if all(element in scale.notes for element in unique_notes):
-                    candidate_keys.append(scale)
-                    bitmasks.append(self.get_bitmask(scale=scale))
-        if "Pentatonic" in scale_includes:
-            for scale in self.pentatonic_scales:
-                if all(element in scale.notes for element in unique_notes):
-                    candidate_keys.append(scale)
-                    bitmasks.append(self.get_bitmask(scale=scale))
+        for family, scales in SCALE_FAMILIES.items():
+            if family in scale_includes:
+                for scale in scales:
+                    if not sounding & ~scale.pitch_classes:
+                        candidate_keys.append(scale)
+                        bitmasks.append(scale.key_mask_bytes)
         if "Avoid" in scale_includes:
             for candidate in candidate_keys:
                 for note in candidate.notes:
@@ -175,20 +413,11 @@ class MusicTheory:
         self.history.enqueue(candidate_key_names)
         return candidate_key_names, bitmasks
     
-    def get_bitmask(self, scale: Scale) -> list[int]:
-        """Returns a tightly packed list of uint8_t (0-255) representing the 88-key bitmask.
+    def get_bitmask(self, scale: Scale) -> bytes:
+        """Returns the 88-key bitmask of a scale as 11 packed bytes.
         Bit 0 of the first byte is MIDI note 21 (A0).
         """
-        bitmask_bytes = [0] * ((88 + 7) // 8)  # 88 bits → 11 bytes
-        
-        for i, midi in enumerate(range(21, 109)):
-            note = self.int_note[midi]
-            if note in scale.notes:
-                byte_index = i // 8
-                bit_index = i % 8
-                bitmask_bytes[byte_index] |= (1 << bit_index)
-        
-        return bitmask_bytes
+        return scale.key_mask_bytes
     
     def find_key(self):
         """First check to see if the original key still is compatible with the currently held down notes.  If so return this. 
@@ -237,7 +466,7 @@ class MusicTheory:
             return most_common_scale
             
         else:
-            logging.info(f"Queue is not yet populated with at least {self.QUEUE_SIZE} elements. Play at least 5 different chords to use this feature.")
+            self.logger.info("[MT] Queue is not yet populated with at least %d elements. Play at least 5 different chords to use this feature.", self.QUEUE_SIZE)
             return None
 
     def get_intervals(self, notes: list[int]) -> tuple[int, ...]:
@@ -334,196 +563,9 @@ class MusicTheory:
         root, branch, leaf = notes
         root, branch, leaf = self.int_note[root], self.int_note[branch], self.int_note[leaf]
         
-        if self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.major_triad):
-            return f"{root} Maj", "major_triad"                                                                       # Major (C, E, G) or (C, G, E)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.major_triad_1st_inv):
-            return f"{leaf}/{root}", "major_triad_1st_inv"                                                            # Major 1st Inversion (E, G, C)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.major_triad_1st_inv_var):
-            return f"{branch}/{root}", "major_triad_1st_inv_var"                                                      # Major 1st Inversion (E, C, G)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.major_triad_2nd_inv):
-            return f"{branch}/{root}", "major_triad_2nd_inv"                                                          # Major 2nd Inversion (G, C, E)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.major_triad_2nd_inv_var):
-            return f"{leaf}/{root}", "major_triad_2nd_inv_var"                                                        # Major 2nd Inversion (G, E, C)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.minor_triad):
-            return f"{root}m", "minor_triad"                                                                          # Minor (C, Eb, G)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.minor_triad_1st_inv):
-            return f"{leaf}m/{root}", "minor_triad_1st_inv"                                                           # Minor 1st Inversion (Eb, G, C)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.minor_triad_1st_inv_var):
-            return f"{branch}m/{root}", "minor_triad_1st_inv_var"                                                     # Minor 1st Inversion (Eb, C, G)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.minor_triad_2nd_inv):
-            return f"{branch}m/{root}", "minor_triad_2nd_inv"                                                         # Minor 2nd Inversion (G, C, Eb)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.minor_triad_2nd_inv_var):
-            return f"{leaf}m/{root}", "minor_triad_2nd_inv_var"                                                       # Minor 2nd Inversion (G, Eb, C)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.add2):
-            return f"{root}add(2)", "add2"                                                                            # Add 2 chord (C, D, E)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.add2_1st_inv):
-            return f"{leaf}add(2)/{root}", "add2_1st_inv"                                                             # Add 2 chord 1st inversion (D, E, C)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.add2_2nd_inv):
-            return f"{branch}add(2)/{root}", "add2_2nd_inv"                                                           # Add 2 chord 2nd inversion (E, C, D)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.diminished):
-            return f"{root}dim", "diminished"                                                                         # Diminished (C, Eb, Gb) or (C, Gb, Eb)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.augmented):
-            return f"{root}aug", "augmented"                                                                          # Augmented (C, E, Ab) or (C, Ab, E)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.eleven_sus4):
-            return f"{root}11sus4", "eleven_sus4"                                                                     # Quartal chord (C, F, Bb)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sus2):
-            return f"{root}sus2", "sus2"                                                                              # Suspended 2 (C, D, G)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.nine_chord):
-            return f"{root}9", "nine_chord"                                                                           # 9 chord with no third (C, G, D)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sus4):
-            return f"{root}sus4", "sus4"                                                                              # Suspended 4 (C, F, G)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.eleven_chord):
-            return f"{root}11", "eleven_chord"                                                                        # 11 chord with no third (C, G, F)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dominant_no_third):
-            return f"{root}7sus", "dominant_no_third"                                                                 # Dominant with no 3rd (C, G, Bb)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dominant_no_third_1st_inv):
-            return f"{leaf}7sus/{root}", "dominant_no_third_1st_inv"                                                  # Dominant with no 3rd 1st Inversion (G, Bb, C)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dominant_no_third_2nd_inv):
-            return f"{branch}7sus/{root}", "dominant_no_third_2nd_inv"                                                # Dominant with no 3rd 2nd Inversion (Bb, C, G)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dominant_no_fifth):
-            return f"{root}7", "dominant_no_fifth"                                                                    # Dominant with no 5th
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dominant_no_fifth_1st_inv):
-            return f"{leaf}7/{root}", "dominant_no_fifth_1st_inv"                                                     # Dominant with no 5th 1st Inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dominant_no_fifth_2nd_inv):
-            return f"{branch}7/{root}", "dominant_no_fifth_2nd_inv"                                                   # Dominant with no 5th 2nd Inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.min6):
-            return f"{root}min6", "min6"                                                                              # Minor 6 (Diminished 1st Inversion)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.min6_1st_inv):
-            return f"{leaf}min6/{root}", "min6_1st_inv"                                                               # Minor 6 1st inv (Diminished 2nd Inversion)
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_no_third):
-            return f"{root}maj7sus", "maj7_no_third"                                                                  # Major 7 no 3rd
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_no_third_1st_inv):
-            return f"{leaf}maj7sus/{root}", "maj7_no_third_1st_inv"                                                   # Major 7 no 3rd 1st Inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_no_third_2nd_inv):
-            return f"{branch}maj7sus/{root}", "maj7_no_third_2nd_inv"                                                 # Major 7 no 3rd 2nd Inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_no_fifth):
-            return f"{root}maj7", "maj7_no_fifth"                                                                     # Major 7 no 5th
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_no_fifth_1st_inv):
-            return f"{leaf}maj7/{root}", "maj7_no_fifth_1st_inv"                                                      # Major 7 no 5th 1st Inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_no_fifth_2nd_inv):
-            return f"{branch}maj7/{root}", "maj7_no_fifth_2nd_inv"                                                    # Major 7 no 5th 2nd Inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.mush):
-            return f"{root} mush", "mush"                                                                             # Mush
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_add2):
-            return f"{root} maj7/9", "maj7_add2"                                                                      # Major 7/9 no third no fifth
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_add2_1st_inv):
-            return f"{leaf} maj7/9/{root}", "maj7_add2_1st_inv"                                                       # Major 7/9 no third no fifth 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_add2_2nd_inv):
-            return f"{branch} maj7sus2(no5)/{root}", "maj7_add2_2nd_inv"                                              # Major 7/9 no third no fifth 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dim_maj7_no_fifth):
-            return f"{root} dim maj7", "dim_maj7_no_fifth"                                                            # Diminished major 7 with no fifth
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dim_maj7_no_fifth_1st_inv):
-            return f"{leaf} dim maj7/{root}", "dim_maj7_no_fifth_1st_inv"                                             # Diminished major 7 with no fifth 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dim_maj7_no_fifth_2nd_inv):
-            return f"{root} phryg", "dim_maj7_no_fifth_2nd_inv"                                                       # Diminished major 7 with no fifth 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sus_maj47):
-            return f"{root}maj7sus4 ", "sus_maj47"                                                                    # Suspended 4th with a major 7th 
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sus_maj47_1st_inv):
-            return f"{leaf}maj7sus4/{root}", "sus_maj47_1st_inv"                                                      # Suspended 4th with a major 7th 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sus_maj47_2nd_inv):
-            return f"{branch}maj7sus4/{root}", "sus_maj47_2nd_inv"                                                    # Suspended 4th with a major 7th 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_flat5):
-            return f"{root}maj7\u266d5", "maj7_flat5"                                                                 # Major 7 flat 5
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_flat5_1st_inv):
-            return f"{leaf}maj7\u266d5/{root}", "maj7_flat5_1st_inv"                                                  # Major 7 flat 5 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_flat5_2nd_inv):
-            return f"{branch}maj7\u266d5/{root}", "maj7_flat5_2nd_inv"                                                # Major 7 flat 5 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.majmin):
-            return f"{root}maj min", "majmin"                                                                         # Major Minor
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.aug_maj7_3rd_inv_no_third):
-            return f"{branch}aug/{root}", "aug_maj7_3rd_inv_no_third"                                                 # Major Minor 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.aug_maj7_no_third):
-            return f"{root}aug maj7", "aug_maj7_no_third"                                                             # Augmented maj7
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sus67):
-            return f"{root}maj7sus(add6)", "sus67"                                                                    # Suspened maj7 add 6
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.min_add2_no_fifth):
-            return f"{root}min(add2)", "min_add2_no_fifth"                                                            # Minor add 2
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.min_add2_no_fifth_1st_inv):
-            return f"{leaf}min(add2)/{root}", "min_add2_no_fifth_1st_inv"                                             # Min add2 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.min7_no5):
-            return f"{root}min7(no5)", "min7_no5"                                                                     # Min7 no 5th
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sus56):
-            return f"{root}sus6", "sus56"                                                                             # Sus chord add 6
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.min7_no5_2nd_inv):
-            return f"{branch}min7(no5)/{root}", "min7_no5_2nd_inv"                                                    # Min7 no 5th 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.major_flat5):
-            return f"{root}maj \u266d5", "major_flat5"                                                                # Major flat 5
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.major_flat5_1st_inv):
-            return f"{leaf}maj \u266d5/{root}", "major_flat5_1st_inv"                                                 # Major flat 5 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.major_flat5_2nd_inv):
-            return f"{root}7 \u266d5", "major_flat5_2nd_inv"                                                          # Major flat 5 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj79):
-            return f"{root}maj7/9", "maj79"                                                                           # Major 7 add 9
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj79_1st_inv):
-            return f"{leaf}maj7/9/{root}", "maj79_1st_inv"                                                            # Major 7 add 9 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj79_2nd_inv):
-            return f"{branch}maj7/9/{root}", "maj79_2nd_inv"                                                          # Major 7 add 9 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj_flat9):
-            return f"{root}maj \u266d9", "maj_flat9"                                                                  # Major flat 9
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj_flat9_1st_inv):
-            return f"{leaf}maj \u266d9/{root}", "maj_flat9_1st_inv"                                                   # Major flat 9 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj_flat9_2nd_inv):
-            return f"{branch}maj \u266d9/{root}", "maj_flat9_2nd_inv"                                                 # Major flat 9 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj_add9):
-            return f"{root}maj(add9no5)", "maj_add9"                                                                  # Major add 9 no fifth
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj_add9_1st_inv):
-            return f"{leaf}maj(add9no5)/{root}", "maj_add9_1st_inv"                                                   # Major add 9 no fifth 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj_add9_2nd_inv):
-            return f"{branch}maj(add9no5)/{root}", "maj_add9_2nd_inv"                                                 # Major add 9 no fifth 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_flat13):
-            return f"{root}maj7/\u266d13(no3no5)", "maj7_flat13"                                                      # Major 7 flat 13 no third no fifth
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sus4_flat9):
-            return f"{root}sus4/\u266d9(no3no5)", "sus4_flat9"                                                        # Sus 4 flat 9 no third no fifth
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sus49):
-            return f"{root}sus4(add9no5)", "sus49"                                                                    # Sus 4 add 9 no fifth
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sus49_1st_inv):
-            return f"{leaf}sus4(add9no5)/{root}", "sus49_1st_inv"                                                     # Sus 4 flat 9 no third no fifth 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.min_sus4):
-            return f"{root}min sus4(no5)", "min_sus4"                                                                 # Sus 4 flat 9 no third no fifth 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dominant_no_third_var):
-            return f"{root}7(no3)", "dominant_no_third_var"                                                           # Dominant no third 
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.six_nine):
-            return f"{root} 6/9", "six_nine"                                                                          # Six nine chord
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_no_third_var):
-            return f"{root}maj7(no3)", "maj7_no_third_var"                                                            # Major7 no third high fifth
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_no_third_var_1st_inv):
-            return f"{leaf}maj7(no3)/{root}", "maj7_no_third_var_1st_inv"                                             # Major7 no third high fifth 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_no_third_var_2nd_inv):
-            return f"{branch}maj7(no3)/{root}", "maj7_no_third_var_2nd_inv"                                           # Major7 no third high fifth 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sharp11_no_third):
-            return f"{root}\u266f11(no3)", "sharp11_no_third"                                                         # Sharp 11 no third
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sharp11_no_third_1st_inv):
-            return f"{leaf}\u266f11(no3)/{root}", "sharp11_no_third_1st_inv"                                          # Sharp 11 no third 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.sharp11_no_third_2nd_inv):
-            return f"{branch}\u266f11(no3)/{root}", "sharp11_no_third_2nd_inv"                                        # Sharp 11 no third 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dominant_no_fifth_var):
-            return f"{root}7(no5)", "dominant_no_fifth_var"                                                           # Dominant no fifth
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dominant_no_fifth_var_1st_inv):
-            return f"{leaf}7(no5)/{root}", "dominant_no_fifth_var_1st_inv"                                            # Dominant no fifth 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.dominant_no_fifth_var_2nd_inv):
-            return f"{branch}7(no5)/{root}", "dominant_no_fifth_var_2nd_inv"                                          # Dominant no fifth 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj_flat5_var):
-            return f"{root}maj\u266d5", "maj_flat5_var"                                                               # Major flat 5 
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj_flat5_var_1st_inv):
-            return f"{leaf}maj\u266d5/{root}", "maj_flat5_var_1st_inv"                                                # Major flat 5 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj_flat5_var_2nd_inv):
-            return f"{branch}maj\u266d5/{root}", "maj_flat5_var_2nd_inv"                                              # Major flat 5 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_flat5_var):
-            return f"{root}maj7\u266d5", "maj7_flat5_var"                                                             # Major 7 flat 5 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_flat5_var_1st_inv):
-            return f"{leaf}maj7\u266d5/{root}", "maj7_flat5_var_1st_inv"                                              # Major 7 flat 5 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.maj7_flat5_var_2nd_inv):
-            return f"{branch}maj7\u266d5/{root}", "maj7_flat5_var_2nd_inv"                                            # Major 7 flat 5 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.min6_var):
-            return f"{root}min6(no5)", "min6_var"                                                                     # Minor 6
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.min6_var_2nd_inv):
-            return f"{branch}min6(no5)/{root}", "min6_var_2nd_inv"                                                    # Minor 6 2nd inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.min9_no5):
-            return f"{root}min9(no5)", "min9_no5"                                                                     # Minor 9 no fifth
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.min9_no5_1st_inv):
-            return f"{leaf}min9(no5)/{root}", "min9_no5_1st_inv"                                                      # Minor 9 no fifth 1st inversion
-        elif self.triad_definitions.query(interval_set=intervals, valid_interval_set=self.triad_definitions.min9_no5_2nd_inv):
-            return f"{branch}min9(no5)/{root}", "min9_no5_2nd_inv"                                                    # Minor 9 no fifth 2nd inversion
+        name = self.triad_definitions.classify(intervals)
+        if name is not None:
+            return TRIAD_NAME_FORMATS[name].format(root=root, branch=branch, leaf=leaf), name
     
         return None
     
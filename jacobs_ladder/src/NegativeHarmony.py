@@ -267,10 +267,18 @@ class NoteMap:
         return True
     
 class NegativeHarmony:
+    """Applies the active NoteMaps to live notes.
+
+    The active maps are compiled into a dense transform table with one row per Midi note (0-127) and one column per
+    active map, so that processing a note is a single table read. Rows for notes outside the piano range [21-108] are
+    empty. The table is rebuilt only when a map is added, removed, edited or toggled, or the play mode changes, so
+    maps should be modified through this class rather than on the NoteMap directly (call compile() if they are).
+    """
 
     def __init__(self, playMode: PlayMode = PlayMode.SUBSTITUTE):
         self.play_mode = playMode
         self.maps = []
+        self.compile()
 
     def addNoteMapping(self, noteMap: NoteMap) -> None:
         """Add a new NoteMap to the NagativeHarmony class
@@ -280,11 +288,35 @@ class NegativeHarmony:
         """
         if noteMap.getName() not in [name.getName() for name in self.maps]:
             self.maps.append(noteMap)
+            self.compile()
+
+    def compile(self) -> None:
+        """Rebuild the transform table and the column names from the active maps and the play mode"""
+        columns = [] if self.play_mode == PlayMode.ORIGINAL_ONLY else [noteMap for noteMap in self.maps if noteMap.isActive()]
+        table = [()] * 128
+        for note in range(21, 109):
+            table[note] = tuple(noteMap.getNegativeHarmonyNote(note) for noteMap in columns)
+        self.table = tuple(table)
+        self.column_names = tuple(noteMap.getName() for noteMap in columns)
+        self.play_original = self.play_mode != PlayMode.SUBSTITUTE or not columns
 
     def editMapNote(self, name: str, key: int, value: int):
         for map in self.maps:
             if map.getName() == name:
-                return map.editOctaveNoteMap(key, value)
+                edited = map.editOctaveNoteMap(key, value)
+                self.compile()
+                return edited
+
+    def getMappedNotes(self, note: int) -> tuple:
+        """Get the notes the active maps transform a note into, one per active map
+
+        Args:
+            note (int): a Midi note represented as an int [0-127]
+
+        Returns:
+            tuple: the mapped notes in map order, empty if no map is active or the note is outside the piano range
+        """
+        return self.table[note]
 
     def getMaps(self) -> list[NoteMap]:
         return self.maps
@@ -292,39 +324,30 @@ class NegativeHarmony:
     def getPlayMode(self) -> PlayMode:
         return self.play_mode
 
-    def processNoteOn(self, note: int) -> NoteProcessResult:
-
-        if self.playMode == PlayMode.ORIGINAL_ONLY:
-            return NoteProcessResult(
-                display=[DisplayNote("Original", note)],
-                play=[note]
-            )
-
-        display_notes = []
-        mapped_notes = []
+    def playsOriginal(self) -> bool:
+        """Check if the original note should still be played alongside (or instead of) the mapped notes
 
-        for note_map in self.maps:
-
-            if not note_map.isActive():
-                continue
-
-            mapped_note = note_map.getNegativeHarmonyNote(note)
+        Returns:
+            bool: False only in SUBSTITUTE mode with at least one active map
+        """
+        return self.play_original
 
-            if mapped_note is None:
-                continue
+    def processNoteOn(self, note: int) -> NoteProcessResult:
+        """Get the notes to display and play for a NOTE_ON message
 
-            display_notes.append(DisplayNote(note_map.getName(), mapped_note))
-            mapped_notes.append(mapped_note)
+        Args:
+            note (int): a Midi note represented as an int [0-127]
 
-        if self.playMode == PlayMode.SUBSTITUTE:
-            play_notes = mapped_notes
+        Returns:
+            NoteProcessResult: the notes labelled by map name and the notes to play
+        """
+        mapped_notes = self.table[note]
+        display_notes = [DisplayNote(name, mapped_note) for name, mapped_note in zip(self.column_names, mapped_notes)]
+        play_notes = list(mapped_notes)
 
-        elif self.playMode == PlayMode.LAYERED:
+        if self.play_original:
             display_notes.insert(0, DisplayNote("Original", note))
-            play_notes = [note] + mapped_notes
-
-        else:
-            play_notes = [note]
+            play_notes.insert(0, note)
 
         return NoteProcessResult(
             display=display_notes,
@@ -332,25 +355,17 @@ class NegativeHarmony:
         )
     
     def processNoteOff(self, note: int) -> list:
-        
-        if self.playMode == PlayMode.ORIGINAL_ONLY:
-            return [note]
+        """Get the notes to release for a NOTE_OFF message
 
-        mapped_notes = []
-
-        for note_map in self.maps:
-            if note_map.isActive():
-                mapped = note_map.getNegativeHarmonyNote(note)
-                if mapped is not None:
-                    mapped_notes.append(mapped)
-
-        if self.playMode == PlayMode.SUBSTITUTE:
-            return mapped_notes
-
-        elif self.playMode == PlayMode.LAYERED:
-            return [note] + mapped_notes
+        Args:
+            note (int): a Midi note represented as an int [0-127]
 
-        return [note]
+        Returns:
+            list: the notes to release
+        """
+        if self.play_original:
+            return [note, *self.table[note]]
+        return list(self.table[note])
 
     def removeNoteMapping(self, name: str) -> None:
         """Remove a map from the Negative Harmony class
@@ -361,28 +376,33 @@ class NegativeHarmony:
         for map in self.maps:
             if map.getName() == name:
                 self.maps.remove(map)
+                self.compile()
                 break
 
     def setMapActive(self, name: str, active: bool) -> None:
         for map in self.maps:
             if map.getName() == name:
                 map.setActive(active)
+                self.compile()
                 return
     
     def setMapAlgorithm(self, name: str, algorithm: Algorithm) -> None:
         for map in self.maps:
             if map.getName() == name:
                 map.setAlgorithm(algorithm)
+                self.compile()
                 return
 
     def setMapKeyCenter(self, name: str, keyCenter: int) -> None:
         for map in self.maps:
             if map.getName() == name:
                 map.setKeyCenter(keyCenter)
+                self.compile()
                 return
             
     def setPlayMode(self, playMode: PlayMode) -> None:
         self.play_mode = playMode
+        self.compile()
         return
         
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
 import struct
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(frozen=True)
 class PitchInfo:
+    """Immutable pitch metadata for a sounding note. Instances are shared (interned) between notes, see `pitches`."""
     analog_value_abs: int = 8192
     analog_value_rel: int = 0
     ratio: str = "1/1"
@@ -21,7 +22,12 @@ class PitchInfo:
         - ratio: 10 bytes ASCII, padded with spaces
         - direction: 1 byte ('u', 'd', or 'n')
         Total: 21 bytes
+
+        The encoding is cached on the instance since PitchInfo is immutable.
         """
+        cached = self.__dict__.get("_serialized")
+        if cached is not None:
+            return cached
 
         if self.direction == "up":
             dir_byte = b"u"
@@ -41,7 +47,12 @@ class PitchInfo:
             ratio_bytes,
         )
 
-        return core + dir_byte
+        serialized = core + dir_byte
+        object.__setattr__(self, "_serialized", serialized)
+        return serialized
+
+# Pitch of an untuned note (pitch wheel centered). Shared by every note which has not been tuned.
+CENTER_PITCH = PitchInfo()
 
 
 pitches = {
@@ -1,17 +1,293 @@
+import os
+import threading
 import time
-import mido
-import rtmidi
-import tkinter as tk
-from tkinter import filedialog
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
 
-def play_midi_file(filename: str, port_name: str = "jacob"):
+from .Clock import Clock, MonotonicClock
+
+# Parsed files by absolute path, invalidated when the file's mtime changes
+_parsed_cache: dict[str, tuple[int, "ParsedMidi"]] = {}
+_parsed_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ParsedMidi:
+    """A MIDI file flattened into parallel arrays of absolute event times (seconds, at the file's own tempo)
+    and raw channel messages, ordered by time. Meta messages are dropped; tempo changes are already applied.
+    """
+    path: str
+    times: array
+    messages: tuple[tuple[int, ...], ...]
+
+    @property
+    def duration(self) -> float:
+        return self.times[-1] if self.times else 0.0
+
+
+def parse_midi_file(filename: str) -> ParsedMidi:
+    """Parse a MIDI file into a flat absolute-time event array, reusing the cached parse while the file is unchanged
+
+    Args:
+        filename (str): path to the .mid file
+
+    Returns:
+        ParsedMidi: the parsed events
+    """
+    path = os.path.abspath(filename)
+    mtime = os.stat(path).st_mtime_ns
+    with _parsed_cache_lock:
+        cached = _parsed_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    import mido
+
+    times = array("d")
+    messages = []
+    now = 0.0
+    for msg in mido.MidiFile(path):
+        now += msg.time
+        if not msg.is_meta:
+            times.append(now)
+            messages.append(tuple(msg.bytes()))
+    parsed = ParsedMidi(path=path, times=times, messages=tuple(messages))
+
+    with _parsed_cache_lock:
+        _parsed_cache[path] = (mtime, parsed)
+    return parsed
+
+
+class MidiPlayer:
+    """Plays a ParsedMidi through a MIDI output on a single scheduler thread.
+
+    Every event is scheduled against an absolute anchor (wall clock at a song position) instead of sleeping for each
+    delta, so sleep overshoot and GC pauses do not accumulate into drift. Seeking, loop regions and tempo scaling only
+    move the anchor; the file is never re-parsed.
+    """
+
+    def __init__(self, midi_out, parsed: ParsedMidi, tempo_scale: float = 1.0, clock: Clock = None):
+        """Create a player
+
+        Args:
+            midi_out (rtmidi.MidiOut): an opened output (anything with send_message)
+            parsed (ParsedMidi): the events to play
+            tempo_scale (float, optional): playback speed, 2.0 plays twice as fast. Defaults to 1.0.
+            clock (Clock, optional): time source. Defaults to a MonotonicClock.
+        """
+        if tempo_scale <= 0:
+            raise ValueError("tempo_scale must be positive")
+        self.midi_out = midi_out
+        self.parsed = parsed
+        self.clock = clock or MonotonicClock()
+        self.tempo_scale = tempo_scale
+        self.loop_region: tuple[float, float] | None = None
+
+        self.position = 0.0
+        self.index = 0
+        self.playing = False
+        self.finished = threading.Event()
+
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._anchor_clock = 0.0
+        self._anchor_position = 0.0
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def _reanchor(self, position: float, index: int = None) -> None:
+        """Schedule subsequent events relative to `position` starting now. Called with the condition held.
+
+        Args:
+            position (float): song position at this instant
+            index (int, optional): next event to send. Defaults to the first event at or after position.
+        """
+        self.position = position
+        self.index = bisect_left(self.parsed.times, position) if index is None else index
+        self._anchor_clock = self.clock.now()
+        self._anchor_position = position
+        self._generation += 1
+        self.clock.notify(self._condition)
+
+    def current_position(self) -> float:
+        """Song position in seconds (at the file's tempo)"""
+        with self._condition:
+            if not self.playing:
+                return self.position
+            return self._anchor_position + (self.clock.now() - self._anchor_clock) * self.tempo_scale
+
+    def play(self) -> None:
+        """Start or resume playback from the current position"""
+        with self._condition:
+            if self.playing:
+                return
+            self.playing = True
+            self.finished.clear()
+            self._reanchor(self.position, self.index)
+            if self._thread is None:
+                self._thread = self.clock.start_thread(self._run, name="MidiPlayer")
+
+    def pause(self) -> None:
+        """Pause playback, silencing any sounding notes"""
+        with self._condition:
+            if not self.playing:
+                return
+            self.position = self._anchor_position + (self.clock.now() - self._anchor_clock) * self.tempo_scale
+            self.playing = False
+            self._generation += 1
+            self.clock.notify(self._condition)
+        self.all_notes_off()
+
+    def seek(self, position: float) -> None:
+        """Jump to a song position in seconds
+
+        Args:
+            position (float): position at the file's tempo, clamped to the file
+        """
+        position = min(max(position, 0.0), self.parsed.duration)
+        with self._condition:
+            if self.playing:
+                self._reanchor(position)
+            else:
+                self.position = position
+                self.index = bisect_left(self.parsed.times, position)
+        self.all_notes_off()
+
+    def set_tempo_scale(self, tempo_scale: float) -> None:
+        """Change the playback speed without interrupting playback
+
+        Args:
+            tempo_scale (float): playback speed, 2.0 plays twice as fast
+        """
+        if tempo_scale <= 0:
+            raise ValueError("tempo_scale must be positive")
+        with self._condition:
+            if self.playing:
+                position = self._anchor_position + (self.clock.now() - self._anchor_clock) * self.tempo_scale
+                self.tempo_scale = tempo_scale
+                self._reanchor(position, self.index)
+            else:
+                self.tempo_scale = tempo_scale
+
+    def set_loop(self, start: float | None, end: float | None = None) -> None:
+        """Loop the region [start, end) until cleared with set_loop(None)
+
+        Args:
+            start (float | None): loop start in seconds, None to stop looping
+            end (float | None, optional): loop end in seconds. Defaults to the end of the file.
+        """
+        with self._condition:
+            if start is None:
+                self.loop_region = None
+            else:
+                end = self.parsed.duration if end is None else end
+                if not 0.0 <= start < end:
+                    raise ValueError(f"Invalid loop region [{start}, {end})")
+                self.loop_region = (start, end)
+            self.clock.notify(self._condition)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until playback reaches the end of the file
+
+        Args:
+            timeout (float | None, optional): seconds to wait. Defaults to None (wait forever).
+
+        Returns:
+            bool: True if playback finished
+        """
+        return self.finished.wait(timeout)
+
+    def stop(self) -> None:
+        """Stop playback, rewind and shut the scheduler thread down"""
+        with self._condition:
+            self._closed = True
+            self.playing = False
+            self._generation += 1
+            self.clock.notify(self._condition)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self._closed = False
+        self.position = 0.0
+        self.index = 0
+        self.all_notes_off()
+
+    def all_notes_off(self) -> None:
+        for channel in range(16):
+            self.midi_out.send_message([0xB0 | channel, 123, 0])
+
+    def _run(self) -> None:
+        times = self.parsed.times
+        messages = self.parsed.messages
+        send_message = self.midi_out.send_message
+        condition = self._condition
+        clock = self.clock
+
+        while True:
+            with condition:
+                while not self.playing and not self._closed:
+                    clock.wait_until(condition, None)
+                if self._closed:
+                    return
+
+                generation = self._generation
+                index = self.index
+                loop_region = self.loop_region
+                wrap = loop_region is not None and (index >= len(times) or times[index] >= loop_region[1])
+                if not wrap and index >= len(times):
+                    self.playing = False
+                    self.position = self.parsed.duration
+                    self.finished.set()
+                    continue
+
+                # Absolute target of the next event (or of the loop end) on the clock
+                event_position = loop_region[1] if wrap else times[index]
+                target = self._anchor_clock + (event_position - self._anchor_position) / self.tempo_scale
+
+                # Coarse wait on the condition so control calls interrupt it immediately
+                if target - clock.now() > clock.spin_threshold:
+                    clock.wait_until(condition, target)
+                    continue
+
+            # Spin for the last stretch outside the lock
+            clock.spin_until(target)
+
+            with condition:
+                if self._generation != generation or not self.playing:
+                    continue
+                if wrap:
+                    # Restart the loop anchored at the wall time the loop end falls on, so looping does not drift
+                    self.position = loop_region[0]
+                    self.index = bisect_left(times, loop_region[0])
+                    self._anchor_clock = target
+                    self._anchor_position = loop_region[0]
+                    self._generation += 1
+                else:
+                    # Send every event that is due (chords share a timestamp)
+                    now = max(target, clock.now())
+                    end = len(times) if loop_region is None else bisect_left(times, loop_region[1])
+                    while index < end and self._anchor_clock + (times[index] - self._anchor_position) / self.tempo_scale <= now:
+                        send_message(messages[index])
+                        index += 1
+                    self.index = index
+                    self.position = times[index - 1]
+
+            if wrap:
+                self.all_notes_off()
+
+
+def play_midi_file(filename: str, port_name: str = "jacob", tempo_scale: float = 1.0):
     """
     Play a MIDI file through a virtual or hardware MIDI port using rtmidi.
 
     Args:
         filename (str): Path to the .mid file
         port_name (str): Name of the MIDI output port (default: 'jacob')
+        tempo_scale (float): playback speed, 2.0 plays twice as fast (default: 1.0)
     """
+    import rtmidi
+
     midiout = rtmidi.MidiOut()
 
     # Try to open an existing port called "jacob"
@@ -28,13 +304,16 @@ def play_midi_file(filename: str, port_name: str = "jacob"):
     else:
         print(f"No existing port: ")
 
-    mid = mido.MidiFile(filename)
+    parsed = parse_midi_file(filename)
     print(f"Playing MIDI file: {filename}")
 
+    player = MidiPlayer(midiout, parsed, tempo_scale=tempo_scale)
     start_time = time.time()
-    for msg in mid.play():
-        if not msg.is_meta:
-            midiout.send_message(msg.bytes())
+    player.play()
+    try:
+        player.wait()
+    finally:
+        player.stop()
 
     elapsed = time.time() - start_time
     print(f"Playback finished in {elapsed:.2f} seconds")
@@ -43,6 +322,9 @@ def play_midi_file(filename: str, port_name: str = "jacob"):
 
 
 if __name__ == "__main__":
+    import tkinter as tk
+    from tkinter import filedialog
+
     # Create a hidden root window
     root = tk.Tk()
     root.withdraw()  # Hide the main tkinter window
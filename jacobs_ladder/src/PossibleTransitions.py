@@ -1,36 +1,204 @@
-from .MusicTheory import MusicTheory
+import argparse
+import os
+import time
 
+from multiprocessing import Pool
 
-mt = MusicTheory(print_msgs=False)
-cDb = mt.determine_key([[60, 0, 144, 100], [61, 0, 144, 100]], True)
-print(f"{cDb=}\n")
+import numpy as np
 
-cD = mt.determine_key([[60, 0, 144, 100], [62, 0, 144, 100]], True)
-print(f"{cD=}\n")
+from .ChordClassifier import NOTE_NAMES, TEMPLATES_BY_DEGREE
+from .Scales import get_all_scales
+from .VoicingIndex import chord_pitch_classes
 
-cEb = mt.determine_key([[60, 0, 144, 100], [63, 0, 144, 100]], True)
-print(f"{cEb=}\n")
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
 
-cE = mt.determine_key([[60, 0, 144, 100], [64, 0, 144, 100]], True)
-print(f"{cE=}\n")
+# Circular semitone distance between pitch classes, indexed [from][to]
+PITCH_CLASS_DISTANCE = np.array([[min((first - second) % 12, (second - first) % 12) for second in range(12)]
+                                 for first in range(12)], dtype=np.int16)
 
-cF = mt.determine_key([[60, 0, 144, 100], [65, 0, 144, 100]], True)
-print(f"{cF=}\n")
+# Arrays of the pool workers, set once by init_worker
+_worker_arrays: dict[str, np.ndarray] = {}
 
-cGb = mt.determine_key([[60, 0, 144, 100], [66, 0, 144, 100]], True)
-print(f"{cGb=}\n")
 
-cG = mt.determine_key([[60, 0, 144, 100], [67, 0, 144, 100]], True)
-print(f"{cG=}\n")
+def chord_vectors(degrees: tuple[int, ...] = None) -> tuple[list[str], list[tuple[int, str, int]], np.ndarray]:
+    """Pitch class vectors of every chord template in ChordClassifier in all 12 transpositions
 
-cAb = mt.determine_key([[60, 0, 144, 100], [68, 0, 144, 100]], True)
-print(f"{cAb=}\n")
+    Args:
+        degrees (tuple[int, ...], optional): template degrees to include. Defaults to None (all).
 
-cA = mt.determine_key([[60, 0, 144, 100], [69, 0, 144, 100]], True)
-print(f"{cA=}\n")
+    Returns:
+        tuple[list[str], list[tuple[int, str, int]], np.ndarray]: chord names (e.g. "D♭ Major7"), their (degree,
+            template, root) and a bool array of shape (chords, 12)
+    """
+    degrees = tuple(sorted(TEMPLATES_BY_DEGREE)) if degrees is None else tuple(sorted(degrees))
+    templates = [(degree, name) for degree in degrees for name in TEMPLATES_BY_DEGREE[degree]]
+    base = np.zeros((len(templates), 12), dtype=bool)
+    for row, (degree, name) in enumerate(templates):
+        base[row, chord_pitch_classes(TEMPLATES_BY_DEGREE[degree][name])] = True
 
-cBb = mt.determine_key([[60, 0, 144, 100], [70, 0, 144, 100]], True)
-print(f"{cBb=}\n")
+    # Transposition by a root is a roll of the vector; rows are ordered template by template, then root
+    vectors = np.stack([np.roll(base, root, axis=1) for root in range(12)], axis=1).reshape(-1, 12)
+    keys = [(degree, name, root) for degree, name in templates for root in range(12)]
+    names = [f"{NOTE_NAMES[root]} {name}" for _, name, root in keys]
+    return names, keys, vectors
 
-cB = mt.determine_key([[60, 0, 144, 100], [71, 0, 144, 100]], True)
-print(f"{cB=}\n")
+
+def scale_vectors() -> tuple[list[str], np.ndarray]:
+    """Pitch class vectors of every scale in Scales.get_all_scales
+
+    Returns:
+        tuple[list[str], np.ndarray]: scale names and a bool array of shape (scales, 12)
+    """
+    scales = get_all_scales()
+    masks = np.array([scale.pitch_classes for scale in scales], dtype=np.int64)
+    return [scale.name for scale in scales], (masks[:, None] >> np.arange(12) & 1).astype(bool)
+
+
+def nearest_distances(vectors: np.ndarray) -> np.ndarray:
+    """Distance from every pitch class to the nearest tone of each chord
+
+    Args:
+        vectors (np.ndarray): bool array of shape (chords, 12)
+
+    Returns:
+        np.ndarray: int16 array of shape (chords, 12)
+    """
+    # (chords, from pitch class, to pitch class) masked to the chord's tones, then the nearest
+    distances = np.where(vectors[:, None, :], PITCH_CLASS_DISTANCE[None, :, :], 12)
+    return distances.min(axis=2).astype(np.int16)
+
+
+def transition_block(vectors: np.ndarray, nearest: np.ndarray, fits: np.ndarray, start: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+    """Costs and shared scale counts of the transitions from chords start..end to every chord
+
+    The voice leading cost is the one ChordSeqTree.voice_leading_distance uses: every tone of either chord moves to
+    the nearest tone of the other, summed, so common tones cost nothing and the cost is symmetric.
+
+    Args:
+        vectors (np.ndarray): bool chord vectors of shape (chords, 12)
+        nearest (np.ndarray): nearest_distances(vectors)
+        fits (np.ndarray): bool array of shape (chords, scales), True where the scale contains the chord
+        start (int): first row
+        end (int): row after the last
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: uint8 costs and uint8 shared scale counts of shape (end - start, chords)
+    """
+    block = vectors[start:end].astype(np.int16)
+    outgoing = block @ nearest.T
+    incoming = nearest[start:end] @ vectors.T.astype(np.int16)
+    shared = fits[start:end].astype(np.int16) @ fits.T.astype(np.int16)
+    return (outgoing + incoming).astype(np.uint8), shared.astype(np.uint8)
+
+
+def init_worker(arrays: dict[str, np.ndarray]) -> None:
+    """Pool initializer: keep the chord and scale arrays for every block the worker computes"""
+    global _worker_arrays
+    _worker_arrays = arrays
+
+
+def transition_block_job(rows: tuple[int, int]) -> tuple[int, np.ndarray, np.ndarray]:
+    """Compute one block of rows in a worker process"""
+    start, end = rows
+    cost, shared = transition_block(_worker_arrays["vectors"], _worker_arrays["nearest"], _worker_arrays["fits"], start, end)
+    return start, cost, shared
+
+
+class TransitionMatrix:
+    """Chord to chord transition analysis over every chord template in ChordClassifier in all 12 transpositions.
+
+    cost[a, b] is the voice leading cost of moving from chord a to chord b and shared[a, b] the number of scales
+    (from Scales.get_all_scales) that contain both, both stored as dense matrices so the suggestions for a chord are
+    a row lookup.
+    """
+
+    def __init__(self, degrees: tuple[int, ...] = None, workers: int = 1, block_rows: int = 256):
+        """Build the matrices
+
+        Args:
+            degrees (tuple[int, ...], optional): template degrees to include. Defaults to None (all).
+            workers (int, optional): processes computing blocks of rows, 1 to build in this process. Defaults to 1.
+            block_rows (int, optional): rows per block. Defaults to 256.
+        """
+        self.names, self.keys, self.vectors = chord_vectors(degrees)
+        self.scale_names, scale_pitch_classes = scale_vectors()
+        self.indices: dict[str, int] = {}
+        for index, name in enumerate(self.names):
+            self.indices.setdefault(name, index)
+
+        # A scale contains a chord when the chord has no tone outside it
+        self.fits = ~((self.vectors[:, None, :] & ~scale_pitch_classes[None, :, :]).any(axis=2))
+        self.nearest = nearest_distances(self.vectors)
+        # 12-bit pitch class masks (bit 0 = C), to tell chords with the same pitch classes apart in one comparison
+        self.masks = self.vectors.astype(np.int32) @ (1 << np.arange(12, dtype=np.int32))
+
+        size = len(self.names)
+        self.cost = np.empty((size, size), dtype=np.uint8)
+        self.shared = np.empty((size, size), dtype=np.uint8)
+        blocks = [(start, min(start + block_rows, size)) for start in range(0, size, block_rows)]
+        if workers <= 1:
+            for start, end in blocks:
+                self.cost[start:end], self.shared[start:end] = transition_block(self.vectors, self.nearest, self.fits, start, end)
+        else:
+            arrays = {"vectors": self.vectors, "nearest": self.nearest, "fits": self.fits}
+            with Pool(processes=workers, initializer=init_worker, initargs=(arrays,)) as pool:
+                for start, cost, shared in pool.imap_unordered(transition_block_job, blocks):
+                    self.cost[start:start + len(cost)] = cost
+                    self.shared[start:start + len(shared)] = shared
+
+    def index(self, name: str) -> int:
+        """Row of a chord by name, e.g. "D♭ Major7" (the lowest degree template when names repeat across degrees)"""
+        return self.indices[name]
+
+    def shared_scales(self, first: int, second: int) -> list[str]:
+        """Names of the scales containing both chords"""
+        return [self.scale_names[scale] for scale in np.flatnonzero(self.fits[first] & self.fits[second])]
+
+    def suggest_next(self, chord: int, k: int = 10, min_shared_scales: int = 1, max_cost: int = None,
+                     include_self: bool = False) -> list[tuple[str, int, int]]:
+        """Suggest the smoothest chords to move to next
+
+        Args:
+            chord (int): row of the current chord (see index)
+            k (int, optional): number of suggestions. Defaults to 10.
+            min_shared_scales (int, optional): only suggest chords sharing at least this many scales. Defaults to 1.
+            max_cost (int, optional): only suggest chords at most this voice leading cost away. Defaults to None.
+            include_self (bool, optional): allow suggesting the same pitch class set. Defaults to False.
+
+        Returns:
+            list[tuple[str, int, int]]: (name, cost, shared scale count), cheapest first then most shared scales
+        """
+        cost = self.cost[chord]
+        shared = self.shared[chord]
+        allowed = shared >= min_shared_scales
+        if max_cost is not None:
+            allowed &= cost <= max_cost
+        if not include_self:
+            allowed &= self.masks != self.masks[chord]
+
+        candidates = np.flatnonzero(allowed)
+        # Cheapest first, then most shared scales, then row order. The row is part of the key, so every key is unique
+        # and the partition keeps exactly the first k rows of that order, ties included
+        ranking = (cost[candidates].astype(np.int64) * 256 + (255 - shared[candidates])) * len(self.names) + candidates
+        if len(candidates) > k:
+            kept = np.argpartition(ranking, k - 1)[:k]
+            candidates, ranking = candidates[kept], ranking[kept]
+        order = np.argsort(ranking)
+        return [(self.names[row], int(cost[row]), int(shared[row])) for row in candidates[order]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chord to chord transition suggestions.")
+    parser.add_argument("chord", nargs="?", default="C Major7", help='Current chord, e.g. "C Major7".')
+    parser.add_argument("-k", type=int, default=10, help="Number of suggestions.")
+    parser.add_argument("--degrees", type=int, nargs="+", default=[3, 4], help="Chord template degrees to consider.")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the build, 0 for all cores.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    transitions = TransitionMatrix(degrees=tuple(args.degrees), workers=args.workers or os.cpu_count())
+    print(f"{len(transitions.names)} chords built in {time.perf_counter() - start:.3f} s")
+    chord = transitions.index(args.chord)
+    for name, cost, shared in transitions.suggest_next(chord, k=args.k):
+        print(f"{name:<32} cost {cost:>2}  shared scales {shared:>2}  e.g. {', '.join(transitions.shared_scales(chord, transitions.index(name))[:3])}")
@@ -0,0 +1,304 @@
+import gc
+import logging
+import os
+import threading
+import time
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+# Seconds without MIDI input and with nothing held after which the idle collector runs a full collection
+DEFAULT_IDLE_GAP = 0.5
+
+# Generation 2 threshold while real-time mode is on, high enough that the interpreter never starts a full
+# collection by itself
+DEFERRED_FULL_COLLECTION_THRESHOLD = 1_000_000_000
+
+# Upper bounds in microseconds of the PauseHistogram buckets (the last bucket is everything above)
+PAUSE_BUCKETS_US = (10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000)
+
+
+class PauseHistogram:
+    """Durations of the cyclic garbage collector's pauses, timed through gc.callbacks. Pauses of collections run by the
+    idle collector are counted apart from those which interrupted playing (the callback or any other thread)."""
+
+    def __init__(self):
+        self.counts = {"playing": [0] * (len(PAUSE_BUCKETS_US) + 1), "idle": [0] * (len(PAUSE_BUCKETS_US) + 1)}
+        self.longest = {"playing": 0.0, "idle": 0.0}
+        self.idle_thread_id: int | None = None
+        self._started_at: float | None = None
+
+    def start(self) -> None:
+        """Start timing collections"""
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+
+    def stop(self) -> None:
+        """Stop timing collections"""
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def _callback(self, phase: str, info: dict) -> None:
+        # The collector holds the GIL from start to stop, so the two phases of one collection are never interleaved
+        if phase == "start":
+            self._started_at = time.perf_counter()
+        elif self._started_at is not None:
+            self.record(time.perf_counter() - self._started_at, idle=threading.get_ident() == self.idle_thread_id)
+            self._started_at = None
+
+    def record(self, seconds: float, idle: bool = False) -> None:
+        """Count one pause
+
+        Args:
+            seconds (float): length of the pause
+            idle (bool, optional): the collection ran in an idle gap. Defaults to False.
+        """
+        kind = "idle" if idle else "playing"
+        microseconds = seconds * 1e6
+        bucket = next((index for index, bound in enumerate(PAUSE_BUCKETS_US) if microseconds <= bound), len(PAUSE_BUCKETS_US))
+        self.counts[kind][bucket] += 1
+        self.longest[kind] = max(self.longest[kind], seconds)
+
+    def format(self) -> str:
+        """The histogram as a table with one row per bucket
+
+        Returns:
+            str: the table, without a trailing newline
+        """
+        labels = [f"<= {bound} us" for bound in PAUSE_BUCKETS_US] + [f"> {PAUSE_BUCKETS_US[-1]} us"]
+        lines = [f"{'gc pause':<14}{'playing':>10}{'idle':>10}"]
+        lines += [f"{label:<14}{playing:>10}{idle:>10}"
+                  for label, playing, idle in zip(labels, self.counts["playing"], self.counts["idle"])]
+        lines.append(f"{'longest (us)':<14}{self.longest['playing'] * 1e6:>10.0f}{self.longest['idle'] * 1e6:>10.0f}")
+        return "\n".join(lines)
+
+
+class IdleCollector:
+    """Process-wide garbage collection control of real-time mode.
+
+    While at least one controller uses it, the objects alive at startup (the theory tables, imported modules) are
+    frozen out of the collector, the interpreter never starts a full (generation 2) collection itself and a daemon
+    thread runs one instead once every controller has been idle for the idle gap. Generation 0 and 1 collections still
+    run automatically; they only visit objects allocated since the last one and stay short.
+    """
+
+    def __init__(self):
+        self.histogram = PauseHistogram()
+        self.idle_gap = DEFAULT_IDLE_GAP
+        self._lock = threading.Lock()
+        self._idle_checks: list = []
+        self._pending_tables: list = []
+        self._saved_threshold: tuple[int, int, int] | None = None
+        self._last_activity = time.monotonic()
+        self._activity = threading.Event()
+        self._closed = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def acquire(self, is_idle, idle_gap: float = DEFAULT_IDLE_GAP, tables=None) -> None:
+        """Start deferring full collections on behalf of a controller
+
+        Args:
+            is_idle (callable): returns True when the controller holds no notes
+            idle_gap (float, optional): seconds without input before collecting. The shortest gap of every
+                controller is used. Defaults to DEFAULT_IDLE_GAP.
+            tables (TheoryTables, optional): tables whose chord dictionaries may still be loading in the background;
+                they are frozen in the first idle gap after they finish. Defaults to None.
+        """
+        with self._lock:
+            first = not self._idle_checks
+            self._idle_checks.append(is_idle)
+            self.idle_gap = idle_gap if first else min(self.idle_gap, idle_gap)
+            if tables is not None and not tables.wait_for_chord_lookups(0):
+                self._pending_tables.append(tables)
+            if not first:
+                return
+
+            # Whatever survives a full collection now lives for the whole session
+            gc.collect()
+            gc.freeze()
+            self._saved_threshold = gc.get_threshold()
+            gc.set_threshold(self._saved_threshold[0], self._saved_threshold[1], DEFERRED_FULL_COLLECTION_THRESHOLD)
+            self.histogram.start()
+            self._closed.clear()
+            self._thread = threading.Thread(target=self._run, name="IdleCollector", daemon=True)
+            self._thread.start()
+
+    def release(self, is_idle) -> None:
+        """Stop deferring full collections on behalf of a controller. The last one restores the collector.
+
+        Args:
+            is_idle (callable): the check given to acquire
+        """
+        with self._lock:
+            if is_idle in self._idle_checks:
+                self._idle_checks.remove(is_idle)
+            if self._idle_checks or self._thread is None:
+                return
+            thread, self._thread = self._thread, None
+            self._closed.set()
+            self._activity.set()
+            self._pending_tables.clear()
+        thread.join()
+        gc.set_threshold(*self._saved_threshold)
+        gc.unfreeze()
+        self.histogram.stop()
+
+    def activity(self) -> None:
+        """Note MIDI input. Called from the MIDI callback, so it only stores a time and sets an event."""
+        self._last_activity = time.monotonic()
+        self._activity.set()
+
+    def collect(self) -> None:
+        """Run a full collection now, freezing the chord dictionaries which have finished loading since the last"""
+        gc.collect()
+        loaded = [tables for tables in self._pending_tables if tables.wait_for_chord_lookups(0)]
+        if loaded:
+            gc.freeze()
+            self._pending_tables = [tables for tables in self._pending_tables if tables not in loaded]
+
+    def _run(self) -> None:
+        self.histogram.idle_thread_id = threading.get_ident()
+        while not self._closed.is_set():
+            # Sleep until there has been input since the last collection, then until a gap follows it
+            self._activity.wait()
+            while not self._closed.is_set():
+                remaining = self._last_activity + self.idle_gap - time.monotonic()
+                if remaining <= 0 and all(is_idle() for is_idle in list(self._idle_checks)):
+                    break
+                self._closed.wait(max(remaining, self.idle_gap / 4))
+            if self._closed.is_set():
+                return
+            self._activity.clear()
+            self.collect()
+
+
+# The idle collector shared by every controller in the process
+_idle_collector: IdleCollector | None = None
+_idle_collector_lock = threading.Lock()
+
+
+def get_idle_collector() -> IdleCollector:
+    """Return the process-wide IdleCollector, creating it on first use"""
+    global _idle_collector
+    with _idle_collector_lock:
+        if _idle_collector is None:
+            _idle_collector = IdleCollector()
+        return _idle_collector
+
+
+def pin_thread(cores: list[int], native_id: int = None) -> None:
+    """Restrict a thread to the given CPU cores
+
+    Args:
+        cores (list[int]): core numbers
+        native_id (int, optional): kernel thread id. Defaults to None (the calling thread).
+
+    Raises:
+        OSError: if the platform has no sched_setaffinity (Linux only) or the cores are not available
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        raise OSError("CPU affinity is only supported on Linux")
+    # On Linux a thread id is accepted wherever a process id is, and 0 is the calling thread
+    os.sched_setaffinity(native_id or 0, cores)
+
+
+def request_fifo(priority: int, native_id: int = None) -> None:
+    """Move a thread to the SCHED_FIFO real-time scheduling policy
+
+    Args:
+        priority (int): real-time priority, 1-99
+        native_id (int, optional): kernel thread id. Defaults to None (the calling thread).
+
+    Raises:
+        OSError: if the platform has no SCHED_FIFO, or PermissionError without CAP_SYS_NICE or an RLIMIT_RTPRIO of at
+            least priority
+    """
+    if not hasattr(os, "SCHED_FIFO"):
+        raise OSError("SCHED_FIFO is only supported on Linux")
+    os.sched_setscheduler(native_id or 0, os.SCHED_FIFO, os.sched_param(priority))
+
+
+class RealTimeMode:
+    """Opt-in scheduling for a MidiController: full garbage collections deferred to idle gaps (see IdleCollector), and
+    the MIDI callback and TimingThread pinned to chosen cores and moved to SCHED_FIFO where permitted.
+
+    rtmidi calls back on a thread of its own which does not exist until the port delivers its first message, so the
+    callback thread is set up from within its first callback. Failures (no permission, not Linux) are logged and the
+    thread keeps the default scheduling.
+    """
+
+    def __init__(self, logger: logging.Logger, cores: list[int] = None, priority: int = None,
+                 idle_gap: float = DEFAULT_IDLE_GAP, is_idle=None):
+        """Constructor for the RealTimeMode class
+
+        Args:
+            logger (logging.Logger): the controller's logger
+            cores (list[int], optional): cores the callback and timing threads are pinned to. Defaults to None (any).
+            priority (int, optional): SCHED_FIFO priority, 1-99. Defaults to None (keep the default policy).
+            idle_gap (float, optional): seconds without input before a full collection. Defaults to DEFAULT_IDLE_GAP.
+            is_idle (callable, optional): returns True when the controller holds no notes. Defaults to None (idle
+                whenever there is no input).
+        """
+        self.logger = logger
+        self.cores = list(cores) if cores else None
+        self.priority = priority
+        self.idle_gap = idle_gap
+        self.is_idle = is_idle or (lambda: True)
+        self.idle_collector = get_idle_collector()
+        self.callback_thread_id: int | None = None
+        self.started = False
+
+    def start(self, tables=None) -> None:
+        """Freeze the objects built at startup, defer full collections and set up the timing thread
+
+        Args:
+            tables (TheoryTables, optional): the controller's theory tables (see IdleCollector.acquire). Defaults to None.
+        """
+        # Deferred so TimingThread is only imported by controllers using real-time mode
+        from .TimingThread import get_shared_timing_thread
+
+        self.idle_collector.acquire(self.is_idle, idle_gap=self.idle_gap, tables=tables)
+        self.started = True
+        self.logger.info("[RT] Real-time mode on: full collections deferred to %.2f s idle gaps, %d objects frozen",
+                         self.idle_gap, gc.get_freeze_count())
+
+        timing_thread = get_shared_timing_thread()
+        timing_thread.thread_setup = self.setup_thread
+        if timing_thread.native_id is not None:
+            self.setup_thread("timing", timing_thread.native_id)
+
+    def on_callback(self) -> None:
+        """Called at the start of every MIDI callback"""
+        if self.callback_thread_id is None:
+            self.callback_thread_id = threading.get_native_id()
+            self.setup_thread("callback")
+        self.idle_collector.activity()
+
+    def setup_thread(self, role: str, native_id: int = None) -> None:
+        """Pin a thread and request SCHED_FIFO for it, as configured
+
+        Args:
+            role (str): name of the thread in the log, e.g. "callback"
+            native_id (int, optional): kernel thread id. Defaults to None (the calling thread).
+        """
+        native_id = native_id or threading.get_native_id()
+        if self.cores is not None:
+            try:
+                pin_thread(self.cores, native_id)
+                self.logger.info("[RT] Pinned the %s thread (%d) to cores %s", role, native_id, self.cores)
+            except OSError as e:
+                self.logger.warning("[RT] Could not pin the %s thread to cores %s: %s", role, self.cores, e)
+        if self.priority is not None:
+            try:
+                request_fifo(self.priority, native_id)
+                self.logger.info("[RT] The %s thread (%d) runs at SCHED_FIFO priority %d", role, native_id, self.priority)
+            except OSError as e:
+                self.logger.warning("[RT] SCHED_FIFO priority %d not permitted for the %s thread: %s", self.priority, role, e)
+
+    def stop(self) -> None:
+        """Log the pause histogram and hand the collector back (restored once no controller uses it)"""
+        if not self.started:
+            return
+        self.started = False
+        self.logger.info("[RT] Garbage collector pauses:\n%s", self.idle_collector.histogram.format())
+        self.idle_collector.release(self.is_idle)
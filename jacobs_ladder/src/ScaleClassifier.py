@@ -1,5 +1,6 @@
 import os
 
+import numpy as np
 import pandas as pd
 
 from .DataClasses import Scale
@@ -10,17 +11,29 @@ from .ScaleTree import ScaleTree
 
 class ScaleClassifier:
     
-    def __init__(self):
-        self.df_dict = self.read_csv_files()
+    def __init__(self, csv_directory: str = None):
+        """Constructor for the ScaleClassifier class
+
+        Args:
+            csv_directory (str, optional): directory of interval .csv files (as written by ScaleTree). Defaults to None
+                (the csv directory of the package).
+        """
+        self.df_dict = self.read_csv_files(csv_directory)
+        # Interval arrays are converted once per scale set, and harmonized once per (scale set, voices)
+        self._offsets_cache = {}
+        self._harmonized_cache = {}
     
-    def read_csv_files(self):
+    def read_csv_files(self, csv_directory: str = None):
         """Read all of the .csv files in the possible_scales directory and convert them into DataFrames 
 
+        Args:
+            csv_directory (str, optional): directory to read. Defaults to None (the csv directory of the package).
+
         Returns:
             dict: a dictionary of DataFrames representing the .csv files read in by the script
         """
         self.script_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.csv_directory = os.path.join(self.script_directory, "csv")
+        self.csv_directory = csv_directory or os.path.join(self.script_directory, "csv")
         
         dfs = {}
         for filename in os.listdir(self.csv_directory):
@@ -36,6 +49,51 @@ class ScaleClassifier:
                     os.remove(file_path)
         return dfs
     
+    def scale_offsets(self, scale_set: tuple[str, ...] = None) -> tuple[np.ndarray, np.ndarray]:
+        """Semitones above the starting note of every note of every scale, from one cumulative sum over the intervals
+        of all of the scales padded to a common width
+
+        Args:
+            scale_set (tuple[str, ...], optional): names of the DataFrames to include. Defaults to None (all, in
+                df_dict order).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: int16 offsets of shape (scales, width + 1) starting with 0 (positions past a
+                scale's octave repeat the octave) and the number of intervals of each scale
+        """
+        scale_set = tuple(self.df_dict) if scale_set is None else tuple(scale_set)
+        cached = self._offsets_cache.get(scale_set)
+        if cached is not None:
+            return cached
+
+        frames = [self.df_dict[df_name].to_numpy(dtype=np.int16) for df_name in scale_set]
+        degrees = np.concatenate([np.full(len(frame), frame.shape[1], dtype=np.int16) for frame in frames])
+        width = max((frame.shape[1] for frame in frames), default=0)
+        offsets = np.zeros((len(degrees), width + 1), dtype=np.int16)
+        row = 0
+        for frame in frames:
+            offsets[row:row + len(frame), 1:frame.shape[1] + 1] = frame
+            row += len(frame)
+        offsets = np.cumsum(offsets, axis=1, dtype=np.int16)
+
+        self._offsets_cache[scale_set] = offsets, degrees
+        return offsets, degrees
+
+    def convert_scales(self, starting_notes, scale_set: tuple[str, ...] = None) -> tuple[np.ndarray, np.ndarray]:
+        """Convert every scale for several starting notes at once
+
+        Args:
+            starting_notes: a MIDI note number or sequence of them
+            scale_set (tuple[str, ...], optional): names of the DataFrames to include. Defaults to None (all).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: notes of shape (starting notes, scales, width + 1) (see scale_offsets) and
+                the number of intervals of each scale
+        """
+        offsets, degrees = self.scale_offsets(scale_set)
+        starting_notes = np.atleast_1d(np.asarray(starting_notes, dtype=np.int16))
+        return starting_notes[:, None, None] + offsets[None, :, :], degrees
+
     def convert_intervals(self, starting_note: int):
         """Given a starting note, create a list of MIDI scales starting from that note upward to the octave
 
@@ -45,15 +103,71 @@ class ScaleClassifier:
         Returns:
             list: a list of scales starting from the starting note which meets the criteria of scales autogenerated by ScaleTree class
         """
-        scale_list = []
-        for df_name, df in self.df_dict.items():
-            for index, row in df.iterrows():
-                remainder = list(map(lambda x: x + starting_note, list(row.cumsum())))
-                scale = [starting_note]
-                scale.extend(remainder)
-                scale_list.append(scale)
+        notes, degrees = self.convert_scales(starting_note)
+        return [scale[:degree + 1] for scale, degree in zip(notes[0].tolist(), degrees.tolist())]
                 
-        return scale_list
+    def harmonized_offsets(self, num_voices: int, scale_set: tuple[str, ...] = None) -> tuple[np.ndarray, np.ndarray]:
+        """Chord scales of every scale relative to its starting note. Chord i stacks every other scale degree from
+        degree i, continuing into the octaves above, so the whole set is a single strided gather.
+
+        Args:
+            num_voices (int): number of voices in each chord (max number of voices is 5)
+            scale_set (tuple[str, ...], optional): names of the DataFrames to include. Defaults to None (all).
+
+        Raises:
+            ValueError: if num_voices is out of range
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: int16 offsets of shape (scales, width + 1, num_voices) and the number of
+                intervals of each scale, which has that many chords plus the one on the octave
+        """
+        if num_voices < 1 or num_voices > 5:
+            raise ValueError("Number of voices must be between 1 and 5.")
+        scale_set = tuple(self.df_dict) if scale_set is None else tuple(scale_set)
+        cached = self._harmonized_cache.get((scale_set, num_voices))
+        if cached is not None:
+            return cached
+
+        offsets, degrees = self.scale_offsets(scale_set)
+        positions = np.arange(offsets.shape[1])[:, None] + 2 * np.arange(num_voices)[None, :]
+        octaves, steps = np.divmod(positions[None, :, :], degrees[:, None, None])
+        gathered = np.take_along_axis(offsets, steps.reshape(len(offsets), -1), axis=1).reshape(steps.shape)
+        harmonized = (gathered + 12 * octaves).astype(np.int16)
+
+        self._harmonized_cache[(scale_set, num_voices)] = harmonized, degrees
+        return harmonized, degrees
+
+    def harmonized_notes(self, starting_notes, num_voices: int, scale_set: tuple[str, ...] = None) -> tuple[np.ndarray, np.ndarray]:
+        """Chord scales of every scale for several starting notes at once, as arrays
+
+        Args:
+            starting_notes: a MIDI note number or sequence of them
+            num_voices (int): number of voices in each chord (max number of voices is 5)
+            scale_set (tuple[str, ...], optional): names of the DataFrames to include. Defaults to None (all).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: notes of shape (starting notes, scales, width + 1, num_voices) (see
+                harmonized_offsets) and the number of intervals of each scale
+        """
+        harmonized, degrees = self.harmonized_offsets(num_voices, scale_set)
+        starting_notes = np.atleast_1d(np.asarray(starting_notes, dtype=np.int16))
+        return starting_notes[:, None, None, None] + harmonized[None], degrees
+
+    def harmonize_scales(self, starting_note: int, num_voices: int, scale_set: tuple[str, ...] = None):
+        """Create the chord scale of every scale from a starting note, in the order of convert_intervals
+
+        Args:
+            starting_note (int): A MIDI note number between 21 and 96 inclusive
+            num_voices (int): number of voices to play at one time in the chord scale (max number of voices is 5)
+            scale_set (tuple[str, ...], optional): names of the DataFrames to include. Defaults to None (all).
+
+        Returns:
+            list[list[list]]: the chord scale of each scale, as create_harmonized_scale returns it
+        """
+        if not 21 <= starting_note <= 96:
+            raise ValueError("The starting note must be in the range 21-96 inclusive.")
+        notes, degrees = self.harmonized_notes(starting_note, num_voices, scale_set)
+        return [chords[:degree + 1] for chords, degree in zip(notes[0].tolist(), degrees.tolist())]
     
     def create_harmonized_scale(self, scale: list, num_voices: int):
         """Given a scale as a list of MIDI notes and a number of voices, return a chord scale using that scale
@@ -69,22 +183,15 @@ class ScaleClassifier:
             raise ValueError("All notes in the scale must be in the range 21-108 inclusive.")
         if num_voices < 1 or num_voices > 5:
             raise ValueError("Number of voices must be between 1 and 5.")
+        if len(scale) < 2:
+            raise ValueError("A scale must have at least two notes.")
     
-        starting_note = scale[0]
-        scale_original = scale.copy()
-        scale_pattern = [note - starting_note for note in scale]
-        for _ in range(2):
-            extension = [scale[-1] + note for note in scale_pattern]
-            scale.extend(extension[1:])
-        
-        chord_scale = []
-        for index in range(len(scale_original)):
-            chord = []
-            for num_voc in range(0, int(num_voices)*2, 2):
-                chord.append(scale[index+num_voc])
-            chord_scale.append(chord)
-            
-        return chord_scale
+        # The scale repeats every (last - first) semitones above its last note
+        pattern = np.asarray(scale, dtype=np.int16) - scale[0]
+        degree = len(scale) - 1
+        positions = np.arange(len(scale))[:, None] + 2 * np.arange(num_voices)[None, :]
+        periods, steps = np.divmod(positions, degree)
+        return (scale[0] + pattern[steps] + periods * pattern[-1]).tolist()
 
 if __name__ == "__main__":
     pd.set_option('display.max_rows', None)
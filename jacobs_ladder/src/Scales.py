@@ -1,278 +1,307 @@
+from types import MappingProxyType
+
 from .DataClasses import Scale
+from .Utilities import scale_name_field
+
+# Every scale in definition order, which is the order of get_all_scales(), so a scale's position is its scale ID
+_SCALES: list[Scale] = []
+
+
+def _register(family: str, name: str, notes: list[str]) -> Scale:
+    """Create a scale with the next scale ID and add it to the registry"""
+    scale = Scale(name, notes, scale_id=len(_SCALES), family=family)
+    _SCALES.append(scale)
+    return scale
+
 
 # --- Octatonic Scales ---
 
 # Diminished Scale (Half-Whole version) Note: Only three scales are needed because others are shifted copies of one another harmonically speaking
-C_Diminished = Scale("C Diminished", ["C", "D\u266d", "E\u266d", "E", "G\u266d", "G", "A", "B\u266d"])
-Db_Diminished = Scale("D\u266d Diminished", ["D\u266d", "D", "E", "F", "G", "A\u266d", "B\u266d", "B"])
-D_Diminished = Scale("D Diminished", ["D", "E\u266d", "F", "G\u266d", "A\u266d", "A", "B", "C"])
+C_Diminished = _register("Diminished", "C Diminished", ["C", "D\u266d", "E\u266d", "E", "G\u266d", "G", "A", "B\u266d"])
+Db_Diminished = _register("Diminished", "D\u266d Diminished", ["D\u266d", "D", "E", "F", "G", "A\u266d", "B\u266d", "B"])
+D_Diminished = _register("Diminished", "D Diminished", ["D", "E\u266d", "F", "G\u266d", "A\u266d", "A", "B", "C"])
 
 # --- Heptatonic Scales ---
 
 # Major/Minor scales
-C_Major = Scale("C Major", ["C", "D", "E", "F", "G", "A", "B"])
-Db_Major = Scale("D\u266d Major", ["D\u266d", "E\u266d", "F", "G\u266d", "A\u266d", "B\u266d", "C"])
-D_Major = Scale("D Major", ["D", "E", "G\u266d", "G", "A", "B", "D\u266d"])
-Eb_Major = Scale("E\u266d Major", ["E\u266d", "F", "G", "A\u266d", "B\u266d", "C", "D"])
-E_Major = Scale("E Major", ["E", "G\u266d", "A\u266d", "A", "B", "D\u266d", "E\u266d"])
-F_Major = Scale("F Major", ["F", "G", "A", "B\u266d", "C", "D", "E"])
-Gb_Major = Scale("G\u266d Major", ["G\u266d", "A\u266d", "B\u266d", "B", "D\u266d", "E\u266d", "F"])
-G_Major = Scale("G Major", ["G", "A", "B", "C", "D", "E", "G\u266d"])
-Ab_Major = Scale("A\u266d Major", ["A\u266d", "B\u266d", "C", "D\u266d", "E\u266d", "F", "G"])
-A_Major = Scale("A Major", ["A", "B", "D\u266d", "D", "E", "G\u266d", "A\u266d"])
-Bb_Major = Scale("B\u266d Major", ["B\u266d", "C", "D", "E\u266d", "F", "G", "A"])
-B_Major = Scale("B Major", ["B", "D\u266d", "E\u266d", "E", "G\u266d", "A\u266d", "B\u266d"])
+C_Major = _register("Ionian", "C Major", ["C", "D", "E", "F", "G", "A", "B"])
+Db_Major = _register("Ionian", "D\u266d Major", ["D\u266d", "E\u266d", "F", "G\u266d", "A\u266d", "B\u266d", "C"])
+D_Major = _register("Ionian", "D Major", ["D", "E", "G\u266d", "G", "A", "B", "D\u266d"])
+Eb_Major = _register("Ionian", "E\u266d Major", ["E\u266d", "F", "G", "A\u266d", "B\u266d", "C", "D"])
+E_Major = _register("Ionian", "E Major", ["E", "G\u266d", "A\u266d", "A", "B", "D\u266d", "E\u266d"])
+F_Major = _register("Ionian", "F Major", ["F", "G", "A", "B\u266d", "C", "D", "E"])
+Gb_Major = _register("Ionian", "G\u266d Major", ["G\u266d", "A\u266d", "B\u266d", "B", "D\u266d", "E\u266d", "F"])
+G_Major = _register("Ionian", "G Major", ["G", "A", "B", "C", "D", "E", "G\u266d"])
+Ab_Major = _register("Ionian", "A\u266d Major", ["A\u266d", "B\u266d", "C", "D\u266d", "E\u266d", "F", "G"])
+A_Major = _register("Ionian", "A Major", ["A", "B", "D\u266d", "D", "E", "G\u266d", "A\u266d"])
+Bb_Major = _register("Ionian", "B\u266d Major", ["B\u266d", "C", "D", "E\u266d", "F", "G", "A"])
+B_Major = _register("Ionian", "B Major", ["B", "D\u266d", "E\u266d", "E", "G\u266d", "A\u266d", "B\u266d"])
 
 # Harmonic Minor Scales
-C_Harmonic_Minor = Scale("C Harmonic Minor", ["C", "D", "E\u266d", "F", "G", "A\u266d", "B"])
-Db_Harmonic_Minor = Scale("D\u266d Harmonic Minor", ["D\u266d", "E\u266d", "E", "G\u266d", "A\u266d", "A", "C"])
-D_Harmonic_Minor = Scale("D Harmonic Minor", ["D", "E", "F", "G", "A", "B\u266d", "D\u266d"])
-Eb_Harmonic_Minor = Scale("E\u266d Harmonic Minor", ["E\u266d", "F", "G\u266d", "A\u266d", "B\u266d", "B", "D"])
-E_Harmonic_Minor = Scale("E Harmonic Minor", ["E", "G\u266d", "G", "A", "B", "C", "E\u266d"])
-F_Harmonic_Minor = Scale("F Harmonic Minor", ["F", "G", "A\u266d", "B\u266d", "C", "D\u266d", "E"])
-Gb_Harmonic_Minor = Scale("G\u266d Harmonic Minor", ["G\u266d", "A\u266d", "A", "B", "D\u266d", "D", "F"])
-G_Harmonic_Minor = Scale("G Harmonic Minor", ["G", "A", "B\u266d", "C", "D", "E\u266d", "G\u266d"])
-Ab_Harmonic_Minor = Scale("A\u266d Harmonic Minor", ["A\u266d", "B\u266d", "B", "D\u266d", "E\u266d", "E", "G"])
-A_Harmonic_Minor = Scale("A Harmonic Minor", ["A", "B", "C", "D", "E", "F", "A\u266d"])
-Bb_Harmonic_Minor = Scale("B\u266d Harmonic Minor", ["B\u266d", "C", "D\u266d", "E\u266d", "F", "G\u266d", "A"])
-B_Harmonic_Minor = Scale("B Harmonic Minor", ["B", "D\u266d", "D", "E", "G\u266d", "G", "B\u266d"])
+C_Harmonic_Minor = _register("Harmonic Minor", "C Harmonic Minor", ["C", "D", "E\u266d", "F", "G", "A\u266d", "B"])
+Db_Harmonic_Minor = _register("Harmonic Minor", "D\u266d Harmonic Minor", ["D\u266d", "E\u266d", "E", "G\u266d", "A\u266d", "A", "C"])
+D_Harmonic_Minor = _register("Harmonic Minor", "D Harmonic Minor", ["D", "E", "F", "G", "A", "B\u266d", "D\u266d"])
+Eb_Harmonic_Minor = _register("Harmonic Minor", "E\u266d Harmonic Minor", ["E\u266d", "F", "G\u266d", "A\u266d", "B\u266d", "B", "D"])
+E_Harmonic_Minor = _register("Harmonic Minor", "E Harmonic Minor", ["E", "G\u266d", "G", "A", "B", "C", "E\u266d"])
+F_Harmonic_Minor = _register("Harmonic Minor", "F Harmonic Minor", ["F", "G", "A\u266d", "B\u266d", "C", "D\u266d", "E"])
+Gb_Harmonic_Minor = _register("Harmonic Minor", "G\u266d Harmonic Minor", ["G\u266d", "A\u266d", "A", "B", "D\u266d", "D", "F"])
+G_Harmonic_Minor = _register("Harmonic Minor", "G Harmonic Minor", ["G", "A", "B\u266d", "C", "D", "E\u266d", "G\u266d"])
+Ab_Harmonic_Minor = _register("Harmonic Minor", "A\u266d Harmonic Minor", ["A\u266d", "B\u266d", "B", "D\u266d", "E\u266d", "E", "G"])
+A_Harmonic_Minor = _register("Harmonic Minor", "A Harmonic Minor", ["A", "B", "C", "D", "E", "F", "A\u266d"])
+Bb_Harmonic_Minor = _register("Harmonic Minor", "B\u266d Harmonic Minor", ["B\u266d", "C", "D\u266d", "E\u266d", "F", "G\u266d", "A"])
+B_Harmonic_Minor = _register("Harmonic Minor", "B Harmonic Minor", ["B", "D\u266d", "D", "E", "G\u266d", "G", "B\u266d"])
 
 # Harmonic Major Scales
-C_Harmonic_Major = Scale("C Harmonic Major", ["C", "D", "E", "F", "G", "A\u266d", "B"])
-Db_Harmonic_Major = Scale("D\u266d Harmonic Major", ["D\u266d", "E\u266d", "F", "G\u266d", "A\u266d", "A", "C"])
-D_Harmonic_Major = Scale("D Harmonic Major", ["D", "E", "G\u266d", "G", "A", "B\u266d", "D\u266d"])
-Eb_Harmonic_Major = Scale("E\u266d Harmonic Major", ["E\u266d", "F", "G", "A\u266d", "B\u266d", "B", "D"])
-E_Harmonic_Major = Scale("E Harmonic Major", ["E", "G\u266d", "A\u266d", "A", "B", "C", "E\u266d"])
-F_Harmonic_Major = Scale("F Harmonic Major", ["F", "G", "A", "B\u266d", "C", "D\u266d", "E"])
-Gb_Harmonic_Major = Scale("G\u266d Harmonic Major", ["G\u266d", "A\u266d", "B\u266d", "B", "D\u266d", "D", "F"])
-G_Harmonic_Major = Scale("G Harmonic Major", ["G", "A", "B", "C", "D", "E\u266d", "G\u266d"])
-Ab_Harmonic_Major = Scale("A\u266d Harmonic Major", ["A\u266d", "B\u266d", "C", "D\u266d", "E\u266d", "E", "G"])
-A_Harmonic_Major = Scale("A Harmonic Major", ["A", "B", "D\u266d", "D", "E", "F", "A\u266d"])
-Bb_Harmonic_Major = Scale("B\u266d Harmonic Major", ["B\u266d", "C", "D", "E\u266d", "F", "G\u266d", "A"])
-B_Harmonic_Major = Scale("B Harmonic Major", ["B", "D\u266d", "E\u266d", "E", "G\u266d", "G", "B\u266d"])
+C_Harmonic_Major = _register("Harmonic Major", "C Harmonic Major", ["C", "D", "E", "F", "G", "A\u266d", "B"])
+Db_Harmonic_Major = _register("Harmonic Major", "D\u266d Harmonic Major", ["D\u266d", "E\u266d", "F", "G\u266d", "A\u266d", "A", "C"])
+D_Harmonic_Major = _register("Harmonic Major", "D Harmonic Major", ["D", "E", "G\u266d", "G", "A", "B\u266d", "D\u266d"])
+Eb_Harmonic_Major = _register("Harmonic Major", "E\u266d Harmonic Major", ["E\u266d", "F", "G", "A\u266d", "B\u266d", "B", "D"])
+E_Harmonic_Major = _register("Harmonic Major", "E Harmonic Major", ["E", "G\u266d", "A\u266d", "A", "B", "C", "E\u266d"])
+F_Harmonic_Major = _register("Harmonic Major", "F Harmonic Major", ["F", "G", "A", "B\u266d", "C", "D\u266d", "E"])
+Gb_Harmonic_Major = _register("Harmonic Major", "G\u266d Harmonic Major", ["G\u266d", "A\u266d", "B\u266d", "B", "D\u266d", "D", "F"])
+G_Harmonic_Major = _register("Harmonic Major", "G Harmonic Major", ["G", "A", "B", "C", "D", "E\u266d", "G\u266d"])
+Ab_Harmonic_Major = _register("Harmonic Major", "A\u266d Harmonic Major", ["A\u266d", "B\u266d", "C", "D\u266d", "E\u266d", "E", "G"])
+A_Harmonic_Major = _register("Harmonic Major", "A Harmonic Major", ["A", "B", "D\u266d", "D", "E", "F", "A\u266d"])
+Bb_Harmonic_Major = _register("Harmonic Major", "B\u266d Harmonic Major", ["B\u266d", "C", "D", "E\u266d", "F", "G\u266d", "A"])
+B_Harmonic_Major = _register("Harmonic Major", "B Harmonic Major", ["B", "D\u266d", "E\u266d", "E", "G\u266d", "G", "B\u266d"])
 
 # Melodic Minor Scales
-C_Melodic_Minor = Scale("C Melodic Minor", ["C", "D", "E\u266d", "F", "G", "A", "B"])
-Db_Melodic_Minor = Scale("D\u266d Melodic Minor", ["D\u266d", "E\u266d", "E", "G\u266d", "A\u266d", "B\u266d", "C"])
-D_Melodic_Minor = Scale("D Melodic Minor", ["D", "E", "F", "G", "A", "B", "D\u266d"])
-Eb_Melodic_Minor = Scale("E\u266d Melodic Minor", ["E\u266d", "F", "G\u266d", "A\u266d", "B\u266d", "C", "D"])
-E_Melodic_Minor = Scale("E Melodic Minor", ["E", "G\u266d", "G", "A", "B", "D\u266d", "E\u266d"])
-F_Melodic_Minor = Scale("F Melodic Minor", ["F", "G", "A\u266d", "B\u266d", "C", "D", "E"])
-Gb_Melodic_Minor = Scale("G\u266d Melodic Minor", ["G\u266d", "A\u266d", "A", "B", "D\u266d", "E\u266d", "F"])
-G_Melodic_Minor = Scale("G Melodic Minor", ["G", "A", "B\u266d", "C", "D", "E", "G\u266d"])
-Ab_Melodic_Minor = Scale("A\u266d Melodic Minor", ["A\u266d", "B\u266d", "B", "D\u266d", "E\u266d", "F", "G"])
-A_Melodic_Minor = Scale("A Melodic Minor", ["A", "B", "C", "D", "E", "G\u266d", "A\u266d"])
-Bb_Melodic_Minor = Scale("B\u266d Melodic Minor", ["B\u266d", "C", "D\u266d", "E\u266d", "F", "G", "A"])
-B_Melodic_Minor = Scale("B Melodic Minor", ["B", "D\u266d", "D", "E", "G\u266d", "A\u266d", "B\u266d"])
+C_Melodic_Minor = _register("Melodic Minor", "C Melodic Minor", ["C", "D", "E\u266d", "F", "G", "A", "B"])
+Db_Melodic_Minor = _register("Melodic Minor", "D\u266d Melodic Minor", ["D\u266d", "E\u266d", "E", "G\u266d", "A\u266d", "B\u266d", "C"])
+D_Melodic_Minor = _register("Melodic Minor", "D Melodic Minor", ["D", "E", "F", "G", "A", "B", "D\u266d"])
+Eb_Melodic_Minor = _register("Melodic Minor", "E\u266d Melodic Minor", ["E\u266d", "F", "G\u266d", "A\u266d", "B\u266d", "C", "D"])
+E_Melodic_Minor = _register("Melodic Minor", "E Melodic Minor", ["E", "G\u266d", "G", "A", "B", "D\u266d", "E\u266d"])
+F_Melodic_Minor = _register("Melodic Minor", "F Melodic Minor", ["F", "G", "A\u266d", "B\u266d", "C", "D", "E"])
+Gb_Melodic_Minor = _register("Melodic Minor", "G\u266d Melodic Minor", ["G\u266d", "A\u266d", "A", "B", "D\u266d", "E\u266d", "F"])
+G_Melodic_Minor = _register("Melodic Minor", "G Melodic Minor", ["G", "A", "B\u266d", "C", "D", "E", "G\u266d"])
+Ab_Melodic_Minor = _register("Melodic Minor", "A\u266d Melodic Minor", ["A\u266d", "B\u266d", "B", "D\u266d", "E\u266d", "F", "G"])
+A_Melodic_Minor = _register("Melodic Minor", "A Melodic Minor", ["A", "B", "C", "D", "E", "G\u266d", "A\u266d"])
+Bb_Melodic_Minor = _register("Melodic Minor", "B\u266d Melodic Minor", ["B\u266d", "C", "D\u266d", "E\u266d", "F", "G", "A"])
+B_Melodic_Minor = _register("Melodic Minor", "B Melodic Minor", ["B", "D\u266d", "D", "E", "G\u266d", "A\u266d", "B\u266d"])
 
 # Diminished Blues Scales
-C_Diminished_Blues = Scale("C Diminished Blues", ["C", "D\u266d", "E\u266d", "E", "G\u266d", "G", "B\u266d"])
-Db_Diminished_Blues = Scale("D\u266d Diminished Blues", ["D\u266d", "D", "E", "F", "G", "A\u266d", "B"])
-D_Diminished_Blues = Scale("D Diminished Blues", ["D", "E\u266d", "F", "G\u266d", "A\u266d", "A", "C"])
-Eb_Diminished_Blues = Scale("E\u266d Diminished Blues", ["E\u266d", "E", "G\u266d", "G", "A", "B\u266d", "D\u266d"])
-E_Diminished_Blues = Scale("E Diminished Blues", ["E", "F", "G", "A\u266d", "B\u266d", "B", "D"])
-F_Diminished_Blues = Scale("F Diminished Blues", ["F", "G\u266d", "A\u266d", "A", "B", "C", "E\u266d"])
-Gb_Diminished_Blues = Scale("G\u266d Diminished Blues", ["G\u266d", "G", "A", "B\u266d", "C", "D\u266d", "E"])
-G_Diminished_Blues = Scale("G Diminished Blues", ["G", "A\u266d", "B\u266d", "B", "D\u266d", "D", "F"])
-Ab_Diminished_Blues = Scale("A\u266d Diminished Blues", ["A\u266d", "A", "B", "C", "D", "E\u266d", "G\u266d"])
-A_Diminished_Blues = Scale("A Diminished Blues", ["A", "B\u266d", "C", "D\u266d", "E\u266d", "E", "G"])
-Bb_Diminished_Blues = Scale("B\u266d Diminished Blues", ["B\u266d", "B", "D\u266d", "D", "E", "F", "A\u266d"])
-B_Diminished_Blues = Scale("B Diminished Blues", ["B", "C", "D", "E\u266d", "F", "G\u266d", "A"])
+C_Diminished_Blues = _register("Diminished Blues", "C Diminished Blues", ["C", "D\u266d", "E\u266d", "E", "G\u266d", "G", "B\u266d"])
+Db_Diminished_Blues = _register("Diminished Blues", "D\u266d Diminished Blues", ["D\u266d", "D", "E", "F", "G", "A\u266d", "B"])
+D_Diminished_Blues = _register("Diminished Blues", "D Diminished Blues", ["D", "E\u266d", "F", "G\u266d", "A\u266d", "A", "C"])
+Eb_Diminished_Blues = _register("Diminished Blues", "E\u266d Diminished Blues", ["E\u266d", "E", "G\u266d", "G", "A", "B\u266d", "D\u266d"])
+E_Diminished_Blues = _register("Diminished Blues", "E Diminished Blues", ["E", "F", "G", "A\u266d", "B\u266d", "B", "D"])
+F_Diminished_Blues = _register("Diminished Blues", "F Diminished Blues", ["F", "G\u266d", "A\u266d", "A", "B", "C", "E\u266d"])
+Gb_Diminished_Blues = _register("Diminished Blues", "G\u266d Diminished Blues", ["G\u266d", "G", "A", "B\u266d", "C", "D\u266d", "E"])
+G_Diminished_Blues = _register("Diminished Blues", "G Diminished Blues", ["G", "A\u266d", "B\u266d", "B", "D\u266d", "D", "F"])
+Ab_Diminished_Blues = _register("Diminished Blues", "A\u266d Diminished Blues", ["A\u266d", "A", "B", "C", "D", "E\u266d", "G\u266d"])
+A_Diminished_Blues = _register("Diminished Blues", "A Diminished Blues", ["A", "B\u266d", "C", "D\u266d", "E\u266d", "E", "G"])
+Bb_Diminished_Blues = _register("Diminished Blues", "B\u266d Diminished Blues", ["B\u266d", "B", "D\u266d", "D", "E", "F", "A\u266d"])
+B_Diminished_Blues = _register("Diminished Blues", "B Diminished Blues", ["B", "C", "D", "E\u266d", "F", "G\u266d", "A"])
 
 # Diminsished Harmonic Scales
-C_Diminished_Harmonic = Scale("C Diminished Harmonic", ["C", "D\u266d", "E\u266d", "E", "G\u266d", "G", "A"])
-Db_Diminished_Harmonic = Scale("D\u266d Diminished Harmonic", ["D\u266d", "D", "E", "F", "G", "A\u266d", "B\u266d"])
-D_Diminished_Harmonic = Scale("D Diminished Harmonic", ["D", "E\u266d", "F", "G\u266d", "A\u266d", "A", "B"])
-Eb_Diminished_Harmonic = Scale("E\u266d Diminished Harmonic", ["E\u266d", "E", "G\u266d", "G", "A", "B\u266d", "C"])
-E_Diminished_Harmonic = Scale("E Diminished Harmonic", ["E", "F", "G", "A\u266d", "B\u266d", "B", "D\u266d"])
-F_Diminished_Harmonic = Scale("F Diminished Harmonic", ["F", "G\u266d", "A\u266d", "A", "B", "C", "D"])
-Gb_Diminished_Harmonic = Scale("G\u266d Diminished Harmonic", ["G\u266d", "G", "A", "B\u266d", "C", "D\u266d", "E\u266d"])
-G_Diminished_Harmonic = Scale("G Diminished Harmonic", ["G", "A\u266d", "B\u266d", "B", "D\u266d", "D", "E"])
-Ab_Diminished_Harmonic = Scale("A\u266d Diminished Harmonic", ["A\u266d", "A", "B", "C", "D", "D", "F"])
-A_Diminished_Harmonic = Scale("A Diminished Harmonic", ["A", "B\u266d", "C", "D\u266d", "E\u266d", "E", "G\u266d"])
-Bb_Diminished_Harmonic = Scale("B\u266d Diminished Harmonic", ["B\u266d", "B", "D\u266d", "D", "E", "F", "G"])
-B_Diminished_Harmonic = Scale("B Diminished Harmonic", ["B", "C", "D", "E\u266d", "F", "G\u266d", "A\u266d"])
+C_Diminished_Harmonic = _register("Diminished Harmonic", "C Diminished Harmonic", ["C", "D\u266d", "E\u266d", "E", "G\u266d", "G", "A"])
+Db_Diminished_Harmonic = _register("Diminished Harmonic", "D\u266d Diminished Harmonic", ["D\u266d", "D", "E", "F", "G", "A\u266d", "B\u266d"])
+D_Diminished_Harmonic = _register("Diminished Harmonic", "D Diminished Harmonic", ["D", "E\u266d", "F", "G\u266d", "A\u266d", "A", "B"])
+Eb_Diminished_Harmonic = _register("Diminished Harmonic", "E\u266d Diminished Harmonic", ["E\u266d", "E", "G\u266d", "G", "A", "B\u266d", "C"])
+E_Diminished_Harmonic = _register("Diminished Harmonic", "E Diminished Harmonic", ["E", "F", "G", "A\u266d", "B\u266d", "B", "D\u266d"])
+F_Diminished_Harmonic = _register("Diminished Harmonic", "F Diminished Harmonic", ["F", "G\u266d", "A\u266d", "A", "B", "C", "D"])
+Gb_Diminished_Harmonic = _register("Diminished Harmonic", "G\u266d Diminished Harmonic", ["G\u266d", "G", "A", "B\u266d", "C", "D\u266d", "E\u266d"])
+G_Diminished_Harmonic = _register("Diminished Harmonic", "G Diminished Harmonic", ["G", "A\u266d", "B\u266d", "B", "D\u266d", "D", "E"])
+Ab_Diminished_Harmonic = _register("Diminished Harmonic", "A\u266d Diminished Harmonic", ["A\u266d", "A", "B", "C", "D", "D", "F"])
+A_Diminished_Harmonic = _register("Diminished Harmonic", "A Diminished Harmonic", ["A", "B\u266d", "C", "D\u266d", "E\u266d", "E", "G\u266d"])
+Bb_Diminished_Harmonic = _register("Diminished Harmonic", "B\u266d Diminished Harmonic", ["B\u266d", "B", "D\u266d", "D", "E", "F", "G"])
+B_Diminished_Harmonic = _register("Diminished Harmonic", "B Diminished Harmonic", ["B", "C", "D", "E\u266d", "F", "G\u266d", "A\u266d"])
 
 # --- Hexatonic Scales ---
 
 # Whole Tone Scales: Note: There are only two because all other whole tone scales are shifted copies of the original two
-C_Whole_Tone = Scale("C Whole Tone", ["C", "D", "E", "G\u266d", "A\u266d", "B\u266d"])
-Db_Whole_Tone = Scale("D\u266d Whole Tone", ["D\u266d", "E\u266d", "F", "G", "A", "B"])
+C_Whole_Tone = _register("Whole Tone", "C Whole Tone", ["C", "D", "E", "G\u266d", "A\u266d", "B\u266d"])
+Db_Whole_Tone = _register("Whole Tone", "D\u266d Whole Tone", ["D\u266d", "E\u266d", "F", "G", "A", "B"])
 
 # --- Pentatonic Scales --- 
 
 # Pure Pentatonic Scale
-C_Pentatonic = Scale("C Pentatonic", ["C", "D", "E", "G", "A"])
-Db_Pentatonic = Scale("D\u266d Pentatonic", ["D\u266d", "E\u266d", "F", "A\u266d", "B\u266d"])
-D_Pentatonic = Scale("D Pentatonic", ["D", "E", "G\u266d", "A", "B"])
-Eb_Pentatonic = Scale("E\u266d Pentatonic", ["E\u266d", "F", "G", "B\u266d", "C"])
-E_Pentatonic = Scale("E Pentatonic", ["E", "G\u266d", "A\u266d", "B", "D\u266d"])
-F_Pentatonic = Scale("F Pentatonic", ["F", "G", "A", "C", "D"])
-Gb_Pentatonic = Scale("G\u266d Pentatonic", ["G\u266d", "A\u266d", "B\u266d", "D\u266d", "E\u266d"])
-G_Pentatonic = Scale("G Pentatonic", ["G", "A", "B", "D", "E"])
-Ab_Pentatonic = Scale("A\u266d Pentatonic", ["A\u266d", "B\u266d", "C", "E\u266d", "F"])
-A_Pentatonic = Scale("A Pentatonic", ["A", "B", "D\u266d", "E", "G\u266d"])
-Bb_Pentatonic = Scale("B\u266d Pentatonic", ["B\u266d", "C", "D", "F", "G"])
-B_Pentatonic = Scale("B Pentatonic", ["B", "D\u266d", "E\u266d", "G\u266d", "A\u266d"])
-
-def get_diminished_scales() -> list[Scale]:
-    """Getter function for retrieving a list of all possible diminished scale objects
+C_Pentatonic = _register("Pentatonic", "C Pentatonic", ["C", "D", "E", "G", "A"])
+Db_Pentatonic = _register("Pentatonic", "D\u266d Pentatonic", ["D\u266d", "E\u266d", "F", "A\u266d", "B\u266d"])
+D_Pentatonic = _register("Pentatonic", "D Pentatonic", ["D", "E", "G\u266d", "A", "B"])
+Eb_Pentatonic = _register("Pentatonic", "E\u266d Pentatonic", ["E\u266d", "F", "G", "B\u266d", "C"])
+E_Pentatonic = _register("Pentatonic", "E Pentatonic", ["E", "G\u266d", "A\u266d", "B", "D\u266d"])
+F_Pentatonic = _register("Pentatonic", "F Pentatonic", ["F", "G", "A", "C", "D"])
+Gb_Pentatonic = _register("Pentatonic", "G\u266d Pentatonic", ["G\u266d", "A\u266d", "B\u266d", "D\u266d", "E\u266d"])
+G_Pentatonic = _register("Pentatonic", "G Pentatonic", ["G", "A", "B", "D", "E"])
+Ab_Pentatonic = _register("Pentatonic", "A\u266d Pentatonic", ["A\u266d", "B\u266d", "C", "E\u266d", "F"])
+A_Pentatonic = _register("Pentatonic", "A Pentatonic", ["A", "B", "D\u266d", "E", "G\u266d"])
+Bb_Pentatonic = _register("Pentatonic", "B\u266d Pentatonic", ["B\u266d", "C", "D", "F", "G"])
+B_Pentatonic = _register("Pentatonic", "B Pentatonic", ["B", "D\u266d", "E\u266d", "G\u266d", "A\u266d"])
+
+# --- Registry ---
+
+# Built once at import and shared by every consumer; nothing here is mutated afterwards
+ALL_SCALES: tuple[Scale, ...] = tuple(_SCALES)
+SCALE_FAMILIES: MappingProxyType = MappingProxyType(
+    {family: tuple(scale for scale in ALL_SCALES if scale.family == family) for family in dict.fromkeys(scale.family for scale in ALL_SCALES)})
+SCALES_BY_NAME: MappingProxyType = MappingProxyType({scale.name: scale for scale in ALL_SCALES})
+SCALE_IDS: MappingProxyType = MappingProxyType({scale.name: scale.scale_id for scale in ALL_SCALES})
+SCALE_BITMASKS: MappingProxyType = MappingProxyType({scale.name: scale.key_mask_bytes for scale in ALL_SCALES})
+_SCALE_NOTES_BY_FAMILY = {family: MappingProxyType({scale.name: scale.notes for scale in scales}) for family, scales in SCALE_FAMILIES.items()}
+
+# Sanitize the ASCII name fields of the scale datagrams up front rather than on the first send
+for _scale in ALL_SCALES:
+    scale_name_field(_scale.name)
+del _scale
+
+def get_diminished_scales() -> tuple[Scale, ...]:
+    """Getter function for retrieving all possible diminished scale objects
 
     Returns:
-        list[Scale]: a list of diminished scale objects
+        tuple[Scale, ...]: the diminished scale objects of the registry (shared, read only)
     """
-    return [C_Diminished, Db_Diminished, D_Diminished]
+    return SCALE_FAMILIES["Diminished"]
 
 def get_diminished_scales_dict():
     """Getter function for retrieving scale objects as a dictionary 
 
     Returns:
-        dict: a dictionary of name: list of notes pairs 
+        MappingProxyType: a read only dictionary of name: notes pairs
     """
-    scales = get_diminished_scales()
-    return {scale.name: scale.notes for scale in scales}
+    return _SCALE_NOTES_BY_FAMILY["Diminished"]
 
-def get_major_scales():
-    """Getter function for retrieving a list of all possible major scale objects
+def get_major_scales() -> tuple[Scale, ...]:
+    """Getter function for retrieving all possible major scale objects
 
     Returns:
-        list[Scale]: a list of major scale objects
+        tuple[Scale, ...]: the major scale objects of the registry (shared, read only)
     """
-    return [C_Major, Db_Major, D_Major, Eb_Major, E_Major, F_Major, 
-            Gb_Major, G_Major, Ab_Major, A_Major, Bb_Major, B_Major]
-    
+    return SCALE_FAMILIES["Ionian"]
+
 def get_major_scales_dict():
     """Getter function for retrieving scale objects as a dictionary 
 
     Returns:
-        dict: a dictionary of name: list of notes pairs 
+        MappingProxyType: a read only dictionary of name: notes pairs
     """
-    scales = get_major_scales()
-    return {scale.name: scale.notes for scale in scales}
+    return _SCALE_NOTES_BY_FAMILY["Ionian"]
 
-def get_harmonic_minor_scales():
-    """Getter function for retrieving a list of all possible harmonic minor scale objects
+def get_harmonic_minor_scales() -> tuple[Scale, ...]:
+    """Getter function for retrieving all possible harmonic minor scale objects
 
     Returns:
-        list[Scale]: a list of harmonic minor scale objects
+        tuple[Scale, ...]: the harmonic minor scale objects of the registry (shared, read only)
     """
-    return [C_Harmonic_Minor, Db_Harmonic_Minor, D_Harmonic_Minor, Eb_Harmonic_Minor, 
-            E_Harmonic_Minor, F_Harmonic_Minor, Gb_Harmonic_Minor, G_Harmonic_Minor, 
-            Ab_Harmonic_Minor, A_Harmonic_Minor, Bb_Harmonic_Minor, B_Harmonic_Minor]
-    
+    return SCALE_FAMILIES["Harmonic Minor"]
+
 def get_harmonic_minor_scales_dict():
     """Getter function for retrieving scale objects as a dictionary 
 
     Returns:
-        dict: a dictionary of name: list of notes pairs 
+        MappingProxyType: a read only dictionary of name: notes pairs
     """
-    scales = get_harmonic_minor_scales()
-    return {scale.name: scale.notes for scale in scales}
+    return _SCALE_NOTES_BY_FAMILY["Harmonic Minor"]
 
-def get_harmonic_major_scales():
-    """Getter function for retrieving a list of all possible harmonic major scale objects
+def get_harmonic_major_scales() -> tuple[Scale, ...]:
+    """Getter function for retrieving all possible harmonic major scale objects
 
     Returns:
-        list[Scale]: a list of harmonic major scale objects
+        tuple[Scale, ...]: the harmonic major scale objects of the registry (shared, read only)
     """
-    return [C_Harmonic_Major, Db_Harmonic_Major, D_Harmonic_Major, Eb_Harmonic_Major, 
-            E_Harmonic_Major, F_Harmonic_Major, Gb_Harmonic_Major, G_Harmonic_Major, 
-            Ab_Harmonic_Major, A_Harmonic_Major, Bb_Harmonic_Major, B_Harmonic_Major]
-    
+    return SCALE_FAMILIES["Harmonic Major"]
+
 def get_harmonic_major_scales_dict():
     """Getter function for retrieving scale objects as a dictionary 
 
     Returns:
-        dict: a dictionary of name: list of notes pairs 
+        MappingProxyType: a read only dictionary of name: notes pairs
     """
-    scales = get_harmonic_major_scales()
-    return {scale.name: scale.notes for scale in scales}
+    return _SCALE_NOTES_BY_FAMILY["Harmonic Major"]
 
-def get_melodic_minor_scales():
-    """Getter function for retrieving a list of all possible melodic minor scale objects
+def get_melodic_minor_scales() -> tuple[Scale, ...]:
+    """Getter function for retrieving all possible melodic minor scale objects
 
     Returns:
-        list[Scale]: a list of melodic minor scale objects
+        tuple[Scale, ...]: the melodic minor scale objects of the registry (shared, read only)
     """
-    return [C_Melodic_Minor, Db_Melodic_Minor, D_Melodic_Minor, Eb_Melodic_Minor, E_Melodic_Minor, F_Melodic_Minor, 
-            Gb_Melodic_Minor, G_Melodic_Minor, Ab_Melodic_Minor, A_Melodic_Minor, Bb_Melodic_Minor, B_Melodic_Minor]
+    return SCALE_FAMILIES["Melodic Minor"]
 
 def get_melodic_minor_scales_dict():
     """Getter function for retrieving scale objects as a dictionary 
 
     Returns:
-        dict: a dictionary of name: list of notes pairs 
+        MappingProxyType: a read only dictionary of name: notes pairs
     """
-    scales = get_melodic_minor_scales()
-    return {scale.name: scale.notes for scale in scales}
+    return _SCALE_NOTES_BY_FAMILY["Melodic Minor"]
 
-def get_diminished_blues_scales():
-    """Getter function for retrieving a list of all possible diminished blues scale objects
+def get_diminished_blues_scales() -> tuple[Scale, ...]:
+    """Getter function for retrieving all possible diminished blues scale objects
 
     Returns:
-        list[Scale]: a list of diminished blues scale objects
+        tuple[Scale, ...]: the diminished blues scale objects of the registry (shared, read only)
     """
-    return [C_Diminished_Blues, Db_Diminished_Blues, D_Diminished_Blues, Eb_Diminished_Blues, E_Diminished_Blues, F_Diminished_Blues,
-            Gb_Diminished_Blues, G_Diminished_Blues, Ab_Diminished_Blues, A_Diminished_Blues, Bb_Diminished_Blues, B_Diminished_Blues]
+    return SCALE_FAMILIES["Diminished Blues"]
 
 def get_diminished_blues_scales_dict():
     """Getter function for retrieving scale objects as a dictionary 
 
     Returns:
-        dict: a dictionary of name: list of notes pairs 
+        MappingProxyType: a read only dictionary of name: notes pairs
     """
-    scales = get_diminished_blues_scales()
-    return {scale.name: scale.notes for scale in scales}
+    return _SCALE_NOTES_BY_FAMILY["Diminished Blues"]
 
-def get_diminished_harmonic_scales():
-    """Getter function for retrieving a list of all possible diminished harmonic scale objects
+def get_diminished_harmonic_scales() -> tuple[Scale, ...]:
+    """Getter function for retrieving all possible diminished harmonic scale objects
 
     Returns:
-        list[Scale]: a list of diminished harmonic scale objects
+        tuple[Scale, ...]: the diminished harmonic scale objects of the registry (shared, read only)
     """
-    return [C_Diminished_Harmonic, Db_Diminished_Harmonic, D_Diminished_Harmonic, Eb_Diminished_Harmonic, E_Diminished_Harmonic, F_Diminished_Harmonic,
-            Gb_Diminished_Harmonic, G_Diminished_Harmonic, Ab_Diminished_Harmonic, A_Diminished_Harmonic, Bb_Diminished_Harmonic, B_Diminished_Harmonic]
+    return SCALE_FAMILIES["Diminished Harmonic"]
 
 def get_diminished_harmonic_scales_dict():
     """Getter function for retrieving scale objects as a dictionary 
 
     Returns:
-        dict: a dictionary of name: list of notes pairs 
+        MappingProxyType: a read only dictionary of name: notes pairs
     """
-    scales = get_diminished_harmonic_scales()
-    return {scale.name: scale.notes for scale in scales}
+    return _SCALE_NOTES_BY_FAMILY["Diminished Harmonic"]
 
-def get_whole_tone_scales():
-    """Getter function for retrieving a list of all possible whole tone scale objects
+def get_whole_tone_scales() -> tuple[Scale, ...]:
+    """Getter function for retrieving all possible whole tone scale objects
 
     Returns:
-        list[Scale]: a list of whole tone scale objects
+        tuple[Scale, ...]: the whole tone scale objects of the registry (shared, read only)
     """
-    return [C_Whole_Tone, Db_Whole_Tone]
+    return SCALE_FAMILIES["Whole Tone"]
 
 def get_whole_tone_scales_dict():
     """Getter function for retrieving scale objects as a dictionary 
 
     Returns:
-        dict: a dictionary of name: list of notes pairs 
+        MappingProxyType: a read only dictionary of name: notes pairs
     """
-    scales = get_whole_tone_scales()
-    return {scale.name: scale.notes for scale in scales}
+    return _SCALE_NOTES_BY_FAMILY["Whole Tone"]
 
-def get_pentatonic_scales():
-    """Getter function for retrieving a list of all possible pentatonic scale objects
+def get_pentatonic_scales() -> tuple[Scale, ...]:
+    """Getter function for retrieving all possible pentatonic scale objects
 
     Returns:
-        list[Scale]: a list of pentatonic scale objects
+        tuple[Scale, ...]: the pentatonic scale objects of the registry (shared, read only)
     """
-    return [C_Pentatonic, Db_Pentatonic, D_Pentatonic, Eb_Pentatonic, E_Pentatonic, F_Pentatonic,
-            Gb_Pentatonic, G_Pentatonic, Ab_Pentatonic, A_Pentatonic, Bb_Pentatonic, B_Pentatonic]
+    return SCALE_FAMILIES["Pentatonic"]
 
 def get_pentatonic_scales_dict():
     """Getter function for retrieving scale objects as a dictionary 
 
     Returns:
-        dict: a dictionary of name: list of notes pairs 
+        MappingProxyType: a read only dictionary of name: notes pairs
+    """
+    return _SCALE_NOTES_BY_FAMILY["Pentatonic"]
+
+def get_all_scales() -> tuple[Scale, ...]:
+    """Getter function for retrieving every scale object of every family in a fixed order. The position of a scale in
+    this tuple is its scale ID (see SharedState).
+
+    Returns:
+        tuple[Scale, ...]: all scale objects of the registry (shared, read only)
+    """
+    return ALL_SCALES
+
+def get_scale(name: str) -> Scale:
+    """Look up a scale of the registry by name, e.g. "D\u266d Major"
+
+    Raises:
+        KeyError: if there is no scale of that name
     """
-    scales = get_pentatonic_scales()
-    return {scale.name: scale.notes for scale in scales}
\ No newline at end of file
+    return SCALES_BY_NAME[name]
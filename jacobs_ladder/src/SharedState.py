@@ -0,0 +1,172 @@
+"""Shared-memory state channel between the MidiController and local front ends.
+
+The live state is published in a memory-mapped file guarded by a seqlock, so readers poll it at their own frame
+rate instead of reconstructing it from UDP type-1 and type-2 datagrams.
+
+Layout (little-endian unless noted, 4096 bytes):
+
+    Offset  Size    Field
+    0       4       magic b"JLST"
+    4       2       layout version (1)
+    6       2       voice capacity (88)
+    8       2       candidate scale capacity (96)
+    10      2       voice record size in bytes (25)
+    12      4       reserved
+    16      8       sequence number (u64), odd while a write is in progress
+    24      8       time of the last publish (u64, time.monotonic_ns of the writer)
+    32      11      88-key live key mask, bit 0 of byte 0 is MIDI note 21 (A0)
+    43      1       voice count (u8)
+    44      2       current key scale ID (u16, 0xFFFF when unknown)
+    46      2       candidate scale count (u16)
+    48      192     candidate scale IDs (u16 each)
+    240     16      reserved
+    256     88*25   voice table
+
+Voice records use the type-2 UDP entry format: note, instance index, status and velocity (u8 each) followed by the
+21 byte PitchInfo.serialize() encoding (big-endian). Scale IDs index Scales.get_all_scales().
+
+Reading: load the sequence number and retry while it is odd, copy the region, then load the sequence number again
+and retry if it changed.
+"""
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+from dataclasses import dataclass
+
+from .KeyMask import MASK_BYTES
+from .Pitch import PitchInfo
+from .Voice import Voice
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+MAGIC = b"JLST"
+LAYOUT_VERSION = 1
+MAX_VOICES = 88
+MAX_CANDIDATES = 96
+VOICE_RECORD_SIZE = 25
+NO_SCALE = 0xFFFF
+REGION_SIZE = 4096
+
+SEQUENCE_OFFSET = 16
+STATE_OFFSET = 24
+CANDIDATES_OFFSET = 48
+VOICES_OFFSET = 256
+
+DEFAULT_SHARED_STATE_PATH = os.path.join(tempfile.gettempdir(), "jacobs_ladder_state.bin")
+
+_HEADER = struct.Struct("<4sHHHH4x")
+_SEQUENCE = struct.Struct("<Q")
+_STATE = struct.Struct(f"<Q{MASK_BYTES}sBHH")
+_CANDIDATES = struct.Struct(f"<{MAX_CANDIDATES}H")
+_VOICE = struct.Struct(">BBBBHhfh10sc")
+
+_DIRECTIONS = {b"u": "up", b"d": "down", b"n": "none"}
+
+
+@dataclass
+class SharedStateSnapshot:
+    sequence: int
+    timestamp_ns: int
+    live_keys: int
+    key_id: int
+    candidate_ids: list[int]
+    voices: list[Voice]
+
+
+class SharedStateWriter:
+    """Publishes the live state of a MidiController to a memory-mapped file"""
+
+    def __init__(self, path: str = DEFAULT_SHARED_STATE_PATH):
+        self.path = path
+        with open(path, "wb") as f:
+            f.write(bytes(REGION_SIZE))
+        self.file = open(path, "r+b")
+        self.region = mmap.mmap(self.file.fileno(), REGION_SIZE)
+        self.sequence = 0
+        _HEADER.pack_into(self.region, 0, MAGIC, LAYOUT_VERSION, MAX_VOICES, MAX_CANDIDATES, VOICE_RECORD_SIZE)
+
+    def publish(self, live_keys: bytes, voices: bytes, candidate_ids: list[int], key_id: int = NO_SCALE) -> None:
+        """Publish a new state
+
+        Args:
+            live_keys (bytes): 11 byte live key mask (KeyMask.LiveKeyMask.to_bytes)
+            voices (bytes): the message_heap packed with Utilities.pack_message_heap
+            candidate_ids (list[int]): scale IDs of the candidate scales
+            key_id (int, optional): scale ID of the current key. Defaults to NO_SCALE.
+        """
+        region = self.region
+        voice_count = min(len(voices) // VOICE_RECORD_SIZE, MAX_VOICES)
+        candidate_count = min(len(candidate_ids), MAX_CANDIDATES)
+
+        self.sequence += 1
+        _SEQUENCE.pack_into(region, SEQUENCE_OFFSET, self.sequence)
+
+        _STATE.pack_into(region, STATE_OFFSET, time.monotonic_ns(), live_keys, voice_count, key_id, candidate_count)
+        if candidate_count:
+            struct.pack_into(f"<{candidate_count}H", region, CANDIDATES_OFFSET, *candidate_ids[:candidate_count])
+        region[VOICES_OFFSET:VOICES_OFFSET + voice_count * VOICE_RECORD_SIZE] = voices[:voice_count * VOICE_RECORD_SIZE]
+
+        self.sequence += 1
+        _SEQUENCE.pack_into(region, SEQUENCE_OFFSET, self.sequence)
+
+    def close(self) -> None:
+        self.region.close()
+        self.file.close()
+
+
+class SharedStateReader:
+    """Reads snapshots of the state published by a SharedStateWriter"""
+
+    def __init__(self, path: str = DEFAULT_SHARED_STATE_PATH):
+        self.file = open(path, "rb")
+        self.region = mmap.mmap(self.file.fileno(), REGION_SIZE, access=mmap.ACCESS_READ)
+        magic, version, _, _, _ = _HEADER.unpack_from(self.region, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            raise ValueError(f"{path} is not a version {LAYOUT_VERSION} shared state region")
+
+    @property
+    def sequence(self) -> int:
+        """Current sequence number. Cheap enough to poll every frame and only call read() when it changes."""
+        return _SEQUENCE.unpack_from(self.region, SEQUENCE_OFFSET)[0]
+
+    def read(self, retries: int = 1000) -> SharedStateSnapshot | None:
+        """Take a consistent snapshot of the state
+
+        Args:
+            retries (int, optional): attempts before giving up on a writer which keeps updating. Defaults to 1000.
+
+        Returns:
+            SharedStateSnapshot | None: the snapshot or None if no consistent copy could be taken
+        """
+        for _ in range(retries):
+            before = self.sequence
+            if before & 1:
+                # Writer is mid-update; yield in case it is a thread of this process waiting on the GIL
+                time.sleep(0)
+                continue
+            data = self.region[:]
+            if self.sequence == before:
+                return self._parse(before, data)
+        return None
+
+    @staticmethod
+    def _parse(sequence: int, data: bytes) -> SharedStateSnapshot:
+        timestamp_ns, live_keys, voice_count, key_id, candidate_count = _STATE.unpack_from(data, STATE_OFFSET)
+        candidate_ids = list(_CANDIDATES.unpack_from(data, CANDIDATES_OFFSET)[:candidate_count])
+        voices = []
+        for index in range(voice_count):
+            note, instance_index, status, velocity, analog_abs, analog_rel, cents, note_order, ratio, direction = \
+                _VOICE.unpack_from(data, VOICES_OFFSET + index * VOICE_RECORD_SIZE)
+            pitch = PitchInfo(analog_abs, analog_rel, ratio.decode("ascii").strip(), cents,
+                              _DIRECTIONS.get(direction, "none"), note_order)
+            voices.append(Voice(note, instance_index, status, velocity, pitch))
+        return SharedStateSnapshot(sequence=sequence, timestamp_ns=timestamp_ns, live_keys=int.from_bytes(live_keys, "little"),
+                                   key_id=key_id, candidate_ids=candidate_ids, voices=voices)
+
+    def close(self) -> None:
+        self.region.close()
+        self.file.close()
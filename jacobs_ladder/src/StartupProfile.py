@@ -0,0 +1,115 @@
+import statistics
+import subprocess
+import sys
+
+from dataclasses import dataclass
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+# Modules which must not be imported just to start the MidiController. They are imported by the
+# features that need them (recording, offline analysis, YAML config parsing) instead.
+DEFERRED_MODULES = ("pandas", "numpy", "mido", "yaml", "bidict")
+
+
+@dataclass
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile_imports(module: str) -> list[ImportTime]:
+    """Import a module in a fresh interpreter with `-X importtime` and parse the per-module timings
+
+    Args:
+        module (str): dotted module name, e.g. "jacobs_ladder.src.MidiManager"
+
+    Returns:
+        list[ImportTime]: one entry per imported module in import order
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}:\n{result.stderr.strip().splitlines()[-1]}")
+
+    import_times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        import_times.append(ImportTime(module=stripped, self_us=int(fields[0]), cumulative_us=int(fields[1]),
+                                       depth=(len(name) - len(stripped)) // 2))
+    return import_times
+
+
+def measure_cold_import_ms(module: str, runs: int = 5) -> float:
+    """Median cumulative import time of a module over several fresh interpreters
+
+    Args:
+        module (str): dotted module name
+        runs (int, optional): number of interpreters to launch. Defaults to 5.
+
+    Returns:
+        float: median import time in milliseconds
+    """
+    samples = []
+    for _ in range(runs):
+        import_times = profile_imports(module)
+        target = next(entry for entry in reversed(import_times) if entry.module == module)
+        samples.append(target.cumulative_us / 1e3)
+    return statistics.median(samples)
+
+
+def find_deferred_imports(module: str, deferred: tuple[str, ...] = DEFERRED_MODULES) -> list[str]:
+    """Return the deferred modules that are (wrongly) imported as a side effect of importing a module
+
+    Args:
+        module (str): dotted module name
+        deferred (tuple[str, ...], optional): top level package names to check. Defaults to DEFERRED_MODULES.
+
+    Returns:
+        list[str]: deferred packages found in sys.modules after the import
+    """
+    imported = {entry.module.split(".")[0] for entry in profile_imports(module)}
+    return [name for name in deferred if name in imported]
+
+
+def print_import_breakdown(module: str, top: int = 20) -> None:
+    """Print the slowest imports (by self time) and the top level packages (by cumulative time) of a module
+
+    Args:
+        module (str): dotted module name
+        top (int, optional): how many rows to print per table. Defaults to 20.
+    """
+    import_times = profile_imports(module)
+    total_us = next(entry for entry in reversed(import_times) if entry.module == module).cumulative_us
+
+    packages = {}
+    for entry in import_times:
+        package = entry.module.split(".")[0]
+        packages[package] = packages.get(package, 0) + entry.self_us
+
+    print(f"Import time of {module}: {total_us / 1e3:.2f} ms ({len(import_times)} modules)\n")
+    print(f"{'self (ms)':>10}  {'cumulative (ms)':>15}  module")
+    for entry in sorted(import_times, key=lambda entry: entry.self_us, reverse=True)[:top]:
+        print(f"{entry.self_us / 1e3:>10.2f}  {entry.cumulative_us / 1e3:>15.2f}  {entry.module}")
+
+    print(f"\n{'total (ms)':>10}  {'share':>6}  package")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"{self_us / 1e3:>10.2f}  {100 * self_us / total_us:>5.1f}%  {package}")
+
+    loaded_deferred = [name for name in DEFERRED_MODULES if name in packages]
+    if loaded_deferred:
+        print(f"\nWarning: deferred modules imported at startup: {', '.join(loaded_deferred)}")
+
+
+if __name__ == "__main__":
+    print_import_breakdown(sys.argv[1] if len(sys.argv) > 1 else "jacobs_ladder.src.MidiManager")
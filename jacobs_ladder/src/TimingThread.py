@@ -0,0 +1,202 @@
+import heapq
+import itertools
+import threading
+
+from .Clock import Clock, MonotonicClock
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+NOTE_ON_STATUS = 0x90
+NOTE_OFF_STATUS = 0x80
+
+
+class PlaybackHandle:
+    """A sequence of MIDI messages scheduled on a TimingThread. Returned immediately by TimingThread.schedule."""
+
+    def __init__(self, timing_thread: "TimingThread", send_message, start_time: float, end_time: float):
+        self.timing_thread = timing_thread
+        self.send_message = send_message
+        self.start_time = start_time
+        self.end_time = end_time
+        self.cancelled = False
+        self.finished = threading.Event()
+
+        # Notes this sequence has turned on and not yet off, as (channel, note), silenced on cancel
+        self.sounding: set[tuple[int, int]] = set()
+        self.pending = 0
+
+    @property
+    def done(self) -> bool:
+        return self.finished.is_set()
+
+    def cancel(self) -> None:
+        """Drop the remaining messages of this sequence and turn off the notes it left sounding"""
+        self.timing_thread.cancel(self)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the sequence has played out or has been cancelled
+
+        Args:
+            timeout (float | None, optional): seconds to wait. Defaults to None (wait forever).
+
+        Returns:
+            bool: True if the sequence is done
+        """
+        return self.finished.wait(timeout)
+
+
+class TimingThread:
+    """A single thread that sends scheduled MIDI messages for any number of overlapping sequences.
+
+    Every message is kept in one heap ordered by its absolute due time, so sequences never spawn threads of their own
+    and the timing of one sequence does not drift with the length of the ones before it.
+    """
+
+    def __init__(self, clock: Clock = None):
+        """Create the (not yet started) timing thread
+
+        Args:
+            clock (Clock, optional): time source. Defaults to a MonotonicClock.
+        """
+        self.clock = clock or MonotonicClock()
+        self._heap: list[tuple[float, int, PlaybackHandle, object, list[int] | None]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        # Called with the role "timing" on the thread itself as it starts, e.g. RealTimeMode.setup_thread
+        self.thread_setup = None
+
+    @property
+    def native_id(self) -> int | None:
+        """Kernel thread id of the running thread, None if it is not running"""
+        thread = self._thread
+        return thread.native_id if thread is not None and thread.is_alive() else None
+
+    def schedule(self, send_message, events: list[tuple[float, list[int]]], after: PlaybackHandle = None,
+                 delay: float = 0.0, length: float = None) -> PlaybackHandle:
+        """Schedule a sequence of messages and return without waiting for it
+
+        Args:
+            send_message (callable): sends one message, usually rtmidi.MidiOut.send_message
+            events (list[tuple[float, list[int]]]): (offset in seconds from the start, message) pairs
+            after (PlaybackHandle, optional): start when this sequence is due to end instead of now. Defaults to None.
+            delay (float, optional): seconds to wait before starting. Defaults to 0.0.
+            length (float, optional): seconds the sequence occupies, which is where a sequence scheduled after it
+                starts. Defaults to the offset of its last message.
+
+        Returns:
+            PlaybackHandle: handle to cancel or wait for the sequence
+        """
+        with self._condition:
+            start_time = self.clock.now()
+            if after is not None and not after.cancelled:
+                start_time = max(start_time, after.end_time)
+            start_time += delay
+            if length is None:
+                length = max((offset for offset, _ in events), default=0.0)
+            end_time = start_time + length
+
+            handle = PlaybackHandle(self, send_message, start_time, end_time)
+            handle.pending = len(events)
+            for offset, message in events:
+                heapq.heappush(self._heap, (start_time + offset, next(self._counter), handle, send_message, message))
+            if not events:
+                handle.finished.set()
+
+            self._ensure_started()
+            self.clock.notify(self._condition)
+        return handle
+
+    def cancel(self, handle: PlaybackHandle) -> None:
+        """Cancel a sequence. Its remaining heap entries are skipped when they come due."""
+        with self._condition:
+            if handle.done or handle.cancelled:
+                return
+            handle.cancelled = True
+            # Silence the sequence from the timing thread so rtmidi is only ever called from one thread
+            heapq.heappush(self._heap, (self.clock.now(), next(self._counter), handle, None, None))
+            self.clock.notify(self._condition)
+
+    def stop(self) -> None:
+        """Stop the thread, dropping everything still scheduled"""
+        with self._condition:
+            self._closed = True
+            for _, _, handle, _, _ in self._heap:
+                handle.cancelled = True
+                handle.finished.set()
+            self._heap.clear()
+            self.clock.notify(self._condition)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._closed = False
+            self._thread = self.clock.start_thread(self._run, name="TimingThread")
+
+    def _run(self) -> None:
+        if self.thread_setup is not None:
+            self.thread_setup("timing")
+        heap = self._heap
+        condition = self._condition
+        clock = self.clock
+        while True:
+            with condition:
+                # Wait on the condition so new sequences and cancels interrupt it, then spin for the last stretch
+                while not self._closed and (not heap or heap[0][0] - clock.now() > clock.spin_threshold):
+                    clock.wait_until(condition, heap[0][0] if heap else None)
+                if self._closed:
+                    return
+                target = heap[0][0]
+
+            clock.spin_until(target)
+
+            # Take everything that is due in one pass (chords share a due time)
+            with condition:
+                now = max(target, clock.now())
+                due = []
+                while heap and heap[0][0] <= now:
+                    due.append(heapq.heappop(heap))
+
+            for _, _, handle, send_message, message in due:
+                if send_message is None:
+                    self._silence(handle)
+                elif not handle.cancelled:
+                    self._send(handle, send_message, message)
+
+    def _send(self, handle: PlaybackHandle, send_message, message: list[int]) -> None:
+        """Send one message of a sequence and track the notes it leaves sounding"""
+        send_message(message)
+        kind = message[0] & 0xF0
+        if kind == NOTE_ON_STATUS and message[2] > 0:
+            handle.sounding.add((message[0] & 0x0F, message[1]))
+        elif kind in (NOTE_ON_STATUS, NOTE_OFF_STATUS):
+            handle.sounding.discard((message[0] & 0x0F, message[1]))
+
+        handle.pending -= 1
+        if handle.pending == 0:
+            handle.finished.set()
+
+    def _silence(self, handle: PlaybackHandle) -> None:
+        """Turn off the notes a cancelled sequence left sounding"""
+        for channel, note in handle.sounding:
+            handle.send_message([NOTE_OFF_STATUS | channel, note, 0])
+        handle.sounding.clear()
+        handle.finished.set()
+
+
+# The timing thread shared by every MidiInjector in the process
+_shared_timing_thread: TimingThread | None = None
+_shared_timing_thread_lock = threading.Lock()
+
+
+def get_shared_timing_thread() -> TimingThread:
+    """Return the process-wide TimingThread, creating it on first use"""
+    global _shared_timing_thread
+    with _shared_timing_thread_lock:
+        if _shared_timing_thread is None:
+            _shared_timing_thread = TimingThread()
+        return _shared_timing_thread
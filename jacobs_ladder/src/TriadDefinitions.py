@@ -1,207 +1,206 @@
-import numpy as np
+from functools import cache
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+LOWEST_NOTE = 21
+HIGHEST_NOTE = 108
+
+# Triad families as (name, close-position intervals or a list of them), in the order MusicTheory.get_triad names them.
+# A spread voicing whose intervals belong to more than one family is named after the first.
+TRIAD_INTERVALS = (
+    ("major_triad",                   [[4, 3], [7, 9]]),
+    ("major_triad_1st_inv",           [3, 5]),
+    ("major_triad_1st_inv_var",       [8, 7]),
+    ("major_triad_2nd_inv",           [5, 4]),
+    ("major_triad_2nd_inv_var",       [9, 8]),
+    ("minor_triad",                   [[3, 4], [7, 8]]),
+    ("minor_triad_1st_inv",           [4, 5]),
+    ("minor_triad_1st_inv_var",       [9, 7]),
+    ("minor_triad_2nd_inv",           [5, 3]),
+    ("minor_triad_2nd_inv_var",       [8, 9]),
+    ("add2",                          [2, 2]),
+    ("add2_1st_inv",                  [2, 8]),
+    ("add2_2nd_inv",                  [8, 2]),
+    ("diminished",                    [[3, 3], [6, 9]]),
+    ("augmented",                     [[4, 4], [8, 8]]),
+    ("eleven_sus4",                   [[5, 5], [10, 7]]),
+    ("sus2",                          [2, 5]),
+    ("nine_chord",                    [7, 7]),
+    ("sus4",                          [5, 2]),
+    ("eleven_chord",                  [7, 10]),
+    ("dominant_no_third",             [7, 3]),
+    ("dominant_no_third_1st_inv",     [3, 2]),
+    ("dominant_no_third_2nd_inv",     [2, 7]),
+    ("dominant_no_fifth",             [4, 6]),
+    ("dominant_no_fifth_1st_inv",     [6, 2]),
+    ("dominant_no_fifth_2nd_inv",     [2, 4]),
+    ("min6",                          [3, 6]),
+    ("min6_1st_inv",                  [6, 3]),
+    ("maj7_no_third",                 [7, 4]),
+    ("maj7_no_third_1st_inv",         [4, 1]),
+    ("maj7_no_third_2nd_inv",         [1, 7]),
+    ("maj7_no_fifth",                 [[4, 7], [11, 5]]),
+    ("maj7_no_fifth_1st_inv",         [7, 1]),
+    ("maj7_no_fifth_2nd_inv",         [1, 4]),
+    ("mush",                          [[1, 1], [1, 10], [10, 1], [11, 2], [2, 11], [11, 11], [9, 4]]),
+    ("maj7_add2",                     [2, 9]),
+    ("maj7_add2_1st_inv",             [9, 1]),
+    ("maj7_add2_2nd_inv",             [1, 2]),
+    ("dim_maj7_no_fifth",             [3, 8]),
+    ("dim_maj7_no_fifth_1st_inv",     [8, 1]),
+    ("dim_maj7_no_fifth_2nd_inv",     [1, 3]),
+    ("sus_maj47",                     [5, 6]),
+    ("sus_maj47_1st_inv",             [6, 1]),
+    ("sus_maj47_2nd_inv",             [1, 5]),
+    ("maj7_flat5",                    [6, 5]),
+    ("maj7_flat5_1st_inv",            [5, 1]),
+    ("maj7_flat5_2nd_inv",            [1, 6]),
+    ("majmin",                        [[3, 1], [4, 11]]),
+    ("aug_maj7_3rd_inv_no_third",     [1, 8]),
+    ("aug_maj7_no_third",             [8, 3]),
+    ("sus67",                         [9, 2]),
+    ("min_add2_no_fifth",             [2, 1]),
+    ("min_add2_no_fifth_1st_inv",     [1, 9]),
+    ("min7_no5",                      [[3, 7], [10, 5]]),
+    ("sus56",                         [[7, 2], [8, 11]]),
+    ("min7_no5_2nd_inv",              [2, 3]),
+    ("major_flat5",                   [4, 2]),
+    ("major_flat5_1st_inv",           [2, 6]),
+    ("major_flat5_2nd_inv",           [6, 4]),
+    ("maj79",                         [11, 3]),
+    ("maj79_1st_inv",                 [3, 10]),
+    ("maj79_2nd_inv",                 [10, 11]),
+    ("maj_flat9",                     [4, 9]),
+    ("maj_flat9_1st_inv",             [9, 11]),
+    ("maj_flat9_2nd_inv",             [11, 4]),
+    ("maj_add9",                      [4, 10]),
+    ("maj_add9_1st_inv",              [10, 10]),
+    ("maj_add9_2nd_inv",              [10, 4]),
+    ("maj7_flat13",                   [11, 9]),
+    ("sus4_flat9",                    [5, 8]),
+    ("sus49",                         [5, 9]),
+    ("sus49_1st_inv",                 [9, 10]),
+    ("min_sus4",                      [5, 10]),
+    ("dominant_no_third_var",         [10, 9]),
+    ("six_nine",                      [9, 5]),
+    ("maj7_no_third_var",             [11, 8]),
+    ("maj7_no_third_var_1st_inv",     [8, 5]),
+    ("maj7_no_third_var_2nd_inv",     [5, 11]),
+    ("sharp11_no_third",              [7, 11]),
+    ("sharp11_no_third_1st_inv",      [11, 6]),
+    ("sharp11_no_third_2nd_inv",      [6, 7]),
+    ("dominant_no_fifth_var",         [10, 6]),
+    ("dominant_no_fifth_var_1st_inv", [6, 8]),
+    ("dominant_no_fifth_var_2nd_inv", [8, 10]),
+    ("maj_flat5_var",                 [6, 10]),
+    ("maj_flat5_var_1st_inv",         [10, 8]),
+    ("maj_flat5_var_2nd_inv",         [8, 6]),
+    ("maj7_flat5_var",                [11, 7]),
+    ("maj7_flat5_var_1st_inv",        [7, 6]),
+    ("maj7_flat5_var_2nd_inv",        [6, 11]),
+    ("min6_var",                      [9, 6]),
+    ("min6_var_2nd_inv",              [9, 9]),
+    ("min9_no5",                      [3, 11]),
+    ("min9_no5_1st_inv",              [11, 10]),
+    ("min9_no5_2nd_inv",              [10, 3]),
+)
+_FAMILY_INTERVALS = dict(TRIAD_INTERVALS)
+
+
+def interval_key(first_interval: int, second_interval: int) -> int:
+    """Integer hash key of a spread interval set (both intervals are below 88 on a piano)"""
+    return first_interval << 7 | second_interval
+
+
+def spread_interval_sets(intervals: list) -> list[tuple[int, int]]:
+    """Every spread of close-position triad intervals by whole octaves that still fits on a piano
+
+    Args:
+        intervals (list): [first, second] or a list of them
+
+    Returns:
+        list[tuple[int, int]]: the (first, second) interval sets
+    """
+    interval_lists = intervals if all(isinstance(item, list) for item in intervals) else [intervals]
+    span = HIGHEST_NOTE - LOWEST_NOTE
+    return [(valid_first_interval, valid_second_interval)
+            for first_interval, second_interval in interval_lists
+            for valid_first_interval in range(first_interval, span - second_interval + 1, 12)
+            for valid_second_interval in range(second_interval, span - valid_first_interval + 1, 12)]
+
+
+@cache
+def get_triad_lookup() -> dict[int, str]:
+    """The interval_key -> family name lookup of every triad family, built once per process"""
+    triads = {}
+    for name, intervals in TRIAD_INTERVALS:
+        for first_interval, second_interval in spread_interval_sets(intervals):
+            triads.setdefault(interval_key(first_interval, second_interval), name)
+    return triads
 
 
 class TriadDefinitions:
     """TraidDefinitions are used for classifying as many 3 note chord combinations as possible for the purposes of 
-    chord identification, and display to the user"""
+    chord identification, and display to the user.
+
+    The valid spread interval sets of every family are precomputed once per process into one integer-keyed dict
+    mapping to the family name, so classifying a voicing is a single hash lookup. The interval sets of a single family
+    (e.g. self.major_triad, for query()) are built on first access.
+    """
     
     def __init__(self):
-        self.major_triad = self.determine_valid_interval_sets(intervals=[[4, 3], [7, 9]])
-        self.major_triad_1st_inv = self.determine_valid_interval_sets(intervals=[3, 5])
-        self.major_triad_1st_inv_var = self.determine_valid_interval_sets(intervals=[8, 7])
-        self.major_triad_2nd_inv = self.determine_valid_interval_sets(intervals=[5, 4])
-        self.major_triad_2nd_inv_var = self.determine_valid_interval_sets(intervals=[9, 8])
-        self.minor_triad = self.determine_valid_interval_sets(intervals=[[3, 4], [7, 8]]) 
-        self.minor_triad_1st_inv = self.determine_valid_interval_sets(intervals=[4, 5]) 
-        self.minor_triad_1st_inv_var = self.determine_valid_interval_sets(intervals=[9, 7]) 
-        self.minor_triad_2nd_inv = self.determine_valid_interval_sets(intervals=[5, 3]) 
-        self.minor_triad_2nd_inv_var = self.determine_valid_interval_sets(intervals=[8, 9]) 
-        self.add2 = self.determine_valid_interval_sets(intervals=[2, 2])
-        self.add2_1st_inv = self.determine_valid_interval_sets(intervals=[2, 8])
-        self.add2_2nd_inv = self.determine_valid_interval_sets(intervals=[8, 2])
-        self.diminished = self.determine_valid_interval_sets(intervals=[[3, 3], [6, 9]]) 
-        self.augmented = self.determine_valid_interval_sets(intervals=[[4, 4], [8, 8]]) 
-        self.eleven_sus4 = self.determine_valid_interval_sets(intervals=[[5, 5], [10, 7]]) 
-        self.sus2 = self.determine_valid_interval_sets(intervals=[2, 5]) 
-        self.nine_chord = self.determine_valid_interval_sets(intervals=[7, 7]) 
-        self.sus4 = self.determine_valid_interval_sets(intervals=[5, 2]) 
-        self.eleven_chord = self.determine_valid_interval_sets(intervals=[7, 10]) 
-        self.dominant_no_third = self.determine_valid_interval_sets(intervals=[7, 3]) 
-        self.dominant_no_third_1st_inv = self.determine_valid_interval_sets(intervals=[3, 2])
-        self.dominant_no_third_2nd_inv = self.determine_valid_interval_sets(intervals=[2, 7])
-        self.dominant_no_fifth = self.determine_valid_interval_sets(intervals=[4, 6])
-        self.dominant_no_fifth_1st_inv = self.determine_valid_interval_sets(intervals=[6, 2])
-        self.dominant_no_fifth_2nd_inv = self.determine_valid_interval_sets(intervals=[2, 4])
-        self.min6 = self.determine_valid_interval_sets(intervals=[3, 6])
-        self.min6_1st_inv = self.determine_valid_interval_sets(intervals=[6, 3])
-        self.maj7_no_third = self.determine_valid_interval_sets(intervals=[7, 4])
-        self.maj7_no_third_1st_inv = self.determine_valid_interval_sets(intervals=[4, 1])
-        self.maj7_no_third_2nd_inv = self.determine_valid_interval_sets(intervals=[1, 7])
-        self.maj7_no_fifth = self.determine_valid_interval_sets(intervals=[[4, 7], [11, 5]])
-        self.maj7_no_fifth_1st_inv = self.determine_valid_interval_sets(intervals=[7, 1])
-        self.maj7_no_fifth_2nd_inv = self.determine_valid_interval_sets(intervals=[1, 4])
-        self.mush = self.determine_valid_interval_sets(intervals=[[1, 1], [1, 10], [10, 1], [11, 2], [2, 11], [11, 11], [9, 4]])
-        self.maj7_add2 = self.determine_valid_interval_sets(intervals=[2, 9])
-        self.maj7_add2_1st_inv = self.determine_valid_interval_sets(intervals=[9, 1])
-        self.maj7_add2_2nd_inv = self.determine_valid_interval_sets(intervals=[1, 2])
-        self.dim_maj7_no_fifth = self.determine_valid_interval_sets(intervals=[3, 8])
-        self.dim_maj7_no_fifth_1st_inv = self.determine_valid_interval_sets(intervals=[8, 1])
-        self.dim_maj7_no_fifth_2nd_inv = self.determine_valid_interval_sets(intervals=[1, 3])
-        self.sus_maj47 = self.determine_valid_interval_sets(intervals=[5, 6])
-        self.sus_maj47_1st_inv = self.determine_valid_interval_sets(intervals=[6, 1])
-        self.sus_maj47_2nd_inv = self.determine_valid_interval_sets(intervals=[1, 5])
-        self.maj7_flat5 = self.determine_valid_interval_sets(intervals=[6, 5])
-        self.maj7_flat5_1st_inv = self.determine_valid_interval_sets(intervals=[5, 1])
-        self.maj7_flat5_2nd_inv = self.determine_valid_interval_sets(intervals=[1, 6])
-        self.majmin = self.determine_valid_interval_sets(intervals=[[3, 1], [4, 11]])
-        self.aug_maj7_3rd_inv_no_third = self.determine_valid_interval_sets(intervals=[1, 8])
-        self.aug_maj7_no_third = self.determine_valid_interval_sets(intervals=[8, 3])
-        self.sus67 = self.determine_valid_interval_sets(intervals=[9, 2])
-        self.min_add2_no_fifth = self.determine_valid_interval_sets(intervals=[2, 1])
-        self.min_add2_no_fifth_1st_inv = self.determine_valid_interval_sets(intervals=[1, 9])
-        self.min7_no5 = self.determine_valid_interval_sets(intervals=[[3, 7], [10, 5]])
-        self.sus56 = self.determine_valid_interval_sets(intervals=[[7, 2], [8, 11]])
-        self.min7_no5_2nd_inv = self.determine_valid_interval_sets(intervals=[2, 3])
-        self.major_flat5 = self.determine_valid_interval_sets(intervals=[4, 2])
-        self.major_flat5_1st_inv = self.determine_valid_interval_sets(intervals=[2, 6])
-        self.major_flat5_2nd_inv = self.determine_valid_interval_sets(intervals=[6, 4])
-        self.maj79 = self.determine_valid_interval_sets(intervals=[11, 3])
-        self.maj79_1st_inv = self.determine_valid_interval_sets(intervals=[3, 10])
-        self.maj79_2nd_inv = self.determine_valid_interval_sets(intervals=[10, 11])
-        self.maj_flat9 = self.determine_valid_interval_sets(intervals=[4, 9])
-        self.maj_flat9_1st_inv = self.determine_valid_interval_sets(intervals=[9, 11])
-        self.maj_flat9_2nd_inv = self.determine_valid_interval_sets(intervals=[11, 4])
-        self.maj_add9 = self.determine_valid_interval_sets(intervals=[4, 10])
-        self.maj_add9_1st_inv = self.determine_valid_interval_sets(intervals=[10, 10])
-        self.maj_add9_2nd_inv = self.determine_valid_interval_sets(intervals=[10, 4])
-        self.maj7_flat13 = self.determine_valid_interval_sets(intervals=[11, 9])
-        self.sus4_flat9 = self.determine_valid_interval_sets(intervals=[5, 8])
-        self.sus49 = self.determine_valid_interval_sets(intervals=[5, 9])
-        self.sus49_1st_inv = self.determine_valid_interval_sets(intervals=[9, 10])
-        self.min_sus4 = self.determine_valid_interval_sets(intervals=[5, 10])
-        self.dominant_no_third_var = self.determine_valid_interval_sets(intervals=[10, 9])
-        self.six_nine = self.determine_valid_interval_sets(intervals=[9, 5])
-        self.maj7_no_third_var = self.determine_valid_interval_sets(intervals=[11, 8])
-        self.maj7_no_third_var_1st_inv = self.determine_valid_interval_sets(intervals=[8, 5])
-        self.maj7_no_third_var_2nd_inv = self.determine_valid_interval_sets(intervals=[5, 11])
-        self.sharp11_no_third = self.determine_valid_interval_sets(intervals=[7, 11])
-        self.sharp11_no_third_1st_inv = self.determine_valid_interval_sets(intervals=[11, 6])
-        self.sharp11_no_third_2nd_inv = self.determine_valid_interval_sets(intervals=[6, 7])
-        self.dominant_no_fifth_var = self.determine_valid_interval_sets(intervals=[10, 6])
-        self.dominant_no_fifth_var_1st_inv = self.determine_valid_interval_sets(intervals=[6, 8])
-        self.dominant_no_fifth_var_2nd_inv = self.determine_valid_interval_sets(intervals=[8, 10])
-        self.maj_flat5_var = self.determine_valid_interval_sets(intervals=[6, 10])
-        self.maj_flat5_var_1st_inv = self.determine_valid_interval_sets(intervals=[10, 8])
-        self.maj_flat5_var_2nd_inv = self.determine_valid_interval_sets(intervals=[8, 6])
-        self.maj7_flat5_var = self.determine_valid_interval_sets(intervals=[11, 7])
-        self.maj7_flat5_var_1st_inv = self.determine_valid_interval_sets(intervals=[7, 6])
-        self.maj7_flat5_var_2nd_inv = self.determine_valid_interval_sets(intervals=[6, 11])
-        self.min6_var = self.determine_valid_interval_sets(intervals=[9, 6])
-        self.min6_var_2nd_inv = self.determine_valid_interval_sets(intervals=[9, 9])
-        self.min9_no5 = self.determine_valid_interval_sets(intervals=[3, 11])
-        self.min9_no5_1st_inv = self.determine_valid_interval_sets(intervals=[11, 10])
-        self.min9_no5_2nd_inv = self.determine_valid_interval_sets(intervals=[10, 3])
-        
-
-    def determine_valid_interval_sets(self, intervals: list[int]):
-        """Determine all of the possible triad chord types given a first and second interval
+        self.triads: dict[int, str] = get_triad_lookup()
+
+    def __getattr__(self, name: str) -> frozenset[tuple[int, int]]:
+        """Build and keep the valid interval sets of a triad family on first access"""
+        intervals = _FAMILY_INTERVALS.get(name)
+        if intervals is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        valid_interval_sets = self.determine_valid_interval_sets(intervals=intervals)
+        setattr(self, name, valid_interval_sets)
+        return valid_interval_sets
+
+    def classify(self, intervals) -> str | None:
+        """Name the triad family of a spread voicing
+
+        Args:
+            intervals (list[int]): the two intervals between the sorted notes (lowest to highest)
+
+        Returns:
+            str | None: the family name (e.g. "major_triad_1st_inv"), None if the intervals are not a known triad
+        """
+        first_interval, second_interval = intervals
+        return self.triads.get(interval_key(first_interval, second_interval))
+
+    def determine_valid_interval_sets(self, intervals: list[int]) -> frozenset[tuple[int, int]]:
+        """Determine all of the possible triad chord types given a first and second interval, i.e. every spread of the
+        close-position intervals by whole octaves that still fits on a piano
 
         Args:
             intervals (int): list of intervals or list of lists of intervals representing the chord you are trying to classify
 
+        Raises:
+            ValueError: if intervals is not a list
+
         Returns:
-            np.ndarray: A 2-D array representing all possible valid triads 
+            frozenset[tuple[int, int]]: all possible valid (first, second) interval sets
         """
-        
-        LOWEST_NOTE = 21
-        
-        if isinstance(intervals, list):
-            if all(isinstance(item, list) for item in intervals):
-                
-                interval_sets = []
-                
-                for interval_list in intervals:
-                    
-                    first_interval, second_interval = interval_list
-                    potential_third_interval = first_interval
-                    potential_second_interval = second_interval
-
-                    valid_first_intervals = [first_interval]
-                    valid_second_intervals = [second_interval]
-
-                    while True:
-                        potential_third_interval = potential_third_interval + 12
-                        if LOWEST_NOTE + potential_third_interval + second_interval <= 108:
-                            valid_first_intervals.append(potential_third_interval)
-                        else:
-                            break
-                        
-                    while True:
-                        potential_second_interval = potential_second_interval + 12
-                        if LOWEST_NOTE + first_interval + potential_second_interval <= 108:
-                            valid_second_intervals.append(potential_second_interval)
-                        else:
-                            break
-
-                    valid_interval_sets = []    
-
-                    for valid_first_interval in valid_first_intervals:
-                        for valid_second_interval in valid_second_intervals:
-                            if LOWEST_NOTE + valid_first_interval + valid_second_interval <= 108:
-                                valid_interval_sets.append((valid_first_interval, valid_second_interval))
-
-                    interval_sets.append(np.array(valid_interval_sets))
-                
-                total_interval_set = np.concatenate(interval_sets, axis=0)
-                return total_interval_set
-                
-            else:
-                first_interval, second_interval = intervals
-                potential_third_interval = first_interval
-                potential_second_interval = second_interval
-
-                valid_first_intervals = [first_interval]
-                valid_second_intervals = [second_interval]
-
-                while True:
-                    potential_third_interval = potential_third_interval + 12
-                    if LOWEST_NOTE + potential_third_interval + second_interval <= 108:
-                        valid_first_intervals.append(potential_third_interval)
-                    else:
-                        break
-                    
-                while True:
-                    potential_second_interval = potential_second_interval + 12
-                    if LOWEST_NOTE + first_interval + potential_second_interval <= 108:
-                        valid_second_intervals.append(potential_second_interval)
-                    else:
-                        break
-
-                valid_interval_sets = []    
-
-                for valid_first_interval in valid_first_intervals:
-                    for valid_second_interval in valid_second_intervals:
-                        if LOWEST_NOTE + valid_first_interval + valid_second_interval <= 108:
-                            valid_interval_sets.append((valid_first_interval, valid_second_interval))
-
-                return np.array(valid_interval_sets)
-        else:
-            ValueError(f"Expecting type list[int] or list[list[int]]. Got type {type(intervals)}")
-        
-        
+        if not isinstance(intervals, list):
+            raise ValueError(f"Expecting type list[int] or list[list[int]]. Got type {type(intervals)}")
+        return frozenset(spread_interval_sets(intervals))
     
-    def query(self, interval_set, valid_interval_set):
+    def query(self, interval_set, valid_interval_set) -> bool:
         """Check if a specific interval set is a member of the valid interval sets
 
         Args:
             interval_set (tuple): The interval set to check.
-            valid_interval_sets (np.ndarray): 2-D array of valid interval sets.
+            valid_interval_sets (frozenset[tuple[int, int]]): valid interval sets.
 
         Returns:
             bool: True if the interval set is a member, False otherwise.
         """
-        mask = np.all(valid_interval_set == np.array(interval_set), axis=1)
-        return np.any(mask)
+        return tuple(interval_set) in valid_interval_set
     
 if __name__ == "__main__":
-    td = TriadDefinitions()
\ No newline at end of file
+    td = TriadDefinitions()
@@ -2,6 +2,7 @@ import json
 import math
 import os
 
+from functools import lru_cache
 from itertools import product
 from fractions import Fraction
 
@@ -287,8 +288,9 @@ def create_tuning_config(ratios: list[Fraction], intervals: list[int], name: str
 
     print(f"Writing tuning configuration \"{filename}\"")
 
+@lru_cache(maxsize=None)
 def read_tuning_config(name: str) -> dict:
-    """Read an  n-limit tuning config 
+    """Read an  n-limit tuning config. The parsed config is cached and shared by every caller, so treat it as read only.
 
     Args:
         name (str): The name of the tuning config (do not include the extension)
@@ -1,34 +1,34 @@
 import json
 import os
+import re
 import struct
 import sys
-import yaml
 
 from .Enums import NoteDivisions
-from .Pitch import PitchInfo
+from .KeyMask import mask_to_bytes, notes_mask
+from .Pitch import CENTER_PITCH
+from .Voice import Voice
 
-def determine_octave(message_heap: list, note: int):
+def determine_octave(message_heap: list[Voice], note: int):
     """Determine if the current note is an octave of any of the currently active notes.
+    Callers which own a PitchClassMap should use PitchClassMap.lookup instead, which avoids the scan.
 
     Args:
+        message_heap (list[Voice]): the currently sounding notes
         note (int): an active note to check against self.message_heap
 
     Returns:
         int: returns the instance index if the current note is an octave multiple of an active note and None otherwise
     """
-    notes= list(map(lambda sublist: sublist[0], message_heap))
-    instance= list(map(lambda sublist: sublist[1], message_heap))
+    pitch_class = note % 12
+    octave_instance = None
 
-    if note in notes:
-        return instance[notes.index(note)]
-
-    octaves= [octave for octave in range(note + 12, 109, 12)]
-    octaves += [octave for octave in range(note - 12, 20, -12)]
-
-    for active_note in notes:
-        if active_note in octaves:
-            return instance[notes.index(active_note)]
-    return None
+    for voice in message_heap:
+        if voice.note == note:
+            return voice.instance_index
+        if octave_instance is None and voice.note % 12 == pitch_class and (note < voice.note <= 108 or 21 <= voice.note < note):
+            octave_instance = voice.instance_index
+    return octave_instance
 
 def division_to_dt(division: str, tempo: int) -> int:
     """Convert a rhythmic division to a time delay (dt) in milliseconds.
@@ -73,6 +73,25 @@ def get_root_from_letter_note(letter_note: str):
         case "G":
             return 67
 
+def find_port(port_names: list[str], wanted: str) -> int | None:
+    """Find a MIDI port by its exact name. rtmidi decorates port names per backend ("client:port 128:0" on ALSA,
+    "name 1" on Windows MM), so the name is compared with its trailing port numbers removed, whole and as each of its
+    client and port parts. A port whose name merely contains or starts with the wanted one (e.g. "jacobs_ladder_lower"
+    or "jacobs_ladder_10" for "jacobs_ladder" or "jacobs_ladder_1") does not match.
+
+    Args:
+        port_names (list[str]): names from rtmidi's get_ports()
+        wanted (str): the configured port name
+
+    Returns:
+        int | None: index of the first matching port, None if there is none
+    """
+    for index, name in enumerate(port_names):
+        bare_name = re.sub(r"\s+\d+(:\d+)?$", "", name)
+        if wanted in (name, bare_name, *bare_name.split(":")):
+            return index
+    return None
+
 def parse_midi_controller_config(config_path: str, print_config=False) -> dict:
     """Parse the MidiController yaml config and do some light field validation
 
@@ -82,6 +101,9 @@ def parse_midi_controller_config(config_path: str, print_config=False) -> dict:
     Returns:
         dict: the kwargs used to instantiate the MidiController
     """
+    # Deferred so importing Utilities on the MIDI path does not pull in PyYAML
+    import yaml
+
     try:
         with open(config_path, 'r') as f:
             config = yaml.safe_load(f)
@@ -92,6 +114,17 @@ def parse_midi_controller_config(config_path: str, print_config=False) -> dict:
         print(f"Error: Could not parse YAML file: {e}")
         sys.exit(1)
 
+    return build_midi_controller_kwargs(config, print_config=print_config)
+
+def build_midi_controller_kwargs(config: dict, print_config=False) -> dict:
+    """Validate a parsed MidiController config and convert it to MidiController kwargs
+
+    Args:
+        config (dict): the parsed yaml config
+
+    Returns:
+        dict: the kwargs used to instantiate the MidiController
+    """
     # --- MIDI ports ---
     input_port = config.get('input_port', 'jacobs_ladder')
     output_ports = config.get('output_ports', [f"jacobs_ladder_{i}" for i in range(12)])
@@ -121,6 +154,31 @@ def parse_midi_controller_config(config_path: str, print_config=False) -> dict:
         print("Error: 'tuning_mode' is static or dynamic, but no 'tuning' provided.")
         sys.exit(1)
 
+    # --- Music theory ---
+    chord_loading = config.get('chord_loading', 'background')
+    valid_chord_loading = ('eager', 'lazy', 'background')
+    if chord_loading not in valid_chord_loading:
+        print(f"Error: Invalid chord_loading '{chord_loading}'. Must be one of {valid_chord_loading}.")
+        sys.exit(1)
+
+    # --- Front end ---
+    shared_state_path = config.get('shared_state_path', None)
+    if shared_state_path is not None and not isinstance(shared_state_path, str):
+        print(f"Error: shared_state_path must be a file path or null, got '{shared_state_path}'.")
+        sys.exit(1)
+
+    # --- Multiple controllers (see ControllerSupervisor) ---
+    name = config.get('name', None)
+    udp_ports = {}
+    for key in ('control_port', 'telemetry_port'):
+        if key not in config:
+            continue
+        port = config[key]
+        if port is not None and (not isinstance(port, int) or not 0 < port < 65536):
+            print(f"Error: {key} must be a port number or null, got '{port}'.")
+            sys.exit(1)
+        udp_ports[key] = port
+
     # --- Log level ---
     LOG_LEVELS = {
         "DEBUG": 10,
@@ -133,6 +191,31 @@ def parse_midi_controller_config(config_path: str, print_config=False) -> dict:
     if log_level_str not in LOG_LEVELS:
         raise ValueError(f"Invalid log_level '{log_level_str}'. Must be one of {list(LOG_LEVELS.keys())}.")
     log_level = LOG_LEVELS[log_level_str]
+    async_logging = config.get('async_logging', False)
+    if not isinstance(async_logging, bool):
+        print(f"Error: async_logging must be true or false, got '{async_logging}'.")
+        sys.exit(1)
+
+    # --- Real-time mode ---
+    real_time_config = config.get('real_time', None) or {}
+    if not isinstance(real_time_config, dict):
+        print(f"Error: real_time must be a mapping, got '{real_time_config}'.")
+        sys.exit(1)
+    real_time = None
+    if real_time_config.get('enabled', False):
+        cores = real_time_config.get('cores', None)
+        if cores is not None and (not isinstance(cores, list) or not cores or not all(isinstance(core, int) and core >= 0 for core in cores)):
+            print(f"Error: real_time cores must be a list of core numbers or null, got '{cores}'.")
+            sys.exit(1)
+        priority = real_time_config.get('priority', None)
+        if priority is not None and (not isinstance(priority, int) or not 1 <= priority <= 99):
+            print(f"Error: real_time priority must be between 1 and 99 or null, got '{priority}'.")
+            sys.exit(1)
+        idle_gap = real_time_config.get('idle_gap', 0.5)
+        if not isinstance(idle_gap, (int, float)) or idle_gap <= 0:
+            print(f"Error: real_time idle_gap must be a positive number of seconds, got '{idle_gap}'.")
+            sys.exit(1)
+        real_time = {'cores': cores, 'priority': priority, 'idle_gap': float(idle_gap)}
 
     formatted_tuning_config = {
         'tuning_configuration': {
@@ -151,8 +234,16 @@ def parse_midi_controller_config(config_path: str, print_config=False) -> dict:
         'tempo': tempo,
         'time_signature': time_signature,
         'log_level': log_level,
+        'async_logging': async_logging,
+        'chord_loading': chord_loading,
+        'shared_state_path': shared_state_path,
+        **udp_ports,
         **formatted_tuning_config
     }
+    if name is not None:
+        kwargs['name'] = str(name)
+    if real_time is not None:
+        kwargs['real_time'] = real_time
 
     if print_config:
         print("Initializing MidiController with parameters:")
@@ -161,18 +252,70 @@ def parse_midi_controller_config(config_path: str, print_config=False) -> dict:
     return kwargs
 
 
-def remove_harmonically_redundant_intervals(message_heap: list[list[int]]):
+def parse_supervisor_config(config_path: str, print_config=False) -> list[dict]:
+    """Parse a ControllerSupervisor yaml config. Every entry of its `controllers` list overrides the top level
+    MidiController settings for one keyboard.
+
+    Args:
+        config_path (str): path to the yaml config
+
+    Returns:
+        list[dict]: the kwargs used to instantiate each MidiController
+    """
+    # Deferred so importing Utilities on the MIDI path does not pull in PyYAML
+    import yaml
+
+    try:
+        with open(config_path, 'r') as f:
+            config = yaml.safe_load(f)
+    except FileNotFoundError:
+        print(f"Error: File {config_path} not found.")
+        sys.exit(1)
+    except yaml.YAMLError as e:
+        print(f"Error: Could not parse YAML file: {e}")
+        sys.exit(1)
+
+    controllers = config.pop('controllers', None)
+    if not isinstance(controllers, list) or not controllers:
+        print("Error: 'controllers' must be a non-empty list.")
+        sys.exit(1)
+
+    controller_kwargs = []
+    for index, overrides in enumerate(controllers):
+        merged = {**config, **overrides}
+        merged.setdefault('name', f"controller_{index}")
+        for key in ('control_port', 'telemetry_port'):
+            if key not in merged:
+                print(f"Error: controller '{merged['name']}' must set {key} (use null to disable telemetry).")
+                sys.exit(1)
+        controller_kwargs.append(build_midi_controller_kwargs(merged, print_config=print_config))
+
+    # Every controller owns its ports, log file and shared state file
+    for key in ('name', 'input_port', 'control_port', 'telemetry_port', 'shared_state_path'):
+        values = [kwargs.get(key) for kwargs in controller_kwargs if kwargs.get(key) is not None]
+        if len(values) != len(set(values)):
+            print(f"Error: each controller needs a unique {key}, got {values}.")
+            sys.exit(1)
+    output_ports = [port for kwargs in controller_kwargs for port in kwargs['output_ports']]
+    if len(output_ports) != len(set(output_ports)):
+        print("Error: controllers must not share output ports.")
+        sys.exit(1)
+
+    return controller_kwargs
+
+
+def remove_harmonically_redundant_intervals(message_heap: list[Voice]):
     """Take in a message heap and return a sorted message heap with redundant harmonies excluded 
 
     Args:
-        message_heap (list[list[int]]): a message heap of the form [[note, instance_index, status, velocity], ...]
+        message_heap (list[Voice]): a message heap of sounding notes
 
     Returns:
-        list[list[int]]: a sorted message heap with redundant harmonies removed
+        list[Voice]: a sorted message heap with redundant harmonies removed
     """
     
-    # Sort the message heap by note (first element)
-    sorted_message_heap = sorted(message_heap, key=lambda x: x[0])
+    # Sort the message heap by note
+    sorted_message_heap = sorted(message_heap, key=lambda voice: voice.note)
     
     # To keep track of instances we've already seen
     unique_instances = set()
@@ -181,7 +324,7 @@ def remove_harmonically_redundant_intervals(message_heap: list[list[int]]):
     harmonically_unique_message_heap = []
     
     for entry in sorted_message_heap:
-        instance = entry[1]
+        instance = entry.instance_index
         # Only add this entry if its instance has not been seen before
         if instance not in unique_instances:
             harmonically_unique_message_heap.append(entry)
@@ -189,60 +332,60 @@ def remove_harmonically_redundant_intervals(message_heap: list[list[int]]):
     
     return harmonically_unique_message_heap
 
+LIVE_KEYS_HEADER = "Live keys".ljust(25)[:25].encode("ascii")
+
 def sanitize_scale_name(name: str) -> str:
     """Convert special characters to ASCII-safe equivalents."""
     return (name
             .replace("♭", "b")
             .replace("♯", "#"))
 
-def build_live_keys_bitmask(message_heap: list[list[int]]) -> list[int]:
-    """Build a bitmask of currently sounding notes from message_heap."""
-    
-    bitmask_bytes = [0] * ((88 + 7) // 8)  # 88 bits → 11 bytes
+# 25 byte ASCII name field of every scale name packed so far; the scale registry (see Scales) fills in every scale at import
+_SCALE_NAME_FIELDS: dict[str, bytes] = {}
 
-    notes = [note[0] for note in message_heap]
+def scale_name_field(name: str) -> bytes:
+    """The 25 byte ASCII name field of a scale in the scales datagram, sanitized once per name."""
+    field = _SCALE_NAME_FIELDS.get(name)
+    if field is None:
+        field = _SCALE_NAME_FIELDS[name] = sanitize_scale_name(name).ljust(25)[:25].encode("ascii")
+    return field
 
-    for i, midi_note in enumerate(range(21, 109)):
-        if midi_note in notes:
-            byte_index = i // 8
-            bit_index = i % 8
-            bitmask_bytes[byte_index] |= (1 << bit_index)
-    
-    return bitmask_bytes
+def build_live_keys_bitmask(message_heap: list[Voice]) -> bytes:
+    """Build a bitmask of currently sounding notes from message_heap."""
+    return mask_to_bytes(notes_mask(voice.note for voice in message_heap))
 
-def pack_message(message_heap: list[list[int]], candidate_scales: list[str], bitmasks: list[list[int]]) -> bytes:
+def pack_message(message_heap: list[Voice], candidate_scales: list[str], bitmasks: list[bytes], live_keys: bytes = None) -> bytes:
     """Pack the scales messages for sending to the dart app
 
     Args:
-        message_heap (list[list[int]]): MIDI messages (note is at index 0).
+        message_heap (list[Voice]): currently sounding notes.
         candidate_scales (list[str]): Candidate scales.
-        bitmasks (list[list[int]]): Bitmasks for each candidate scale.
+        bitmasks (list[bytes]): Bitmasks for each candidate scale.
+        live_keys (bytes, optional): bitmask of the sounding notes if already known (see KeyMask.LiveKeyMask).
+            Built from message_heap when None. Defaults to None.
 
     Returns:
         bytes: Packed datagram.
     """
     if message_heap == []:
         return None
-    data_bytes = b""
 
     # --- Add Live Keys entry first ---
-    live_keys = build_live_keys_bitmask(message_heap)
-    header = "Live keys".ljust(25)[:25].encode("ascii")
-    data_bytes += header + bytes(live_keys)
+    if live_keys is None:
+        live_keys = build_live_keys_bitmask(message_heap)
+    parts = [LIVE_KEYS_HEADER, live_keys]
 
     # --- Add candidate scales entries ---
     for candidate_scale, bitmask in zip(candidate_scales, bitmasks):
-        safe_name = sanitize_scale_name(candidate_scale)
-        header = safe_name.ljust(25)[:25].encode("ascii")
-        data_bytes += header + bytes(bitmask)
+        parts.append(scale_name_field(candidate_scale))
+        parts.append(bytes(bitmask))
 
-    return data_bytes
+    return b"".join(parts)
 
-def pack_message_heap(message_heap: list[list]) -> bytes:
+def pack_message_heap(message_heap: list[Voice]) -> bytes:
     """Pack the entire message heap into bytes for sending as message type 2.
 
-    Each element:
-    [note, instance_index, status, velocity, pitch_info]
+    Each element is a Voice (note, instance_index, status, velocity, pitch)
 
     Layout per entry:
     - note: 1 byte
@@ -257,18 +400,9 @@ def pack_message_heap(message_heap: list[list]) -> bytes:
 
     payload = bytearray()
 
-    for msg in message_heap:
-        note = msg[0] & 0xFF
-        instance_index = msg[1] & 0xFF
-        status = msg[2] & 0xFF
-        velocity = msg[3] & 0xFF
-        pitch_info = msg[4]
-
-        if pitch_info is None:
-            pitch_info = PitchInfo()
-
-        payload.extend([note, instance_index, status, velocity])
-        payload.extend(pitch_info.serialize())
+    for voice in message_heap:
+        payload.extend((voice.note & 0xFF, voice.instance_index & 0xFF, voice.status & 0xFF, voice.velocity & 0xFF))
+        payload.extend((voice.pitch or CENTER_PITCH).serialize())
 
     return bytes(payload)
 
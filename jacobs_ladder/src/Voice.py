@@ -0,0 +1,88 @@
+from .Pitch import CENTER_PITCH, PitchInfo
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+
+class Voice:
+    """A single sounding note held in the MidiController's message_heap.
+
+    Replaces the [note, instance_index, status, velocity, PitchInfo] list. Slots keep the record compact and
+    heap ordering compares only the note (then the instance index) instead of falling through a list compare.
+    The pitch is a shared PitchInfo (CENTER_PITCH or an entry of `pitches`) so no allocation happens per note.
+    """
+    __slots__ = ("note", "instance_index", "status", "velocity", "pitch")
+
+    def __init__(self, note: int, instance_index: int, status: int, velocity: int, pitch: PitchInfo = CENTER_PITCH):
+        self.note = note
+        self.instance_index = instance_index
+        self.status = status
+        self.velocity = velocity
+        self.pitch = pitch
+
+    def __lt__(self, other: "Voice") -> bool:
+        if self.note != other.note:
+            return self.note < other.note
+        return self.instance_index < other.instance_index
+
+    def __repr__(self) -> str:
+        return f"Voice(note={self.note}, instance_index={self.instance_index}, status={self.status}, velocity={self.velocity}, pitch={self.pitch.ratio})"
+
+
+class PitchClassMap:
+    """12-entry pitch class -> instance index map of the sounding voices.
+
+    Octaves of a note share its output instance, so the instance for a new note is a single list read instead of
+    a scan of the message_heap. Kept in sync by the owner on every message_heap push and delete.
+    """
+    __slots__ = ("instances", "counts")
+
+    def __init__(self):
+        self.instances: list[int | None] = [None] * 12
+        self.counts: list[int] = [0] * 12
+
+    def add(self, voice: Voice) -> None:
+        """Register a voice which was pushed onto the message_heap
+
+        Args:
+            voice (Voice): the sounding note
+        """
+        pitch_class = voice.note % 12
+        if self.counts[pitch_class] == 0:
+            self.instances[pitch_class] = voice.instance_index
+        self.counts[pitch_class] += 1
+
+    def remove(self, voice: Voice) -> None:
+        """Unregister a voice which was deleted from the message_heap
+
+        Args:
+            voice (Voice): the released note
+        """
+        pitch_class = voice.note % 12
+        if self.counts[pitch_class] == 0:
+            return
+        self.counts[pitch_class] -= 1
+        if self.counts[pitch_class] == 0:
+            self.instances[pitch_class] = None
+
+    def lookup(self, note: int) -> int | None:
+        """Return the instance index shared by the sounding octaves of a note
+
+        Args:
+            note (int): MIDI note
+
+        Returns:
+            int | None: the instance index, or None if no note of the same pitch class is sounding
+        """
+        return self.instances[note % 12]
+
+    def rebuild(self, message_heap: list[Voice]) -> None:
+        """Resynchronise the map from a message_heap
+
+        Args:
+            message_heap (list[Voice]): the currently sounding notes
+        """
+        self.instances = [None] * 12
+        self.counts = [0] * 12
+        for voice in message_heap:
+            self.add(voice)
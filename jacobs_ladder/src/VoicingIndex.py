@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import time
+
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+
+from .ChordClassifier import TEMPLATES_BY_DEGREE
+
+__author__ = "Alex Wilson"
+__copyright__ = "Copyright (c) 2023 Jacob's Ladder"
+
+LOWEST_NOTE = 21    # A0
+HIGHEST_NOTE = 108  # C8
+MAX_DEGREE = 8
+
+# Two hands of about an octave each
+DEFAULT_MAX_SPAN = 24
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "jacobs_ladder"
+
+# Bump when the layout of the cached arrays changes
+INDEX_VERSION = 1
+
+
+def chord_pitch_classes(intervals: list[int]) -> list[int]:
+    """Pitch classes of a chord template relative to its root, e.g. [4, 3, 5] -> [0, 4, 7]"""
+    pitch_classes = [0]
+    for interval in intervals[:-1]:
+        pitch_classes.append(pitch_classes[-1] + interval)
+    return pitch_classes
+
+
+def sort_key(chord: np.ndarray | int, root: np.ndarray | int, span: np.ndarray | int, top: np.ndarray | int):
+    """Composite key the index is sorted on: chord, then root, then span, then top note (pass int64 arrays or ints)"""
+    return ((chord * 12 + root) * 128 + span) * 128 + top
+
+
+def spread_offsets(pitch_classes: list[int], bottom_tone: int, max_span: int) -> np.ndarray:
+    """Semitones above the bottom note of every voicing of a chord with one note per pitch class, the given chord tone
+    at the bottom and at most max_span between the lowest and highest note
+
+    Args:
+        pitch_classes (list[int]): pitch classes of the chord relative to its root
+        bottom_tone (int): index into pitch_classes of the lowest note
+        max_span (int): largest distance in semitones between the lowest and highest note
+
+    Returns:
+        np.ndarray: int16 array of shape (voicings, degree), columns in pitch_classes order
+    """
+    bottom = pitch_classes[bottom_tone]
+    candidates = []
+    for index, pitch_class in enumerate(pitch_classes):
+        if index == bottom_tone:
+            candidates.append((0,))
+        else:
+            candidates.append(tuple(range((pitch_class - bottom) % 12, max_span + 1, 12)))
+    return np.array(list(product(*candidates)), dtype=np.int16).reshape(-1, len(pitch_classes))
+
+
+class VoicingIndex:
+    """Columnar index of every playable spread voicing (one note per pitch class) of every chord template in
+    ChordClassifier, on the piano range A0-C8 within a span constraint.
+
+    Rows are sorted by chord, root, span and top note, so a query for a chord and root is a binary search for a
+    contiguous block followed by a mask over that block. Columns:
+
+        chord (uint16): index into chord_names
+        root (uint8): pitch class of the template root (0 = C)
+        span (uint8): semitones between the lowest and highest note
+        top (uint8), bottom (uint8): highest and lowest Midi note
+        notes (uint8, rows x MAX_DEGREE): the Midi notes from lowest to highest, padded with 0
+
+    Chords with a symmetric pitch class set (e.g. Augmented, Fully diminished) list the same voicings under each of
+    their roots.
+    """
+
+    COLUMNS = ("chord", "root", "span", "top", "bottom", "notes")
+
+    def __init__(self, chord_names: list[tuple[int, str]], columns: dict[str, np.ndarray], max_span: int):
+        """Wrap generated or cached columns, see build_voicing_index and load_voicing_index
+
+        Args:
+            chord_names (list[tuple[int, str]]): (degree, template name) of every chord id
+            columns (dict[str, np.ndarray]): the COLUMNS, sorted by sort_key
+            max_span (int): span constraint the voicings were generated with
+        """
+        self.chord_names = chord_names
+        self.max_span = max_span
+        self.chord = columns["chord"]
+        self.root = columns["root"]
+        self.span = columns["span"]
+        self.top = columns["top"]
+        self.bottom = columns["bottom"]
+        self.notes = columns["notes"]
+        self.keys = sort_key(*(column.astype(np.int64) for column in (self.chord, self.root, self.span, self.top)))
+
+        self.chord_ids: dict[tuple[int, str], int] = {chord_name: chord_id for chord_id, chord_name in enumerate(chord_names)}
+        self.degrees = np.array([degree for degree, _ in chord_names], dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.chord)
+
+    def chord_id(self, name: str, degree: int = None) -> int:
+        """Look up the id of a chord template
+
+        Args:
+            name (str): template name, e.g. "Major7"
+            degree (int, optional): number of pitch classes, needed when templates of different degrees share a name.
+                Defaults to None.
+
+        Raises:
+            KeyError: if no template (of that degree) has the name
+            ValueError: if the name is ambiguous and no degree is given
+
+        Returns:
+            int: the chord id
+        """
+        if degree is not None:
+            return self.chord_ids[(degree, name)]
+        matches = [chord_id for (chord_degree, chord_name), chord_id in self.chord_ids.items() if chord_name == name]
+        if not matches:
+            raise KeyError(name)
+        if len(matches) > 1:
+            raise ValueError(f"'{name}' is a template of several degrees, pass degree=")
+        return matches[0]
+
+    def query(self, chord: int, root: int = None, span: tuple[int, int] = None, top: tuple[int, int] = None) -> np.ndarray:
+        """Find the voicings of a chord
+
+        Args:
+            chord (int): chord id (see chord_id)
+            root (int, optional): root pitch class 0-11, None for every root. Defaults to None.
+            span (tuple[int, int], optional): inclusive span range in semitones. Defaults to None (any).
+            top (tuple[int, int], optional): inclusive range of the top note. Defaults to None (any).
+
+        Returns:
+            np.ndarray: row indices into the columns, e.g. index.notes[rows, :degree]
+        """
+        span_low, span_high = span if span is not None else (0, 127)
+        top_low, top_high = top if top is not None else (0, 127)
+
+        if root is not None:
+            start = int(self.keys.searchsorted(sort_key(chord, root, span_low, top_low), side="left"))
+            end = int(self.keys.searchsorted(sort_key(chord, root, span_high, top_high), side="right"))
+            if span_low == span_high or top is None:
+                return np.arange(start, end)
+            tops = self.top[start:end]
+            return start + np.flatnonzero((tops >= top_low) & (tops <= top_high))
+
+        start = int(self.keys.searchsorted(sort_key(chord, 0, 0, 0), side="left"))
+        end = int(self.keys.searchsorted(sort_key(chord, 11, 127, 127), side="right"))
+        mask = (self.span[start:end] >= span_low) & (self.span[start:end] <= span_high)
+        if top is not None:
+            mask &= (self.top[start:end] >= top_low) & (self.top[start:end] <= top_high)
+        return start + np.flatnonzero(mask)
+
+    def voicings(self, chord: int, root: int = None, span: tuple[int, int] = None, top: tuple[int, int] = None) -> np.ndarray:
+        """The notes of the voicings query() finds
+
+        Returns:
+            np.ndarray: uint8 array of shape (voicings, degree), lowest note first
+        """
+        return self.notes[self.query(chord, root=root, span=span, top=top), :self.degrees[chord]]
+
+
+def build_voicing_index(max_span: int = DEFAULT_MAX_SPAN, degrees: tuple[int, ...] = None) -> VoicingIndex:
+    """Generate the voicing index
+
+    For every template and every choice of lowest chord tone, the octave placements of the other tones within
+    max_span are enumerated once and broadcast across every lowest note on the piano.
+
+    Args:
+        max_span (int, optional): largest distance in semitones between the lowest and highest note. Defaults to DEFAULT_MAX_SPAN.
+        degrees (tuple[int, ...], optional): template degrees to include. Defaults to None (all).
+
+    Returns:
+        VoicingIndex: the index
+    """
+    degrees = tuple(sorted(TEMPLATES_BY_DEGREE)) if degrees is None else tuple(sorted(degrees))
+    chord_names = [(degree, name) for degree in degrees for name in TEMPLATES_BY_DEGREE[degree]]
+    bottoms = np.arange(LOWEST_NOTE, HIGHEST_NOTE + 1, dtype=np.int16)
+
+    parts = {column: [] for column in VoicingIndex.COLUMNS}
+    for chord_id, (degree, name) in enumerate(chord_names):
+        pitch_classes = chord_pitch_classes(TEMPLATES_BY_DEGREE[degree][name])
+        for bottom_tone in range(degree):
+            offsets = spread_offsets(pitch_classes, bottom_tone, max_span)
+            spans = offsets.max(axis=1)
+
+            # (bottoms, voicings, degree), then keep those whose top note is on the piano
+            notes = bottoms[:, None, None] + offsets[None, :, :]
+            playable = (bottoms[:, None] + spans[None, :]) <= HIGHEST_NOTE
+            notes = np.sort(notes[playable], axis=1)
+            count = len(notes)
+
+            padded = np.zeros((count, MAX_DEGREE), dtype=np.uint8)
+            padded[:, :degree] = notes
+            parts["notes"].append(padded)
+            parts["chord"].append(np.full(count, chord_id, dtype=np.uint16))
+            parts["root"].append(((notes[:, 0] - pitch_classes[bottom_tone]) % 12).astype(np.uint8))
+            parts["span"].append((notes[:, -1] - notes[:, 0]).astype(np.uint8))
+            parts["top"].append(notes[:, -1].astype(np.uint8))
+            parts["bottom"].append(notes[:, 0].astype(np.uint8))
+
+    columns = {column: np.concatenate(arrays) for column, arrays in parts.items()}
+    keys = sort_key(*(columns[column].astype(np.int64) for column in ("chord", "root", "span", "top")))
+    order = np.argsort(keys, kind="stable")
+    columns = {column: np.ascontiguousarray(array[order]) for column, array in columns.items()}
+    return VoicingIndex(chord_names, columns, max_span)
+
+
+def cache_path(max_span: int, degrees: tuple[int, ...] = None, cache_dir: str | Path = None) -> Path:
+    """Cache file of an index, named after a hash of everything it is generated from (editing a template in
+    ChordClassifier produces a new file)"""
+    degrees = tuple(sorted(TEMPLATES_BY_DEGREE)) if degrees is None else tuple(sorted(degrees))
+    source = json.dumps([INDEX_VERSION, max_span, degrees, LOWEST_NOTE, HIGHEST_NOTE,
+                         [[degree, list(TEMPLATES_BY_DEGREE[degree].items())] for degree in degrees]])
+    digest = hashlib.sha1(source.encode()).hexdigest()[:16]
+    return Path(cache_dir or DEFAULT_CACHE_DIR) / f"voicings_{digest}.npz"
+
+
+def load_voicing_index(max_span: int = DEFAULT_MAX_SPAN, degrees: tuple[int, ...] = None, cache_dir: str | Path = None,
+                       rebuild: bool = False) -> VoicingIndex:
+    """Load the voicing index from the disk cache, generating and caching it first if needed
+
+    Args:
+        max_span (int, optional): largest distance in semitones between the lowest and highest note. Defaults to DEFAULT_MAX_SPAN.
+        degrees (tuple[int, ...], optional): template degrees to include. Defaults to None (all).
+        cache_dir (str | Path, optional): cache directory. Defaults to DEFAULT_CACHE_DIR.
+        rebuild (bool, optional): regenerate even if a cached index exists. Defaults to False.
+
+    Returns:
+        VoicingIndex: the index
+    """
+    path = cache_path(max_span, degrees, cache_dir)
+    if path.exists() and not rebuild:
+        with np.load(path) as cached:
+            chord_names = [(int(degree), str(name)) for degree, name in zip(cached["chord_degrees"], cached["chord_names"])]
+            return VoicingIndex(chord_names, {column: cached[column] for column in VoicingIndex.COLUMNS}, int(cached["max_span"]))
+
+    index = build_voicing_index(max_span=max_span, degrees=degrees)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first so a concurrent reader never sees a partial cache
+    temporary_path = path.with_suffix(f".{os.getpid()}.tmp.npz")
+    np.savez(temporary_path, max_span=index.max_span,
+             chord_degrees=np.array([degree for degree, _ in index.chord_names], dtype=np.uint8),
+             chord_names=np.array([name for _, name in index.chord_names]),
+             **{column: getattr(index, column) for column in VoicingIndex.COLUMNS})
+    os.replace(temporary_path, path)
+    return index
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    index = load_voicing_index()
+    print(f"{len(index)} voicings of {len(index.chord_names)} chords loaded in {time.perf_counter() - start:.2f} s "
+          f"({cache_path(DEFAULT_MAX_SPAN)})")
+    major7 = index.chord_id("Major7")
+    for notes in index.voicings(major7, root=0, span=(14, 17), top=(72, 76)):
+        print(notes.tolist())
@@ -0,0 +1,74 @@
+"""Startup time and memory of MusicTheory for each chord dictionary loading mode.
+
+Each mode is measured in a fresh interpreter so module caches do not skew the results.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkChordLoading
+"""
+import json
+import logging
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from jacobs_ladder.src.MusicTheory import CHORD_LOADING_MODES, MusicTheory
+from jacobs_ladder.src.Voice import Voice
+
+
+def max_rss_mb() -> float | None:
+    """Peak resident set size of this process in MB (None where the resource module is unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def measure(mode: str) -> dict:
+    logger = logging.getLogger("BenchmarkChordLoading")
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    music_theory = MusicTheory(logger=logger, chord_loading=mode)
+    constructed = time.perf_counter()
+    startup_bytes, _ = tracemalloc.get_traced_memory()
+
+    # Time to first note: a triad lookup is what a live performance hits first
+    music_theory.determine_chord([Voice(60, 0, 144, 100), Voice(64, 4, 144, 100), Voice(67, 7, 144, 100)])
+    first_chord = time.perf_counter()
+
+    music_theory.wait_for_chord_lookups()
+    for degree in range(2, 9):
+        music_theory.get_chord_lookup(degree)
+    all_loaded = time.perf_counter()
+    loaded_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mode": mode,
+        "startup_ms": (constructed - start) * 1e3,
+        "first_chord_ms": (first_chord - start) * 1e3,
+        "all_loaded_ms": (all_loaded - start) * 1e3,
+        "startup_kb": startup_bytes / 1024,
+        "all_loaded_kb": loaded_bytes / 1024,
+        "peak_kb": peak_bytes / 1024,
+        "max_rss_mb": max_rss_mb(),
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        print(json.dumps(measure(sys.argv[1])))
+        sys.exit(0)
+
+    print(f"{'mode':<12}{'startup':>12}{'1st chord':>12}{'all loaded':>12}{'heap@start':>14}{'heap@all':>12}{'max RSS':>10}")
+    for mode in CHORD_LOADING_MODES:
+        output = subprocess.run([sys.executable, "-m", "jacobs_ladder.test.BenchmarkChordLoading", mode],
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        rss = f"{result['max_rss_mb']:.1f} MB" if result["max_rss_mb"] is not None else "n/a"
+        print(f"{result['mode']:<12}{result['startup_ms']:>9.2f} ms{result['first_chord_ms']:>9.2f} ms"
+              f"{result['all_loaded_ms']:>9.2f} ms{result['startup_kb']:>11.1f} KB{result['all_loaded_kb']:>9.1f} KB{rss:>10}")
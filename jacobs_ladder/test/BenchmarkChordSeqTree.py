@@ -0,0 +1,36 @@
+"""Top-k chord progressions by voice leading distance: scoring and sorting every ordered progression against
+ChordSeqTree.best_progressions, which keeps a bounded heap and prunes branches that cannot make the top k.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkChordSeqTree
+"""
+import time
+
+from jacobs_ladder.src.ChordSeqTree import ChordSeqTree
+
+CHORDS = ["I Major 7", "I Dominant 7", "I Minor 7", "bII Major 7", "bII Dominant 7", "II Minor 7", "II Dominant 7",
+          "II Minor 7 b5", "bIII Major 7", "bIII Diminished", "III Minor 7", "III Dominant 7", "IV Major 7", "IV Minor 7",
+          "IV Minor 7 b5", "bV Minor 7 b5", "V Dominant", "V Minor 7", "bVI Diminshed", "bVI Major 7", "bVI Dominant",
+          "VI Minor 7", "VI Dominant 7", "bVII Dominant", "bVII Minor 7", "VII Diminished", "VII Minor 7 b5"]
+K = 10
+
+
+if __name__ == "__main__":
+    tree = ChordSeqTree()
+    print(f"{'choices':>8}{'progressions':>16}{'sort all (s)':>14}{'top-k heap (s)':>16}")
+    for choices in (2, 3, 4, 5, 8):
+        count = tree.count_sequences(len(CHORDS), choices, ordered=True)
+        start = time.perf_counter()
+        best = tree.best_progressions(CHORDS, choices, k=K)
+        heap_seconds = time.perf_counter() - start
+
+        sort_seconds = None
+        if count <= 500_000:
+            start = time.perf_counter()
+            ranked = sorted((tree.score_progression(progression), order, progression)
+                            for order, progression in enumerate(tree.iter_sequences(CHORDS, choices, ordered=True)))
+            sort_seconds = time.perf_counter() - start
+            assert best == [(score, progression) for score, _, progression in ranked[:K]]
+        sort_column = f"{sort_seconds:.3f}" if sort_seconds is not None else "-"
+        print(f"{choices:>8}{count:>16}{sort_column:>14}{heap_seconds:>16.4f}")
+    print(f"\nBest {K} of 8: {best[0][0]}-{best[-1][0]} semitones, e.g. {' -> '.join(best[0][1])}")
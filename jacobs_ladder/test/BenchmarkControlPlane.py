@@ -0,0 +1,105 @@
+"""Wakeup latency, idle CPU and caller-side send cost of the polling UDPReceiver/UDPSender threads against the
+asyncio ControlPlane used by MidiController.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkControlPlane
+"""
+import logging
+import socket
+import statistics
+import threading
+import time
+
+from jacobs_ladder.src.ControlPlane import ControlPlane, DatagramReceiver, DatagramSender
+from jacobs_ladder.src.Udp import UDPReceiver, UDPSender
+
+HOST = "127.0.0.1"
+PINGS = 2_000
+IDLE_SECONDS = 3.0
+KEY_EVENTS = 2_000
+DATAGRAM = bytes(4 + 36 * 8)  # type-1 datagram with live keys and 7 candidate scales
+
+
+class LatencyMixin:
+    def init_latency(self):
+        self.latencies_us = []
+        self.received = threading.Event()
+
+    def dispatch_message(self, data):
+        self.latencies_us.append((time.perf_counter_ns() - int.from_bytes(data[:8], "little")) / 1e3)
+        self.received.set()
+
+
+class PollingReceiver(LatencyMixin, UDPReceiver):
+    pass
+
+
+class LoopReceiver(LatencyMixin, DatagramReceiver):
+    pass
+
+
+def measure_latency(receiver, port: int) -> list[float]:
+    client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    for _ in range(PINGS):
+        receiver.received.clear()
+        client.sendto(time.perf_counter_ns().to_bytes(8, "little"), (HOST, port))
+        receiver.received.wait(timeout=2)
+        time.sleep(0.0005)
+    client.close()
+    return receiver.latencies_us
+
+
+def measure_idle_cpu_ms() -> float:
+    start = time.process_time()
+    time.sleep(IDLE_SECONDS)
+    return (time.process_time() - start) * 1e3 / IDLE_SECONDS
+
+
+def measure_send_us(sender) -> float:
+    """Caller-side cost of the two datagrams MidiController sends per key event"""
+    elapsed = 0.0
+    for _ in range(KEY_EVENTS):
+        start = time.perf_counter()
+        sender.send_bytes(DATAGRAM)
+        sender.send_bytes(DATAGRAM)
+        elapsed += time.perf_counter() - start
+        time.sleep(0.0005)
+    return elapsed / KEY_EVENTS * 1e6
+
+
+def report(name: str, latencies: list[float], idle_cpu_ms: float, send_us: float) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{name:<14}{statistics.median(latencies):>12.1f}{p99:>12.1f}{idle_cpu_ms:>16.3f}{send_us:>16.2f}")
+
+
+if __name__ == "__main__":
+    logger = logging.getLogger("BenchmarkControlPlane")
+    print(f"{'design':<14}{'p50 (us)':>12}{'p99 (us)':>12}{'idle CPU (ms/s)':>16}{'send/event (us)':>16}")
+
+    receivers = [PollingReceiver(host=HOST, port=51000 + i, logger=logger) for i in range(2)]
+    for receiver in receivers:
+        receiver.init_latency()
+        receiver.start_listener()
+    idle_cpu_ms = measure_idle_cpu_ms()
+    latencies = measure_latency(receivers[0], 51000)
+    sender = UDPSender(host=HOST, port=51010, logger=logger)
+    send_us = measure_send_us(sender)
+    sender.stop()
+    for receiver in receivers:
+        receiver.stop()
+    report("threads", latencies, idle_cpu_ms, send_us)
+
+    control_plane = ControlPlane(logger=logger)
+    receivers = [LoopReceiver(host=HOST, port=51000 + i, logger=logger, control_plane=control_plane) for i in range(2)]
+    for receiver in receivers:
+        receiver.init_latency()
+        receiver.start_listener()
+    idle_cpu_ms = measure_idle_cpu_ms()
+    latencies = measure_latency(receivers[0], 51000)
+    sender = DatagramSender(host=HOST, port=51010, logger=logger, control_plane=control_plane)
+    send_us = measure_send_us(sender)
+    control_plane.stop()
+    report("control plane", latencies, idle_cpu_ms, send_us)
+    if sender.dropped:
+        print(f"\n{sender.dropped} of {2 * KEY_EVENTS} datagrams dropped under backpressure")
@@ -0,0 +1,76 @@
+"""88-key bitmask generation: the previous per-key loops against the precomputed scale masks and the
+incremental LiveKeyMask used by MidiController.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkKeyMask
+"""
+import timeit
+
+from jacobs_ladder.src.Dictionaries import get_midi_notes
+from jacobs_ladder.src.KeyMask import LiveKeyMask, keyboard_mask, mask_to_bytes, pitch_class_mask
+from jacobs_ladder.src.Scales import get_major_scales
+from jacobs_ladder.src.Utilities import build_live_keys_bitmask
+from jacobs_ladder.src.Voice import Voice
+
+REPEATS = 20_000
+INT_NOTE = get_midi_notes()
+
+
+def legacy_scale_bitmask(scale) -> list[int]:
+    """MusicTheory.get_bitmask as it was before the precomputed masks (kept here for comparison)"""
+    bitmask_bytes = [0] * 11
+    for i, midi in enumerate(range(21, 109)):
+        if INT_NOTE[midi] in scale.notes:
+            bitmask_bytes[i // 8] |= (1 << (i % 8))
+    return bitmask_bytes
+
+
+def legacy_live_keys_bitmask(message_heap: list[Voice]) -> list[int]:
+    """Utilities.build_live_keys_bitmask as it was before the int masks (kept here for comparison)"""
+    bitmask_bytes = [0] * 11
+    notes = [voice.note for voice in message_heap]
+    for i, midi_note in enumerate(range(21, 109)):
+        if midi_note in notes:
+            bitmask_bytes[i // 8] |= (1 << (i % 8))
+    return bitmask_bytes
+
+
+def time_ns(func) -> float:
+    return min(timeit.repeat(func, number=REPEATS, repeat=5)) / REPEATS * 1e9
+
+
+if __name__ == "__main__":
+    scale = get_major_scales()[0]
+    scale_bitmasks = {scale.name: mask_to_bytes(keyboard_mask(pitch_class_mask(scale.notes)))}
+    assert bytes(legacy_scale_bitmask(scale)) == scale_bitmasks[scale.name]
+
+    print("Scale mask per candidate scale")
+    print(f"{'legacy (ns)':>14}{'build (ns)':>12}{'cached (ns)':>13}")
+    print(f"{time_ns(lambda: legacy_scale_bitmask(scale)):>14.0f}"
+          f"{time_ns(lambda: mask_to_bytes(keyboard_mask(pitch_class_mask(scale.notes)))):>12.0f}"
+          f"{time_ns(lambda: scale_bitmasks[scale.name]):>13.0f}")
+
+    # Notes transposed out of the MIDI range are ignored rather than aliasing or raising
+    live_keys = LiveKeyMask()
+    for note in (-12, 60, 127 + 12):
+        live_keys.add(note)
+    live_keys.remove(-12)
+    live_keys.remove(127 + 12)
+    assert live_keys.counts == [int(note == 60) for note in range(128)] and live_keys.mask == 1 << (60 - 21)
+
+    print("\nLive keys mask per event")
+    print(f"{'held':>4}{'legacy (ns)':>14}{'rebuild (ns)':>14}{'incremental (ns)':>18}")
+    for held in (1, 4, 8, 12):
+        message_heap = [Voice(36 + 5 * i, i, 144, 100) for i in range(held)]
+        live_keys = LiveKeyMask()
+        live_keys.rebuild(voice.note for voice in message_heap)
+        assert bytes(legacy_live_keys_bitmask(message_heap)) == build_live_keys_bitmask(message_heap) == live_keys.to_bytes()
+
+        def incremental():
+            # One note on and one note off, then serialise as MidiController does
+            live_keys.add(100)
+            live_keys.remove(100)
+            return live_keys.to_bytes()
+
+        print(f"{held:>4}{time_ns(lambda: legacy_live_keys_bitmask(message_heap)):>14.0f}"
+              f"{time_ns(lambda: build_live_keys_bitmask(message_heap)):>14.0f}{time_ns(incremental):>18.0f}")
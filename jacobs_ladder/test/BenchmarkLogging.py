@@ -0,0 +1,85 @@
+"""Logging latency seen by the MIDI callback: a burst of warnings logged through setup_logging's synchronous file
+handler against the asynchronous mode (queue front end, background QueueListener, lazy formatting), with and without
+rate limiting, on a normal log file and on one whose writes stall (a slow disk, or a terminal being scrolled).
+The log files are written to a temporary directory and checked after each run. Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkLogging
+"""
+import os
+import tempfile
+import time
+
+from jacobs_ladder.src import Logging
+from jacobs_ladder.src.Logging import setup_logging, stop_logging
+
+BURST = 5_000
+STALL = 0.0002  # seconds every write of the stalled log takes
+
+
+def stall_writes(handler) -> None:
+    emit = handler.emit
+
+    def stalled_emit(record):
+        time.sleep(STALL)
+        emit(record)
+
+    handler.emit = stalled_emit
+
+
+def burst(logger) -> list[int]:
+    """Log as the callback would on every event of a burst, timing each call"""
+    latencies = []
+    for event in range(BURST):
+        start = time.perf_counter_ns()
+        logger.warning("[MM] no instances are left! %s", event)
+        latencies.append(time.perf_counter_ns() - start)
+    return latencies
+
+
+def percentile(latencies: list[int], fraction: float) -> float:
+    return sorted(latencies)[min(len(latencies) - 1, int(len(latencies) * fraction))] / 1e3
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        os.makedirs("jacobs_ladder/logs")
+
+        print(f"{BURST} warnings per burst, latency per logging call")
+        print(f"{'mode':<42}{'p50 (us)':>10}{'p99 (us)':>10}{'max (us)':>10}{'lines':>8}")
+        for stalled in (False, True):
+            for name, asynchronous, rate_limit in (("synchronous", False, 0), ("asynchronous", True, 0),
+                                                   ("asynchronous, rate limited", True, 1.0)):
+                app_name = f"Benchmark{'Stalled' if stalled else ''}{name.title().replace(' ', '').replace(',', '')}"
+                logger = setup_logging(app_name, level=20, asynchronous=asynchronous, rate_limit=rate_limit)
+                if stalled:
+                    handlers = Logging._listeners[app_name].handlers if asynchronous else logger.handlers
+                    stall_writes(handlers[0])
+
+                latencies = burst(logger)
+                stop_logging(app_name)
+                for handler in list(logger.handlers):
+                    handler.close()
+                    logger.removeHandler(handler)
+
+                with open(f"jacobs_ladder/logs/{app_name}.log", encoding="utf-8") as log_file:
+                    lines = log_file.read().splitlines()
+                expected = 1 if rate_limit else BURST
+                assert len(lines) == expected and lines[-1].endswith("no instances are left! " + ("0" if rate_limit else str(BURST - 1))), lines[-1:]
+
+                label = f"{name}{', stalled log' if stalled else ''}"
+                print(f"{label:<42}{percentile(latencies, 0.5):>10.1f}{percentile(latencies, 0.99):>10.1f}"
+                      f"{max(latencies) / 1e3:>10.1f}{len(lines):>8}")
+
+        # Suppressed repeats are reported on the next record let through
+        logger = setup_logging("BenchmarkSuppressed", level=20, asynchronous=True, rate_limit=0.05)
+        for event in range(101):
+            if event == 100:
+                time.sleep(0.06)
+            logger.warning("[MM] no instances are left! %s", event)
+        stop_logging("BenchmarkSuppressed")
+        with open("jacobs_ladder/logs/BenchmarkSuppressed.log", encoding="utf-8") as log_file:
+            lines = log_file.read().splitlines()
+        assert len(lines) == 2 and lines[1].endswith("no instances are left! 100 (99 similar messages suppressed)"), lines
+        print("\nRepeats dropped by the rate limit are counted on the next record let through")
+        os.chdir(os.path.dirname(directory))
@@ -0,0 +1,112 @@
+"""Offline negative harmony/transposition of MIDI files: MidiTransformer's in-place rewrite of the note bytes through
+a lookup table against a mido round trip (load, map every note message, save). A synthetic library is written to a
+temporary directory, both outputs are checked to hold the same messages, and the process pool throughput is reported.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkMidiTransformer
+"""
+import io
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import mido
+import numpy as np
+
+from jacobs_ladder.src.Enums import Algorithm
+from jacobs_ladder.src.MidiTransformer import (DRUM_CHANNEL, OCTAVE_NOTE_MAPS, build_note_table, collect_jobs,
+                                               find_note_offsets, transform_bytes, transform_corpus)
+from jacobs_ladder.src.NegativeHarmony import NoteMap
+
+FILES = 20
+NOTES_PER_TRACK = 5_000
+TRACKS = 3
+
+
+def write_library(directory: Path) -> None:
+    """Multi-track files with meta events, sysex, controllers and a drum channel"""
+    random.seed(3)
+    for index in range(FILES):
+        midi_file = mido.MidiFile(ticks_per_beat=480)
+        for track_index in range(TRACKS):
+            channel = DRUM_CHANNEL if track_index == TRACKS - 1 else track_index
+            track = mido.MidiTrack([mido.MetaMessage("track_name", name=f"track {track_index}"),
+                                    mido.Message("sysex", data=[0x7E, 0x7F, 0x09, 0x01]),
+                                    mido.Message("program_change", channel=channel, program=track_index)])
+            for i in range(NOTES_PER_TRACK):
+                note = random.randint(0, 127)
+                track.append(mido.Message("note_on", channel=channel, note=note, velocity=90, time=random.randint(0, 120)))
+                if i % 50 == 0:
+                    track.append(mido.Message("control_change", channel=channel, control=64, value=127))
+                    track.append(mido.MetaMessage("marker", text=f"bar {i // 50}"))
+                track.append(mido.Message("note_off", channel=channel, note=note, velocity=0, time=random.randint(0, 120)))
+            midi_file.tracks.append(track)
+        midi_file.save(directory / f"song_{index}.mid")
+
+
+def mido_round_trip(path: Path, table: np.ndarray, output_path: Path) -> None:
+    midi_file = mido.MidiFile(path)
+    for track in midi_file.tracks:
+        for msg in track:
+            if msg.type in ("note_on", "note_off", "polytouch") and msg.channel != DRUM_CHANNEL:
+                msg.note = int(table[msg.note])
+    midi_file.save(output_path)
+
+
+def check_running_status(table: np.ndarray) -> None:
+    """Running status carried across a meta event, as many files do"""
+    track = bytes([0x00, 0x90, 60, 100,             # note on
+                   0x10, 62, 100,                   # running status note on
+                   0x00, 0xFF, 0x06, 0x01, 0x41,    # marker
+                   0x10, 60, 0,                     # running status note off
+                   0x00, 0xB0, 64, 127,             # sustain
+                   0x00, 0xFF, 0x2F, 0x00])         # end of track
+    data = b"MThd" + (6).to_bytes(4, "big") + bytes([0, 0, 0, 1, 1, 0xE0]) + b"MTrk" + len(track).to_bytes(4, "big") + track
+    assert list(find_note_offsets(data)) == [24, 27, 35]
+    transformed, notes = transform_bytes(data, table)
+    expected = [int(table[60]), int(table[62]), int(table[60])]
+    played = [msg.note for msg in mido.MidiFile(file=io.BytesIO(transformed)) if msg.type in ("note_on", "note_off")]
+    assert notes == 3 and played == expected, played
+
+
+if __name__ == "__main__":
+    note_map = NoteMap(name="cg-reflected", octaveNoteMap=dict(OCTAVE_NOTE_MAPS["cg-reflected"]),
+                       algorithm=Algorithm.LOWER_OCTAVE, active=True)
+    table = build_note_table(note_map=note_map, transpose=3)
+    check_running_status(table)
+
+    with tempfile.TemporaryDirectory() as directory, tempfile.TemporaryDirectory() as mido_directory:
+        directory = Path(directory)
+        write_library(directory)
+        jobs = collect_jobs([str(directory)], "negative")
+        library_bytes = sum(os.path.getsize(path) for path, _ in jobs)
+        notes = FILES * TRACKS * NOTES_PER_TRACK * 2
+
+        start = time.perf_counter()
+        for path, output_path in jobs:
+            mido_round_trip(Path(path), table, Path(mido_directory) / Path(output_path).name)
+        mido_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path, output_path in jobs:
+            transformed, _ = transform_bytes(Path(path).read_bytes(), table)
+            Path(output_path).write_bytes(transformed)
+        table_seconds = time.perf_counter() - start
+
+        for path, output_path in jobs:
+            ours = [msg for track in mido.MidiFile(output_path).tracks for msg in track]
+            theirs = [msg for track in mido.MidiFile(Path(mido_directory) / Path(output_path).name).tracks for msg in track]
+            assert ours == theirs, path
+        print(f"{FILES} files, {notes} note messages, {library_bytes / 1e6:.1f} MB: outputs match the mido round trip")
+
+        summary = transform_corpus([str(directory)], table, "negative")
+        assert not summary["failures"] and summary["files"] == FILES and summary["notes"] > 0
+        # The outputs of the earlier run are not picked up again
+        assert len(collect_jobs([str(directory)], "negative")) == FILES
+
+        print(f"\n{'transformer':<28}{'files/s':>10}{'notes/s':>14}{'MB/s':>8}")
+        for name, seconds in (("mido round trip", mido_seconds), ("lookup table", table_seconds),
+                              (f"lookup table, pool of {os.cpu_count()}", summary["seconds"])):
+            print(f"{name:<28}{FILES / seconds:>10.1f}{notes / seconds:>14.0f}{library_bytes / 1e6 / seconds:>8.1f}")
@@ -0,0 +1,87 @@
+"""Per-event cost of negative harmony: the per-map loop over NoteMap.getNegativeHarmonyNote with DisplayNote and
+NoteProcessResult allocations against a read of the compiled transform table, plus the cost of recompiling the
+table when a map is toggled. The table is checked against the per-map loop for every note and play mode.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkNegativeHarmony
+"""
+import timeit
+
+from jacobs_ladder.src.DataClasses import DisplayNote, NoteProcessResult
+from jacobs_ladder.src.Enums import Algorithm, PlayMode
+from jacobs_ladder.src.NegativeHarmony import NegativeHarmony, NoteMap
+
+EVENTS = 100_000
+
+CG_REFLECTED = {60: 67, 61: 66, 62: 65, 63: 64, 64: 63, 65: 62, 66: 61, 67: 60, 68: 71, 69: 70, 70: 69, 71: 68}
+C_REVOLVED = {60: 60, 61: 71, 62: 70, 63: 69, 64: 68, 65: 67, 66: 66, 67: 65, 68: 64, 69: 63, 70: 62, 71: 61}
+
+
+def per_map_note_on(negative_harmony: NegativeHarmony, note: int) -> NoteProcessResult:
+    """The note on processing before the table: every map is visited for every note"""
+    display_notes = []
+    mapped_notes = []
+    active_maps = 0
+    for note_map in negative_harmony.getMaps():
+        if not note_map.isActive():
+            continue
+        active_maps += 1
+        mapped_note = note_map.getNegativeHarmonyNote(note)
+        if mapped_note is None:
+            continue
+        display_notes.append(DisplayNote(note_map.getName(), mapped_note))
+        mapped_notes.append(mapped_note)
+
+    if negative_harmony.getPlayMode() == PlayMode.ORIGINAL_ONLY:
+        return NoteProcessResult(display=[DisplayNote("Original", note)], play=[note])
+    if negative_harmony.getPlayMode() == PlayMode.LAYERED or not active_maps:
+        display_notes.insert(0, DisplayNote("Original", note))
+        mapped_notes.insert(0, note)
+    return NoteProcessResult(display=display_notes, play=mapped_notes)
+
+
+def build() -> NegativeHarmony:
+    negative_harmony = NegativeHarmony(playMode=PlayMode.LAYERED)
+    negative_harmony.addNoteMapping(NoteMap("C-G reflected", dict(CG_REFLECTED), Algorithm.LOWER_OCTAVE, active=True))
+    negative_harmony.addNoteMapping(NoteMap("C revolved", dict(C_REVOLVED), Algorithm.FIXED_AXIS, active=True))
+    negative_harmony.addNoteMapping(NoteMap("C closest", dict(C_REVOLVED), Algorithm.CLOSEST_OCTAVE, active=False))
+    return negative_harmony
+
+
+def check(negative_harmony: NegativeHarmony) -> None:
+    for note in range(128):
+        expected = per_map_note_on(negative_harmony, note)
+        actual = negative_harmony.processNoteOn(note)
+        assert actual == expected, (note, actual, expected)
+        assert negative_harmony.processNoteOff(note) == expected.play
+
+
+if __name__ == "__main__":
+    negative_harmony = build()
+    for play_mode in PlayMode:
+        negative_harmony.setPlayMode(play_mode)
+        check(negative_harmony)
+    negative_harmony.setPlayMode(PlayMode.LAYERED)
+    negative_harmony.setMapActive("C closest", True)
+    check(negative_harmony)
+    negative_harmony.editMapNote("C-G reflected", 62, 66)
+    negative_harmony.setMapKeyCenter("C revolved", 62)
+    check(negative_harmony)
+    negative_harmony.removeNoteMapping("C revolved")
+    check(negative_harmony)
+    print("Compiled table matches the per-map loop for every note, play mode and map edit")
+
+    negative_harmony = build()
+    notes = [21 + i % 88 for i in range(EVENTS)]
+    timings = {
+        "per-map loop": timeit.timeit(lambda: [per_map_note_on(negative_harmony, note) for note in notes], number=1),
+        "processNoteOn (table)": timeit.timeit(lambda: [negative_harmony.processNoteOn(note) for note in notes], number=1),
+        "table read": timeit.timeit(lambda: [negative_harmony.table[note] for note in notes], number=1),
+    }
+    print(f"\n{'note on':<24}{'per event (us)':>16}")
+    for name, seconds in timings.items():
+        print(f"{name:<24}{seconds / EVENTS * 1e6:>16.3f}")
+
+    toggles = 1000
+    seconds = timeit.timeit(lambda: negative_harmony.setMapActive("C closest", True), number=toggles)
+    print(f"\nRecompile on toggle: {seconds / toggles * 1e6:.1f} us")
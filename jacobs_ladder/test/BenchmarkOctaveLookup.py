@@ -0,0 +1,48 @@
+"""Octave sharing lookup on NOTE_ON for 1-12 held notes: the previous list-building determine_octave, the
+single-pass determine_octave and the PitchClassMap read used by MidiController.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkOctaveLookup
+"""
+import timeit
+
+from jacobs_ladder.src.Utilities import determine_octave
+from jacobs_ladder.src.Voice import PitchClassMap, Voice
+
+REPEATS = 20_000
+
+
+def legacy_determine_octave(message_heap: list, note: int):
+    """determine_octave as it was before the PitchClassMap (kept here for comparison)"""
+    notes = list(map(lambda voice: voice.note, message_heap))
+    instance = list(map(lambda voice: voice.instance_index, message_heap))
+
+    if note in notes:
+        return instance[notes.index(note)]
+
+    octaves = [octave for octave in range(note + 12, 109, 12)]
+    octaves += [octave for octave in range(note - 12, 20, -12)]
+
+    for active_note in notes:
+        if active_note in octaves:
+            return instance[notes.index(active_note)]
+    return None
+
+
+if __name__ == "__main__":
+    print(f"{'held':>4}{'legacy (ns)':>14}{'scan (ns)':>12}{'map (ns)':>11}")
+    for held in range(1, 13):
+        # Held notes spread over several octaves, query an octave of the highest pitch class (worst case scan)
+        message_heap = [Voice(36 + 5 * i, i, 144, 100) for i in range(held)]
+        pitch_class_map = PitchClassMap()
+        pitch_class_map.rebuild(message_heap)
+        note = message_heap[-1].note - 24
+
+        assert legacy_determine_octave(message_heap, note) == determine_octave(message_heap, note) == pitch_class_map.lookup(note)
+
+        results = []
+        for func in (lambda: legacy_determine_octave(message_heap, note),
+                     lambda: determine_octave(message_heap, note),
+                     lambda: pitch_class_map.lookup(note)):
+            results.append(min(timeit.repeat(func, number=REPEATS, repeat=5)) / REPEATS * 1e9)
+        print(f"{held:>4}{results[0]:>14.0f}{results[1]:>12.0f}{results[2]:>11.0f}")
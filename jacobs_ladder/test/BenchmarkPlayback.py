@@ -0,0 +1,109 @@
+"""Playback timing of mido's MidiFile.play() generator (the previous PlayMidi implementation) against MidiPlayer,
+idle and with a background thread churning the allocator and the garbage collector.
+Each message's send time is compared to its ideal time from the call that starts playback.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkPlayback
+"""
+import gc
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import mido
+
+from jacobs_ladder.src.PlayMidi import MidiPlayer, parse_midi_file
+
+BPM = 120
+SIXTEENTHS = 48  # 6 seconds of 16th note chords
+
+
+class RecordingOut:
+    """Stands in for rtmidi.MidiOut and records when each channel message was sent"""
+
+    def __init__(self):
+        self.sent: list[tuple[float, list[int]]] = []
+
+    def send_message(self, message):
+        # Ignore the all-notes-off controller messages the player sends when stopping
+        if message[0] & 0xF0 != 0xB0:
+            self.sent.append((time.perf_counter(), message))
+
+
+def write_test_file(path: str) -> None:
+    mid = mido.MidiFile(ticks_per_beat=480)
+    track = mido.MidiTrack()
+    mid.tracks.append(track)
+    track.append(mido.MetaMessage("set_tempo", tempo=mido.bpm2tempo(BPM)))
+    for i in range(SIXTEENTHS):
+        chord = [48 + i % 12, 52 + i % 12, 55 + i % 12]
+        for note in chord:
+            track.append(mido.Message("note_on", note=note, velocity=80, time=0))
+        for j, note in enumerate(chord):
+            track.append(mido.Message("note_off", note=note, velocity=0, time=120 if j == 0 else 0))
+    mid.save(path)
+
+
+def play_with_mido(path: str, out: RecordingOut) -> float:
+    mid = mido.MidiFile(path)
+    start = time.perf_counter()
+    for msg in mid.play():
+        if not msg.is_meta:
+            out.send_message(msg.bytes())
+    return start
+
+
+def play_with_player(path: str, out: RecordingOut) -> float:
+    player = MidiPlayer(out, parse_midi_file(path))
+    start = time.perf_counter()
+    player.play()
+    player.wait()
+    player.stop()
+    return start
+
+
+def churn(stop: threading.Event) -> None:
+    """Allocate cyclic garbage and force collections to stress the interpreter while playing"""
+    while not stop.is_set():
+        junk = []
+        for _ in range(20_000):
+            node = [junk]
+            junk.append(node)
+        gc.collect()
+
+
+def measure(play, path: str, load: bool) -> dict:
+    ideal = parse_midi_file(path).times
+    out = RecordingOut()
+    stop = threading.Event()
+    worker = threading.Thread(target=churn, args=(stop,), daemon=True) if load else None
+    if worker:
+        worker.start()
+    start = play(path, out)
+    stop.set()
+    if worker:
+        worker.join()
+
+    errors_ms = sorted(abs((sent - start) - ideal_time) * 1e3 for (sent, _), ideal_time in zip(out.sent, ideal))
+    final_drift_ms = ((out.sent[-1][0] - start) - ideal[len(out.sent) - 1]) * 1e3
+    return {
+        "mean": statistics.mean(errors_ms),
+        "p99": errors_ms[int(len(errors_ms) * 0.99) - 1],
+        "max": errors_ms[-1],
+        "drift": final_drift_ms,
+    }
+
+
+if __name__ == "__main__":
+    path = os.path.join(tempfile.gettempdir(), "jacobs_ladder_playback_benchmark.mid")
+    write_test_file(path)
+
+    print(f"{'player':<12}{'load':<6}{'mean (ms)':>11}{'p99 (ms)':>10}{'max (ms)':>10}{'drift (ms)':>12}")
+    for load in (False, True):
+        for name, play in (("mido.play", play_with_mido), ("MidiPlayer", play_with_player)):
+            result = measure(play, path, load)
+            print(f"{name:<12}{'yes' if load else 'no':<6}{result['mean']:>11.3f}{result['p99']:>10.3f}"
+                  f"{result['max']:>10.3f}{result['drift']:>12.3f}")
+    os.remove(path)
@@ -0,0 +1,118 @@
+"""Real-time mode: garbage collector pauses seen by the MIDI callback path with the default collector against
+RealTimeMode (objects alive at startup frozen, full collections deferred to the idle gaps between phrases). The
+callback is simulated without rtmidi: every event runs the candidate scale, key and datagram work of
+MidiController.filter, records the event and leaves some cyclic garbage behind, as tracebacks and closures do. The
+process holds a long-lived heap the size of a running controller's (imported libraries, loaded tables), which is
+what makes a full collection slow. Pinning to core 0 and SCHED_FIFO are attempted as the controller would and the
+outcome printed. Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkRealTime
+"""
+import gc
+import logging
+import random
+import threading
+import time
+
+from jacobs_ladder.src.MusicTheory import MusicTheory
+from jacobs_ladder.src.RealTime import PauseHistogram, RealTimeMode, get_idle_collector, pin_thread, request_fifo
+from jacobs_ladder.src.Utilities import pack_message
+from jacobs_ladder.src.Voice import Voice
+
+PHRASES = 60
+EVENTS_PER_PHRASE = 200
+IDLE_GAP = 0.02
+LONG_LIVED_OBJECTS = 100_000
+INCLUDES = ["Ionian", "Harmonic Minor", "Harmonic Major", "Melodic Minor"]
+
+
+class Garbage:
+    """An object in a reference cycle, only reclaimed by the cyclic collector"""
+
+    def __init__(self):
+        self.cycle = self
+
+
+def play(music_theory: MusicTheory, real_time: RealTimeMode = None) -> list[int]:
+    """Play the phrases, with an idle gap after each, timing every simulated callback"""
+    random.seed(3)
+    latencies, recorded = [], []
+    message_heap = []
+    for _ in range(PHRASES):
+        for event in range(EVENTS_PER_PHRASE):
+            start = time.perf_counter_ns()
+            if real_time is not None:
+                real_time.on_callback()
+            if len(message_heap) < 4:
+                message_heap.append(Voice(random.randint(48, 84), len(message_heap), 144, 100))
+            else:
+                message_heap.pop(0)
+            names, bitmasks = music_theory.get_candidate_scales(message_heap=message_heap, scale_includes=INCLUDES)
+            music_theory.find_key()
+            if names:
+                pack_message(message_heap, names, bitmasks)
+            # Kept for the whole session, like the recorder's events, so it ends up in the oldest generation
+            recorded.append(([144, event & 0x7F, 100], {"time": time.perf_counter(), "voices": list(message_heap)}))
+            for _ in range(20):
+                Garbage()
+            latencies.append(time.perf_counter_ns() - start)
+        message_heap.clear()
+        time.sleep(IDLE_GAP * 2)
+    return latencies
+
+
+def percentile(latencies: list[int], fraction: float) -> float:
+    return sorted(latencies)[min(len(latencies) - 1, int(len(latencies) * fraction))] / 1e3
+
+
+def print_row(name: str, latencies: list[int]) -> None:
+    print(f"{name:<24}{percentile(latencies, 0.5):>10.1f}{percentile(latencies, 0.99):>10.1f}"
+          f"{percentile(latencies, 0.999):>11.1f}{max(latencies) / 1e3:>10.1f}")
+
+
+def scheduling_outcome(cores: list[int], priority: int) -> tuple[str, str]:
+    """Try pinning and SCHED_FIFO on a short-lived thread, so the benchmark itself keeps the default policy"""
+    outcome = {}
+
+    def attempt():
+        for key, setup in (("pin", lambda: pin_thread(cores)), ("fifo", lambda: request_fifo(priority))):
+            try:
+                setup()
+                outcome[key] = "ok"
+            except OSError as e:
+                outcome[key] = f"{type(e).__name__}: {e}"
+
+    thread = threading.Thread(target=attempt)
+    thread.start()
+    thread.join()
+    return outcome["pin"], outcome["fifo"]
+
+
+if __name__ == "__main__":
+    logger = logging.getLogger("BenchmarkRealTime")
+    music_theory = MusicTheory(logger=logger, chord_loading="eager")
+    long_lived = [[index] for index in range(LONG_LIVED_OBJECTS)]
+
+    histogram = PauseHistogram()
+    histogram.start()
+    default_latencies = play(music_theory)
+    histogram.stop()
+
+    real_time = RealTimeMode(logger=logger, cores=[0], idle_gap=IDLE_GAP)
+    real_time.start(tables=music_theory.tables)
+    frozen = gc.get_freeze_count()
+    real_time_latencies = play(music_theory, real_time)
+    real_time_histogram = get_idle_collector().histogram
+    real_time.stop()
+    assert gc.get_freeze_count() == 0 and gc.get_threshold()[2] < 1000
+
+    events = PHRASES * EVENTS_PER_PHRASE
+    print(f"{PHRASES} phrases x {EVENTS_PER_PHRASE} events, {len(long_lived)} long-lived objects, {frozen} frozen by real-time mode\n")
+    print(f"{'collector':<24}{'p50 (us)':>10}{'p99 (us)':>10}{'p99.9 (us)':>11}{'max (us)':>10}")
+    print_row("default", default_latencies)
+    print_row("real-time mode", real_time_latencies)
+    print(f"\nDefault collector ({events} events)\n{histogram.format()}")
+    print(f"\nReal-time mode ({events} events)\n{real_time_histogram.format()}")
+
+    pinned, fifo = scheduling_outcome([0], 50)
+    print(f"\npin to core 0: {pinned}\nSCHED_FIFO 50: {fifo}")
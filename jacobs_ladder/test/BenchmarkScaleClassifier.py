@@ -0,0 +1,114 @@
+"""Harmonized scale generation: ScaleClassifier's previous per-row iterrows/cumsum conversion and nested-loop
+harmonization against the array versions (one cumulative sum over every scale, a strided gather per voice count,
+cached per scale set) returning lists or arrays. Every scale ScaleTree can generate (all 2048 interval patterns filling an octave) is written to
+a temporary csv directory and harmonized from all 12 starting notes for 1-5 voices; the outputs are checked to match.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkScaleClassifier
+"""
+import tempfile
+import time
+from itertools import product
+from pathlib import Path
+
+import pandas as pd
+
+from jacobs_ladder.src.ScaleClassifier import ScaleClassifier
+
+STARTING_NOTES = range(60, 72)
+VOICES = range(1, 6)
+
+
+def write_scales(directory: Path) -> None:
+    """Every composition of 12 semitones into intervals, one csv per degree as ScaleTree names them"""
+    by_degree = {}
+    for cuts in product((False, True), repeat=11):
+        intervals, run = [], 1
+        for cut in cuts:
+            if cut:
+                intervals.append(run)
+                run = 1
+            else:
+                run += 1
+        intervals.append(run)
+        by_degree.setdefault(len(intervals), []).append(intervals)
+    for degree, rows in by_degree.items():
+        pd.DataFrame(rows, columns=[f"Column_{i + 1}" for i in range(degree)]).to_csv(
+            directory / f"degree_{degree}_interval_12_nco_0.csv", index=False)
+
+
+def loop_convert_intervals(df_dict: dict, starting_note: int) -> list:
+    scale_list = []
+    for df_name, df in df_dict.items():
+        for index, row in df.iterrows():
+            remainder = list(map(lambda x: x + starting_note, list(row.cumsum())))
+            scale = [starting_note]
+            scale.extend(remainder)
+            scale_list.append(scale)
+    return scale_list
+
+
+def loop_harmonized_scale(scale: list, num_voices: int) -> list:
+    starting_note = scale[0]
+    scale_original = scale.copy()
+    scale = scale.copy()
+    scale_pattern = [note - starting_note for note in scale]
+    # Extended far enough for every voice count (the original stopped after two octaves)
+    for _ in range(8):
+        extension = [scale[-1] + note for note in scale_pattern]
+        scale.extend(extension[1:])
+    chord_scale = []
+    for index in range(len(scale_original)):
+        chord = []
+        for num_voc in range(0, int(num_voices) * 2, 2):
+            chord.append(scale[index + num_voc])
+        chord_scale.append(chord)
+    return chord_scale
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        write_scales(Path(directory))
+        classifier = ScaleClassifier(csv_directory=directory)
+        scale_count = sum(len(df) for df in classifier.df_dict.values())
+
+        start = time.perf_counter()
+        loop_results = {}
+        for starting_note in STARTING_NOTES:
+            scales = loop_convert_intervals(classifier.df_dict, starting_note)
+            for num_voices in VOICES:
+                loop_results[starting_note, num_voices] = [loop_harmonized_scale(scale, num_voices) for scale in scales]
+        loop_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        array_results = {}
+        for starting_note in STARTING_NOTES:
+            for num_voices in VOICES:
+                array_results[starting_note, num_voices] = classifier.harmonize_scales(starting_note, num_voices)
+        array_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for starting_note in STARTING_NOTES:
+            for num_voices in VOICES:
+                classifier.harmonize_scales(starting_note, num_voices)
+        cached_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for num_voices in VOICES:
+            notes, degrees = classifier.harmonized_notes(STARTING_NOTES, num_voices)
+        arrays_seconds = time.perf_counter() - start
+
+        assert array_results == loop_results
+        assert notes[3, 100, :degrees[100] + 1].tolist() == array_results[STARTING_NOTES[3], VOICES[-1]][100]
+        scales = classifier.convert_intervals(60)
+        assert scales == loop_convert_intervals(classifier.df_dict, 60)
+        assert all(classifier.create_harmonized_scale(scale, 4) == loop_harmonized_scale(scale, 4) for scale in scales)
+
+    chord_scales = len(STARTING_NOTES) * len(VOICES) * scale_count
+    print(f"{scale_count} scales x {len(STARTING_NOTES)} starting notes x {len(VOICES)} voice counts = "
+          f"{chord_scales} chord scales, outputs match\n")
+    print(f"{'implementation':<32}{'seconds':>10}{'chord scales/s':>16}")
+    for name, seconds in (("iterrows + nested loops", loop_seconds), ("cumsum + strided gather", array_seconds),
+                          ("cached offsets", cached_seconds),
+                          ("arrays, all starting notes", arrays_seconds)):
+        print(f"{name:<32}{seconds:>10.3f}{chord_scales / seconds:>16.0f}")
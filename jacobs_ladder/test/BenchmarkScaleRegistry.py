@@ -0,0 +1,85 @@
+"""Scale registry: the previous per-call Scale list construction and note name searches of get_candidate_scales
+against the frozen registry built once at import (shared tuples, 12-bit pitch class masks, precomputed 88-key masks
+and ASCII name fields). Candidate scales and packed datagrams are checked to match for random held notes.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkScaleRegistry
+"""
+import logging
+import random
+import timeit
+from types import SimpleNamespace
+
+from jacobs_ladder.src.Dictionaries import get_midi_notes
+from jacobs_ladder.src.KeyMask import keyboard_mask, mask_to_bytes, pitch_class_mask
+from jacobs_ladder.src.MusicTheory import MusicTheory
+from jacobs_ladder.src.Scales import ALL_SCALES, SCALE_FAMILIES, get_all_scales, get_major_scales_dict
+from jacobs_ladder.src.Utilities import pack_message, sanitize_scale_name, scale_name_field
+from jacobs_ladder.src.Voice import Voice
+
+REPEATS = 2_000
+INCLUDES = ["Ionian", "Harmonic Minor", "Harmonic Major", "Melodic Minor", "Diminished", "Whole Tone", "Pentatonic"]
+INT_NOTE = get_midi_notes()
+# The bitmasks were already precomputed per scale name before the registry
+LEGACY_BITMASKS = {scale.name: mask_to_bytes(keyboard_mask(pitch_class_mask(scale.notes))) for scale in ALL_SCALES}
+
+
+# The mutable scales with note name lists the get_*_scales() getters used to hand out
+LEGACY_SCALES = {family: [SimpleNamespace(name=scale.name, notes=list(scale.notes)) for scale in scales]
+                 for family, scales in SCALE_FAMILIES.items()}
+
+
+def legacy_scale_lists() -> dict[str, list]:
+    """The get_*_scales() lists as every consumer rebuilt them"""
+    return {family: list(scales) for family, scales in LEGACY_SCALES.items()}
+
+
+def legacy_candidate_scales(scale_lists: dict[str, list], message_heap: list[Voice], scale_includes: list[str]):
+    """MusicTheory.get_candidate_scales as it was before the registry (kept here for comparison)"""
+    unique_notes = list(set(INT_NOTE[voice.note] for voice in message_heap))
+    candidate_keys, bitmasks = [], []
+    for family in scale_lists:
+        if family in scale_includes:
+            for scale in scale_lists[family]:
+                if all(element in scale.notes for element in unique_notes):
+                    candidate_keys.append(scale.name)
+                    bitmasks.append(LEGACY_BITMASKS[scale.name])
+    return candidate_keys, bitmasks
+
+
+def legacy_pack_names(candidate_scales: list[str]) -> bytes:
+    return b"".join(sanitize_scale_name(name).ljust(25)[:25].encode("ascii") for name in candidate_scales)
+
+
+def time_us(func) -> float:
+    return min(timeit.repeat(func, number=REPEATS, repeat=5)) / REPEATS * 1e6
+
+
+if __name__ == "__main__":
+    assert [scale.scale_id for scale in get_all_scales()] == list(range(len(ALL_SCALES)))
+    assert get_all_scales() is get_all_scales() and get_major_scales_dict() is get_major_scales_dict()
+
+    music_theory = MusicTheory(logger=logging.getLogger("BenchmarkScaleRegistry"))
+    scale_lists = legacy_scale_lists()
+    random.seed(5)
+    heaps = [[Voice(note, index, 144, 100) for index, note in enumerate(random.sample(range(36, 96), random.randint(1, 6)))]
+             for _ in range(500)]
+    for message_heap in heaps:
+        names, bitmasks = music_theory.get_candidate_scales(message_heap=message_heap, scale_includes=INCLUDES)
+        assert (names, bitmasks) == legacy_candidate_scales(scale_lists, message_heap, INCLUDES)
+        if names:
+            packed = pack_message(message_heap, names, bitmasks)
+            assert legacy_pack_names(names) == b"".join(packed[36 + 36 * i:36 + 36 * i + 25] for i in range(len(names)))
+    print(f"{len(heaps)} random chords: candidate scales, masks and datagrams match")
+
+    print(f"\n{'operation':<40}{'legacy (us)':>12}{'registry (us)':>15}")
+    print(f"{'build the scale lists (per consumer)':<40}{time_us(legacy_scale_lists):>12.1f}"
+          f"{time_us(get_all_scales):>15.2f}")
+    for held in (1, 3, 6):
+        message_heap = [Voice(48 + 7 * i, i, 144, 100) for i in range(held)]
+        legacy = time_us(lambda: legacy_candidate_scales(scale_lists, message_heap, INCLUDES))
+        registry = time_us(lambda: music_theory.get_candidate_scales(message_heap=message_heap, scale_includes=INCLUDES))
+        print(f"{f'get_candidate_scales, {held} held':<40}{legacy:>12.1f}{registry:>15.2f}")
+    names = [scale.name for scale in ALL_SCALES[:12]]
+    print(f"{'name fields of 12 scales':<40}{time_us(lambda: legacy_pack_names(names)):>12.1f}"
+          f"{time_us(lambda: b''.join(scale_name_field(name) for name in names)):>15.2f}")
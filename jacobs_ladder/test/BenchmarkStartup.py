@@ -0,0 +1,44 @@
+"""Cold start regression benchmark for the MidiController entry point.
+
+Fails (non-zero exit code) if importing the entry point takes longer than the budget or if any of the
+deferred heavy modules (pandas, numpy, mido, yaml, bidict) are imported at startup.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkStartup [--budget-ms 150] [--runs 5]
+"""
+import argparse
+import sys
+
+from jacobs_ladder.src.StartupProfile import find_deferred_imports, measure_cold_import_ms, print_import_breakdown
+
+ENTRY_POINT = "jacobs_ladder.src.MidiManager"
+
+# Cold import budget for the entry point. Raise it deliberately (and note why) when a new import is justified.
+COLD_IMPORT_BUDGET_MS = 150.0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if the MidiController cold start exceeds its budget.")
+    parser.add_argument('--module', type=str, default=ENTRY_POINT, help="Entry point module to import.")
+    parser.add_argument('--budget-ms', type=float, default=COLD_IMPORT_BUDGET_MS, help="Cold import budget in ms.")
+    parser.add_argument('--runs', type=int, default=5, help="Number of fresh interpreters to sample.")
+    args = parser.parse_args()
+
+    failures = []
+
+    cold_import_ms = measure_cold_import_ms(args.module, runs=args.runs)
+    print(f"Median cold import of {args.module}: {cold_import_ms:.2f} ms (budget {args.budget_ms:.2f} ms)")
+    if cold_import_ms > args.budget_ms:
+        failures.append(f"cold import took {cold_import_ms:.2f} ms, budget is {args.budget_ms:.2f} ms")
+
+    deferred = find_deferred_imports(args.module)
+    if deferred:
+        failures.append(f"deferred modules imported at startup: {', '.join(deferred)}")
+
+    if failures:
+        print()
+        print_import_breakdown(args.module)
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+    print("PASSED")
@@ -0,0 +1,72 @@
+"""Resolution and sleep jitter of the clocks the schedulers can run on: time.sleep, the Clock wait-then-spin pattern
+on time.perf_counter, and the compiled qpc_utils timer (QPC on Windows, CLOCK_MONOTONIC_RAW on Linux and macOS) with
+its calibrated qpcSmartSleepNs, when it has been built.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkTimer
+"""
+import statistics
+import threading
+import time
+
+from jacobs_ladder.src.Clock import MonotonicClock, QpcClock
+
+SLEEP_MS = (1, 5, 10)
+REPEATS = 200
+
+
+def resolution_ns(clock) -> float:
+    """Smallest non-zero step between consecutive reads of the clock"""
+    steps = []
+    for _ in range(10_000):
+        first = clock.get_ticks()
+        second = clock.get_ticks()
+        while second == first:
+            second = clock.get_ticks()
+        steps.append(second - first)
+    return min(steps) * 1e9 / clock.get_frequency()
+
+
+def wait_then_spin(clock, seconds: float) -> None:
+    """The scheduler pattern: a Condition wait until spin_threshold before the deadline, then spin_until"""
+    condition = threading.Condition()
+    deadline = clock.now() + seconds
+    with condition:
+        while deadline - clock.now() > clock.spin_threshold:
+            clock.wait_until(condition, deadline)
+    clock.spin_until(deadline)
+
+
+def jitter(sleep, clock, seconds: float) -> tuple[float, float, float]:
+    """Mean, p99 and max overshoot in microseconds of sleeping for `seconds`"""
+    overshoots = []
+    for _ in range(REPEATS):
+        start = clock.get_ticks()
+        sleep(seconds)
+        elapsed = (clock.get_ticks() - start) / clock.get_frequency()
+        overshoots.append((elapsed - seconds) * 1e6)
+    overshoots.sort()
+    return statistics.mean(overshoots), overshoots[int(len(overshoots) * 0.99) - 1], overshoots[-1]
+
+
+if __name__ == "__main__":
+    monotonic = MonotonicClock()
+    candidates = [("time.sleep", monotonic, time.sleep),
+                  ("perf_counter wait+spin", monotonic, lambda seconds: wait_then_spin(monotonic, seconds))]
+    try:
+        qpc = QpcClock()
+        print(f"qpc_utils: {qpc.get_frequency()} Hz, calibrated spin threshold {qpc.qpc.qpcGetSpinThresholdNs() / 1e3:.0f} us")
+        candidates += [("qpcSmartSleepNs", qpc, qpc.sleep),
+                       ("qpc wait+spin", qpc, lambda seconds: wait_then_spin(qpc, seconds))]
+    except ImportError:
+        qpc = None
+        print("qpc_utils is not built; build jacobs_ladder/cpp to include it")
+
+    print(f"\nResolution: perf_counter {resolution_ns(monotonic):.0f} ns" +
+          (f", qpc_utils {resolution_ns(qpc):.0f} ns" if qpc else ""))
+
+    print(f"\n{'sleep':<24}{'target':>8}{'mean (us)':>11}{'p99 (us)':>10}{'max (us)':>10}")
+    for name, clock, sleep in candidates:
+        for ms in SLEEP_MS:
+            mean, p99, worst = jitter(sleep, clock, ms / 1000)
+            print(f"{name:<24}{ms:>6}ms{mean:>11.1f}{p99:>10.1f}{worst:>10.1f}")
@@ -0,0 +1,68 @@
+"""Chord transition matrix: the pure Python pair loop (ChordSeqTree.voice_leading_distance and a subset test per
+scale) against PossibleTransitions.TransitionMatrix's broadcast build, in this process and across a pool, checked to
+agree, and the latency of a "next chord" suggestion, which is a row lookup. Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkTransitions
+"""
+import os
+import time
+import timeit
+
+import numpy as np
+
+from jacobs_ladder.src.ChordSeqTree import voice_leading_distance
+from jacobs_ladder.src.PossibleTransitions import TransitionMatrix
+
+# Triads and seventh chords for the pure Python reference, which is quadratic
+REFERENCE_DEGREES = (3, 4)
+
+
+def python_matrices(transitions: TransitionMatrix) -> tuple[np.ndarray, np.ndarray]:
+    masks = [int(mask) for mask in transitions.masks]
+    fits = [set(np.flatnonzero(row).tolist()) for row in transitions.fits]
+    cost = [[voice_leading_distance(first, second) for second in masks] for first in masks]
+    shared = [[len(fits[first] & fits[second]) for second in range(len(masks))] for first in range(len(masks))]
+    return np.array(cost, dtype=np.uint8), np.array(shared, dtype=np.uint8)
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    subset = TransitionMatrix(degrees=REFERENCE_DEGREES)
+    subset_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cost, shared = python_matrices(subset)
+    python_seconds = time.perf_counter() - start
+    assert (cost == subset.cost).all() and (shared == subset.shared).all()
+    print(f"degrees {REFERENCE_DEGREES}, {len(subset.names)} chords: pure Python {python_seconds:.2f} s, "
+          f"broadcast {subset_seconds * 1e3:.1f} ms, matrices match")
+
+    # Suggestions are the first k rows of a full sort, ties at the k-th rank included
+    for chord in range(len(subset.names)):
+        row_cost, row_shared = subset.cost[chord].astype(np.int64), subset.shared[chord].astype(np.int64)
+        rows = np.flatnonzero((row_shared >= 1) & (subset.masks != subset.masks[chord]))
+        ordered = rows[np.lexsort((rows, 255 - row_shared[rows], row_cost[rows]))]
+        for k in (1, 3, 5, 10):
+            expected = [subset.names[row] for row in ordered[:k]]
+            assert [name for name, _, _ in subset.suggest_next(chord, k=k)] == expected, (subset.names[chord], k)
+    print("suggest_next matches a full sort for every chord and k in (1, 3, 5, 10)")
+
+    print(f"\n{'all degrees, workers':<24}{'chords':>8}{'pairs':>12}{'build (s)':>12}")
+    full = None
+    for workers in (1, 2, os.cpu_count()):
+        start = time.perf_counter()
+        transitions = TransitionMatrix(workers=workers)
+        seconds = time.perf_counter() - start
+        if full is None:
+            full = transitions
+        else:
+            assert (transitions.cost == full.cost).all() and (transitions.shared == full.shared).all()
+        print(f"{workers:<24}{len(transitions.names):>8}{len(transitions.names) ** 2:>12}{seconds:>12.3f}")
+
+    chord = full.index("C Major7")
+    number = 2000
+    for label, kwargs in (("suggest_next", {}), ("suggest_next, max_cost=2", {"max_cost": 2}),
+                          ("suggest_next, 3 shared scales", {"min_shared_scales": 3})):
+        seconds = timeit.timeit(lambda: full.suggest_next(chord, **kwargs), number=number) / number
+        print(f"{label:<32}{seconds * 1e6:>8.1f} us")
+    print("\nC Major7 ->", ", ".join(name for name, _, _ in full.suggest_next(chord, k=5)))
@@ -0,0 +1,70 @@
+"""Per-event allocations of the NOTE_ON record: legacy [note, instance_index, status, velocity, PitchInfo()] lists
+versus slotted Voice records sharing an interned PitchInfo.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkVoiceAllocations
+"""
+import gc
+import heapq
+import sys
+import time
+import tracemalloc
+
+from jacobs_ladder.src.Pitch import PitchInfo
+from jacobs_ladder.src.Utilities import pack_message_heap
+from jacobs_ladder.src.Voice import Voice
+
+NOTES = list(range(21, 109))
+CYCLES = 100_000
+HELD_NOTES = 10
+
+
+def legacy_note_on(message_heap: list, note: int, instance_index: int):
+    heapq.heappush(message_heap, [note, instance_index, 144, 100, PitchInfo()])
+
+
+def voice_note_on(message_heap: list, note: int, instance_index: int):
+    heapq.heappush(message_heap, Voice(note, instance_index, 144, 100))
+
+
+def allocations_per_event(note_on) -> tuple[float, float]:
+    """Blocks and bytes still allocated per NOTE_ON after all 88 keys are held"""
+    message_heap = []
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    for note in NOTES:
+        note_on(message_heap, note, note % 12)
+    blocks = sys.getallocatedblocks() - blocks_before
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.enable()
+    return blocks / len(NOTES), size / len(NOTES)
+
+
+def seconds_per_event(note_on) -> float:
+    """NOTE_ON/NOTE_OFF cycles with HELD_NOTES notes already sounding"""
+    message_heap = []
+    for note in NOTES[:HELD_NOTES]:
+        note_on(message_heap, note, note % 12)
+    start = time.perf_counter()
+    for i in range(CYCLES):
+        note_on(message_heap, 60 + i % 12, i % 12)
+        heapq.heappop(message_heap)
+    return (time.perf_counter() - start) / CYCLES
+
+
+if __name__ == "__main__":
+    print(f"{'record':<10}{'blocks/event':>14}{'bytes/event':>14}{'ns/event':>12}")
+    for name, note_on in (("list", legacy_note_on), ("Voice", voice_note_on)):
+        blocks, size = allocations_per_event(note_on)
+        print(f"{name:<10}{blocks:>14.2f}{size:>14.1f}{seconds_per_event(note_on) * 1e9:>12.0f}")
+
+    message_heap = []
+    for note in NOTES[:HELD_NOTES]:
+        voice_note_on(message_heap, note, note % 12)
+    start = time.perf_counter()
+    for _ in range(CYCLES // 10):
+        pack_message_heap(message_heap)
+    print(f"\npack_message_heap ({HELD_NOTES} held notes): {(time.perf_counter() - start) / (CYCLES // 10) * 1e6:.2f} us")
@@ -0,0 +1,66 @@
+"""Voicing index generation, disk cache and query latency. A few chords are checked against a brute-force search
+over every combination of notes within the span.
+Run from the project root:
+
+    python -m jacobs_ladder.test.BenchmarkVoicingIndex
+"""
+import tempfile
+import time
+import timeit
+from itertools import combinations
+
+from jacobs_ladder.src.ChordClassifier import TEMPLATES_BY_DEGREE
+from jacobs_ladder.src.VoicingIndex import (DEFAULT_MAX_SPAN, HIGHEST_NOTE, LOWEST_NOTE, cache_path, chord_pitch_classes,
+                                            load_voicing_index)
+
+QUERIES = 10_000
+
+
+def brute_force(intervals: list[int], root: int, max_span: int) -> set[tuple[int, ...]]:
+    """Every set of notes, one per pitch class of the chord, within max_span"""
+    pitch_classes = {(root + pitch_class) % 12 for pitch_class in chord_pitch_classes(intervals)}
+    voicings = set()
+    for bottom in range(LOWEST_NOTE, HIGHEST_NOTE + 1):
+        if bottom % 12 not in pitch_classes:
+            continue
+        window = range(bottom + 1, min(bottom + max_span, HIGHEST_NOTE) + 1)
+        for upper in combinations(window, len(pitch_classes) - 1):
+            notes = (bottom, *upper)
+            if {note % 12 for note in notes} == pitch_classes:
+                voicings.add(notes)
+    return voicings
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        index = load_voicing_index(cache_dir=cache_dir)
+        generated = time.perf_counter() - start
+        start = time.perf_counter()
+        cached = load_voicing_index(cache_dir=cache_dir)
+        loaded = time.perf_counter() - start
+        size = cache_path(DEFAULT_MAX_SPAN, cache_dir=cache_dir).stat().st_size
+    assert all((getattr(index, column) == getattr(cached, column)).all() for column in index.COLUMNS)
+    assert index.chord_names == cached.chord_names
+
+    for degree, name, root in ((3, "Major", 0), (3, "Augmented", 4), (4, "Major7", 7), (4, "Fully diminished", 2)):
+        chord = index.chord_id(name, degree=degree)
+        expected = brute_force(TEMPLATES_BY_DEGREE[degree][name], root, DEFAULT_MAX_SPAN)
+        found = {tuple(notes) for notes in index.voicings(chord, root=root).tolist()}
+        assert found == expected, (name, len(found), len(expected))
+    print("Voicings match a brute-force search for Major, Augmented, Major7 and Fully diminished")
+
+    print(f"\n{len(index)} voicings of {len(index.chord_names)} chords within {DEFAULT_MAX_SPAN} semitones")
+    print(f"Generate and cache: {generated:.2f} s, load from cache: {loaded * 1e3:.0f} ms ({size / 1e6:.1f} MB)")
+
+    major7 = index.chord_id("Major7")
+    queries = {
+        "chord, root": lambda: index.query(major7, root=0),
+        "chord, root, span": lambda: index.query(major7, root=0, span=(16, 16)),
+        "chord, root, span, top": lambda: index.query(major7, root=0, span=(14, 17), top=(72, 76)),
+        "chord, span, top": lambda: index.query(major7, span=(14, 17), top=(72, 76)),
+    }
+    print(f"\n{'query':<26}{'rows':>6}{'per query (us)':>16}")
+    for name, query in queries.items():
+        seconds = timeit.timeit(query, number=QUERIES)
+        print(f"{name:<26}{len(query()):>6}{seconds / QUERIES * 1e6:>16.2f}")
@@ -0,0 +1,87 @@
+"""Recording timestamps from rtmidi's accumulated delta times (InputTimeline) against re-timestamping in the callback.
+A performance on an exact sixteenth-note grid is delivered with random callback lag on a VirtualClock; both
+recordings are saved and compared to the grid.
+Run from the project root:
+
+    python -m jacobs_ladder.test.TestInputTimeline
+"""
+import logging
+import os
+import random
+import tempfile
+
+import mido
+
+from jacobs_ladder.src.Clock import VirtualClock
+from jacobs_ladder.src.InputTimeline import InputTimeline
+from jacobs_ladder.src.MidiRecorder import MidiRecorder
+
+NOTES = 400
+STEP_S = 0.125       # sixteenth notes at 120 bpm
+STEP_TICKS = 240     # at 960 ticks per beat
+MAX_LAG_S = 0.008    # callback scheduling lag
+
+
+def save(recorder: MidiRecorder, name: str) -> list[int]:
+    path = os.path.join(tempfile.gettempdir(), name)
+    recorder.stop(filename=path)
+    recorder._saving_thread.join()
+    ticks = []
+    now = 0
+    for msg in mido.MidiFile(path).tracks[0]:
+        if not msg.is_meta:
+            now += msg.time
+            ticks.append(now)
+    os.remove(path)
+    return ticks
+
+
+def grid_error(ticks: list[int]) -> tuple[float, int]:
+    """Mean and max distance in ticks of note-on ticks from the sixteenth-note grid"""
+    errors = [abs(tick - i * STEP_TICKS) for i, tick in enumerate(ticks)]
+    return sum(errors) / len(errors), max(errors)
+
+
+if __name__ == "__main__":
+    random.seed(7)
+    logger = logging.getLogger("TestInputTimeline")
+    clock = VirtualClock(start=100.0)
+    timeline = InputTimeline(clock=clock)
+    from_deltas = MidiRecorder(logger=logger, clock=clock)
+    from_callback = MidiRecorder(logger=logger, clock=clock)
+
+    # Note on at every grid point, note off 1 ms before the next; rtmidi reports the exact gaps between them
+    performance = []
+    for i in range(NOTES):
+        performance.append((i * STEP_S, 144))
+        performance.append(((i + 1) * STEP_S - 0.001, 128))
+
+    previous = None
+    for performed_at, status in performance:
+        dt = 0.0 if previous is None else performed_at - previous
+        previous = performed_at
+        # The callback runs some time after the driver received the message
+        clock.advance(100.0 + performed_at + random.uniform(0.0, MAX_LAG_S) - clock.now())
+        event_time = timeline.advance(dt)
+        if status == 144 and performed_at == 0.0:
+            from_deltas.start(tempo=120, start_time=event_time)
+            from_callback.start(tempo=120)
+        from_deltas.record_event(status, 60, 100, timestamp=event_time)
+        from_callback.record_event(status, 60, 100)
+
+    # Only the note-ons sit on the grid
+    delta_ticks = save(from_deltas, "jacobs_ladder_timeline_deltas.mid")[::2]
+    callback_ticks = save(from_callback, "jacobs_ladder_timeline_callback.mid")[::2]
+    delta_mean, delta_max = grid_error(delta_ticks)
+    callback_mean, callback_max = grid_error(callback_ticks)
+    print(f"{'timestamps':<22}{'mean error (ticks)':>20}{'max error (ticks)':>20}")
+    print(f"{'rtmidi deltas':<22}{delta_mean:>20.2f}{delta_max:>20}")
+    print(f"{'callback clock':<22}{callback_mean:>20.2f}{callback_max:>20}")
+    print(f"Timeline: {timeline.summary()}")
+    assert delta_max == 0
+
+    # A port reopened mid-performance restarts rtmidi's deltas; the cross-check re-anchors the timeline
+    clock.advance(5.0)
+    timeline.advance(0.0)
+    assert timeline.resyncs == 1 and abs(timeline.now() - timeline.position) < 1e-9
+    print("Resync after a restarted port: ok")
@@ -0,0 +1,79 @@
+"""Output voice accounting of MidiController with negative harmony: a 7-note chord is played and released through
+the MIDI callback (filter) with one active map in each play mode, with and without the sustain pedal, and all 12
+voices must be back in the pool with no note left sounding. The controller is constructed with injected MIDI ports
+which record what they are sent, telemetry off and its control port on an ephemeral port. Run from the project root:
+
+    python -m jacobs_ladder.test.TestMappedVoices
+"""
+import logging
+
+from jacobs_ladder.src.Enums import Algorithm, PlayMode
+from jacobs_ladder.src.MidiManager import MidiController
+from jacobs_ladder.src.MusicTheory import TheoryTables
+from jacobs_ladder.src.NegativeHarmony import NegativeHarmony, NoteMap
+
+C_REVOLVED = {60: 60, 61: 71, 62: 70, 63: 69, 64: 68, 65: 67, 66: 66, 67: 65, 68: 64, 69: 63, 70: 62, 71: 61}
+CHORD = [60, 62, 64, 65, 67, 69, 71]
+
+
+class RecordingPort:
+    """An output port keeping the notes it has been sent a NOTE_ON for and no NOTE_OFF yet"""
+
+    def __init__(self):
+        self.sounding = set()
+
+    def send_message(self, message: list[int]) -> None:
+        kind = message[0] & 0xF0
+        if kind == 0x90 and message[2] > 0:
+            self.sounding.add(message[1])
+        elif kind in (0x80, 0x90):
+            self.sounding.discard(message[1])
+
+    def is_port_open(self) -> bool:
+        return True
+
+    def close_port(self) -> None:
+        pass
+
+
+class InjectedInput(RecordingPort):
+    """The input port; messages are delivered by calling filter directly"""
+
+    def set_callback(self, callback) -> None:
+        self.callback = callback
+
+
+def build_controller(theory_tables: TheoryTables, play_mode: PlayMode) -> MidiController:
+    negative_harmony = NegativeHarmony(playMode=play_mode)
+    negative_harmony.addNoteMapping(NoteMap("C revolved", dict(C_REVOLVED), Algorithm.FIXED_AXIS, active=True))
+    return MidiController(name="TestMappedVoices", midi_in=InjectedInput(), midi_out_ports=[RecordingPort() for _ in range(12)],
+                          tuning_configuration={"tuning_mode": None}, scale_includes=["Ionian"], theory_tables=theory_tables,
+                          control_port=0, telemetry_port=None, negative_harmony=negative_harmony, listen=False)
+
+
+def play_chord(controller: MidiController, pedal: bool) -> None:
+    if pedal:
+        controller.filter(([176, 64, 127], 0.0), None)
+    for note in CHORD:
+        controller.filter(([144, note, 100], 0.01), None)
+    for note in CHORD:
+        controller.filter(([128, note, 0], 0.01), None)
+    if pedal:
+        controller.filter(([176, 64, 0], 0.01), None)
+
+
+if __name__ == "__main__":
+    theory_tables = TheoryTables(logger=logging.getLogger("TestMappedVoices"), chord_loading="lazy")
+    for play_mode in (PlayMode.SUBSTITUTE, PlayMode.LAYERED):
+        for pedal in (False, True):
+            controller = build_controller(theory_tables, play_mode)
+            try:
+                assert controller.midi_in.callback == controller.filter
+                play_chord(controller, pedal)
+                play_chord(controller, pedal)
+                assert sorted(controller.instance_index) == list(range(12)), (play_mode, pedal, controller.instance_index)
+                assert not controller.in_use_indices and not controller.mapped_voices and not controller.message_heap
+                assert not any(port.sounding for port in controller.midi_out_ports), (play_mode, pedal)
+            finally:
+                controller.shutdown()
+            print(f"{play_mode.name:<12} {'with' if pedal else 'without'} pedal: all 12 voices free, nothing sounding")
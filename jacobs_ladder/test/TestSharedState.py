@@ -0,0 +1,94 @@
+"""Shared-memory state channel: round trip, torn-read check against a busy writer and publish/read cost.
+Pass the path of a running MidiController's shared_state_path to watch it instead.
+Run from the project root:
+
+    python -m jacobs_ladder.test.TestSharedState [--watch PATH]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+import timeit
+
+from jacobs_ladder.src.KeyMask import LiveKeyMask
+from jacobs_ladder.src.Pitch import pitches
+from jacobs_ladder.src.SharedState import SharedStateReader, SharedStateWriter
+from jacobs_ladder.src.Utilities import pack_message_heap
+from jacobs_ladder.src.Voice import Voice
+
+REPEATS = 20_000
+
+
+def watch(path: str) -> None:
+    reader = SharedStateReader(path)
+    last_sequence = None
+    try:
+        while True:
+            if reader.sequence != last_sequence:
+                snapshot = reader.read()
+                if snapshot is not None:
+                    last_sequence = snapshot.sequence
+                    print(f"key={snapshot.key_id} candidates={snapshot.candidate_ids} "
+                          f"voices={[(voice.note, voice.pitch.ratio) for voice in snapshot.voices]}")
+            time.sleep(1 / 60)
+    except KeyboardInterrupt:
+        reader.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--watch", type=str, default=None, help="Print the state published at this path at 60 Hz.")
+    args = parser.parse_args()
+    if args.watch:
+        watch(args.watch)
+        raise SystemExit(0)
+
+    path = os.path.join(tempfile.gettempdir(), "jacobs_ladder_state_test.bin")
+    writer = SharedStateWriter(path)
+    reader = SharedStateReader(path)
+
+    message_heap = [Voice(60, 0, 144, 100), Voice(64, 4, 144, 90, pitches["major_third_up"]), Voice(67, 7, 144, 80, pitches["perfect_fifth_up"])]
+    live_keys = LiveKeyMask()
+    live_keys.rebuild(voice.note for voice in message_heap)
+    voices = pack_message_heap(message_heap)
+    writer.publish(live_keys.to_bytes(), voices, candidate_ids=[1, 6, 14], key_id=1)
+
+    snapshot = reader.read()
+    assert snapshot.live_keys == live_keys.mask and snapshot.candidate_ids == [1, 6, 14] and snapshot.key_id == 1
+    assert [(voice.note, voice.instance_index, voice.pitch.ratio) for voice in snapshot.voices] == \
+           [(voice.note, voice.instance_index, voice.pitch.ratio) for voice in message_heap]
+    print("Round trip: ok")
+
+    # The writer publishes states whose fields all derive from one counter, a torn read would mix two of them
+    stop = threading.Event()
+    def busy_writer():
+        count = 0
+        while not stop.is_set():
+            held = count % 40
+            writer.publish(bytes(11), pack_message_heap([Voice(21 + i, i % 12, 144, 100) for i in range(held)]),
+                           candidate_ids=list(range(held)), key_id=held)
+            count += 1
+
+    thread = threading.Thread(target=busy_writer)
+    thread.start()
+    torn = failed = 0
+    for _ in range(REPEATS):
+        snapshot = reader.read()
+        if snapshot is None:
+            failed += 1
+            continue
+        held = snapshot.key_id
+        if snapshot.candidate_ids != list(range(held)) or [voice.note for voice in snapshot.voices] != [21 + i for i in range(held)]:
+            torn += 1
+    stop.set()
+    thread.join()
+    print(f"Torn reads: {torn} of {REPEATS} ({failed} reads gave up on a busy writer)")
+
+    publish_ns = min(timeit.repeat(lambda: writer.publish(live_keys.to_bytes(), voices, [1, 6, 14], 1), number=REPEATS, repeat=5)) / REPEATS * 1e9
+    read_ns = min(timeit.repeat(reader.read, number=REPEATS, repeat=5)) / REPEATS * 1e9
+    print(f"publish: {publish_ns:.0f} ns, read: {read_ns:.0f} ns")
+
+    reader.close()
+    writer.close()
+    os.remove(path)
@@ -0,0 +1,77 @@
+"""Shared TimingThread: overlapping sequences, chaining with after=, cancel and the timing error of each message.
+Run from the project root:
+
+    python -m jacobs_ladder.test.TestTimingThread
+"""
+import statistics
+import threading
+import time
+
+from jacobs_ladder.src.TimingThread import TimingThread
+
+SEQUENCES = 8
+STEPS = 40
+STEP_S = 0.025
+
+
+class RecordingOut:
+    """Stands in for rtmidi.MidiOut and records when each message was sent"""
+
+    def __init__(self):
+        self.sent: list[tuple[float, list[int]]] = []
+
+    def send_message(self, message):
+        self.sent.append((time.perf_counter(), message))
+
+
+def scale_events(base_note: int) -> list[tuple[float, list[int]]]:
+    events = []
+    for step in range(STEPS):
+        events.append((step * STEP_S, [0x90, base_note + step % 12, 80]))
+        events.append(((step + 1) * STEP_S, [0x80, base_note + step % 12, 0]))
+    return events
+
+
+if __name__ == "__main__":
+    timing_thread = TimingThread()
+
+    # Overlapping sequences scheduled from one thread, none of which blocks the caller
+    outs = [RecordingOut() for _ in range(SEQUENCES)]
+    start = time.perf_counter()
+    handles = [timing_thread.schedule(out.send_message, scale_events(36 + 6 * i)) for i, out in enumerate(outs)]
+    schedule_ms = (time.perf_counter() - start) * 1e3
+    for handle in handles:
+        assert handle.wait(timeout=5)
+
+    errors_ms = []
+    for out in outs:
+        ideal = sorted(offset for offset, _ in scale_events(0))
+        errors_ms.extend((sent - start - ideal_time) * 1e3 for (sent, _), ideal_time in zip(out.sent, ideal))
+        assert len(out.sent) == 2 * STEPS
+    errors_ms.sort()
+    print(f"{SEQUENCES} overlapping sequences, {len(errors_ms)} messages on {threading.active_count() - 1} extra thread(s): "
+          f"scheduled in {schedule_ms:.3f} ms, error mean {statistics.mean(errors_ms):.3f} ms, "
+          f"p99 {errors_ms[int(len(errors_ms) * 0.99) - 1]:.3f} ms, max {errors_ms[-1]:.3f} ms")
+
+    # A sequence scheduled after another starts where the first one is due to end
+    out = RecordingOut()
+    first = timing_thread.schedule(out.send_message, [(0.0, [0x90, 60, 80]), (0.1, [0x80, 60, 0])])
+    second = timing_thread.schedule(out.send_message, [(0.0, [0x90, 62, 80]), (0.1, [0x80, 62, 0])], after=first)
+    second.wait(timeout=5)
+    gap_ms = (out.sent[2][0] - out.sent[0][0]) * 1e3
+    assert out.sent[2][1][1] == 62 and abs(gap_ms - 100) < 20
+    print(f"Chaining: second sequence started {gap_ms:.3f} ms after the first")
+
+    # Cancelling drops the rest of a sequence and turns off what it left sounding
+    out = RecordingOut()
+    handle = timing_thread.schedule(out.send_message, [(0.0, [0x90, 60, 80]), (0.0, [0x90, 64, 80]),
+                                                       (1.0, [0x80, 60, 0]), (1.0, [0x80, 64, 0])])
+    time.sleep(0.05)
+    handle.cancel()
+    assert handle.wait(timeout=1)
+    time.sleep(1.1)
+    assert [message[0] & 0xF0 for _, message in out.sent] == [0x90, 0x90, 0x80, 0x80]
+    assert sorted(message[1] for _, message in out.sent[2:]) == [60, 64]
+    print("Cancel: ok")
+
+    timing_thread.stop()
@@ -0,0 +1,116 @@
+"""Runs MidiScheduler, MidiPlayer, TimingThread and MidiRecorder on a VirtualClock and checks that every message
+lands on its exact scheduled time. Two hours of sixteenth notes are simulated in a few seconds.
+Run from the project root:
+
+    python -m jacobs_ladder.test.TestVirtualClock
+"""
+import logging
+import os
+import tempfile
+import time
+from array import array
+
+import mido
+
+from jacobs_ladder.src.Clock import VirtualClock
+from jacobs_ladder.src.DataClasses import NoteEvent
+from jacobs_ladder.src.MidiRecorder import MidiRecorder
+from jacobs_ladder.src.MidiScheduler import MidiScheduler
+from jacobs_ladder.src.PlayMidi import MidiPlayer, ParsedMidi
+from jacobs_ladder.src.TimingThread import TimingThread
+
+HOURS = 2
+STEP_MS = 125  # sixteenth notes at 120 bpm
+STEPS = HOURS * 3600 * 1000 // STEP_MS
+
+
+class RecordingOut:
+    """Stands in for rtmidi.MidiOut and records the virtual time each message was sent at"""
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self.sent: list[tuple[float, list[int]]] = []
+
+    def send_message(self, message):
+        self.sent.append((self.clock.now(), list(message)))
+
+
+def check_scheduler() -> None:
+    clock = VirtualClock()
+    out = RecordingOut(clock)
+    scheduler = MidiScheduler(clock=clock, midi_out=out)
+    scheduler.add_events([NoteEvent(dt=0 if i == 0 else STEP_MS, note=60 + i % 12, status=144, velocity=100)
+                          for i in range(STEPS)])
+    scheduler.schedule_events(initial_delay=1000)
+    clock.advance(HOURS * 3600 + 2)
+    scheduler.stop()
+
+    assert len(out.sent) == STEPS
+    assert all(sent == 1.0 + i * STEP_MS / 1000 for i, (sent, _) in enumerate(out.sent))
+    print(f"MidiScheduler: {STEPS} events over {HOURS} h on exact times")
+
+
+def check_player() -> None:
+    clock = VirtualClock()
+    out = RecordingOut(clock)
+    times = array("d", (i * STEP_MS / 1000 for i in range(STEPS)))
+    parsed = ParsedMidi(path="virtual", times=times, messages=tuple((0x90, 60 + i % 12, 80) for i in range(STEPS)))
+    player = MidiPlayer(out, parsed, clock=clock)
+    player.play()
+    clock.advance(HOURS * 3600 / 2)
+    player.set_tempo_scale(2.0)
+    clock.advance(HOURS * 3600)
+    assert player.wait(timeout=1)
+    player.stop()
+
+    notes = [(sent, message) for sent, message in out.sent if message[0] & 0xF0 == 0x90]
+    assert len(notes) == STEPS
+    half = STEPS // 2
+    assert all(sent == times[i] for i, (sent, _) in enumerate(notes[:half]))
+    # After the tempo change at half time the rest plays twice as fast from that point
+    assert all(abs(sent - (times[half] + (times[half + i] - times[half]) / 2)) < 1e-9
+               for i, (sent, _) in enumerate(notes[half:]))
+    print(f"MidiPlayer: {STEPS} events over {HOURS} h on exact times, tempo change included")
+
+
+def check_timing_thread() -> None:
+    clock = VirtualClock()
+    out = RecordingOut(clock)
+    timing_thread = TimingThread(clock=clock)
+    events = [(i * STEP_MS / 1000, [0x90, 60, 80]) for i in range(STEPS // 8)]
+    first = timing_thread.schedule(out.send_message, events)
+    second = timing_thread.schedule(out.send_message, events, delay=STEP_MS / 2000)
+    clock.advance(events[-1][0] + 1)
+    assert first.wait(timeout=1) and second.wait(timeout=1)
+    timing_thread.stop()
+
+    expected = sorted([offset for offset, _ in events] + [offset + STEP_MS / 2000 for offset, _ in events])
+    assert [sent for sent, _ in out.sent] == expected
+    print(f"TimingThread: 2 overlapping sequences of {len(events)} events on exact times")
+
+
+def check_recorder() -> None:
+    clock = VirtualClock()
+    recorder = MidiRecorder(logger=logging.getLogger("TestVirtualClock"), clock=clock)
+    recorder.start(tempo=120)
+    for i in range(16):
+        clock.advance(STEP_MS / 1000)
+        recorder.record_event(144 if i % 2 == 0 else 128, 60, 100)
+    path = os.path.join(tempfile.gettempdir(), "jacobs_ladder_virtual_clock.mid")
+    recorder.stop(filename=path)
+    recorder._saving_thread.join()
+
+    # 125 ms at 120 bpm is a sixteenth note: 240 ticks at 960 ticks per beat
+    deltas = [msg.time for msg in mido.MidiFile(path).tracks[0] if not msg.is_meta]
+    os.remove(path)
+    assert deltas == [240] * 16, deltas
+    print("MidiRecorder: 16 sixteenth notes recorded on exact ticks")
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    check_scheduler()
+    check_player()
+    check_timing_thread()
+    check_recorder()
+    print(f"Done in {time.perf_counter() - start:.2f} s of real time")